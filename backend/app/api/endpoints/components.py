@@ -5,129 +5,251 @@ Handles component creation, variants, and customization
 """
 
 import logging
-from typing import Dict, List, Any, Optional
-from fastapi import APIRouter, HTTPException, status, Depends, Query
-from pydantic import BaseModel, Field, validator
+import os
+import time
+from typing import Dict, Iterator, List, Any, Literal, Optional, Tuple, Union
+import orjson
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect, status, Depends, Query
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from pydantic import BaseModel, Field, ValidationError
 import asyncio
 from datetime import datetime
 
-from app.services.generators.design_generator import DesignGeneratorService
-from app.services.generators.component_generator import ComponentGeneratorService
+from app.api.validation import ColorRole, ComponentType, CssMode, DesignStyle, Framework, HexColor
+from app.services.generation_worker import (
+    build_generation_payload, canonical_generation_request, generator_version,
+    get_design_service, init_generation_worker, iter_generation_events, similarity_threshold
+)
+from app.utils.http_cache import (
+    cache_headers, etag_matches, http_date, is_not_modified, not_modified_response, strong_etag, weak_etag
+)
+from app.services.live_session import LiveSession, merge_changes
+from app.utils.metrics import (
+    GENERATION_COALESCED, GENERATION_POOL_QUEUE_DEPTH, LIVE_SESSION_EDITS, LIVE_SESSIONS, observe_generation
+)
+from app.utils.responses import RawJSONResponse, dumps
+from app.utils.single_flight import SingleFlight, TooManyWaiters
+from app.utils.streaming import STREAMING_HEADERS, EventData, encode_event_stream, negotiate_stream_format
+from app.utils.worker_pool import BoundedWorkerPool, PoolSlot, WorkerPoolFull
 
-# Initialize services
-design_service = DesignGeneratorService()
-component_service = ComponentGeneratorService()
+# Generator services are created on first use (get_design_service / get_component_service)
+# and warmed up from the app lifespan
+generation_pool = BoundedWorkerPool(
+    name="generation",
+    max_workers=int(os.getenv("GENERATION_WORKERS", "4")),
+    max_queue=int(os.getenv("GENERATION_QUEUE_SIZE", "64")),
+    use_processes=os.getenv("GENERATION_EXECUTOR", "process") == "process",
+    initializer=init_generation_worker
+)
+GENERATION_POOL_QUEUE_DEPTH.set_function(lambda: generation_pool.stats()["queue_depth"])
+# Identical generate requests in flight at the same time share one pool job
+generation_flights = SingleFlight(
+    name="generation",
+    max_waiters=int(os.getenv("GENERATION_COALESCE_MAX_WAITERS", "256")),
+    timeout=float(os.getenv("GENERATION_COALESCE_TIMEOUT_SECONDS", "30")) or None
+)
+# Live sessions apply edits in the API process, where their state lives
+live_session_pool = BoundedWorkerPool(
+    name="live_sessions",
+    max_workers=int(os.getenv("LIVE_SESSION_WORKERS", "4")),
+    max_queue=int(os.getenv("LIVE_SESSION_QUEUE_SIZE", "64")),
+    use_processes=False
+)
+LIVE_SESSION_MAX = int(os.getenv("LIVE_SESSION_MAX", "256"))
+LIVE_SESSION_MAX_MESSAGE_BYTES = int(os.getenv("LIVE_SESSION_MAX_MESSAGE_BYTES", "65536"))
+# Extra wait after an edit arrives so the rest of a burst joins it
+LIVE_SESSION_COALESCE_SECONDS = float(os.getenv("LIVE_SESSION_COALESCE_MS", "10")) / 1000
+LIVE_SESSION_BUSY_RETRY_SECONDS = float(os.getenv("LIVE_SESSION_BUSY_RETRY_MS", "250")) / 1000
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 # Request/Response Models
 class ColorPaletteRequest(BaseModel):
     """Request model for color palette configuration"""
-    primary: str = Field(..., description="Primary color in hex format")
-    secondary: Optional[str] = Field(None, description="Secondary color in hex format")
-    accent: Optional[str] = Field(None, description="Accent color in hex format")
-    neutral: Optional[str] = Field(None, description="Neutral color in hex format")
-    background: Optional[str] = Field(None, description="Background color in hex format")
-    surface: Optional[str] = Field(None, description="Surface color in hex format")
+    primary: HexColor = Field(..., description="Primary color in hex format")
+    secondary: Optional[HexColor] = Field(None, description="Secondary color in hex format")
+    accent: Optional[HexColor] = Field(None, description="Accent color in hex format")
+    neutral: Optional[HexColor] = Field(None, description="Neutral color in hex format")
+    background: Optional[HexColor] = Field(None, description="Background color in hex format")
+    surface: Optional[HexColor] = Field(None, description="Surface color in hex format")
 
 class DesignConfigRequest(BaseModel):
     """Complete design configuration request"""
-    style: str = Field(default="modern", description="Design style preference")
+    style: DesignStyle = Field(default="modern", description="Design style preference")
     colors: ColorPaletteRequest = Field(..., description="Color palette configuration")
-    
-    @validator('style')
-    def validate_style(cls, v):
-        """Validate design style is supported"""
-        allowed_styles = ['modern', 'minimalist', 'brutalist', 'glassmorphism', 'neumorphism', 'retro', 'organic', 'geometric']
-        if v not in allowed_styles:
-            raise ValueError(f'Style must be one of: {", ".join(allowed_styles)}')
-        return v
+    seed: Optional[int] = Field(None, description="Seed for reproducible variation; derived from the inputs when omitted")
 
 class ComponentGenerationRequest(BaseModel):
     """Request model for component generation"""
     design_config: DesignConfigRequest = Field(..., description="Design system configuration")
-    component_types: List[str] = Field(default=["button", "card", "form"], description="Component types to generate")
+    component_types: List[ComponentType] = Field(default=["button", "card", "form"], min_length=1, max_length=20, description="Component types to generate")
     variants_per_type: int = Field(default=3, ge=1, le=10, description="Number of variants per component type")
     include_states: bool = Field(default=True, description="Include hover, focus, and disabled states")
-    framework: str = Field(default="vue", description="Target framework (vue or react)")
+    framework: Framework = Field(default="vue", description="Target framework (vue or react)")
+    css_mode: CssMode = Field(
+        default="scoped",
+        description="'scoped': each component carries its own styles; 'shared': components reference utility classes from the response's deduplicated stylesheet; 'auto': 'shared' when that makes the response smaller, else 'scoped' (a stylesheet is returned only in shared mode)"
+    )
+
+class LiveSessionChanges(BaseModel):
+    """Edit to a live session; omitted fields stay as they are, colors merge role by role (null clears)"""
+    style: Optional[DesignStyle] = Field(None, description="New design style")
+    colors: Optional[Dict[ColorRole, Optional[HexColor]]] = Field(None, description="Changed colors in hex format")
+    seed: Optional[int] = Field(None, description="New seed")
+    component_types: Optional[List[ComponentType]] = Field(None, min_length=1, max_length=20, description="Component types to generate")
+    variants_per_type: Optional[int] = Field(None, ge=1, le=10, description="Number of variants per component type")
+    include_states: Optional[bool] = Field(None, description="Include hover, focus, and disabled states")
+    framework: Optional[Framework] = Field(None, description="Target framework (vue or react)")
+    css_mode: Optional[CssMode] = Field(None, description="Per-component ('scoped') or shared utility ('shared') styles, or 'auto' to pick the smaller")
+
+class LiveSessionStart(BaseModel):
+    """First message of a live session"""
+    type: Literal["start"]
+    request: ComponentGenerationRequest
+
+class LiveSessionMessage(BaseModel):
+    """Message sent by a live session client after start"""
+    type: Literal["edit", "resync"]
+    seq: Optional[int] = Field(None, description="Client sequence number, echoed by the patch that includes the edit")
+    changes: LiveSessionChanges = Field(default_factory=LiveSessionChanges)
+
+# Static catalogue: encoded and fingerprinted once, then revalidated by clients and CDNs
+COMPONENT_TYPES = {
+    "form_components": {
+        "types": ["button", "input", "select", "checkbox", "radio", "toggle"],
+        "description": "Interactive form elements with validation states"
+    },
+    "layout_components": {
+        "types": ["card", "modal", "dropdown", "accordion", "tab"],
+        "description": "Structural components for content organization"
+    },
+    "navigation_components": {
+        "types": ["navigation", "breadcrumb", "pagination"],
+        "description": "Navigation and wayfinding components"
+    },
+    "data_components": {
+        "types": ["table", "list", "avatar", "badge"],
+        "description": "Components for displaying data and content"
+    }
+}
+_component_types_body = dumps(COMPONENT_TYPES)
+_component_types_headers = cache_headers(
+    etag=strong_etag(_component_types_body),
+    cache_control=os.getenv("COMPONENT_TYPES_CACHE_CONTROL", "public, max-age=3600"),
+    last_modified=http_date(time.time())
+)
+GENERATE_CACHE_CONTROL = os.getenv("GENERATE_CACHE_CONTROL", "public, max-age=300")
 
 @router.get("/types")
-async def get_component_types():
+async def get_component_types(http_request: Request):
     """Get list of available component types and their variants"""
-    try:
-        component_types = {
-            "form_components": {
-                "types": ["button", "input", "select", "checkbox", "radio", "toggle"],
-                "description": "Interactive form elements with validation states"
-            },
-            "layout_components": {
-                "types": ["card", "modal", "dropdown", "accordion", "tab"],
-                "description": "Structural components for content organization"
-            },
-            "navigation_components": {
-                "types": ["navigation", "breadcrumb", "pagination"],
-                "description": "Navigation and wayfinding components"
-            },
-            "data_components": {
-                "types": ["table", "list", "avatar", "badge"],
-                "description": "Components for displaying data and content"
-            }
-        }
-        
-        logger.info("Retrieved component types successfully")
-        return component_types
-        
-    except Exception as e:
-        logger.error(f"Error retrieving component types: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve component types"
-        )
+    if is_not_modified(
+        http_request.headers,
+        _component_types_headers["ETag"],
+        _component_types_headers["Last-Modified"]
+    ):
+        return not_modified_response(_component_types_headers)
+    
+    logger.info("Retrieved component types successfully")
+    return RawJSONResponse(content=_component_types_body, headers=_component_types_headers)
 
 @router.post("/generate")
-async def generate_components(request: ComponentGenerationRequest):
-    """Generate components based on design configuration"""
+async def generate_components(request: ComponentGenerationRequest, http_request: Request):
+    """
+    Generate components based on design configuration
+    
+    Clients sending Accept: application/x-ndjson or text/event-stream receive
+    the design tokens first and then each component as it is produced.
+    
+    Output is deterministic for a given request and generator version, so the
+    response carries an ETag over those; a request whose If-None-Match
+    matches is answered with 304 without generating anything. (Generation is
+    a read-only POST, so it gets GET's conditional semantics here.) The ETag
+    is weak because only the tokens and components repeat exactly; created_at
+    and generation_time are per response. The one exception is a request
+    without a seed while similarity re-rolls are on: its design depends on
+    earlier ones, so it is sent with no-store instead.
+    
+    Identical JSON requests arriving while one is being generated wait for
+    that generation and share its response body instead of generating again.
+    """
     try:
-        logger.info(f"Starting component generation for {len(request.component_types)} types")
-        
-        # Generate design system tokens
-        design_tokens = design_service.generate_design_system(
-            base_config=request.design_config.dict(),
-            style_preference=request.design_config.style,
-            color_preference=request.design_config.colors.primary
-        )
+        request_data = request.model_dump()
+        stream_format = negotiate_stream_format(http_request.headers.get("accept"))
+        validator: Dict[str, str] = {}
+        response_headers = {"Cache-Control": "no-store"}
+        # Without a validator clients can neither revalidate nor reuse the body
+        if request.design_config.seed is not None or similarity_threshold() <= 0:
+            etag = weak_etag(
+                generator_version().encode("utf-8"),
+                canonical_generation_request(request_data),
+                (stream_format or "application/json").encode("utf-8")
+            )
+            if etag_matches(http_request.headers.get("if-none-match"), etag):
+                return not_modified_response(cache_headers(etag, GENERATE_CACHE_CONTROL))
+            validator = {"ETag": etag}
+            response_headers = cache_headers(etag, GENERATE_CACHE_CONTROL)
         
-        # For now, return mock data
-        generated_components = []
-        for i, component_type in enumerate(request.component_types):
-            for j in range(request.variants_per_type):
-                component = {
-                    "id": f"{component_type}_{i}_{j}",
-                    "name": f"{component_type.capitalize()}Component{j+1}",
-                    "type": component_type,
-                    "variant": f"variant-{j+1}",
-                    "framework": request.framework,
-                    "template": f"<!-- {component_type} component template -->",
-                    "styles": {"main": f".{component_type} {{ /* styles */ }}"},
-                    "props": {"size": "md", "variant": "primary"},
-                    "usage_example": f"<{component_type.capitalize()}Component />",
-                    "accessibility_features": ["keyboard-navigation", "aria-labels"],
-                    "created_at": datetime.now().isoformat()
-                }
-                generated_components.append(component)
+        logger.info(f"Starting component generation for {len(request.component_types)} types")
         
-        response = {
-            "success": True,
-            "message": f"Successfully generated {len(generated_components)} components",
-            "components": generated_components,
-            "design_tokens": design_tokens.__dict__ if hasattr(design_tokens, '__dict__') else {},
-            "generation_time": 0.5,
-            "total_components": len(generated_components)
-        }
+        if stream_format:
+            # Sync iterator: Starlette advances it on its threadpool, one event
+            # at a time. It holds a generation pool slot until the stream ends,
+            # so streamed requests count toward the same limit (and get the
+            # same 503) as pooled ones.
+            slot = generation_pool.reserve()
+            try:
+                timings: Dict[str, float] = {}
+                events = _record_timings(iter_generation_events(request_data, timings), timings)
+                return StreamingResponse(
+                    _release_after(encode_event_stream(events, stream_format), slot),
+                    media_type=stream_format,
+                    headers={**STREAMING_HEADERS, **validator},
+                    # Also covers a client disconnecting before the stream is drained
+                    background=BackgroundTask(slot.release)
+                )
+            except BaseException:
+                slot.release()
+                raise
         
-        logger.info(f"Component generation completed")
-        return response
+        # Generation and JSON encoding both run on the pool so the event loop
+        # only ever handles the finished response body
+        (body, timings), shared = await generation_flights.run(
+            canonical_generation_request(request_data),
+            generation_pool.run, build_generation_payload, request_data
+        )
+        if shared:
+            GENERATION_COALESCED.labels("shared").inc()
+            logger.info("Component generation shared with an identical in-flight request")
+        else:
+            GENERATION_COALESCED.labels("started").inc()
+            observe_generation(timings, "json")
+            logger.info(f"Component generation completed in {timings['total']:.4f}s")
+        return RawJSONResponse(content=body, headers=response_headers)
         
+    except TooManyWaiters as e:
+        GENERATION_COALESCED.labels("rejected").inc()
+        logger.warning(f"Too many identical generate requests waiting, rejecting (retry after {e.retry_after}s)")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many identical requests in progress. Please try again later.",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except asyncio.TimeoutError:
+        GENERATION_COALESCED.labels("timed_out").inc()
+        logger.warning(f"Component generation did not finish within {generation_flights.timeout}s")
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Component generation timed out"
+        )
+    except WorkerPoolFull as e:
+        logger.warning(f"Generation queue full, rejecting request (retry after {e.retry_after}s)")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Generation queue is full. Please try again later.",
+            headers={"Retry-After": str(e.retry_after)}
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -137,16 +259,208 @@ async def generate_components(request: ComponentGenerationRequest):
             detail="Component generation failed due to internal error"
         )
 
+def _release_after(chunks: Iterator[bytes], slot: PoolSlot) -> Iterator[bytes]:
+    """Pass chunks through and release the pool slot once the stream ends or is closed"""
+    try:
+        yield from chunks
+    finally:
+        slot.release()
+
+def _record_timings(
+    events: Iterator[Tuple[str, EventData]],
+    timings: Dict[str, float]
+) -> Iterator[Tuple[str, EventData]]:
+    """Pass events through and record stage timings once the stream completes"""
+    yield from events
+    if "total" in timings:
+        observe_generation(timings, "stream")
+
+@router.websocket("/live")
+async def live_session(websocket: WebSocket):
+    """
+    Live customization session
+    
+    JSON text frames:
+      -> {"type": "start", "request": <ComponentGenerationRequest>}
+      <- {"type": "snapshot", "version", "request", "design_tokens", "component_ids", "components"}
+      -> {"type": "edit", "seq": n, "changes": <LiveSessionChanges>}
+      <- {"type": "patch", "version", "seq", "coalesced", "ops", "recomputed", "rendered", "generation_time"}
+      -> {"type": "resync"}, answered with a snapshot
+      <- {"type": "error", "seq", "message"} for a rejected message; the session goes on
+      <- {"type": "busy", "retry_after"} when the pool is full; the edit is kept and retried
+    
+    ops is a JSON Patch against the previous snapshot state. Edits that arrive
+    while one is being applied or sent are merged into one, so a client
+    dragging a color picker gets the latest state as fast as the server and
+    the connection allow instead of a growing backlog; seq is the last edit
+    included and coalesced the number of edits merged.
+    """
+    await websocket.accept()
+    if LIVE_SESSIONS.labels().value >= LIVE_SESSION_MAX:
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="Too many live sessions")
+        return
+    
+    LIVE_SESSIONS.inc()
+    try:
+        raw = await _receive_live_message(websocket)
+        if raw is None:
+            return
+        try:
+            start = LiveSessionStart.model_validate(orjson.loads(raw))
+        except (orjson.JSONDecodeError, ValidationError) as e:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=f"Invalid start message: {_describe_error(e)}"[:120])
+            return
+        
+        session = LiveSession(start.request.model_dump())
+        try:
+            snapshot = await live_session_pool.run(session.start)
+        except WorkerPoolFull as e:
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason=f"Generation queue is full, retry after {e.retry_after}s")
+            return
+        connection = _LiveSessionConnection(websocket, session)
+        await connection.send({"type": "snapshot", **snapshot})
+        logger.info(f"Live session started with {len(session.components)} components")
+        
+        processor = asyncio.create_task(connection.process_edits())
+        try:
+            await connection.receive_edits()
+        finally:
+            processor.cancel()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        LIVE_SESSIONS.dec()
+
+class _LiveSessionConnection:
+    """Pending (coalesced) edit and send side of one live session"""
+    
+    def __init__(self, websocket: WebSocket, session: LiveSession):
+        self.websocket = websocket
+        self.session = session
+        self.pending: Dict[str, Any] = {}
+        self.pending_count = 0
+        self.pending_seq: Optional[int] = None
+        self.resync = False
+        self.wake = asyncio.Event()
+        self._send_lock = asyncio.Lock()
+    
+    async def send(self, message: Dict[str, Any]) -> None:
+        async with self._send_lock:
+            await self.websocket.send_text(dumps(message).decode("utf-8"))
+    
+    async def receive_edits(self) -> None:
+        """Merge incoming edits into the pending one until the client disconnects"""
+        while True:
+            raw = await _receive_live_message(self.websocket)
+            if raw is None:
+                return
+            seq = None
+            try:
+                data = orjson.loads(raw)
+                seq = data.get("seq") if isinstance(data, dict) else None
+                message = LiveSessionMessage.model_validate(data)
+            except (orjson.JSONDecodeError, ValidationError) as e:
+                LIVE_SESSION_EDITS.labels("rejected").inc()
+                await self.send({"type": "error", "seq": seq, "message": _describe_error(e)})
+                continue
+            
+            if message.type == "resync":
+                self.resync = True
+            else:
+                self.pending = merge_changes(self.pending, message.changes.model_dump(exclude_unset=True))
+                self.pending_count += 1
+                if message.seq is not None:
+                    self.pending_seq = message.seq
+            self.wake.set()
+    
+    async def process_edits(self) -> None:
+        """Apply the pending edit and send its patch, one at a time"""
+        try:
+            while True:
+                await self.wake.wait()
+                if LIVE_SESSION_COALESCE_SECONDS > 0:
+                    await asyncio.sleep(LIVE_SESSION_COALESCE_SECONDS)
+                self.wake.clear()
+                
+                if self.resync:
+                    self.resync = False
+                    await self.send({"type": "snapshot", **self.session.snapshot()})
+                if not self.pending_count:
+                    continue
+                
+                changes, count, seq = self.pending, self.pending_count, self.pending_seq
+                self.pending, self.pending_count, self.pending_seq = {}, 0, None
+                try:
+                    update = await live_session_pool.run(self.session.apply, changes)
+                except WorkerPoolFull as e:
+                    # Keep the edit; anything received meanwhile merges on top of it
+                    self.pending = merge_changes(changes, self.pending)
+                    self.pending_count += count
+                    if self.pending_seq is None:
+                        self.pending_seq = seq
+                    await self.send({"type": "busy", "retry_after": e.retry_after})
+                    await asyncio.sleep(LIVE_SESSION_BUSY_RETRY_SECONDS)
+                    self.wake.set()
+                    continue
+                except Exception as e:
+                    logger.exception(f"Error applying live session edit: {str(e)}")
+                    await self.send({"type": "error", "seq": seq, "message": "Edit could not be applied"})
+                    continue
+                
+                LIVE_SESSION_EDITS.labels("applied").inc()
+                if count > 1:
+                    LIVE_SESSION_EDITS.labels("coalesced").inc(count - 1)
+                observe_generation(update.timings, "live")
+                await self.send({
+                    "type": "patch",
+                    "version": update.version,
+                    "seq": seq,
+                    "coalesced": count,
+                    "ops": update.operations,
+                    "recomputed": update.recomputed,
+                    "rendered": update.rendered,
+                    "generation_time": round(update.timings["total"], 6)
+                })
+        except WebSocketDisconnect:
+            pass
+
+async def _receive_live_message(websocket: WebSocket) -> Optional[Union[str, bytes]]:
+    """Next text or binary message, or None once the client has gone (or sent too much)"""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        return None
+    raw = message.get("text")
+    if raw is None:
+        raw = message.get("bytes") or b""
+    if len(raw) > LIVE_SESSION_MAX_MESSAGE_BYTES:
+        await websocket.close(code=status.WS_1009_MESSAGE_TOO_BIG, reason="Message too big")
+        return None
+    return raw
+
+def _describe_error(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in detail['loc']) or 'message'}: {detail['msg']}"
+            for detail in error.errors()
+        )
+    return str(error)
+
 @router.get("/health")
 async def components_health_check():
     """Health check endpoint for components service"""
     try:
+        design_service = get_design_service()
         return {
             "status": "healthy",
             "services": {
                 "design_generator": "healthy",
                 "component_generator": "healthy"
             },
+            "design_cache": design_service.cache.stats(),
+            "similarity_index": design_service.similarity_index.stats() if design_service.similarity_index else None,
+            "generation_pool": generation_pool.stats(),
+            "generation_flights": generation_flights.stats(),
+            "live_session_pool": live_session_pool.stats(),
             "timestamp": datetime.now().isoformat()
         }
         
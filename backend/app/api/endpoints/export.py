@@ -4,16 +4,71 @@ API endpoints for code export functionality
 """
 
 import logging
-from fastapi import APIRouter
+import os
+from typing import List
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 from datetime import datetime
 
+from app.api.endpoints.components import DesignConfigRequest
+from app.api.validation import ComponentType, CssMode
+from app.services.generators.component_generator import COMPONENT_SPECS, FRAMEWORK_TEMPLATES
+from app.services.library_export import iter_library_files
+from app.utils.zip_stream import ZIP_MEDIA_TYPE, iter_zip
+
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+EXPORT_COMPRESSLEVEL = int(os.getenv("EXPORT_ZIP_COMPRESSLEVEL", "6"))
+
+class LibraryExportRequest(BaseModel):
+    """Request model for exporting a component library"""
+    design_config: DesignConfigRequest = Field(..., description="Design system configuration")
+    component_types: List[ComponentType] = Field(
+        default_factory=lambda: list(COMPONENT_SPECS),
+        min_length=1,
+        max_length=len(COMPONENT_SPECS),
+        description="Component types to export"
+    )
+    variants_per_type: int = Field(default=3, ge=1, le=10, description="Number of variants per component type")
+    include_states: bool = Field(default=True, description="Include hover, focus, and disabled states")
+    css_mode: CssMode = Field(default="scoped", description="'scoped': one stylesheet per component; 'shared': one deduplicated utility stylesheet; 'auto': whichever is smaller")
+
+@router.post("/{framework}")
+async def export_library(framework: str, request: LibraryExportRequest):
+    """
+    Export a complete component library as a ZIP archive
+    
+    Contains the components (Vue SFCs, or React TSX with one stylesheet each;
+    with css_mode 'shared', or 'auto' past the break-even, one utility
+    stylesheet instead), TypeScript definitions for the tokens,
+    tailwind.config.js and the tokens as CSS variables. Files are rendered
+    and compressed one at a time on the threadpool and streamed as soon as
+    each is written, so memory stays flat and the download starts before the
+    last component is rendered.
+    """
+    if framework not in FRAMEWORK_TEMPLATES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unsupported framework: {framework}. Use one of: {', '.join(FRAMEWORK_TEMPLATES)}"
+        )
+    
+    logger.info(f"Starting {framework} library export for {len(request.component_types)} types")
+    files = iter_library_files({**request.model_dump(), "framework": framework})
+    return StreamingResponse(
+        iter_zip(files, compresslevel=EXPORT_COMPRESSLEVEL),
+        media_type=ZIP_MEDIA_TYPE,
+        headers={
+            "Content-Disposition": f'attachment; filename="ui-library-{framework}.zip"',
+            "X-Accel-Buffering": "no"
+        }
+    )
+
 @router.get("/health")
 async def export_health_check():
     """Health check endpoint for export service"""
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat()
-    }
\ No newline at end of file
+    }
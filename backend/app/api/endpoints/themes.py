@@ -4,16 +4,505 @@ API endpoints for theme generation and management
 """
 
 import logging
-from fastapi import APIRouter
+import os
+import time
+from dataclasses import asdict
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional
+import orjson
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field, TypeAdapter
 from datetime import datetime
 
+from app.api.endpoints.components import DesignConfigRequest, generation_pool
+from app.api.validation import ColorRole, DesignStyle, HexColor, PaletteRole, parse_design_tokens
+from app.services.design_batch import DesignBatchRunner
+from app.services.generation_worker import get_design_service
+from app.services.generators.component_generator import token_key
+from app.services.generators.design_generator import SECTION_DEPENDENCIES
+from app.services.theme_store import NEUTRAL_HUE_BUCKET, ThemePage, ThemeRecord, ThemeStore, hue_to_bucket
+from app.utils.http_cache import cache_headers, etag_matches, not_modified_response, strong_etag
+from app.utils.metrics import observe_generation
+from app.utils.responses import FastJSONResponse, RawJSONResponse, dumps
+from app.utils.worker_pool import WorkerPoolFull
+
+if TYPE_CHECKING:
+    from app.services.generators.color_names import ColorNameTable
+    from app.services.generators.contrast_engine import ContrastEngine
+    from app.services.generators.design_generator import DesignTokens
+    from app.services.generators.palette_engine import BatchPaletteEngine
+    from app.services.thumbnails import ThumbnailRenderer
+
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Process pool shared by every batch request; shut down from the app lifespan
+batch_runner = DesignBatchRunner()
+
+# Saved themes; opened on first use and closed from the app lifespan
+theme_store = ThemeStore(
+    path=os.getenv("THEME_STORE_PATH", os.path.join("data", "themes.db")),
+    readers=int(os.getenv("THEME_STORE_READERS", "4"))
+)
+
+# Thumbnail URLs are content-addressed (token hash), so responses never change
+THUMBNAIL_CACHE_CONTROL = os.getenv("THUMBNAIL_CACHE_CONTROL", "public, max-age=31536000, immutable")
+
+ThumbnailFormat = Literal["png", "webp"]
+
+ColorHarmony = Literal[
+    "monochromatic", "analogous", "complementary", "triadic", "split_complementary", "tetradic", "compound"
+]
+
+@lru_cache(maxsize=1)
+def get_contrast_engine() -> "ContrastEngine":
+    """Stateless engine shared by contrast audit requests (imports NumPy on first use)"""
+    from app.services.generators.contrast_engine import ContrastEngine
+    return ContrastEngine()
+
+@lru_cache(maxsize=1)
+def get_palette_engine() -> "BatchPaletteEngine":
+    """Batch palette engine shared by palette batch requests (imports NumPy on first use)"""
+    from app.services.generators.palette_engine import BatchPaletteEngine
+    return BatchPaletteEngine(get_design_service(), get_contrast_engine())
+
+@lru_cache(maxsize=1)
+def get_color_table() -> "ColorNameTable":
+    """Reference color table shared by color match requests, memory-mapped from COLOR_TABLE_DIR"""
+    from app.services.generators.color_names import ColorNameTable
+    return ColorNameTable(os.getenv("COLOR_TABLE_DIR", "data") or None)
+
+@lru_cache(maxsize=1)
+def get_thumbnail_renderer() -> "ThumbnailRenderer":
+    """Renderer and image cache shared by thumbnail requests (imports Pillow on first use)"""
+    from app.services.thumbnails import ThumbnailRenderer
+    return ThumbnailRenderer(
+        cache_entries=int(os.getenv("THUMBNAIL_CACHE_ENTRIES", "4096")),
+        cache_bytes=int(os.getenv("THUMBNAIL_CACHE_MB", "64")) * 1024 * 1024
+    )
+
+class ThemeBatchRequest(BaseModel):
+    """Request model for batch design system generation"""
+    items: List[DesignConfigRequest] = Field(..., min_length=1, max_length=1000, description="Design configurations to generate")
+
+# Built once; dumping all batch items in one call is cheaper than model_dump per item
+DESIGN_CONFIGS_ADAPTER = TypeAdapter(List[DesignConfigRequest])
+
+class DesignConfigChanges(BaseModel):
+    """Partial design configuration; colors are merged key by key (null clears an override)"""
+    style: Optional[DesignStyle] = Field(None, description="New design style")
+    colors: Optional[Dict[ColorRole, Optional[HexColor]]] = Field(None, description="Changed colors in hex format")
+    seed: Optional[int] = Field(None, description="New seed")
+
+class ThemePatchRequest(BaseModel):
+    """Request model for incremental design token regeneration"""
+    previous_tokens: Dict[str, Any] = Field(..., description="Design tokens returned for design_config")
+    design_config: DesignConfigRequest = Field(..., description="Configuration that produced previous_tokens")
+    changes: DesignConfigChanges = Field(..., description="Fields to change")
+
+class ThemeSaveRequest(BaseModel):
+    """Request model for saving a theme"""
+    name: str = Field(..., min_length=1, max_length=200, description="Display name")
+    design_config: DesignConfigRequest = Field(..., description="Configuration of the theme")
+    design_tokens: Optional[Dict[str, Any]] = Field(None, description="Tokens generated for design_config; generated when omitted")
+
+class ThumbnailRequest(BaseModel):
+    """Request model for rendering a thumbnail of an unsaved token set"""
+    design_tokens: Dict[str, Any] = Field(..., description="Design tokens to preview")
+    format: ThumbnailFormat = Field("png", description="Image format")
+    width: int = Field(320, ge=80, le=1280, description="Image width in pixels (height follows a 16:10 aspect)")
+
+class ContrastAuditRequest(BaseModel):
+    """Request model for WCAG contrast auditing of color palettes"""
+    palettes: List[Dict[str, Optional[str]]] = Field(..., min_length=1, max_length=5000, description="Palettes as role -> hex color")
+    correct: bool = Field(True, description="Adjust failing roles until they pass")
+    locked_roles: List[PaletteRole] = Field(default_factory=list, description="Roles that must not be adjusted")
+    include_matrix: bool = Field(False, description="Include every pairwise contrast ratio")
+
+class PaletteBatchRequest(BaseModel):
+    """Request model for generating color palettes for many base colors"""
+    base_colors: List[HexColor] = Field(..., min_length=1, max_length=10000, description="Base (primary) colors in hex format")
+    style: DesignStyle = Field("modern", description="Design style of every palette")
+    harmony: ColorHarmony = Field("complementary", description="Color harmony of every palette")
+    include_shadows: bool = Field(False, description="Include each palette's shadow tokens")
+    include_ramps: bool = Field(False, description="Include a 50-950 tint/shade ramp of each base color")
+
+class ColorMatchRequest(BaseModel):
+    """Request model for naming colors or snapping them to the Tailwind palette"""
+    colors: List[HexColor] = Field(..., min_length=1, max_length=10000, description="Colors in hex format")
+    source: Optional[Literal["css", "tailwind"]] = Field(None, description="Match only CSS named colors or only Tailwind palette steps")
+
+@router.post("/contrast/audit")
+async def audit_theme_contrast(request: ContrastAuditRequest):
+    """
+    Check palettes against WCAG 2.1 AA and optionally correct them
+    
+    All palettes are audited in one vectorized pass. With correct, failing
+    roles have their lightness moved (hue kept) just far enough to pass;
+    'corrected' lists the new colors and 'unresolved' the requirements that
+    still fail, e.g. because the role is locked.
+    """
+    roles = list(dict.fromkeys(role for palette in request.palettes for role in palette))
+    columns = {role: [palette.get(role) for palette in request.palettes] for role in roles}
+    
+    def run():
+        contrast_engine = get_contrast_engine()
+        if request.correct:
+            correction = contrast_engine.correct(columns, locked_roles=request.locked_roles)
+            return correction.audit, correction
+        return contrast_engine.audit(columns), None
+    
+    try:
+        audit, correction = await run_in_threadpool(run)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    
+    results = []
+    for index in range(len(request.palettes)):
+        failures = audit.failures(index)
+        result: Dict[str, Any] = {"passes": not failures}
+        if correction is not None:
+            result["corrected"] = {
+                role: str(correction.colors[role][index])
+                for role, changed in zip(roles, correction.changed[index])
+                if changed
+            }
+            result["unresolved"] = failures
+        else:
+            result["failures"] = failures
+        results.append(result)
+    
+    response: Dict[str, Any] = {
+        "success": True,
+        "results": results,
+        "summary": {
+            "total": len(results),
+            "passing": sum(result["passes"] for result in results),
+            "corrected": int(correction.changed.any(axis=1).sum()) if correction is not None else 0
+        }
+    }
+    if request.include_matrix:
+        # NaN (missing role) serializes as null
+        response["roles"] = roles
+        response["matrix"] = audit.matrix
+    return FastJSONResponse(response)
+
+@router.post("/colors/match")
+async def match_colors(request: ColorMatchRequest):
+    """
+    Find the closest named color or Tailwind palette step for each color
+    
+    Closeness is Delta E 1976 in CIE Lab; delta_e 0 means an exact match.
+    With source 'tailwind' this snaps a palette to Tailwind classes (e.g.
+    '#3b82f6' -> 'blue-500').
+    """
+    # HexColor validates to an int; dumping gives back normalized '#rrggbb' strings
+    colors = request.model_dump()["colors"]
+    matches = await run_in_threadpool(get_color_table().match, colors, request.source)
+    return FastJSONResponse({
+        "success": True,
+        "matches": [asdict(match) for match in matches]
+    })
+
+@router.post("/palettes")
+async def generate_palette_batch(request: PaletteBatchRequest):
+    """
+    Color palettes for many base colors in one vectorized pass
+    
+    Meant for bulk pre-generation of brand palettes. Each palette is the
+    colors section generate_design_system builds with that base color as
+    the primary color and the given style and harmony, contrast correction
+    included.
+    """
+    base_colors = request.model_dump()["base_colors"]
+    
+    def run():
+        engine = get_palette_engine()
+        palettes = engine.generate_palettes(base_colors, request.style, request.harmony)
+        columns = {role: values.tolist() for role, values in palettes.items()}
+        result: Dict[str, Any] = {"palettes": [dict(zip(columns, row)) for row in zip(*columns.values())]}
+        if request.include_shadows:
+            shadows = {name: values.tolist() for name, values in engine.generate_shadow_systems(palettes['shadow'], request.style).items()}
+            result["shadows"] = [dict(zip(shadows, row)) for row in zip(*shadows.values())]
+        if request.include_ramps:
+            ramps = {str(step): values.tolist() for step, values in engine.tint_shade_ramps(base_colors).items()}
+            result["ramps"] = [dict(zip(ramps, row)) for row in zip(*ramps.values())]
+        return result
+    
+    return FastJSONResponse({"success": True, **await run_in_threadpool(run)})
+
+@router.get("/typography/pairings")
+async def get_typography_pairings(
+    style: DesignStyle = Query("modern", description="Design style to rank the pairings for"),
+    limit: int = Query(0, ge=0, le=100, description="Number of pairings to return; 0 for all")
+):
+    """Font pairings ranked by how well they suit a design style, best first"""
+    ranked = get_design_service().pairing_index.ranked(style, limit)
+    return FastJSONResponse({
+        "style": style,
+        "pairings": [
+            {"primary": primary, "secondary": secondary, "score": score}
+            for (primary, secondary), score in ranked
+        ]
+    })
+
+@router.patch("/tokens")
+async def patch_theme_tokens(request: ThemePatchRequest):
+    """
+    Apply an edit to an existing design token set
+    
+    Only the sections whose inputs changed (and sections depending on them)
+    are recomputed; the rest are returned unchanged from previous_tokens.
+    Built for live-preview controls that send many small edits per second,
+    so it runs on the threadpool rather than paying the generation pool's
+    process round trip.
+    """
+    try:
+        previous_tokens = parse_design_tokens(request.previous_tokens)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"previous_tokens: {str(e)}"
+        )
+    
+    timings: Dict[str, float] = {}
+    
+    def run():
+        started = time.perf_counter()
+        design_tokens, design_config, recomputed = get_design_service().regenerate_design_system(
+            previous_tokens,
+            request.design_config.model_dump(),
+            request.changes.model_dump(exclude_unset=True),
+            timings=timings
+        )
+        timings["total"] = time.perf_counter() - started
+        return design_tokens.to_dict(), design_config, recomputed
+    
+    tokens_dict, design_config, recomputed = await run_in_threadpool(run)
+    observe_generation(timings, "patch")
+    
+    return FastJSONResponse({
+        "success": True,
+        "design_tokens": tokens_dict,
+        "design_config": design_config,
+        "recomputed": recomputed,
+        "reused": [section for section in SECTION_DEPENDENCIES if section not in recomputed],
+        "generation_time": round(timings["total"], 6)
+    })
+
+@router.post("/batch")
+async def generate_theme_batch(request: ThemeBatchRequest):
+    """
+    Generate design systems for many configurations at once
+    
+    Generation runs in a process pool; results are streamed back as NDJSON in
+    the same order as the request items, each with per-item timings, followed
+    by a summary line.
+    """
+    configs = DESIGN_CONFIGS_ADAPTER.dump_python(request.items)
+    logger.info(f"Starting batch theme generation for {len(configs)} items")
+    
+    async def stream_results():
+        started = time.perf_counter()
+        failed = 0
+        async for item in batch_runner.generate(configs):
+            failed += "error" in item
+            yield dumps(item) + b"\n"
+        
+        summary = {
+            "done": True,
+            "total": len(configs),
+            "failed": failed,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 3)
+        }
+        logger.info(f"Batch theme generation completed: {summary}")
+        yield dumps(summary) + b"\n"
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+@router.post("", status_code=status.HTTP_201_CREATED)
+async def save_theme(request: ThemeSaveRequest):
+    """
+    Save a theme
+    
+    The token set is stored once per distinct content; 'deduplicated' is true
+    when an identical token set was already saved (by this or another theme).
+    """
+    design_config = request.design_config.model_dump()
+    if request.design_tokens is not None:
+        try:
+            design_tokens = parse_design_tokens(request.design_tokens)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"design_tokens: {str(e)}"
+            )
+    else:
+        design_tokens = await run_in_threadpool(
+            get_design_service().generate_design_system,
+            base_config=design_config,
+            style_preference=design_config["style"],
+            color_preference=design_config["colors"]["primary"],
+            seed=design_config["seed"]
+        )
+    
+    record = await run_in_threadpool(ThemeRecord.create, request.name, design_config, design_tokens)
+    summary, deduplicated = await theme_store.save(record)
+    return FastJSONResponse(
+        status_code=status.HTTP_201_CREATED,
+        content={"success": True, "theme": summary, "deduplicated": deduplicated}
+    )
+
+@router.get("")
+async def list_themes(
+    style: Optional[str] = Query(None, description="Only themes of this design style"),
+    hue: Optional[int] = Query(None, ge=0, le=359, description="Only themes whose primary color is near this hue (degrees)"),
+    neutral: bool = Query(False, description="Only themes with a grey primary color"),
+    limit: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page")
+):
+    """
+    List saved themes, newest first
+    
+    Pages are keyset-paginated: pass next_cursor to get the following page.
+    """
+    bucket = NEUTRAL_HUE_BUCKET if neutral else hue_to_bucket(hue) if hue is not None else None
+    try:
+        page = await theme_store.list(style=style, hue_bucket=bucket, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    return _page_response(page)
+
+@router.get("/search")
+async def search_themes(
+    q: str = Query(..., min_length=1, max_length=200, description="Name prefix (case-insensitive)"),
+    style: Optional[str] = Query(None, description="Only themes of this design style"),
+    limit: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page")
+):
+    """Find saved themes by name prefix, in name order (keyset-paginated like the listing)"""
+    try:
+        page = await theme_store.search(q, style=style, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    return _page_response(page)
+
+@router.get("/{theme_id:int}")
+async def get_theme(theme_id: int):
+    """Return a saved theme with its design configuration and tokens"""
+    theme = await theme_store.get(theme_id)
+    if theme is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Theme {theme_id} not found")
+    # Configuration and tokens are stored as JSON and spliced in without re-encoding
+    body = b"".join((
+        b'{"success":true,"theme":', dumps(theme.summary),
+        b',"design_config":', theme.design_config,
+        b',"design_tokens":', theme.tokens, b"}"
+    ))
+    return RawJSONResponse(content=body)
+
+@router.get("/thumbnails/{token_hash}.{image_format}")
+async def get_theme_thumbnail(
+    token_hash: str,
+    image_format: ThumbnailFormat,
+    http_request: Request,
+    width: int = Query(320, ge=80, le=1280, description="Image width in pixels (height follows a 16:10 aspect)")
+):
+    """
+    Preview image of a saved token set (by the token_hash of any theme using it)
+    
+    The image shows the palette, border radii and shadows. A token hash always
+    names the same content, so the response is cacheable indefinitely.
+    """
+    etag = _thumbnail_etag(token_hash, width, image_format)
+    if etag_matches(http_request.headers.get("if-none-match"), etag):
+        return not_modified_response(cache_headers(etag, THUMBNAIL_CACHE_CONTROL))
+    
+    image = get_thumbnail_renderer().cached(token_hash, width, image_format)
+    if image is None:
+        tokens = await theme_store.get_tokens(token_hash)
+        if tokens is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Token set {token_hash} not found")
+        try:
+            # Token sets saved before values were validated may not render
+            design_tokens = parse_design_tokens(orjson.loads(tokens))
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Token set {token_hash} cannot be rendered: {str(e)}"
+            )
+        image = await _render_thumbnail(design_tokens, token_hash, width, image_format)
+    return _thumbnail_response(image, etag, image_format)
+
+@router.post("/thumbnail")
+async def render_theme_thumbnail(request: ThumbnailRequest, http_request: Request):
+    """
+    Preview image of an unsaved token set
+    
+    Rendered images are cached by token hash, so re-posting the same tokens
+    (or revalidating with the returned ETag) is cheap.
+    """
+    try:
+        design_tokens = parse_design_tokens(request.design_tokens)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"design_tokens: {str(e)}"
+        )
+    token_hash = token_key(design_tokens)
+    etag = _thumbnail_etag(token_hash, request.width, request.format)
+    if etag_matches(http_request.headers.get("if-none-match"), etag):
+        return not_modified_response(cache_headers(etag, THUMBNAIL_CACHE_CONTROL))
+    
+    image = get_thumbnail_renderer().cached(token_hash, request.width, request.format)
+    if image is None:
+        image = await _render_thumbnail(design_tokens, token_hash, request.width, request.format)
+    return _thumbnail_response(image, etag, request.format)
+
+async def _render_thumbnail(design_tokens: "DesignTokens", token_hash: str, width: int, image_format: str) -> bytes:
+    # Rendering holds the GIL for most of its run, so it goes to the generation
+    # process pool rather than a thread pool; the result is cached in this process
+    from app.services.thumbnails import render_thumbnail
+    try:
+        image = await generation_pool.run(render_thumbnail, design_tokens, width, image_format)
+    except WorkerPoolFull as e:
+        logger.warning(f"Generation queue full, rejecting thumbnail (retry after {e.retry_after}s)")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Generation queue is full. Please try again later.",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    get_thumbnail_renderer().store(token_hash, width, image_format, image)
+    return image
+
+def _thumbnail_etag(token_hash: str, width: int, image_format: str) -> str:
+    from app.services.thumbnails import RENDERER_VERSION
+    return strong_etag(f"thumbnail:{RENDERER_VERSION}:{width}:{image_format}".encode("utf-8"), token_hash.encode("utf-8"))
+
+def _thumbnail_response(image: bytes, etag: str, image_format: str) -> Response:
+    from app.services.thumbnails import THUMBNAIL_FORMATS
+    return Response(
+        content=image,
+        media_type=THUMBNAIL_FORMATS[image_format][1],
+        headers=cache_headers(etag, THUMBNAIL_CACHE_CONTROL)
+    )
+
+def _page_response(page: ThemePage) -> FastJSONResponse:
+    return FastJSONResponse({
+        "success": True,
+        "themes": page.items,
+        "next_cursor": page.next_cursor
+    })
+
 @router.get("/health")
 async def themes_health_check():
     """Health check endpoint for themes service"""
     return {
         "status": "healthy",
+        "batch_workers": batch_runner.max_workers,
+        "theme_store": theme_store.stats(),
+        "thumbnail_cache": get_thumbnail_renderer().stats(),
         "timestamp": datetime.now().isoformat()
-    }
\ No newline at end of file
+    }
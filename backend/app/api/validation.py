@@ -0,0 +1,213 @@
+# backend/app/api/validation.py
+"""
+Reusable request field types (Pydantic v2)
+
+Colors are parsed once at the API boundary into a compact 24-bit integer,
+so malformed values are rejected with a 422 instead of failing inside the
+generator, and equivalent spellings (#FFF, fff, #ffffff) become one value.
+Model dumps turn them back into canonical lowercase #rrggbb strings, which
+is what the generators and cache keys consume. Component types are limited
+to the known specs, since they end up in file names and identifiers.
+Client-supplied design token sets are checked value by value, since they are
+rendered into images and stylesheets and may be stored.
+"""
+
+import re
+from typing import Annotated, Any, Callable, Dict, Literal, get_args
+
+from pydantic import PlainSerializer, PlainValidator, WithJsonSchema
+
+from app.services.generators.component_generator import COMPONENT_SPECS
+from app.services.generators.design_generator import ColorPalette, DesignTokens
+
+DesignStyle = Literal[
+    "modern", "minimalist", "brutalist", "glassmorphism", "neumorphism", "retro", "organic", "geometric"
+]
+DESIGN_STYLES = get_args(DesignStyle)
+
+Framework = Literal["vue", "react"]
+
+CssMode = Literal["scoped", "shared", "auto"]
+
+# Palette roles a design configuration can set
+ColorRole = Literal["primary", "secondary", "accent", "neutral", "background", "surface"]
+# Every role of a generated palette (ColorPalette fields)
+PaletteRole = Literal[
+    "primary", "secondary", "accent", "neutral", "background", "surface", "success", "warning",
+    "error", "info", "text_primary", "text_secondary", "border", "shadow"
+]
+
+_HEX_COLOR = re.compile(r"#?([0-9a-fA-F]{6}|[0-9a-fA-F]{3})")
+
+
+def parse_hex_color(value: Any) -> int:
+    """
+    Parse '#rrggbb', '#rgb' (the '#' is optional) or an int already in compact form
+
+    Raises:
+        ValueError: If value is not a color in one of those forms
+    """
+    if isinstance(value, str):
+        match = _HEX_COLOR.fullmatch(value.strip())
+        if match is not None:
+            digits = match.group(1)
+            if len(digits) == 3:
+                digits = digits[0] * 2 + digits[1] * 2 + digits[2] * 2
+            return int(digits, 16)
+    elif isinstance(value, int) and not isinstance(value, bool) and 0 <= value <= 0xFFFFFF:
+        return value
+    raise ValueError("Color must be a hex color such as #3366ff or #36f")
+
+
+def format_hex_color(value: int) -> str:
+    """Canonical '#rrggbb' form of a compact color"""
+    return f"#{value:06x}"
+
+
+HexColor = Annotated[
+    int,
+    PlainValidator(parse_hex_color),
+    PlainSerializer(format_hex_color, return_type=str),
+    WithJsonSchema({"type": "string", "pattern": "^#?([0-9a-fA-F]{6}|[0-9a-fA-F]{3})$", "examples": ["#3366ff"]})
+]
+
+
+def parse_component_type(value: Any) -> str:
+    """
+    Accept only component types the generator has a spec for
+
+    Raises:
+        ValueError: If value is not one of COMPONENT_SPECS
+    """
+    if isinstance(value, str) and value in COMPONENT_SPECS:
+        return value
+    raise ValueError(f"Unknown component type; expected one of: {', '.join(COMPONENT_SPECS)}")
+
+
+ComponentType = Annotated[
+    str,
+    PlainValidator(parse_component_type),
+    WithJsonSchema({"type": "string", "enum": list(COMPONENT_SPECS), "examples": ["button"]})
+]
+
+
+# Token value forms, as the design generator emits them
+_NUMBER = r"(?:\d+(?:\.\d+)?|\.\d+)"
+_PX_LENGTH = re.compile(rf"{_NUMBER}px|0")
+_EM_LENGTH = re.compile(rf"-?{_NUMBER}em|0")
+_MS_DURATION = re.compile(rf"{_NUMBER}ms")
+_EASING = re.compile(
+    rf"cubic-bezier\(\s*-?{_NUMBER}(?:\s*,\s*-?{_NUMBER}){{3}}\s*\)"
+    r"|steps\(\s*\d+\s*(?:,\s*(?:start|end|jump-start|jump-end|jump-none|jump-both)\s*)?\)"
+    r"|linear|ease|ease-in|ease-out|ease-in-out"
+)
+_FONT_STACK = re.compile(r"[\w '\"-]+(?:,[\w '\"-]+)*")
+_SHADOW_COLOR = (
+    rf"rgba?\(\s*\d{{1,3}}\s*,\s*\d{{1,3}}\s*,\s*\d{{1,3}}\s*(?:,\s*{_NUMBER}\s*)?\)"
+    r"|#(?:[0-9a-fA-F]{3}){1,2}"
+)
+_SHADOW_LAYER = rf"(?:inset\s+)?(?:-?{_NUMBER}(?:px)?\s+){{2,4}}(?:{_SHADOW_COLOR})"
+_SHADOW = re.compile(rf"none|{_SHADOW_LAYER}(?:\s*,\s*{_SHADOW_LAYER})*")
+_TOKEN_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9_-]*")
+
+
+def _is_color(value: Any) -> bool:
+    try:
+        parse_hex_color(value)
+    except ValueError:
+        return False
+    return isinstance(value, str)
+
+
+def _matches(pattern: "re.Pattern[str]") -> Callable[[Any], bool]:
+    return lambda value: isinstance(value, str) and pattern.fullmatch(value.strip()) is not None
+
+
+def _is_positive_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and 0 < value < 100
+
+
+def _is_shadow(value: Any) -> bool:
+    if not (isinstance(value, str) and _SHADOW.fullmatch(value.strip())):
+        return False
+    # rgb() channels must be bytes and alpha at most 1
+    for channels in re.findall(r"rgba?\(([^)]*)\)", value):
+        parts = [float(part) for part in channels.split(",")]
+        if any(part > 255 for part in parts[:3]) or (len(parts) > 3 and parts[3] > 1):
+            return False
+    return True
+
+
+_TOKEN_CHECKS: Dict[str, Dict[str, Callable[[Any], bool]]] = {
+    'colors': {name: _is_color for name in ColorPalette.__dataclass_fields__},
+    'typography': {
+        'font_family_primary': _matches(_FONT_STACK),
+        'font_family_secondary': _matches(_FONT_STACK),
+        'font_family_mono': _matches(_FONT_STACK),
+        'scale_ratio': _is_positive_number,
+        'base_size': _matches(_PX_LENGTH),
+        'line_height_base': _is_positive_number,
+        'line_height_heading': _is_positive_number,
+        'letter_spacing_normal': _matches(_EM_LENGTH),
+        'letter_spacing_wide': _matches(_EM_LENGTH)
+    },
+    'spacing': {
+        'unit': lambda value: isinstance(value, int) and not isinstance(value, bool) and 0 < value <= 64,
+        'scale': lambda value: isinstance(value, list) and all(
+            isinstance(step, int) and not isinstance(step, bool) and 0 <= step <= 10000 for step in value
+        ),
+        'container_padding': _matches(_PX_LENGTH),
+        'section_padding': _matches(_PX_LENGTH),
+        'component_padding': _matches(_PX_LENGTH)
+    },
+    'borders': {
+        name: _matches(_PX_LENGTH)
+        for name in ('radius_xs', 'radius_sm', 'radius_md', 'radius_lg', 'radius_xl', 'radius_full',
+                     'width_thin', 'width_normal', 'width_thick')
+    },
+    'animations': {
+        'duration_fast': _matches(_MS_DURATION),
+        'duration_normal': _matches(_MS_DURATION),
+        'duration_slow': _matches(_MS_DURATION),
+        'easing_ease': _matches(_EASING),
+        'easing_ease_in': _matches(_EASING),
+        'easing_ease_out': _matches(_EASING),
+        'easing_ease_in_out': _matches(_EASING),
+        'easing_bounce': _matches(_EASING)
+    }
+}
+# Sections that are name -> value mappings, with the check for every value
+_TOKEN_MAP_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    'shadows': _is_shadow,
+    'breakpoints': _matches(_PX_LENGTH)
+}
+
+
+def parse_design_tokens(value: Any) -> DesignTokens:
+    """
+    Rebuild a client-supplied token set and check every value
+
+    DesignTokens.from_dict only checks the structure; the values are held to
+    the forms the generator emits (hex colors, px lengths, ms durations,
+    box-shadows, ...), so a token set that would break thumbnail rendering or
+    CSS export is rejected here instead.
+
+    Raises:
+        ValueError: If the structure is incomplete or a value is malformed
+    """
+    if not isinstance(value, dict):
+        raise ValueError("Design tokens must be an object")
+    try:
+        design_tokens = DesignTokens.from_dict(value)
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Not a complete design token set: {str(e)}") from e
+
+    for section, checks in _TOKEN_CHECKS.items():
+        for name, check in checks.items():
+            if not check(value[section][name]):
+                raise ValueError(f"Invalid design token {section}.{name}: {str(value[section][name])[:60]!r}")
+    for section, check in _TOKEN_MAP_CHECKS.items():
+        for name, token in value[section].items():
+            if not (isinstance(name, str) and _TOKEN_NAME.fullmatch(name)) or not check(token):
+                raise ValueError(f"Invalid design token {section}.{str(name)[:40]}: {str(token)[:60]!r}")
+    return design_tokens
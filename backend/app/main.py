@@ -12,20 +12,39 @@ from typing import Dict, Any
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse, Response
 from pydantic import ValidationError
 
 from app.api.endpoints import components, themes, export
+from app.services.generation_worker import get_component_service, get_design_service
+from app.utils.compression import CompressedBodyCache, CompressionMiddleware
+from app.utils.http_cache import PrecompressedStaticFiles
 from app.utils.logging_config import setup_logging
-from app.utils.rate_limiter import RateLimiter
+from app.utils.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, registry as metrics_registry
+from app.utils.rate_limiter import RateLimiter, create_backend
+from app.utils.request_middleware import RequestContextMiddleware
+from app.utils.responses import FastJSONResponse
+from app.utils.startup import Warmup
 
 # Initialize logging
 setup_logging()
 logger = logging.getLogger(__name__)
 
 # Rate limiter instance
-rate_limiter = RateLimiter(max_requests=100, window_seconds=60)
+rate_limiter = RateLimiter(
+    max_requests=int(os.getenv("RATE_LIMIT_MAX_REQUESTS", "100")),
+    window_seconds=int(os.getenv("RATE_LIMIT_WINDOW_SECONDS", "60")),
+    backend=create_backend()
+)
+
+# Expensive initialization, run concurrently once the app is serving (see /ready)
+warmup = Warmup()
+warmup.add("templates", lambda: get_component_service().warm_up())
+warmup.add("design_generator", lambda: get_design_service().warm_up())
+warmup.add("contrast_engine", themes.get_contrast_engine)
+warmup.add("thumbnails", themes.get_thumbnail_renderer)
+warmup.add("color_table", themes.get_color_table)
+warmup.add("generation_pool", lambda: components.generation_pool.warm_up())
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -36,16 +55,26 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting UI Customizer Tool API")
     
-    # Initialize any startup processes here
-    # - Database connections
-    # - Cache warming
-    # - Template loading
+    # Warmup runs in the background so /health answers immediately; set
+    # WARMUP_BLOCKING=1 to hold startup until /ready would report ready
+    rate_limiter.start()
+    warmup.start()
+    if os.getenv("WARMUP_BLOCKING", "0") == "1":
+        await warmup.wait()
     
     yield
     
     # Shutdown  
     logger.info("Shutting down UI Customizer Tool API")
-    # Clean up resources here
+    await warmup.stop()
+    themes.batch_runner.shutdown()
+    await themes.theme_store.close()
+    components.generation_pool.shutdown()
+    components.live_session_pool.shutdown()
+    design_service = get_design_service()
+    if design_service.similarity_index is not None:
+        design_service.similarity_index.save()
+    await rate_limiter.stop()
 
 # Create FastAPI application instance
 app = FastAPI(
@@ -53,6 +82,7 @@ app = FastAPI(
     description="API for generating dynamic, customizable UI components for Vue.js and React",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
     docs_url="/api/docs",
     redoc_url="/api/redoc"
 )
@@ -68,13 +98,35 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000", "http://localhost:5173", "http://127.0.0.1:3000"],
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
-# Mount static files
+# Response compression (brotli when installed, else gzip); compressed bodies
+# are reused for identical content, e.g. the same theme requested again
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.getenv("COMPRESSION_MIN_SIZE", "1024")),
+    gzip_level=int(os.getenv("COMPRESSION_GZIP_LEVEL", "6")),
+    brotli_quality=int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5")),
+    offload_size=int(os.getenv("COMPRESSION_OFFLOAD_SIZE", str(256 * 1024))),
+    cache=CompressedBodyCache(
+        max_entries=int(os.getenv("COMPRESSION_CACHE_ENTRIES", "256")),
+        max_bytes=int(os.getenv("COMPRESSION_CACHE_MB", "32")) * 1024 * 1024
+    )
+)
+
+# Mount static files (serves build-time .br/.gz variants when accepted)
 if os.path.exists("static"):
-    app.mount("/static", StaticFiles(directory="static"), name="static")
+    app.mount(
+        "/static",
+        PrecompressedStaticFiles(
+            directory="static",
+            cache_control=os.getenv("STATIC_CACHE_CONTROL", "public, max-age=86400")
+        ),
+        name="static"
+    )
 
 # Global exception handler
 @app.exception_handler(ValidationError)
@@ -109,7 +161,8 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
             "message": exc.detail,
             "status_code": exc.status_code,
             "request_id": getattr(request.state, 'request_id', None)
-        }
+        },
+        headers=getattr(exc, 'headers', None)
     )
 
 @app.exception_handler(Exception)
@@ -129,48 +182,12 @@ async def general_exception_handler(request: Request, exc: Exception) -> JSONRes
         }
     )
 
-# Middleware for request logging and rate limiting
-@app.middleware("http")
-async def request_middleware(request: Request, call_next):
-    """
-    Middleware for request processing
-    Handles rate limiting, request logging, and adds request ID
-    """
-    # Generate unique request ID
-    import uuid
-    request_id = str(uuid.uuid4())
-    request.state.request_id = request_id
-    
-    # Get client IP address
-    client_ip = request.client.host if request.client else "unknown"
-    
-    # Apply rate limiting
-    if not await rate_limiter.is_allowed(client_ip):
-        logger.warning(f"Rate limit exceeded for IP: {client_ip}")
-        return JSONResponse(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            content={
-                "error": "Rate Limit Exceeded",
-                "message": "Too many requests. Please try again later.",
-                "request_id": request_id
-            }
-        )
-    
-    # Log request
-    logger.info(f"Request {request_id}: {request.method} {request.url} from {client_ip}")
-    
-    # Process request
-    try:
-        response = await call_next(request)
-        logger.info(f"Response {request_id}: {response.status_code}")
-        
-        # Add request ID to response headers
-        response.headers["X-Request-ID"] = request_id
-        
-        return response
-    except Exception as e:
-        logger.exception(f"Error processing request {request_id}: {str(e)}")
-        raise
+# Request IDs, rate limiting and access logging (outermost middleware)
+app.add_middleware(
+    RequestContextMiddleware,
+    rate_limiter=rate_limiter,
+    access_log_sample_rate=float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "1.0"))
+)
 
 # Include API routers
 app.include_router(
@@ -213,6 +230,30 @@ async def health_check() -> Dict[str, Any]:
             detail="Service temporarily unavailable"
         )
 
+# Readiness endpoint
+@app.get("/ready", tags=["health"])
+async def readiness_check() -> JSONResponse:
+    """
+    Readiness probe for load balancers and orchestrators
+    Returns 503 until every startup warmup task has finished, with per-task
+    state and timings; unlike /health it does not pass while warming up
+    """
+    report = warmup.report()
+    return FastJSONResponse(
+        status_code=status.HTTP_200_OK if report["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=report
+    )
+
+# Metrics endpoint
+@app.get("/metrics", tags=["health"], include_in_schema=False)
+async def metrics() -> Response:
+    """
+    Prometheus scrape endpoint
+    Exposes per-route latency, in-flight requests, payload sizes, rate limiter
+    rejections and generation stage timings for this worker process
+    """
+    return Response(content=metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
+
 # Root endpoint
 @app.get("/", tags=["root"])
 async def root() -> Dict[str, str]:
@@ -224,7 +265,9 @@ async def root() -> Dict[str, str]:
         "version": "1.0.0",
         "docs": "/api/docs",
         "redoc": "/api/redoc",
-        "health": "/health"
+        "health": "/health",
+        "ready": "/ready",
+        "metrics": "/metrics"
     }
 
 if __name__ == "__main__":
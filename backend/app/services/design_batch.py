@@ -0,0 +1,124 @@
+# backend/app/services/design_batch.py
+"""
+Process-pool fan-out for batch design system generation
+Keeps CPU-bound generation off the event loop and yields results in request order
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.services.generation_worker import create_similarity_index
+from app.services.generators.design_generator import DesignGeneratorService
+
+logger = logging.getLogger(__name__)
+
+# One generator per worker process, created on first use inside that process
+_worker_service: Optional[DesignGeneratorService] = None
+
+
+def generate_in_worker(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Generate one design system inside a pool worker
+
+    Args:
+        config: A DesignConfigRequest in dict form
+
+    Returns:
+        The token dict plus the time spent generating, in milliseconds
+    """
+    global _worker_service
+    if _worker_service is None:
+        _worker_service = DesignGeneratorService(similarity_index=create_similarity_index())
+
+    started = time.perf_counter()
+    design_tokens = _worker_service.generate_design_system(
+        base_config=config,
+        style_preference=config.get("style"),
+        color_preference=(config.get("colors") or {}).get("primary"),
+        seed=config.get("seed")
+    )
+    return {
+        "design_tokens": design_tokens.to_dict(),
+        "generation_time_ms": round((time.perf_counter() - started) * 1000, 3)
+    }
+
+
+class DesignBatchRunner:
+    """
+    Runs generate_design_system for many configurations on a ProcessPoolExecutor
+
+    The pool is created lazily on first use and sized by max_workers (default:
+    the DESIGN_BATCH_WORKERS environment variable, else the CPU count). At most
+    max_in_flight items are submitted ahead of the one being yielded, so a large
+    batch never queues every payload in the pool at once.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_in_flight: Optional[int] = None):
+        self.max_workers = max_workers or int(os.getenv("DESIGN_BATCH_WORKERS", "0")) or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight or self.max_workers * 4
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """The shared process pool, started on first access"""
+        if self._executor is None:
+            logger.info(f"Starting design batch pool with {self.max_workers} workers")
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def generate(self, configs: List[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Generate every configuration and yield one result per item, in input order
+
+        Each result carries the item index, either design_tokens or error, the
+        time spent generating in the worker and the total time since submission.
+        """
+        loop = asyncio.get_running_loop()
+        pending: deque = deque()
+        next_index = 0
+
+        def submit(index: int) -> None:
+            future = loop.run_in_executor(self.executor, generate_in_worker, configs[index])
+            pending.append((index, time.perf_counter(), future))
+
+        while next_index < len(configs) and next_index < self.max_in_flight:
+            submit(next_index)
+            next_index += 1
+
+        try:
+            while pending:
+                index, submitted_at, future = pending.popleft()
+                try:
+                    result = await future
+                    item = {"index": index, **result}
+                except Exception as e:
+                    logger.error(f"Batch item {index} failed: {str(e)}")
+                    item = {"index": index, "error": str(e), "generation_time_ms": None}
+
+                item["total_time_ms"] = round((time.perf_counter() - submitted_at) * 1000, 3)
+
+                if next_index < len(configs):
+                    submit(next_index)
+                    next_index += 1
+
+                yield item
+        finally:
+            # Client went away or the stream was closed early
+            for _, _, future in pending:
+                future.cancel()
+
+    def shutdown(self) -> None:
+        """Stop the process pool, if it was started"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            logger.info("Design batch pool shut down")
@@ -0,0 +1,186 @@
+# backend/app/services/design_cache.py
+"""
+Content-addressed cache for generated design token systems
+Keys are canonical hashes of the generation inputs (style, colors, seed)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def canonical_design_input(
+    style: Optional[str],
+    colors: Optional[Dict[str, Any]],
+    seed: Optional[int]
+) -> Dict[str, Any]:
+    """
+    Normalize generation inputs so equivalent requests share one representation
+
+    Color values are stripped and lowercased, and unset colors are dropped so
+    that {"accent": None} and a missing accent hash identically.
+    """
+    normalized_colors = {
+        name: value.strip().lower()
+        for name, value in (colors or {}).items()
+        if isinstance(value, str) and value.strip()
+    }
+    return {
+        "style": style,
+        "colors": dict(sorted(normalized_colors.items())),
+        "seed": seed
+    }
+
+
+def canonical_design_key(
+    style: Optional[str],
+    colors: Optional[Dict[str, Any]],
+    seed: Optional[int]
+) -> str:
+    """Return the SHA-256 hex digest of the canonical generation input"""
+    payload = json.dumps(
+        canonical_design_input(style, colors, seed),
+        sort_keys=True,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DesignTokenCache:
+    """
+    Bounded LRU cache with TTL and an optional on-disk tier
+
+    The memory tier holds token objects; the disk tier holds their dict form as
+    JSON files named by key, so entries survive restarts. Both tiers honour the
+    same TTL. All operations are guarded by a lock so the cache can be shared
+    between worker threads.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600.0,
+        disk_path: Optional[str] = None
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_path = disk_path
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.disk_hits = 0
+
+        if disk_path:
+            os.makedirs(disk_path, exist_ok=True)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key from memory, or None on a miss"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if now - stored_at < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return None
+
+    def get_serialized(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the dict form of an entry from the disk tier, if present and fresh"""
+        path = self._disk_file(key)
+        if path is None:
+            return None
+
+        try:
+            if time.time() - os.path.getmtime(path) >= self.ttl_seconds:
+                os.remove(path)
+                return None
+            with open(path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable design cache file {path}: {str(e)}")
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+        return data
+
+    def set(self, key: str, value: Any, serialized: Optional[Dict[str, Any]] = None) -> None:
+        """Store value in memory and, when configured, its dict form on disk"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        if serialized is not None:
+            self._write_disk(key, serialized)
+
+    def clear(self) -> None:
+        """Drop every in-memory entry (disk files are left in place)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters for health and metrics reporting"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "disk_enabled": self.disk_path is not None
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _disk_file(self, key: str) -> Optional[str]:
+        if not self.disk_path:
+            return None
+        return os.path.join(self.disk_path, f"{key}.json")
+
+    def _write_disk(self, key: str, data: Dict[str, Any]) -> None:
+        path = self._disk_file(key)
+        if path is None:
+            return
+
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as handle:
+                json.dump(data, handle, separators=(",", ":"))
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write design cache file {path}: {str(e)}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
@@ -0,0 +1,322 @@
+# backend/app/services/generation_worker.py
+"""
+Component generation work unit, runnable in the API process or a pool worker
+All inputs and outputs are plain data so the job can cross process boundaries
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Tuple
+
+import orjson
+
+from app.services.design_cache import DesignTokenCache, canonical_design_input
+from app.services.generators.component_generator import TEMPLATE_DIR, ComponentGeneratorService, pascal_case, token_key
+from app.services.generators.css_compiler import shared_css_pays_off
+from app.services.generators.design_generator import DesignGeneratorService, DesignTokens
+from app.utils.streaming import EventData
+
+if TYPE_CHECKING:
+    from app.services.similarity_index import DesignSimilarityIndex
+
+logger = logging.getLogger(__name__)
+
+# One generator of each kind (and token cache) per process, created on first use
+_design_service: Optional[DesignGeneratorService] = None
+_component_service: Optional[ComponentGeneratorService] = None
+# Warmup threads and early requests may ask for a service at the same time
+_services_lock = threading.Lock()
+
+
+def get_design_service() -> DesignGeneratorService:
+    """Return this process's design generator, configured from the environment"""
+    global _design_service
+    if _design_service is None:
+        with _services_lock:
+            if _design_service is None:
+                _design_service = DesignGeneratorService(
+                    cache=DesignTokenCache(
+                        max_entries=int(os.getenv("DESIGN_CACHE_MAX_ENTRIES", "1024")),
+                        ttl_seconds=float(os.getenv("DESIGN_CACHE_TTL_SECONDS", "3600")),
+                        disk_path=os.getenv("DESIGN_CACHE_DIR") or None
+                    ),
+                    similarity_index=create_similarity_index(),
+                    max_rerolls=int(os.getenv("DESIGN_SIMILARITY_MAX_REROLLS", "3"))
+                )
+    return _design_service
+
+
+def similarity_threshold() -> float:
+    """
+    DESIGN_SIMILARITY_THRESHOLD, or 0 (the default) when re-rolls are off
+
+    With re-rolls on, a request without a seed may get a different design
+    depending on what this process generated before, so its output is no
+    longer a function of the request alone.
+    """
+    return max(0.0, float(os.getenv("DESIGN_SIMILARITY_THRESHOLD", "0")))
+
+
+def create_similarity_index() -> Optional["DesignSimilarityIndex"]:
+    """
+    Build the design similarity index from the environment
+
+    Off unless DESIGN_SIMILARITY_THRESHOLD is set above 0. Every process keeps
+    its own index; with DESIGN_SIMILARITY_INDEX_PATH set they load it on start
+    and merge into it every DESIGN_SIMILARITY_AUTOSAVE new designs.
+    """
+    threshold = similarity_threshold()
+    if threshold <= 0:
+        return None
+    from app.services.similarity_index import DesignSimilarityIndex
+    return DesignSimilarityIndex(
+        threshold=threshold,
+        path=os.getenv("DESIGN_SIMILARITY_INDEX_PATH") or None,
+        autosave_every=int(os.getenv("DESIGN_SIMILARITY_AUTOSAVE", "1000"))
+    )
+
+
+def get_component_service() -> ComponentGeneratorService:
+    """Return this process's component code generator"""
+    global _component_service
+    if _component_service is None:
+        with _services_lock:
+            if _component_service is None:
+                _component_service = ComponentGeneratorService()
+    return _component_service
+
+
+@lru_cache(maxsize=1)
+def generator_version() -> str:
+    """
+    Identify the generator code and templates that produce responses
+
+    GENERATOR_VERSION overrides it (e.g. with the release tag); otherwise it is
+    a digest of the generator modules and templates, so any change to them
+    invalidates ETags issued for earlier output.
+    """
+    configured = os.getenv("GENERATOR_VERSION")
+    if configured:
+        return configured
+
+    digest = hashlib.sha256()
+    generators_dir = os.path.join(os.path.dirname(__file__), "generators")
+    for root in (generators_dir, TEMPLATE_DIR):
+        for directory, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(name for name in dirnames if name != "__pycache__")
+            for filename in sorted(filenames):
+                if filename.endswith((".py", ".j2")):
+                    path = os.path.join(directory, filename)
+                    digest.update(os.path.relpath(path, root).encode("utf-8"))
+                    with open(path, "rb") as f:
+                        digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def canonical_generation_request(request_data: Dict[str, Any]) -> bytes:
+    """
+    Encode a ComponentGenerationRequest (dict form) canonically
+
+    Equivalent requests (color case, unset colors) encode identically;
+    component order is kept since it determines component IDs.
+    """
+    design_config = request_data["design_config"]
+    return orjson.dumps({
+        "design_config": canonical_design_input(
+            design_config.get("style"), design_config.get("colors"), design_config.get("seed")
+        ),
+        "component_types": request_data["component_types"],
+        "variants_per_type": request_data["variants_per_type"],
+        "include_states": request_data.get("include_states", True),
+        "framework": request_data["framework"],
+        "css_mode": resolve_css_mode(request_data)
+    }, option=orjson.OPT_SORT_KEYS)
+
+
+def resolve_css_mode(request_data: Dict[str, Any]) -> str:
+    """
+    The request's css_mode, with 'auto' resolved by size
+
+    'auto' is 'shared' when that makes the output smaller than 'scoped'
+    (shared_css_pays_off), judged by the distinct component types.
+    """
+    css_mode = request_data.get("css_mode", "scoped")
+    if css_mode != "auto":
+        return css_mode
+    pays_off = shared_css_pays_off(
+        len(set(request_data["component_types"])),
+        request_data["variants_per_type"],
+        request_data.get("include_states", True)
+    )
+    return "shared" if pays_off else "scoped"
+
+
+def init_generation_worker() -> None:
+    """
+    Process pool initializer
+
+    Lowers the worker's scheduling priority so the API process, which only
+    does I/O and routing, wins the CPU whenever both are runnable.
+    """
+    niceness = int(os.getenv("GENERATION_WORKER_NICE", "10"))
+    if niceness and hasattr(os, "nice"):
+        os.nice(niceness)
+    get_design_service().warm_up()
+    get_component_service().warm_up()
+
+
+def generate_design_tokens(request_data: Dict[str, Any], timings: Optional[Dict[str, float]] = None) -> DesignTokens:
+    """Generate the design token system for a ComponentGenerationRequest in dict form"""
+    design_config = request_data["design_config"]
+    return get_design_service().generate_design_system(
+        base_config=design_config,
+        style_preference=design_config.get("style"),
+        color_preference=design_config["colors"].get("primary"),
+        seed=design_config.get("seed"),
+        timings=timings
+    )
+
+
+def iter_component_slots(request_data: Dict[str, Any]) -> Iterator[Tuple[str, int, str, int]]:
+    """Yield (component ID, type index, component type, variant index) for every requested variant"""
+    for i, component_type in enumerate(request_data["component_types"]):
+        for j in range(request_data["variants_per_type"]):
+            yield f"{component_type}_{i}_{j}", i, component_type, j
+
+
+def build_component(
+    request_data: Dict[str, Any],
+    design_tokens: DesignTokens,
+    component_type: str,
+    type_index: int,
+    variant_index: int,
+    tokens_hash: Optional[str] = None
+) -> Dict[str, Any]:
+    """Build one component variant of a ComponentGenerationRequest (dict form)"""
+    rendered = get_component_service().render_component(
+        component_type=component_type,
+        variant_index=variant_index,
+        framework=request_data["framework"],
+        design_tokens=design_tokens,
+        include_states=request_data.get("include_states", True),
+        tokens_hash=tokens_hash or token_key(design_tokens),
+        css_mode=resolve_css_mode(request_data)
+    )
+    return {
+        "id": f"{component_type}_{type_index}_{variant_index}",
+        "name": f"{pascal_case(component_type)}Component{variant_index + 1}",
+        "type": component_type,
+        "framework": request_data["framework"],
+        **rendered,
+        "created_at": datetime.now().isoformat()
+    }
+
+
+def iter_components(request_data: Dict[str, Any], design_tokens: DesignTokens) -> Iterator[Dict[str, Any]]:
+    """Yield each requested component variant as soon as it is built"""
+    tokens_hash = token_key(design_tokens)
+    for _, i, component_type, j in iter_component_slots(request_data):
+        yield build_component(request_data, design_tokens, component_type, i, j, tokens_hash)
+
+
+def shared_stylesheet(
+    request_data: Dict[str, Any],
+    design_tokens: DesignTokens,
+    tokens_hash: Optional[str] = None
+) -> Optional[str]:
+    """The stylesheet shared by the request's components, or None unless css_mode resolves to 'shared'"""
+    if resolve_css_mode(request_data) != "shared":
+        return None
+    return get_component_service().stylesheet(
+        design_tokens,
+        request_data["variants_per_type"],
+        include_states=request_data.get("include_states", True),
+        tokens_hash=tokens_hash
+    )
+
+
+def iter_generation_events(
+    request_data: Dict[str, Any],
+    timings: Optional[Dict[str, float]] = None
+) -> Iterator[Tuple[str, EventData]]:
+    """
+    Yield (event, data) pairs for a streamed generation response
+
+    Design tokens come first (then the stylesheet in the shared CSS mode),
+    then one event per component, then a summary, so nothing is accumulated
+    beyond the component being built. If timings is
+    given it receives per-stage seconds plus "components" and "total" (time
+    spent by the consumer between events included).
+    """
+    timings = {} if timings is None else timings
+    started = time.perf_counter()
+    total_components = 0
+    try:
+        design_tokens = generate_design_tokens(request_data, timings)
+        yield "design_tokens", design_tokens.to_json()
+        stylesheet = shared_stylesheet(request_data, design_tokens)
+        if stylesheet is not None:
+            yield "stylesheet", {"css": stylesheet}
+
+        components_started = time.perf_counter()
+        for component in iter_components(request_data, design_tokens):
+            total_components += 1
+            yield "component", component
+        timings["components"] = time.perf_counter() - components_started
+    except Exception as e:
+        # Headers are already sent, so report the failure in-band
+        logger.exception(f"Error during streamed component generation: {str(e)}")
+        yield "error", {
+            "success": False,
+            "message": "Component generation failed due to internal error",
+            "total_components": total_components
+        }
+        return
+
+    timings["total"] = time.perf_counter() - started
+    yield "done", {
+        "success": True,
+        "message": f"Successfully generated {total_components} components",
+        "generation_time": round(timings["total"], 4),
+        "total_components": total_components
+    }
+
+
+def build_generation_payload(request_data: Dict[str, Any]) -> Tuple[bytes, Dict[str, float]]:
+    """
+    Generate design tokens and components and return the encoded JSON response body
+
+    Args:
+        request_data: A ComponentGenerationRequest in dict form
+
+    Returns:
+        The response body and the seconds spent per stage, so the caller can
+        record them even when this ran in another process
+    """
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+    design_tokens = generate_design_tokens(request_data, timings)
+
+    components_started = time.perf_counter()
+    generated_components = list(iter_components(request_data, design_tokens))
+    stylesheet = shared_stylesheet(request_data, design_tokens)
+    timings["components"] = time.perf_counter() - components_started
+    timings["total"] = time.perf_counter() - started
+
+    response = {
+        "success": True,
+        "message": f"Successfully generated {len(generated_components)} components",
+        "components": generated_components,
+        "generation_time": round(timings["total"], 4),
+        "total_components": len(generated_components)
+    }
+    if stylesheet is not None:
+        response["stylesheet"] = stylesheet
+    # Splice in the token set's cached encoding instead of re-encoding it
+    body = orjson.dumps(response)
+    return body[:-1] + b',"design_tokens":' + design_tokens.to_json() + b"}", timings
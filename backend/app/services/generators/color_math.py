@@ -0,0 +1,158 @@
+# backend/app/services/generators/color_math.py
+"""
+Vectorized color conversions shared by the palette, contrast and color name engines
+Each function works on whole NumPy arrays and reproduces colour/colorsys results
+"""
+
+from typing import Sequence
+
+import numpy as np
+from colour import Color
+
+ONE_THIRD = 1.0 / 3.0
+ONE_SIXTH = 1.0 / 6.0
+TWO_THIRD = 2.0 / 3.0
+
+# Matches colour.FLOAT_ERROR so achromatic detection agrees with the scalar path
+FLOAT_ERROR = 0.0000005
+
+_HEX_DIGITS = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+
+
+def parse_hex_colors(colors: Sequence[str]) -> np.ndarray:
+    """
+    Parse hex color strings into an (N, 3) uint8 array
+
+    Six-digit '#rrggbb' values are decoded in bulk; anything else (short hex,
+    CSS names) falls back to colour.Color for that entry only.
+    """
+    normalized = [
+        value.lower() if len(value) == 7 and value[0] == '#' else Color(value).hex_l
+        for value in colors
+    ]
+    if not normalized:
+        return np.empty((0, 3), dtype=np.uint8)
+
+    digits = np.frombuffer("".join(value[1:] for value in normalized).encode("ascii"), dtype=np.uint8)
+    digits = digits.reshape(len(normalized), 6).astype(np.int16)
+    nibbles = np.where(digits >= ord('a'), digits - ord('a') + 10, digits - ord('0'))
+    if np.any((nibbles < 0) | (nibbles > 15)):
+        raise ValueError("Invalid hex color in batch")
+    return (nibbles[:, 0::2] * 16 + nibbles[:, 1::2]).astype(np.uint8)
+
+
+def rgb_to_hsl(rgb: np.ndarray) -> np.ndarray:
+    """Convert an (N, 3) float RGB array in [0, 1] to HSL, mirroring colour.rgb2hsl"""
+    red, green, blue = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+    vmin = np.minimum(np.minimum(red, green), blue)
+    vmax = np.maximum(np.maximum(red, green), blue)
+    diff = vmax - vmin
+    vsum = vmin + vmax
+    lightness = vsum / 2
+
+    chromatic = diff >= FLOAT_ERROR
+    safe_diff = np.where(chromatic, diff, 1.0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        saturation = np.where(lightness < 0.5, diff / vsum, diff / (2.0 - vsum))
+
+    delta_red = (((vmax - red) / 6) + (diff / 2)) / safe_diff
+    delta_green = (((vmax - green) / 6) + (diff / 2)) / safe_diff
+    delta_blue = (((vmax - blue) / 6) + (diff / 2)) / safe_diff
+
+    hue = np.where(
+        red == vmax,
+        delta_blue - delta_green,
+        np.where(
+            green == vmax,
+            (1.0 / 3) + delta_red - delta_blue,
+            (2.0 / 3) + delta_green - delta_red
+        )
+    )
+    hue = np.where(hue < 0, hue + 1, hue)
+    hue = np.where(hue > 1, hue - 1, hue)
+
+    return np.stack([
+        np.where(chromatic, hue, 0.0),
+        np.where(chromatic, saturation, 0.0),
+        lightness
+    ], axis=1)
+
+
+def _hue_channel(m1: np.ndarray, m2: np.ndarray, hue: np.ndarray) -> np.ndarray:
+    """Vectorized colorsys._v"""
+    hue = np.mod(hue, 1.0)
+    return np.where(
+        hue < ONE_SIXTH,
+        m1 + (m2 - m1) * hue * 6.0,
+        np.where(
+            hue < 0.5,
+            m2,
+            np.where(hue < TWO_THIRD, m1 + (m2 - m1) * (TWO_THIRD - hue) * 6.0, m1)
+        )
+    )
+
+
+def hsl_to_rgb(hue: np.ndarray, saturation: np.ndarray, lightness: np.ndarray) -> np.ndarray:
+    """
+    Convert HSL arrays (hue in turns) to an (N, 3) float RGB array
+
+    Saturation and lightness are clamped to [0, 1] and hue wrapped, matching
+    the scalar _hsl_to_hex helper which feeds colorsys.hls_to_rgb.
+    """
+    hue = np.mod(hue, 1.0)
+    saturation = np.clip(saturation, 0.0, 1.0)
+    lightness = np.clip(lightness, 0.0, 1.0)
+
+    m2 = np.where(lightness <= 0.5, lightness * (1.0 + saturation), lightness + saturation - (lightness * saturation))
+    m1 = 2.0 * lightness - m2
+
+    rgb = np.stack([
+        _hue_channel(m1, m2, hue + ONE_THIRD),
+        _hue_channel(m1, m2, hue),
+        _hue_channel(m1, m2, hue - ONE_THIRD)
+    ], axis=1)
+    gray = saturation == 0.0
+    rgb[gray] = lightness[gray, None]
+    return rgb
+
+
+def rgb_to_bytes(rgb: np.ndarray) -> np.ndarray:
+    """Round float RGB in [0, 1] to uint8 with Python's round-half-to-even semantics"""
+    return np.rint(rgb * 255).astype(np.uint8)
+
+
+def bytes_to_hex(rgb_bytes: np.ndarray) -> np.ndarray:
+    """Format an (N, 3) uint8 array as '#rrggbb' strings without per-color Python calls"""
+    count = len(rgb_bytes)
+    ascii_codes = np.empty((count, 7), dtype=np.uint8)
+    ascii_codes[:, 0] = ord('#')
+    ascii_codes[:, 1::2] = _HEX_DIGITS[rgb_bytes >> 4]
+    ascii_codes[:, 2::2] = _HEX_DIGITS[rgb_bytes & 0x0F]
+    return ascii_codes.view('S7').ravel().astype('U7')
+
+
+# sRGB (D65) -> CIE XYZ, and the D65 reference white
+_RGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041]
+])
+_D65_WHITE = np.array([0.95047, 1.0, 1.08883])
+_SRGB_LINEAR = np.where(
+    np.arange(256) / 255 <= 0.04045,
+    np.arange(256) / 255 / 12.92,
+    ((np.arange(256) / 255 + 0.055) / 1.055) ** 2.4
+)
+
+
+def rgb_bytes_to_lab(rgb_bytes: np.ndarray) -> np.ndarray:
+    """Convert a (..., 3) uint8 sRGB array to CIE L*a*b* (D65), where Euclidean distance is Delta E 1976"""
+    xyz = (_SRGB_LINEAR[rgb_bytes] @ _RGB_TO_XYZ.T) / _D65_WHITE
+    delta = 6 / 29
+    f = np.where(xyz > delta ** 3, np.cbrt(xyz), xyz / (3 * delta ** 2) + 4 / 29)
+    return np.stack([
+        116 * f[..., 1] - 16,
+        500 * (f[..., 0] - f[..., 1]),
+        200 * (f[..., 1] - f[..., 2])
+    ], axis=-1)
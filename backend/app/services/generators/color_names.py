@@ -0,0 +1,216 @@
+# backend/app/services/generators/color_names.py
+"""
+Named color and Tailwind palette lookup in CIE Lab
+The table of reference colors is built once, saved as a structured .npy file
+and memory-mapped by every process; nearest matches for thousands of colors
+are found in one matrix product per chunk instead of per-color scans
+"""
+
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from colour import COLOR_NAME_TO_RGB
+
+from app.services.generators.color_math import bytes_to_hex, parse_hex_colors, rgb_bytes_to_lab
+
+logger = logging.getLogger(__name__)
+
+# Bump when the reference colors or the row layout change; it is part of the
+# file name, so a new version builds its own table next to the old one
+TABLE_VERSION = 1
+
+SOURCES = ('css', 'tailwind')
+
+# Tailwind CSS v3 default palette: 11 steps per family, lightest first
+TAILWIND_STEPS = (50, 100, 200, 300, 400, 500, 600, 700, 800, 900, 950)
+TAILWIND_PALETTE = {
+    'slate': "f8fafc f1f5f9 e2e8f0 cbd5e1 94a3b8 64748b 475569 334155 1e293b 0f172a 020617",
+    'gray': "f9fafb f3f4f6 e5e7eb d1d5db 9ca3af 6b7280 4b5563 374151 1f2937 111827 030712",
+    'zinc': "fafafa f4f4f5 e4e4e7 d4d4d8 a1a1aa 71717a 52525b 3f3f46 27272a 18181b 09090b",
+    'neutral': "fafafa f5f5f5 e5e5e5 d4d4d4 a3a3a3 737373 525252 404040 262626 171717 0a0a0a",
+    'stone': "fafaf9 f5f5f4 e7e5e4 d6d3d1 a8a29e 78716c 57534e 44403c 292524 1c1917 0c0a09",
+    'red': "fef2f2 fee2e2 fecaca fca5a5 f87171 ef4444 dc2626 b91c1c 991b1b 7f1d1d 450a0a",
+    'orange': "fff7ed ffedd5 fed7aa fdba74 fb923c f97316 ea580c c2410c 9a3412 7c2d12 431407",
+    'amber': "fffbeb fef3c7 fde68a fcd34d fbbf24 f59e0b d97706 b45309 92400e 78350f 451a03",
+    'yellow': "fefce8 fef9c3 fef08a fde047 facc15 eab308 ca8a04 a16207 854d0e 713f12 422006",
+    'lime': "f7fee7 ecfccb d9f99d bef264 a3e635 84cc16 65a30d 4d7c0f 3f6212 365314 1a2e05",
+    'green': "f0fdf4 dcfce7 bbf7d0 86efac 4ade80 22c55e 16a34a 15803d 166534 14532d 052e16",
+    'emerald': "ecfdf5 d1fae5 a7f3d0 6ee7b7 34d399 10b981 059669 047857 065f46 064e3b 022c22",
+    'teal': "f0fdfa ccfbf1 99f6e4 5eead4 2dd4bf 14b8a6 0d9488 0f766e 115e59 134e4a 042f2e",
+    'cyan': "ecfeff cffafe a5f3fc 67e8f9 22d3ee 06b6d4 0891b2 0e7490 155e75 164e63 083344",
+    'sky': "f0f9ff e0f2fe bae6fd 7dd3fc 38bdf8 0ea5e9 0284c7 0369a1 075985 0c4a6e 082f49",
+    'blue': "eff6ff dbeafe bfdbfe 93c5fd 60a5fa 3b82f6 2563eb 1d4ed8 1e40af 1e3a8a 172554",
+    'indigo': "eef2ff e0e7ff c7d2fe a5b4fc 818cf8 6366f1 4f46e5 4338ca 3730a3 312e81 1e1b4b",
+    'violet': "f5f3ff ede9fe ddd6fe c4b5fd a78bfa 8b5cf6 7c3aed 6d28d9 5b21b6 4c1d95 2e1065",
+    'purple': "faf5ff f3e8ff e9d5ff d8b4fe c084fc a855f7 9333ea 7e22ce 6b21a8 581c87 3b0764",
+    'fuchsia': "fdf4ff fae8ff f5d0fe f0abfc e879f9 d946ef c026d3 a21caf 86198f 701a75 4a044e",
+    'pink': "fdf2f8 fce7f3 fbcfe8 f9a8d4 f472b6 ec4899 db2777 be185d 9d174d 831843 500724",
+    'rose': "fff1f2 ffe4e6 fecdd3 fda4af fb7185 f43f5e e11d48 be123c 9f1239 881337 4c0519"
+}
+
+# colour's table is X11-based: drop the names CSS does not define and add the one it lacks
+_NON_CSS_NAMES = frozenset({'navyblue', 'lightslateblue', 'violetred', 'lightgoldenrod'})
+_EXTRA_CSS_NAMES = {'rebeccapurple': (0x66, 0x33, 0x99)}
+
+TABLE_DTYPE = np.dtype([
+    ('lab', '<f8', (3,)),
+    # Squared norm of lab, precomputed for the distance expansion
+    ('norm', '<f8'),
+    ('rgb', 'u1', (3,)),
+    ('source', 'u1'),
+    ('name', 'S24')
+])
+
+# Query colors per distance matrix, bounding memory at chunk x table rows
+QUERY_CHUNK = 4096
+
+
+@dataclass(frozen=True)
+class ColorMatch:
+    """Closest reference color to a query color"""
+    color: str
+    name: str
+    hex: str
+    source: str
+    delta_e: float
+
+
+def _reference_colors() -> Iterator[Tuple[str, str, Tuple[int, int, int]]]:
+    """(source, name, rgb) of every reference color, one name per CSS color value"""
+    seen = set()
+    for name, rgb in [*COLOR_NAME_TO_RGB.items(), *_EXTRA_CSS_NAMES.items()]:
+        # Aliases (grey/gray, aqua/cyan) share a value; the first name listed wins
+        if name not in _NON_CSS_NAMES and rgb not in seen:
+            seen.add(rgb)
+            yield 'css', name, rgb
+    for family, values in TAILWIND_PALETTE.items():
+        for step, value in zip(TAILWIND_STEPS, values.split()):
+            yield 'tailwind', f"{family}-{step}", tuple(bytes.fromhex(value))
+
+
+def build_color_table() -> np.ndarray:
+    """Build the reference color table in memory"""
+    references = list(_reference_colors())
+    table = np.zeros(len(references), dtype=TABLE_DTYPE)
+    table['rgb'] = np.array([rgb for _, _, rgb in references], dtype=np.uint8)
+    table['lab'] = rgb_bytes_to_lab(table['rgb'])
+    table['norm'] = np.einsum('ij,ij->i', table['lab'], table['lab'])
+    table['source'] = [SOURCES.index(source) for source, _, _ in references]
+    table['name'] = [name.encode('ascii') for _, name, _ in references]
+    return table
+
+
+class ColorNameTable:
+    """
+    Nearest reference color lookups (CSS named colors, Tailwind palette steps)
+
+    Distances are Delta E 1976 (Euclidean in CIE Lab), matching the design
+    similarity index. With a directory, the table is read from a .npy file
+    there with mmap_mode, so worker processes share one copy from the page
+    cache; the first process to find it missing builds and writes it
+    atomically. Read-only after construction, so safe to share between threads.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.path = os.path.join(directory, f"color_table_v{TABLE_VERSION}.npy") if directory else None
+        self.table = self._open() if self.path else build_color_table()
+        # Contiguous copies for the matrix product (a few KB; the mmap stays the source of truth)
+        self._lab = np.ascontiguousarray(self.table['lab'])
+        self._norm = np.ascontiguousarray(self.table['norm'])
+        self._rows = {
+            source: np.flatnonzero(self.table['source'] == index)
+            for index, source in enumerate(SOURCES)
+        }
+        self._names = [name.decode('ascii') for name in self.table['name']]
+        self._hex = bytes_to_hex(np.asarray(self.table['rgb']))
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def nearest(self, colors: Sequence[str], source: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Table rows closest to each color and their Delta E
+
+        Args:
+            colors: Hex colors (anything colour.Color parses is accepted)
+            source: 'css' or 'tailwind' to restrict matches; None for both
+
+        Returns:
+            (N,) row indices into the table and (N,) distances
+        """
+        rows = self._rows[source] if source else np.arange(len(self.table))
+        lab = rgb_bytes_to_lab(parse_hex_colors(colors))
+        indices = np.empty(len(lab), dtype=np.intp)
+        distances = np.empty(len(lab))
+        table_lab = self._lab[rows]
+        table_norm = self._norm[rows]
+        for start in range(0, len(lab), QUERY_CHUNK):
+            chunk = lab[start:start + QUERY_CHUNK]
+            # |q - t|^2 = |q|^2 - 2 q.t + |t|^2; only the last two terms decide the argmin
+            squared = table_norm - 2.0 * (chunk @ table_lab.T)
+            best = np.argmin(squared, axis=1)
+            indices[start:start + len(chunk)] = rows[best]
+            best_squared = squared[np.arange(len(chunk)), best] + np.einsum('ij,ij->i', chunk, chunk)
+            distances[start:start + len(chunk)] = np.sqrt(np.maximum(best_squared, 0.0))
+        return indices, distances
+
+    def match(self, colors: Sequence[str], source: Optional[str] = None) -> List[ColorMatch]:
+        """Closest reference color for each color, with its name and hex value"""
+        indices, distances = self.nearest(colors, source)
+        return [
+            ColorMatch(
+                color=color,
+                name=self._names[index],
+                hex=str(self._hex[index]),
+                source=SOURCES[self.table['source'][index]],
+                delta_e=round(float(distance), 3)
+            )
+            for color, index, distance in zip(colors, indices.tolist(), distances)
+        ]
+
+    def snap_palette(self, palette: Dict[str, str], source: str = 'tailwind') -> Dict[str, ColorMatch]:
+        """Closest reference color for every role of a palette"""
+        roles = [role for role, value in palette.items() if value]
+        return dict(zip(roles, self.match([palette[role] for role in roles], source)))
+
+    def _open(self) -> np.ndarray:
+        table = self._read()
+        if table is None:
+            self._write(build_color_table())
+            table = self._read()
+        if table is None:
+            # Unwritable location: fall back to a private in-memory table
+            return build_color_table()
+        return table
+
+    def _read(self) -> Optional[np.ndarray]:
+        if not os.path.exists(self.path):
+            return None
+        try:
+            table = np.load(self.path, mmap_mode='r')
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to read color table {self.path}: {str(e)}")
+            return None
+        if table.dtype != TABLE_DTYPE or table.ndim != 1 or len(table) == 0:
+            logger.warning(f"Ignoring color table {self.path} with an unexpected layout")
+            return None
+        return table
+
+    def _write(self, table: np.ndarray) -> None:
+        """Write the table atomically, so concurrent readers never see a partial file"""
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp.npy"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            np.save(temp_path, table)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to save color table {self.path}: {str(e)}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
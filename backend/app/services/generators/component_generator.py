@@ -0,0 +1,450 @@
+# backend/app/services/generators/component_generator.py
+"""
+Component code generation service
+Renders Vue single-file components and React TSX components from Jinja2 templates
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from app.services.generators.css_compiler import STATE_CLASS, CssCompiler, root_rule
+from app.services.generators.design_generator import DesignTokens
+
+if TYPE_CHECKING:
+    from jinja2 import Environment, Template
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "templates")
+
+FRAMEWORK_TEMPLATES = {
+    "vue": "vue/component.vue.j2",
+    "react": "react/component.tsx.j2"
+}
+
+# 'scoped': every component carries its own rules; 'shared': components reference
+# utility classes from one deduplicated stylesheet (see stylesheet())
+CSS_MODES = ("scoped", "shared")
+
+# Markup and API surface per component type
+COMPONENT_SPECS: Dict[str, Dict[str, Any]] = {
+    "button": {"tag": "button", "attrs": {"type": "button"}, "text_prop": "label", "emits": ["click"], "interactive": True,
+               "a11y": ["keyboard-navigation", "focus-visible-ring", "aria-disabled"]},
+    "input": {"tag": "input", "attrs": {"type": "text"}, "void": True, "emits": ["input", "change"], "interactive": True,
+              "a11y": ["label-association", "focus-visible-ring", "aria-invalid"]},
+    "select": {"tag": "select", "attrs": {}, "has_slot": True, "emits": ["change"], "interactive": True,
+               "a11y": ["native-select-semantics", "focus-visible-ring"]},
+    "checkbox": {"tag": "input", "attrs": {"type": "checkbox"}, "void": True, "emits": ["change"], "interactive": True,
+                 "a11y": ["native-checkbox-semantics", "focus-visible-ring"]},
+    "radio": {"tag": "input", "attrs": {"type": "radio"}, "void": True, "emits": ["change"], "interactive": True,
+              "a11y": ["native-radio-semantics", "focus-visible-ring"]},
+    "toggle": {"tag": "button", "attrs": {"type": "button", "role": "switch"}, "text_prop": "label", "emits": ["click"],
+               "interactive": True, "a11y": ["switch-role", "keyboard-navigation", "focus-visible-ring"]},
+    "form": {"tag": "form", "attrs": {"novalidate": "true"}, "has_slot": True, "emits": ["submit"],
+             "a11y": ["landmark-form", "error-summary"]},
+    "card": {"tag": "article", "attrs": {}, "text_prop": "title", "has_slot": True,
+             "a11y": ["semantic-article", "heading-structure"]},
+    "modal": {"tag": "div", "attrs": {"role": "dialog", "aria-modal": "true"}, "text_prop": "title", "has_slot": True,
+              "emits": ["close"], "a11y": ["dialog-role", "focus-trap", "escape-to-close"]},
+    "dropdown": {"tag": "div", "attrs": {"role": "menu"}, "has_slot": True, "emits": ["select"], "interactive": True,
+                 "a11y": ["menu-role", "arrow-key-navigation", "escape-to-close"]},
+    "accordion": {"tag": "details", "attrs": {}, "text_prop": "title", "has_slot": True, "emits": ["toggle"],
+                  "a11y": ["native-disclosure", "keyboard-navigation"]},
+    "tab": {"tag": "button", "attrs": {"type": "button", "role": "tab"}, "text_prop": "label", "emits": ["click"],
+            "interactive": True, "a11y": ["tab-role", "arrow-key-navigation", "aria-selected"]},
+    "navigation": {"tag": "nav", "attrs": {"aria-label": "Main"}, "has_slot": True,
+                   "a11y": ["landmark-navigation", "aria-current"]},
+    "breadcrumb": {"tag": "nav", "attrs": {"aria-label": "Breadcrumb"}, "has_slot": True,
+                   "a11y": ["landmark-navigation", "aria-current"]},
+    "pagination": {"tag": "nav", "attrs": {"aria-label": "Pagination"}, "has_slot": True, "emits": ["change"],
+                   "a11y": ["landmark-navigation", "aria-current", "keyboard-navigation"]},
+    "table": {"tag": "table", "attrs": {}, "has_slot": True, "a11y": ["table-semantics", "scope-headers"]},
+    "list": {"tag": "ul", "attrs": {"role": "list"}, "has_slot": True, "a11y": ["list-semantics"]},
+    "avatar": {"tag": "img", "attrs": {"alt": ""}, "void": True, "a11y": ["alt-text"]},
+    "badge": {"tag": "span", "attrs": {}, "text_prop": "label", "a11y": ["status-text"]},
+    "alert": {"tag": "div", "attrs": {"role": "alert"}, "text_prop": "message", "has_slot": True,
+              "a11y": ["alert-role", "live-region"]},
+    "tooltip": {"tag": "div", "attrs": {"role": "tooltip"}, "text_prop": "label", "a11y": ["tooltip-role", "aria-describedby"]}
+}
+
+DEFAULT_SPEC: Dict[str, Any] = {"tag": "div", "attrs": {}, "has_slot": True, "a11y": ["semantic-container"]}
+
+# Visual variants, in the order they are assigned to variants_per_type.
+# Declaration values are token paths (resolved to var(--token, fallback)) or literals.
+VARIANTS: List[Dict[str, Any]] = [
+    {"name": "primary", "declarations": {"background-color": "colors.primary", "color": "colors.background", "border-color": "colors.primary"}},
+    {"name": "secondary", "declarations": {"background-color": "colors.secondary", "color": "colors.background", "border-color": "colors.secondary"}},
+    {"name": "outline", "declarations": {"background-color": "transparent", "color": "colors.primary", "border-color": "colors.primary"}},
+    {"name": "ghost", "declarations": {"background-color": "transparent", "color": "colors.text_primary", "border-color": "transparent"}},
+    {"name": "soft", "declarations": {"background-color": "colors.surface", "color": "colors.primary", "border-color": "colors.border"}},
+    {"name": "accent", "declarations": {"background-color": "colors.accent", "color": "colors.text_primary", "border-color": "colors.accent"}},
+    {"name": "elevated", "declarations": {"background-color": "colors.surface", "color": "colors.text_primary", "box-shadow": "shadows.lg"}},
+    {"name": "neutral", "declarations": {"background-color": "colors.neutral", "color": "colors.background", "border-color": "colors.neutral"}},
+    {"name": "inverse", "declarations": {"background-color": "colors.text_primary", "color": "colors.background", "border-color": "colors.text_primary"}},
+    {"name": "subtle", "declarations": {"background-color": "colors.background", "color": "colors.text_secondary", "border-color": "colors.border"}}
+]
+
+_VARIABLE_PREFIXES = {"colors": "color", "shadows": "shadow"}
+
+# HTML boolean attributes and their JSX names; React gets them bare (= {true})
+JSX_BOOLEAN_ATTRIBUTES = {"novalidate": "noValidate", "disabled": "disabled", "required": "required", "open": "open"}
+
+
+def css_variable_name(token_path: str) -> str:
+    """Map a token path such as 'colors.text_primary' to '--color-text-primary'"""
+    section, name = token_path.split(".", 1)
+    return f"--{_VARIABLE_PREFIXES.get(section, section)}-{name.replace('_', '-')}"
+
+
+def pascal_case(value: str) -> str:
+    """Identifier-safe PascalCase form of a name, e.g. 'date-picker' -> 'DatePicker'"""
+    name = "".join(part.capitalize() for part in re.split(r"[^A-Za-z0-9]+", value) if part)
+    return name if name[:1].isalpha() else f"Component{name}"
+
+
+def component_name(component_type: str, variant_index: int) -> str:
+    """Export name of a component variant, e.g. ('button', 0) -> 'ButtonPrimary'"""
+    return f"{pascal_case(component_type)}{VARIANTS[variant_index % len(VARIANTS)]['name'].capitalize()}"
+
+
+def token_key(design_tokens: DesignTokens) -> str:
+    """Content hash identifying a token set (hashes its cached JSON encoding)"""
+    return hashlib.sha256(design_tokens.to_json()).hexdigest()
+
+
+class ComponentGeneratorService:
+    """
+    Renders framework component code for every (component type, variant, framework)
+
+    Templates are loaded into one Jinja2 environment with an on-disk bytecode
+    cache; warm_up() compiles them all ahead of the first request and can write
+    precompiled template modules that later processes import directly. Fragments
+    that depend only on a token set (CSS variables, base and state rules,
+    variant rules) are rendered once per token set and memoized. In the shared
+    CSS mode components only list utility classes, whose rules the CSS compiler
+    interns once per process.
+    """
+
+    def __init__(
+        self,
+        template_dir: str = TEMPLATE_DIR,
+        bytecode_cache_dir: Optional[str] = None,
+        precompiled_dir: Optional[str] = None,
+        fragment_cache_size: int = 256
+    ):
+        self.template_dir = template_dir
+        self.bytecode_cache_dir = bytecode_cache_dir or os.getenv("TEMPLATE_BYTECODE_CACHE_DIR") or os.path.join(
+            tempfile.gettempdir(), "ui-customizer-jinja"
+        )
+        self.precompiled_dir = precompiled_dir or os.getenv("TEMPLATE_PRECOMPILED_DIR") or None
+        self.fragment_cache_size = fragment_cache_size
+
+        # Jinja2 is imported with the first service instance, not with this module
+        from jinja2 import FileSystemLoader
+
+        os.makedirs(self.bytecode_cache_dir, exist_ok=True)
+        self.environment = self._create_environment(FileSystemLoader(template_dir))
+        self._templates: Dict[str, "Template"] = {}
+        self._render_plans: Dict[Tuple[str, int, str, bool, str], Dict[str, Any]] = {}
+        self.css_compiler = CssCompiler()
+        self._variant_classes_cache: Dict[int, List[str]] = {}
+        self._fragments: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._fragments_lock = threading.Lock()
+        self.is_warm = False
+
+        logger.info("Component generator service initialized")
+
+    def warm_up(self) -> None:
+        """Compile every template and precompute render plans for all known components"""
+        if self.is_warm:
+            return
+
+        template_names = self.environment.list_templates(extensions=["j2"])
+
+        if self.precompiled_dir:
+            from jinja2 import ChoiceLoader, FileSystemLoader, ModuleLoader
+
+            self.environment.compile_templates(self.precompiled_dir, zip=None, ignore_errors=False)
+            self.environment = self._create_environment(ChoiceLoader([
+                ModuleLoader(self.precompiled_dir),
+                FileSystemLoader(self.template_dir)
+            ]))
+            self._templates.clear()
+            self._render_plans.clear()
+
+        for name in template_names:
+            self._template(name)
+
+        for framework in FRAMEWORK_TEMPLATES:
+            for component_type in COMPONENT_SPECS:
+                for variant_index in range(len(VARIANTS)):
+                    for css_mode in CSS_MODES:
+                        self._render_plan(component_type, variant_index, framework, True, css_mode)
+
+        self.is_warm = True
+        logger.info(f"Compiled {len(self._templates)} component templates")
+
+    def render_component(
+        self,
+        component_type: str,
+        variant_index: int,
+        framework: str,
+        design_tokens: DesignTokens,
+        include_states: bool = True,
+        tokens_hash: Optional[str] = None,
+        css_mode: str = "scoped"
+    ) -> Dict[str, Any]:
+        """
+        Render one component variant
+
+        Args:
+            component_type: Component type such as 'button' or 'card'
+            variant_index: Position of the variant (wraps around VARIANTS)
+            framework: 'vue' or 'react'
+            design_tokens: Token set the styles are generated from
+            include_states: Emit hover/focus/disabled rules and a disabled prop
+            tokens_hash: Precomputed token_key(design_tokens), to avoid rehashing per variant
+            css_mode: 'scoped' for per-component styles, 'shared' for utility
+                classes from stylesheet() (styles is then empty)
+
+        Returns:
+            Dict with template, styles, props, usage_example and accessibility_features
+        """
+        if framework not in FRAMEWORK_TEMPLATES:
+            raise ValueError(f"Unsupported framework: {framework}")
+        if css_mode not in CSS_MODES:
+            raise ValueError(f"Unsupported CSS mode: {css_mode}")
+
+        plan = self._render_plan(component_type, variant_index % len(VARIANTS), framework, include_states, css_mode)
+
+        styles: Dict[str, str] = {}
+        if css_mode == "scoped":
+            tokens_hash = tokens_hash or token_key(design_tokens)
+            styles["main"] = self._template("shared/component.css.j2").render(
+                class_name=plan["class_name"],
+                variant=plan["variant"],
+                include_states=include_states,
+                base_rule=self._fragment(tokens_hash, "base_rule", design_tokens),
+                variant_rule=self._fragment(tokens_hash, f"variant:{plan['variant']['name']}", design_tokens),
+                state_rules=self._fragment(tokens_hash, "state_rules", design_tokens) if include_states else ""
+            )
+
+        return {
+            "variant": plan["variant"]["name"],
+            "template": plan["template"].render(plan["context"]),
+            "styles": styles,
+            "props": {prop["name"]: json.loads(prop["default"]) for prop in plan["context"]["props"]},
+            "usage_example": plan["usage_example"],
+            "accessibility_features": plan["accessibility_features"]
+        }
+
+    def css_variables(self, design_tokens: DesignTokens, tokens_hash: Optional[str] = None) -> str:
+        """Return the :root custom property block for a token set (memoized)"""
+        return self._fragment(tokens_hash or token_key(design_tokens), "css_variables", design_tokens)
+
+    def stylesheet(
+        self,
+        design_tokens: Optional[DesignTokens],
+        variants_per_type: int,
+        include_states: bool = True,
+        tokens_hash: Optional[str] = None
+    ) -> str:
+        """
+        Minified stylesheet for components rendered with css_mode='shared'
+
+        Every component type shares the base utilities, so the stylesheet
+        depends only on which variants are used: its size stops growing once
+        all VARIANTS appear, whatever the number of components. Without
+        design_tokens the :root block is left out (e.g. when it is exported
+        separately as tokens.css).
+        """
+        class_names = self.css_compiler.base_classes()
+        for variant_index in range(min(variants_per_type, len(VARIANTS))):
+            class_names += self._variant_classes(variant_index)
+        rules = self.css_compiler.stylesheet(class_names, include_states)
+        if design_tokens is None:
+            return rules
+        return self._fragment(tokens_hash or token_key(design_tokens), "root_rule", design_tokens) + rules
+
+    def render_template(self, name: str, **context: Any) -> str:
+        """Render any template under the template directory (e.g. export scaffolding)"""
+        return self._template(name).render(**context)
+
+    def _create_environment(self, loader) -> "Environment":
+        from jinja2 import Environment, FileSystemBytecodeCache, StrictUndefined
+
+        environment = Environment(
+            loader=loader,
+            bytecode_cache=FileSystemBytecodeCache(self.bytecode_cache_dir),
+            autoescape=False,
+            trim_blocks=True,
+            lstrip_blocks=True,
+            keep_trailing_newline=True,
+            undefined=StrictUndefined,
+            auto_reload=False
+        )
+        environment.filters["handler_name"] = lambda event: f"on{event[:1].upper()}{event[1:]}"
+        environment.filters["token_value"] = _token_value
+        return environment
+
+    def _template(self, name: str) -> "Template":
+        template = self._templates.get(name)
+        if template is None:
+            template = self._templates[name] = self.environment.get_template(name)
+        return template
+
+    def _render_plan(
+        self,
+        component_type: str,
+        variant_index: int,
+        framework: str,
+        include_states: bool,
+        css_mode: str = "scoped"
+    ) -> Dict[str, Any]:
+        """
+        Static render context for a (component type, variant, framework) combination
+
+        Plans are cached for the known component types only, so arbitrary
+        types (rendered with DEFAULT_SPEC) cannot grow the cache.
+        """
+        key = (component_type, variant_index, framework, include_states, css_mode)
+        plan = self._render_plans.get(key)
+        if plan is not None:
+            return plan
+
+        spec = {"attrs": {}, "emits": [], "void": False, "has_slot": False, "text_prop": None, "interactive": False}
+        spec.update(COMPONENT_SPECS.get(component_type, DEFAULT_SPEC))
+        if framework == "react":
+            # None renders a bare JSX attribute
+            spec["attrs"] = {
+                JSX_BOOLEAN_ATTRIBUTES.get(attr, attr): None if attr in JSX_BOOLEAN_ATTRIBUTES else value
+                for attr, value in spec["attrs"].items()
+            }
+        variant = VARIANTS[variant_index]
+        stateful = include_states and spec["interactive"]
+        name = component_name(component_type, variant_index)
+
+        props = []
+        if spec["text_prop"]:
+            props.append({"name": spec["text_prop"], "type": "string", "default": json.dumps(pascal_case(component_type))})
+        props.append({"name": "size", "type": "'sm' | 'md' | 'lg'", "default": json.dumps("md")})
+        if stateful:
+            props.append({"name": "disabled", "type": "boolean", "default": "false"})
+
+        class_name = f"ui-{component_type}"
+        if css_mode == "shared":
+            classes = [class_name, *self.css_compiler.base_classes(), *self._variant_classes(variant_index)]
+            if include_states:
+                classes.append(STATE_CLASS)
+        else:
+            classes = [class_name, f"{class_name}--{variant['name']}"]
+
+        plan = {
+            "template": self._template(FRAMEWORK_TEMPLATES[framework]),
+            "class_name": class_name,
+            "variant": variant,
+            "context": {
+                "name": name,
+                "class_name": class_name,
+                "classes": classes,
+                "spec": spec,
+                "variant": variant,
+                "props": props,
+                "stateful": stateful
+            },
+            "usage_example": f"<{name} />" if spec["void"] or not spec["has_slot"] else f"<{name}>...</{name}>",
+            "accessibility_features": list(spec["a11y"])
+        }
+        if component_type in COMPONENT_SPECS:
+            self._render_plans[key] = plan
+        return plan
+
+    def _variant_classes(self, variant_index: int) -> List[str]:
+        """Utility classes of a variant's declarations (token paths become custom property references)"""
+        classes = self._variant_classes_cache.get(variant_index)
+        if classes is None:
+            classes = self._variant_classes_cache[variant_index] = self.css_compiler.intern_all(
+                (property, f"var({css_variable_name(value)})" if "." in value else value)
+                for property, value in VARIANTS[variant_index]["declarations"].items()
+            )
+        return classes
+
+    def _fragment(self, tokens_hash: str, fragment: str, design_tokens: DesignTokens) -> str:
+        """Render a token-only fragment once per token set"""
+        key = (tokens_hash, fragment)
+        with self._fragments_lock:
+            rendered = self._fragments.get(key)
+            if rendered is not None:
+                self._fragments.move_to_end(key)
+                return rendered
+
+        if fragment == "css_variables":
+            rendered = self._template("shared/css_variables.css.j2").render(variables=_css_variables(design_tokens))
+        elif fragment == "root_rule":
+            rendered = root_rule(_css_variables(design_tokens))
+        elif fragment.startswith("variant:"):
+            variant = next(item for item in VARIANTS if item["name"] == fragment.split(":", 1)[1])
+            rendered = self._template("shared/variant_rule.css.j2").render(variant=variant, tokens=design_tokens)
+        else:
+            rendered = self._template(f"shared/{fragment}.css.j2").render(tokens=design_tokens)
+        rendered = rendered.rstrip("\n")
+
+        with self._fragments_lock:
+            self._fragments[key] = rendered
+            while len(self._fragments) > self.fragment_cache_size:
+                self._fragments.popitem(last=False)
+        return rendered
+
+
+def _resolve_token(token_path: str, design_tokens: DesignTokens) -> Any:
+    section, name = token_path.split(".", 1)
+    value = getattr(design_tokens, section)
+    return value[name] if isinstance(value, dict) else getattr(value, name)
+
+
+def _token_value(value: str, design_tokens: DesignTokens) -> str:
+    """Jinja filter: token path -> var(--name, fallback); anything else passes through"""
+    if "." not in value:
+        return value
+    return f"var({css_variable_name(value)}, {_resolve_token(value, design_tokens)})"
+
+
+def _css_variables(design_tokens: DesignTokens) -> List[Tuple[str, Any]]:
+    """Flatten a token set into (custom property, value) pairs"""
+    tokens = design_tokens.to_dict()
+    variables = [(css_variable_name(f"colors.{name}"), value) for name, value in tokens["colors"].items()]
+    variables += [(css_variable_name(f"shadows.{name}"), value) for name, value in tokens["shadows"].items()]
+
+    typography = tokens["typography"]
+    variables += [
+        ("--font-family-primary", typography["font_family_primary"]),
+        ("--font-family-secondary", typography["font_family_secondary"]),
+        ("--font-family-mono", typography["font_family_mono"]),
+        ("--font-size-base", typography["base_size"]),
+        ("--font-scale-ratio", typography["scale_ratio"]),
+        ("--line-height-base", typography["line_height_base"]),
+        ("--line-height-heading", typography["line_height_heading"]),
+        ("--letter-spacing-normal", typography["letter_spacing_normal"]),
+        ("--letter-spacing-wide", typography["letter_spacing_wide"])
+    ]
+
+    spacing = tokens["spacing"]
+    variables += [
+        ("--spacing-unit", f"{spacing['unit']}px"),
+        ("--spacing-container", spacing["container_padding"]),
+        ("--spacing-section", spacing["section_padding"]),
+        ("--spacing-component", spacing["component_padding"])
+    ]
+    variables += [
+        (f"--{name.replace('_', '-')}" if name.startswith("radius") else f"--border-{name.replace('_', '-')}", value)
+        for name, value in tokens["borders"].items()
+    ]
+    variables += [(f"--{name.replace('_', '-')}", value) for name, value in tokens["animations"].items()]
+    return variables
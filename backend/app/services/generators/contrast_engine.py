@@ -0,0 +1,401 @@
+# backend/app/services/generators/contrast_engine.py
+"""
+WCAG 2.1 contrast auditing and palette correction
+ContrastEngine computes every pairwise contrast ratio for N palettes in one
+NumPy pass and repairs failing roles by moving their lightness along the hue;
+correct_palette is the scalar equivalent for a single palette, where per-call
+NumPy overhead would dominate
+"""
+
+import colorsys
+import logging
+from dataclasses import dataclass
+from typing import Any, Collection, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from colour import Color
+
+from app.services.generators.color_math import (
+    bytes_to_hex, hsl_to_rgb, parse_hex_colors, rgb_to_bytes, rgb_to_hsl
+)
+
+logger = logging.getLogger(__name__)
+
+# WCAG 2.1 AA minimums: normal text (1.4.3) and UI components / graphics (1.4.11)
+AA_TEXT = 4.5
+AA_NON_TEXT = 3.0
+
+# (role adjusted when the pair fails, role it is read against, minimum ratio),
+# following how the component variants combine palette roles. Roles are
+# corrected in this order, so later checks see earlier corrections; background
+# and surface are never adjusted.
+CONTRAST_REQUIREMENTS: Tuple[Tuple[str, str, float], ...] = (
+    ('text_primary', 'background', AA_TEXT),
+    ('text_primary', 'surface', AA_TEXT),
+    ('text_secondary', 'background', AA_TEXT),
+    ('text_secondary', 'surface', AA_TEXT),
+    ('primary', 'background', AA_TEXT),
+    ('primary', 'surface', AA_TEXT),
+    ('secondary', 'background', AA_TEXT),
+    ('neutral', 'background', AA_TEXT),
+    ('accent', 'text_primary', AA_TEXT),
+    ('success', 'background', AA_NON_TEXT),
+    ('warning', 'background', AA_NON_TEXT),
+    ('error', 'background', AA_NON_TEXT),
+    ('info', 'background', AA_NON_TEXT),
+)
+
+# Bisection steps per direction; the lightness found is within
+# 2 ** -SEARCH_ITERATIONS of the distance to black or white of the minimum move
+SEARCH_ITERATIONS = 12
+
+# sRGB byte -> linear channel value, per the WCAG 2.1 relative luminance definition
+_CHANNELS = np.arange(256, dtype=np.float64) / 255
+_LINEAR = np.where(_CHANNELS <= 0.03928, _CHANNELS / 12.92, ((_CHANNELS + 0.055) / 1.055) ** 2.4)
+_LINEAR_VALUES = _LINEAR.tolist()
+_RED_WEIGHT, _GREEN_WEIGHT, _BLUE_WEIGHT = 0.2126, 0.7152, 0.0722
+
+# Rows searched per chunk during correction (bounds temporary arrays)
+_SEARCH_CHUNK = 65536
+
+
+def relative_luminance(rgb_bytes: np.ndarray) -> np.ndarray:
+    """Relative luminance of a (..., 3) uint8 RGB array"""
+    linear = _LINEAR[rgb_bytes]
+    # Summed in the same order as _luminance so both paths agree bit for bit
+    return linear[..., 0] * _RED_WEIGHT + linear[..., 1] * _GREEN_WEIGHT + linear[..., 2] * _BLUE_WEIGHT
+
+
+def contrast_ratio(luminance_a: np.ndarray, luminance_b: np.ndarray) -> np.ndarray:
+    """WCAG contrast ratio between two (broadcastable) luminance arrays"""
+    lighter = np.maximum(luminance_a, luminance_b)
+    darker = np.minimum(luminance_a, luminance_b)
+    return (lighter + 0.05) / (darker + 0.05)
+
+
+@dataclass
+class ContrastAudit:
+    """
+    Contrast results for N palettes
+
+    matrix[n, i, j] is the ratio between roles[i] and roles[j] of palette n;
+    ratios and passed have one column per applicable requirement. Pairs with a
+    missing role have a NaN ratio and count as passed.
+    """
+    roles: List[str]
+    requirements: List[Tuple[str, str, float]]
+    matrix: np.ndarray
+    ratios: np.ndarray
+    passed: np.ndarray
+
+    def failures(self, index: int) -> List[Dict[str, Any]]:
+        """Failing requirements of one palette"""
+        return [
+            {"foreground": foreground, "background": background, "ratio": round(float(ratio), 2), "required": minimum}
+            for (foreground, background, minimum), ratio, passed in zip(
+                self.requirements, self.ratios[index], self.passed[index]
+            )
+            if not passed
+        ]
+
+
+@dataclass
+class ContrastCorrection:
+    """Corrected palette columns, which roles changed, and the audit of the result"""
+    colors: Dict[str, np.ndarray]
+    changed: np.ndarray
+    audit: ContrastAudit
+
+
+class ContrastEngine:
+    """
+    Batch WCAG contrast checker and corrector
+
+    Palettes are passed column-wise (role -> N hex strings, None where a
+    palette lacks the role), like BatchPaletteEngine output. Correction keeps
+    each failing role's hue and saturation and bisects its lightness towards
+    black and towards white, taking the smaller move that satisfies all of
+    that role's requirements (darker on a tie); roles with no passing
+    lightness are left unchanged. Results match correct_palette exactly.
+    """
+
+    def __init__(
+        self,
+        requirements: Sequence[Tuple[str, str, float]] = CONTRAST_REQUIREMENTS,
+        iterations: int = SEARCH_ITERATIONS
+    ):
+        self.requirements = list(requirements)
+        self.iterations = iterations
+
+        # A role checked against another adjustable role is corrected in a
+        # later stage than that role; roles within a stage are independent and
+        # searched together
+        stage_of: Dict[str, int] = {}
+        for role in dict.fromkeys(foreground for foreground, _, _ in self.requirements):
+            depends = [
+                stage_of[background] for foreground, background, _ in self.requirements
+                if foreground == role and background in stage_of
+            ]
+            stage_of[role] = max(depends) + 1 if depends else 0
+        self._stages = [
+            [role for role, stage in stage_of.items() if stage == number]
+            for number in range(max(stage_of.values(), default=-1) + 1)
+        ]
+
+    def audit(self, palettes: Mapping[str, Sequence[Optional[str]]]) -> ContrastAudit:
+        """Compute the contrast matrix and requirement results for a batch of palettes"""
+        roles, rgb, present = self._parse(palettes)
+        return self._audit(roles, relative_luminance(rgb), present)
+
+    def correct(
+        self,
+        palettes: Mapping[str, Sequence[Optional[str]]],
+        locked_roles: Collection[str] = ()
+    ) -> ContrastCorrection:
+        """
+        Fix failing pairs by adjusting lightness along the hue
+
+        Args:
+            palettes: Role -> N hex colors (None for missing)
+            locked_roles: Roles that must not change (e.g. user-chosen colors)
+        """
+        roles, rgb, present = self._parse(palettes)
+        luminance = relative_luminance(rgb)
+        changed = np.zeros(present.shape, dtype=bool)
+        index = {role: position for position, role in enumerate(roles)}
+
+        for stage in self._stages:
+            checks = {
+                role: [
+                    (index[background], minimum)
+                    for foreground, background, minimum in self.requirements
+                    if foreground == role and background in index
+                ]
+                for role in stage
+                if role in index and role not in locked_roles
+            }
+            checks = {role: role_checks for role, role_checks in checks.items() if role_checks}
+            if not checks:
+                continue
+
+            # Shorter check lists are padded and masked out
+            columns = np.array([index[role] for role in checks])
+            width = max(len(role_checks) for role_checks in checks.values())
+            against = np.zeros((len(columns), width), dtype=np.intp)
+            minimums = np.zeros((len(columns), width))
+            valid = np.zeros((len(columns), width), dtype=bool)
+            for slot, role_checks in enumerate(checks.values()):
+                against[slot, :len(role_checks)] = [position for position, _ in role_checks]
+                minimums[slot, :len(role_checks)] = [minimum for _, minimum in role_checks]
+                valid[slot, :len(role_checks)] = True
+
+            against_luminance = luminance[:, against]
+            against_present = present[:, against] & valid
+            ratios = contrast_ratio(luminance[:, columns, None], against_luminance)
+            failing = present[:, columns] & np.any(against_present & (ratios < minimums), axis=2)
+            rows, slots = np.nonzero(failing)
+            if not len(rows):
+                continue
+
+            corrected, found = self._search(
+                rgb[rows, columns[slots]], against_luminance[rows, slots], against_present[rows, slots], minimums[slots]
+            )
+            rows, targets = rows[found], columns[slots[found]]
+            rgb[rows, targets] = corrected[found]
+            luminance[rows, targets] = relative_luminance(corrected[found])
+            changed[rows, targets] = True
+
+        colors = {}
+        for position, role in enumerate(roles):
+            values = np.asarray(palettes[role], dtype=object)
+            if changed[:, position].any():
+                values = values.copy()
+                rows = np.flatnonzero(changed[:, position])
+                values[rows] = bytes_to_hex(rgb[rows, position])
+            colors[role] = values
+        return ContrastCorrection(colors=colors, changed=changed, audit=self._audit(roles, luminance, present))
+
+    def _parse(self, palettes: Mapping[str, Sequence[Optional[str]]]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Parse every role of every palette in one call; returns roles, (N, K, 3) bytes, (N, K) presence"""
+        roles = list(palettes)
+        columns = [list(palettes[role]) for role in roles]
+        count = len(columns[0]) if columns else 0
+        if any(len(column) != count for column in columns):
+            raise ValueError("Every palette role must have one value per palette")
+
+        present = np.array([[value is not None for value in column] for column in columns], dtype=bool)
+        present = present.T.reshape(count, len(roles))
+        flat = [value if value is not None else "#000000" for row in zip(*columns) for value in row]
+        rgb = parse_hex_colors(flat).reshape(count, len(roles), 3)
+        return roles, rgb, present
+
+    def _audit(self, roles: List[str], luminance: np.ndarray, present: np.ndarray) -> ContrastAudit:
+        index = {role: position for position, role in enumerate(roles)}
+        matrix = contrast_ratio(luminance[:, :, None], luminance[:, None, :])
+        matrix[~(present[:, :, None] & present[:, None, :])] = np.nan
+
+        requirements = [
+            requirement for requirement in self.requirements
+            if requirement[0] in index and requirement[1] in index
+        ]
+        foreground = np.array([index[role] for role, _, _ in requirements], dtype=np.intp)
+        background = np.array([index[role] for _, role, _ in requirements], dtype=np.intp)
+        minimums = np.array([minimum for _, _, minimum in requirements])
+        ratios = matrix[:, foreground, background]
+        with np.errstate(invalid='ignore'):
+            passed = np.isnan(ratios) | (ratios >= minimums)
+        return ContrastAudit(roles=roles, requirements=requirements, matrix=matrix, ratios=ratios, passed=passed)
+
+    def _search(
+        self,
+        rgb_bytes: np.ndarray,
+        against_luminance: np.ndarray,
+        against_present: np.ndarray,
+        minimums: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bisect lightness towards black and towards white for each failing color
+
+        t in [0, 1] moves lightness from its current value to the extreme; a
+        direction counts only if its extreme passes, and bisection keeps the
+        upper bound passing. Candidates are quantized to bytes before they are
+        checked, so a returned color passes exactly as it will be emitted.
+        """
+        count = len(rgb_bytes)
+        hsl = rgb_to_hsl(rgb_bytes.astype(np.float64) / 255)
+        best = rgb_bytes.copy()
+        found = np.zeros(count, dtype=bool)
+
+        for start in range(0, count, _SEARCH_CHUNK):
+            rows = slice(start, start + _SEARCH_CHUNK)
+            size = len(hsl[rows])
+            # Rows [0, size) move towards black, rows [size, 2 * size) towards white
+            both_hsl = np.concatenate([hsl[rows], hsl[rows]])
+            extremes = np.repeat([0.0, 1.0], size)
+            checks = (
+                np.concatenate([against_luminance[rows], against_luminance[rows]]),
+                np.concatenate([against_present[rows], against_present[rows]]),
+                np.concatenate([minimums[rows], minimums[rows]])
+            )
+
+            high = np.ones(2 * size)
+            low = np.zeros(2 * size)
+            chosen, feasible = self._evaluate(both_hsl, extremes, high, *checks)
+            for _ in range(self.iterations):
+                middle = (low + high) / 2
+                candidates, ok = self._evaluate(both_hsl, extremes, middle, *checks)
+                high = np.where(ok, middle, high)
+                low = np.where(ok, low, middle)
+                chosen = np.where(ok[:, None], candidates, chosen)
+
+            distance = np.where(feasible, high, np.inf)
+            lighter = distance[size:] < distance[:size]
+            best[rows] = np.where(lighter[:, None], chosen[size:], chosen[:size])
+            found[rows] = feasible[:size] | feasible[size:]
+
+        best[~found] = rgb_bytes[~found]
+        return best, found
+
+    @staticmethod
+    def _evaluate(
+        hsl: np.ndarray,
+        extremes: np.ndarray,
+        t: np.ndarray,
+        against_luminance: np.ndarray,
+        against_present: np.ndarray,
+        minimums: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Quantized candidate per row at position t and whether it meets every minimum"""
+        hue, saturation, lightness = hsl.T
+        candidates = rgb_to_bytes(hsl_to_rgb(hue, saturation, lightness + (extremes - lightness) * t))
+        ratios = contrast_ratio(relative_luminance(candidates)[:, None], against_luminance)
+        ok = np.all((ratios >= minimums) | ~against_present, axis=1)
+        return candidates, ok
+
+
+def correct_palette(
+    colors: Mapping[str, str],
+    locked_roles: Collection[str] = (),
+    requirements: Sequence[Tuple[str, str, float]] = CONTRAST_REQUIREMENTS,
+    iterations: int = SEARCH_ITERATIONS
+) -> Dict[str, str]:
+    """
+    Scalar ContrastEngine.correct for a single palette
+
+    Args:
+        colors: Role -> hex color
+        locked_roles: Roles that must not change
+
+    Returns:
+        Role -> corrected '#rrggbb' for the roles that changed
+    """
+    luminance = {role: _luminance(_hex_bytes(value)) for role, value in colors.items()}
+    changed: Dict[str, str] = {}
+
+    for role in dict.fromkeys(foreground for foreground, _, _ in requirements):
+        if role not in colors or role in locked_roles:
+            continue
+        checks = [
+            (luminance[background], minimum)
+            for foreground, background, minimum in requirements
+            if foreground == role and background in colors
+        ]
+        if not checks or _passes(luminance[role], checks):
+            continue
+
+        red, green, blue = _hex_bytes(colors[role])
+        hue, saturation, lightness = Color(rgb=(red / 255, green / 255, blue / 255)).hsl
+        saturation = _clamp(saturation)
+        best = None
+        for extreme in (0.0, 1.0):
+            chosen = _lightness_candidate(hue, saturation, lightness, extreme, 1.0)
+            if not _passes(_luminance(chosen), checks):
+                continue
+            low, high = 0.0, 1.0
+            for _ in range(iterations):
+                middle = (low + high) / 2
+                candidate = _lightness_candidate(hue, saturation, lightness, extreme, middle)
+                if _passes(_luminance(candidate), checks):
+                    high, chosen = middle, candidate
+                else:
+                    low = middle
+            if best is None or high < best[0]:
+                best = (high, chosen)
+
+        if best is not None:
+            changed[role] = "#{:02x}{:02x}{:02x}".format(*best[1])
+            luminance[role] = _luminance(best[1])
+    return changed
+
+
+def _lightness_candidate(
+    hue: float,
+    saturation: float,
+    lightness: float,
+    extreme: float,
+    t: float
+) -> Tuple[int, int, int]:
+    red, green, blue = colorsys.hls_to_rgb(hue % 1.0, _clamp(lightness + (extreme - lightness) * t), saturation)
+    return round(red * 255), round(green * 255), round(blue * 255)
+
+
+def _clamp(value: float) -> float:
+    return max(0.0, min(1.0, value))
+
+
+def _hex_bytes(value: str) -> Tuple[int, int, int]:
+    value = value.lower() if len(value) == 7 and value[0] == '#' else Color(value).hex_l
+    return int(value[1:3], 16), int(value[3:5], 16), int(value[5:7], 16)
+
+
+def _luminance(rgb: Tuple[int, int, int]) -> float:
+    return _LINEAR_VALUES[rgb[0]] * _RED_WEIGHT + _LINEAR_VALUES[rgb[1]] * _GREEN_WEIGHT + _LINEAR_VALUES[rgb[2]] * _BLUE_WEIGHT
+
+
+def _passes(luminance: float, checks: List[Tuple[float, float]]) -> bool:
+    """Whether a luminance meets every (against luminance, minimum ratio) check"""
+    for against, minimum in checks:
+        lighter, darker = (luminance, against) if luminance > against else (against, luminance)
+        if (lighter + 0.05) / (darker + 0.05) < minimum:
+            return False
+    return True
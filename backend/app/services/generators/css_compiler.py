@@ -0,0 +1,162 @@
+# backend/app/services/generators/css_compiler.py
+"""
+Deduplicating CSS compiler for shared component styles
+
+Instead of every component carrying its own rules, each distinct declaration
+is interned once as an atomic utility class and components reference those
+classes. Declarations point at the token custom properties (var(--name)),
+so the utility rules do not depend on the token set: they are compiled once
+per process, and only the :root block changes with the tokens. Output is
+built and minified directly from the declarations, without parsing CSS.
+
+The shared stylesheet is a fixed cost and every component's markup grows by
+its class list, so shared output is only smaller (gzipped stylesheet plus
+markup) than scoped output past a break-even point; see shared_css_pays_off.
+"""
+
+import hashlib
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+Declaration = Tuple[str, str]
+
+# Same declarations as shared/base_rule.css.j2 and shared/state_rules.css.j2,
+# referencing the :root custom properties without fallbacks
+BASE_DECLARATIONS: Tuple[Declaration, ...] = (
+    ("font-family", "var(--font-family-primary)"),
+    ("font-size", "var(--font-size-base)"),
+    ("line-height", "var(--line-height-base)"),
+    ("padding", "var(--spacing-component)"),
+    ("border", "var(--border-width-thin) solid transparent"),
+    ("border-radius", "var(--radius-md)"),
+    ("transition", ", ".join(
+        f"{property} var(--duration-normal) var(--easing-ease-in-out)"
+        for property in ("background-color", "color", "box-shadow")
+    ))
+)
+
+# Interaction states, shared by every component carrying STATE_CLASS
+STATE_CLASS = "ui-state"
+STATE_RULES: Tuple[Tuple[Tuple[str, ...], Tuple[Declaration, ...]], ...] = (
+    ((":hover",), (("box-shadow", "var(--shadow-md)"),)),
+    ((":focus-visible",), (("outline", "var(--border-width-normal) solid var(--color-accent)"), ("outline-offset", "2px"))),
+    ((".is-disabled", ":disabled"), (("opacity", "0.5"), ("cursor", "not-allowed"), ("box-shadow", "none")))
+)
+
+UTILITY_PREFIX = "u-"
+_PROPERTY_ABBREVIATIONS = {
+    "background-color": "bg",
+    "color": "text",
+    "border-color": "border-color",
+    "box-shadow": "shadow",
+    "font-family": "font",
+    "font-size": "text-size",
+    "line-height": "leading",
+    "padding": "p",
+    "border-radius": "rounded"
+}
+_VARIABLE_VALUE = re.compile(r"var\(--([\w-]+)\)")
+_MAX_SLUG_LENGTH = 24
+
+# include_states -> (variant offset, threshold): shared output is smaller once
+# distinct types * (variants + offset) >= threshold. Fitted to the gzipped CSS
+# plus markup reported by benchmarks/bench_css_bundle over 1-18 types and
+# 1-10 variants in both frameworks; off by at most 1% next to the break-even.
+SHARED_CSS_BREAK_EVEN: Dict[bool, Tuple[int, int]] = {True: (2, 48), False: (0, 56)}
+
+
+def minify_value(value: Any) -> str:
+    """Compact a declaration value: single spaces, none around commas, no leading zero"""
+    value = re.sub(r"\s+", " ", str(value).strip())
+    value = re.sub(r" ?, ?", ",", value)
+    return re.sub(r"(?<![\w.])0\.(\d)", r".\1", value)
+
+
+def utility_name(property: str, value: str) -> str:
+    """
+    Stable class name for a declaration, e.g. ('color', 'var(--color-primary)') -> 'u-text-color-primary'
+
+    Values that do not make a short readable slug are named by a digest.
+    """
+    match = _VARIABLE_VALUE.fullmatch(value)
+    slug = match.group(1) if match else re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-")
+    if not slug or len(slug) > _MAX_SLUG_LENGTH:
+        slug = hashlib.blake2b(value.encode("utf-8"), digest_size=4).hexdigest()
+    return f"{UTILITY_PREFIX}{_PROPERTY_ABBREVIATIONS.get(property, property)}-{slug}"
+
+
+def shared_css_pays_off(type_count: int, variants_per_type: int, include_states: bool = True) -> bool:
+    """
+    Whether the shared CSS mode makes a response smaller than the scoped one
+
+    With states, e.g. 16 types of one variant, 8 of four or 4 of ten; below
+    that the utility stylesheet and the longer class lists outweigh the
+    per-component styles they replace.
+    """
+    offset, threshold = SHARED_CSS_BREAK_EVEN[include_states]
+    return type_count * (variants_per_type + offset) >= threshold
+
+
+def root_rule(variables: Sequence[Tuple[str, Any]]) -> str:
+    """Minified :root block defining the given custom properties"""
+    return ":root{" + ";".join(f"{name}:{minify_value(value)}" for name, value in variables) + "}"
+
+
+class CssCompiler:
+    """
+    Interns declarations into utility classes and assembles minified stylesheets
+
+    Utilities keep the order in which they were first interned, which is also
+    their cascade order: intern base declarations before variant ones so a
+    variant's border-color still overrides the base border shorthand.
+    Thread-safe.
+    """
+
+    def __init__(self):
+        self._classes: Dict[Declaration, str] = {}
+        self._rules: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.state_rules = "".join(
+            ",".join(f".{STATE_CLASS}{selector}" for selector in selectors)
+            + "{" + ";".join(f"{property}:{minify_value(value)}" for property, value in declarations) + "}"
+            for selectors, declarations in STATE_RULES
+        )
+        self._base_classes = self.intern_all(BASE_DECLARATIONS)
+
+    def intern(self, property: str, value: str) -> str:
+        """Return the utility class for a declaration, creating it on first use"""
+        declaration = (property, minify_value(value))
+        class_name = self._classes.get(declaration)
+        if class_name is not None:
+            return class_name
+        with self._lock:
+            class_name = self._classes.get(declaration)
+            if class_name is None:
+                class_name = utility_name(*declaration)
+                if class_name in self._rules:
+                    # Two declarations slugged alike; the digest tells them apart
+                    digest = hashlib.blake2b(f"{property}:{declaration[1]}".encode("utf-8"), digest_size=4).hexdigest()
+                    class_name = f"{class_name}-{digest}"
+                self._rules[class_name] = f".{class_name}{{{property}:{declaration[1]}}}"
+                self._classes[declaration] = class_name
+        return class_name
+
+    def intern_all(self, declarations: Iterable[Declaration]) -> List[str]:
+        """Utility classes for a sequence of declarations, in order"""
+        return [self.intern(property, value) for property, value in declarations]
+
+    def base_classes(self) -> List[str]:
+        """Utility classes of the base declarations every component carries"""
+        return list(self._base_classes)
+
+    def stylesheet(self, class_names: Iterable[str], include_states: bool = True) -> str:
+        """Minified rules of class_names (each once, in interning order), then the state rules"""
+        wanted = set(class_names)
+        with self._lock:
+            rules = "".join(rule for class_name, rule in self._rules.items() if class_name in wanted)
+        return rules + (self.state_rules if include_states else "")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"utilities": len(self._rules), "bytes": sum(len(rule) for rule in self._rules.values())}
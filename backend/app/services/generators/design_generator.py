@@ -7,14 +7,40 @@ Uses algorithmic design principles to avoid cookie-cutter appearances
 import logging
 import random
 import colorsys
-from typing import Dict, List, Any, Tuple, Optional
-from dataclasses import dataclass, asdict
+import sys
+import time
+from typing import TYPE_CHECKING, Dict, List, Any, Tuple, Optional
+from dataclasses import dataclass, asdict, field, fields, is_dataclass, replace
 from colour import Color
 import json
+import orjson
+
+from app.services.design_cache import DesignTokenCache, canonical_design_key
+
+# NumPy-backed modules are imported on first use (or by warm_up) to keep imports fast
+if TYPE_CHECKING:
+    from app.services.generators.typography_index import TypographyPairingIndex
+    from app.services.similarity_index import DesignSimilarityIndex
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Token objects are immutable and, where supported (3.10+), slotted: they are
+# shared between requests through the token cache
+_TOKEN_DATACLASS = {"frozen": True, **({"slots": True} if sys.version_info >= (3, 10) else {})}
+
+# Inputs of each DesignTokens section, in a valid build order. Inputs are the
+# config fields (style, colors_config, seed) or earlier sections.
+SECTION_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    'colors': ('style', 'colors_config', 'seed'),
+    'typography': ('style', 'seed'),
+    'spacing': ('style', 'seed'),
+    'borders': ('style', 'seed'),
+    'animations': ('style', 'seed'),
+    'shadows': ('style', 'colors'),
+    'breakpoints': ()
+}
+
+@dataclass(**_TOKEN_DATACLASS)
 class ColorPalette:
     """Represents a complete color palette for UI design"""
     primary: str
@@ -32,7 +58,7 @@ class ColorPalette:
     border: str
     shadow: str
 
-@dataclass
+@dataclass(**_TOKEN_DATACLASS)
 class TypographyScale:
     """Typography system with font families and scale"""
     font_family_primary: str
@@ -45,7 +71,7 @@ class TypographyScale:
     letter_spacing_normal: str
     letter_spacing_wide: str
     
-@dataclass
+@dataclass(**_TOKEN_DATACLASS)
 class SpacingSystem:
     """Consistent spacing system"""
     unit: int
@@ -54,7 +80,7 @@ class SpacingSystem:
     section_padding: str
     component_padding: str
     
-@dataclass
+@dataclass(**_TOKEN_DATACLASS)
 class BorderSystem:
     """Border radius and width system"""
     radius_xs: str
@@ -67,7 +93,7 @@ class BorderSystem:
     width_normal: str
     width_thick: str
     
-@dataclass
+@dataclass(**_TOKEN_DATACLASS)
 class AnimationSystem:
     """Animation and transition system"""
     duration_fast: str
@@ -79,7 +105,7 @@ class AnimationSystem:
     easing_ease_in_out: str
     easing_bounce: str
     
-@dataclass
+@dataclass(**_TOKEN_DATACLASS)
 class DesignTokens:
     """Complete design token system"""
     colors: ColorPalette
@@ -89,14 +115,63 @@ class DesignTokens:
     animations: AnimationSystem
     shadows: Dict[str, str]
     breakpoints: Dict[str, str]
+    
+    # Serialized forms, computed on first use (not part of equality or init)
+    _dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    _json: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-dict form of the token system, built once; treat it as read-only"""
+        if self._dict is None:
+            object.__setattr__(self, '_dict', {
+                section.name: _plain(getattr(self, section.name))
+                for section in fields(self) if section.init
+            })
+        return self._dict
+    
+    def to_json(self) -> bytes:
+        """Compact JSON encoding of to_dict(), built once"""
+        if self._json is None:
+            object.__setattr__(self, '_json', orjson.dumps(self.to_dict()))
+        return self._json
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DesignTokens":
+        """Rebuild a token system from its to_dict() form"""
+        return cls(
+            colors=ColorPalette(**data['colors']),
+            typography=TypographyScale(**data['typography']),
+            spacing=SpacingSystem(**data['spacing']),
+            borders=BorderSystem(**data['borders']),
+            animations=AnimationSystem(**data['animations']),
+            shadows=dict(data['shadows']),
+            breakpoints=dict(data['breakpoints'])
+        )
 
 class DesignGeneratorService:
     """
     Advanced design generation service that creates unique, cohesive design systems
     """
     
-    def __init__(self):
-        """Initialize the design generator with base configurations"""
+    def __init__(
+        self,
+        cache: Optional[DesignTokenCache] = None,
+        similarity_index: Optional["DesignSimilarityIndex"] = None,
+        max_rerolls: int = 3
+    ):
+        """
+        Initialize the design generator with base configurations
+        
+        Args:
+            cache: Optional token cache consulted before generating a design system
+            similarity_index: Optional index of earlier designs; new designs
+                too close to one of them are re-rolled
+            max_rerolls: Re-roll attempts before a near-duplicate is accepted
+        """
+        self.cache = cache
+        self.similarity_index = similarity_index
+        self.max_rerolls = max_rerolls
+        
         self.design_styles = [
             'modern', 'minimalist', 'brutalist', 'glassmorphism', 
             'neumorphism', 'retro', 'organic', 'geometric'
@@ -113,14 +188,68 @@ class DesignGeneratorService:
             ('Work Sans', 'Merriweather'), ('Space Grotesk', 'Inter'),
             ('Plus Jakarta Sans', 'Inter'), ('Outfit', 'Inter')
         ]
+        self._pairing_index: Optional["TypographyPairingIndex"] = None
+        # Typography picks among this many of the style's best ranked pairings
+        self.pairing_choices = 3
+        
+        # Hue offsets (in turns) of the secondary and accent colors per harmony
+        self.harmony_offsets = {
+            'monochromatic': (0.0, 0.0),
+            'analogous': (1 / 12, -1 / 12),
+            'complementary': (0.5, 0.5),
+            'triadic': (1 / 3, 2 / 3),
+            'split_complementary': (5 / 12, 7 / 12),
+            'tetradic': (0.25, 0.5),
+            'compound': (5 / 12, 1 / 12)
+        }
+        
+        # Per-style tuning used by the individual sub-generators
+        self.style_profiles = {
+            'modern': {'saturation': 1.0, 'scale_ratio': 1.25, 'unit': 4, 'radius': 8, 'duration': 200, 'shadow_alpha': 0.12},
+            'minimalist': {'saturation': 0.6, 'scale_ratio': 1.2, 'unit': 8, 'radius': 4, 'duration': 150, 'shadow_alpha': 0.06},
+            'brutalist': {'saturation': 1.2, 'scale_ratio': 1.5, 'unit': 8, 'radius': 0, 'duration': 100, 'shadow_alpha': 1.0},
+            'glassmorphism': {'saturation': 0.9, 'scale_ratio': 1.25, 'unit': 4, 'radius': 16, 'duration': 300, 'shadow_alpha': 0.18},
+            'neumorphism': {'saturation': 0.5, 'scale_ratio': 1.2, 'unit': 4, 'radius': 12, 'duration': 250, 'shadow_alpha': 0.15},
+            'retro': {'saturation': 1.1, 'scale_ratio': 1.333, 'unit': 4, 'radius': 2, 'duration': 200, 'shadow_alpha': 0.8},
+            'organic': {'saturation': 0.8, 'scale_ratio': 1.2, 'unit': 4, 'radius': 20, 'duration': 400, 'shadow_alpha': 0.1},
+            'geometric': {'saturation': 1.0, 'scale_ratio': 1.414, 'unit': 8, 'radius': 0, 'duration': 180, 'shadow_alpha': 0.14}
+        }
         
         logger.info("Design generator service initialized")
     
+    def warm_up(self) -> None:
+        """
+        Build every section once per style, bypassing the cache and similarity index
+        
+        Imports the lazily loaded color modules and fills their lookup tables,
+        so the first real request does not pay for them.
+        """
+        started = time.perf_counter()
+        for style in self.design_styles:
+            sections: Dict[str, Any] = {}
+            for section in SECTION_DEPENDENCIES:
+                sections[section] = self._build_section(section, style, {}, 0, sections)
+        if self.similarity_index is not None:
+            from app.services.similarity_index import design_features
+            design_features(DesignTokens(**sections))
+        logger.info(f"Design generator warmed up in {(time.perf_counter() - started) * 1000:.1f} ms")
+    
+    @property
+    def pairing_index(self) -> "TypographyPairingIndex":
+        """typography_pairings ranked per design style, built on first use"""
+        if self._pairing_index is None:
+            from app.services.generators.typography_index import TypographyPairingIndex
+            # Concurrent first uses build equal indexes; either one may be kept
+            self._pairing_index = TypographyPairingIndex(self.typography_pairings, self.design_styles)
+        return self._pairing_index
+    
     def generate_design_system(
         self, 
         base_config: Optional[Dict[str, Any]] = None,
         style_preference: Optional[str] = None,
-        color_preference: Optional[str] = None
+        color_preference: Optional[str] = None,
+        seed: Optional[int] = None,
+        timings: Optional[Dict[str, float]] = None
     ) -> DesignTokens:
         """
         Generate a complete, unique design system based on preferences
@@ -129,6 +258,10 @@ class DesignGeneratorService:
             base_config: Optional base configuration to build upon
             style_preference: Preferred design style (modern, minimalist, etc.)
             color_preference: Base color for palette generation
+            seed: Optional seed; when omitted one is derived from the inputs so
+                identical inputs always produce identical tokens
+            timings: Optional dict that receives seconds spent per stage
+                (cache, colors, typography, ..., breakpoints)
             
         Returns:
             Complete design token system
@@ -136,43 +269,402 @@ class DesignGeneratorService:
         try:
             logger.info(f"Generating design system with style: {style_preference}")
             
-            # Determine design style
-            style = style_preference or random.choice(self.design_styles)
+            colors_config = dict((base_config or {}).get('colors') or {})
+            if color_preference:
+                colors_config['primary'] = color_preference
+            cache_key = canonical_design_key(style_preference, colors_config, seed)
+            
+            mark = time.perf_counter()
             
-            # Generate color palette
-            colors = self._generate_color_palette(color_preference, style)
+            def lap(stage: str) -> None:
+                nonlocal mark
+                if timings is not None:
+                    now = time.perf_counter()
+                    timings[stage] = now - mark
+                    mark = now
             
-            # Generate typography system
-            typography = self._generate_typography_system(style)
+            if self.cache is not None:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    lap("cache")
+                    return cached
+                
+                serialized = self.cache.get_serialized(cache_key)
+                if serialized is not None:
+                    design_tokens = DesignTokens.from_dict(serialized)
+                    self.cache.set(cache_key, design_tokens)
+                    lap("cache")
+                    return design_tokens
+                lap("cache")
             
-            # Generate spacing system
-            spacing = self._generate_spacing_system(style)
+            seed_base = seed if seed is not None else int(cache_key[:16], 16)
             
-            # Generate border system
-            borders = self._generate_border_system(style)
+            # Determine design style
+            style = style_preference or _section_rng(seed_base, 'style').choice(self.design_styles)
             
-            # Generate animation system
-            animations = self._generate_animation_system(style)
+            sections: Dict[str, Any] = {}
+            for section in SECTION_DEPENDENCIES:
+                sections[section] = self._build_section(section, style, colors_config, seed_base, sections)
+                lap(section)
             
-            # Generate shadows
-            shadows = self._generate_shadow_system(style, colors)
+            design_tokens = DesignTokens(**sections)
             
-            # Generate breakpoints
-            breakpoints = self._generate_breakpoint_system()
+            if self.similarity_index is not None:
+                design_tokens = self._ensure_unique(
+                    design_tokens, cache_key, style, colors_config, seed_base, reroll=seed is None
+                )
+                lap("similarity")
             
-            design_tokens = DesignTokens(
-                colors=colors,
-                typography=typography,
-                spacing=spacing,
-                borders=borders,
-                animations=animations,
-                shadows=shadows,
-                breakpoints=breakpoints
-            )
+            if self.cache is not None:
+                self.cache.set(cache_key, design_tokens, serialized=design_tokens.to_dict())
             
             logger.info("Design system generated successfully")
             return design_tokens
             
         except Exception as e:
             logger.error(f"Error generating design system: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+    
+    def regenerate_design_system(
+        self,
+        previous_tokens: DesignTokens,
+        previous_config: Dict[str, Any],
+        changes: Dict[str, Any],
+        timings: Optional[Dict[str, float]] = None
+    ) -> Tuple[DesignTokens, Dict[str, Any], List[str]]:
+        """
+        Apply an edit to an existing design system, recomputing only what it invalidates
+        
+        Sections are rebuilt in dependency order when one of their inputs
+        changed; a rebuilt section that comes out identical does not
+        invalidate its dependents. Everything else is reused from
+        previous_tokens, so e.g. fonts stay put while the primary color moves.
+        With an explicit seed the result equals a full generation of the new
+        config.
+        
+        Args:
+            previous_tokens: Token set produced for previous_config
+            previous_config: Design config (style, colors, seed) that produced it
+            changes: Partial config; colors are merged key by key
+            timings: Optional dict that receives seconds spent per rebuilt section
+            
+        Returns:
+            New tokens, the merged config, and the names of rebuilt sections
+        """
+        config = {
+            'style': changes.get('style', previous_config.get('style')),
+            'colors': {**(previous_config.get('colors') or {}), **(changes.get('colors') or {})},
+            'seed': changes.get('seed', previous_config.get('seed'))
+        }
+        colors_config = {name: value for name, value in config['colors'].items() if value}
+        
+        changed = {
+            name for name in ('style', 'seed')
+            if config[name] != previous_config.get(name)
+        }
+        previous_colors = {name: value for name, value in (previous_config.get('colors') or {}).items() if value}
+        if colors_config != previous_colors:
+            changed.add('colors_config')
+        
+        seed_base = config['seed']
+        if seed_base is None:
+            seed_base = int(canonical_design_key(config['style'], colors_config, None)[:16], 16)
+        style = config['style'] or _section_rng(seed_base, 'style').choice(self.design_styles)
+        
+        sections = {
+            section: getattr(previous_tokens, section)
+            for section in SECTION_DEPENDENCIES
+        }
+        rebuilt = []
+        for section, inputs in SECTION_DEPENDENCIES.items():
+            if changed.isdisjoint(inputs):
+                continue
+            started = time.perf_counter()
+            value = self._build_section(section, style, colors_config, seed_base, sections)
+            rebuilt.append(section)
+            if timings is not None:
+                timings[section] = time.perf_counter() - started
+            if value != sections[section]:
+                sections[section] = value
+                changed.add(section)
+        
+        return DesignTokens(**sections), config, rebuilt
+    
+    def _ensure_unique(
+        self,
+        design_tokens: DesignTokens,
+        cache_key: str,
+        style: str,
+        colors_config: Dict[str, Any],
+        seed_base: int,
+        reroll: bool
+    ) -> DesignTokens:
+        """
+        Re-roll a design that is a near-duplicate of an indexed one, then index it
+        
+        Only designs without an explicit seed are re-rolled, since an explicit
+        seed promises reproducible output. Each attempt derives its seed from
+        the previous one, so for a given index the outcome is still
+        deterministic; style and requested colors are kept.
+        """
+        from app.services.similarity_index import design_features
+        
+        features = design_features(design_tokens)
+        for attempt in range(self.max_rerolls + 1):
+            match = self.similarity_index.nearest(features, exclude_key=cache_key)
+            if match is None:
+                break
+            if not reroll or attempt == self.max_rerolls:
+                logger.info(f"Design {cache_key[:12]} is within {match[1]:.4f} of {match[0][:12]}; keeping it")
+                break
+            
+            seed_base = _section_rng(seed_base, 'reroll').getrandbits(64)
+            sections: Dict[str, Any] = {}
+            for section in SECTION_DEPENDENCIES:
+                sections[section] = self._build_section(section, style, colors_config, seed_base, sections)
+            design_tokens = DesignTokens(**sections)
+            features = design_features(design_tokens)
+        
+        self.similarity_index.add(cache_key, features)
+        return design_tokens
+    
+    def _build_section(
+        self,
+        section: str,
+        style: str,
+        colors_config: Dict[str, Any],
+        seed_base: int,
+        sections: Dict[str, Any]
+    ) -> Any:
+        """Build one DesignTokens section from its inputs and already built sections"""
+        rng = _section_rng(seed_base, section)
+        
+        if section == 'colors':
+            colors = self._generate_color_palette(colors_config.get('primary'), style, rng)
+            colors = self._apply_color_overrides(colors, colors_config)
+            return self._ensure_contrast(colors, locked_roles=[name for name, value in colors_config.items() if value])
+        if section == 'typography':
+            return self._generate_typography_system(style, rng)
+        if section == 'spacing':
+            return self._generate_spacing_system(style, rng)
+        if section == 'borders':
+            return self._generate_border_system(style, rng)
+        if section == 'animations':
+            return self._generate_animation_system(style, rng)
+        if section == 'shadows':
+            return self._generate_shadow_system(style, sections['colors'])
+        if section == 'breakpoints':
+            return self._generate_breakpoint_system()
+        raise ValueError(f"Unknown design token section: {section}")
+    
+    def _generate_color_palette(
+        self, 
+        base_color: Optional[str], 
+        style: str, 
+        rng: random.Random
+    ) -> ColorPalette:
+        """Generate a harmonious palette around the base color"""
+        if base_color:
+            hue, saturation, lightness = Color(base_color).hsl
+        else:
+            hue = rng.random()
+            saturation = rng.uniform(0.55, 0.85)
+            lightness = rng.uniform(0.4, 0.55)
+        
+        harmony = rng.choice(self.color_harmonies)
+        return self._build_color_palette(hue, saturation, lightness, style, harmony)
+    
+    def _build_color_palette(
+        self, 
+        hue: float, 
+        saturation: float, 
+        lightness: float, 
+        style: str, 
+        harmony: str
+    ) -> ColorPalette:
+        """Derive every palette role from the base HSL color and a color harmony"""
+        profile = self.style_profiles.get(style, self.style_profiles['modern'])
+        saturation = _clamp(saturation * profile['saturation'])
+        secondary_offset, accent_offset = self.harmony_offsets[harmony]
+        
+        if harmony == 'monochromatic':
+            secondary = _hsl_to_hex(hue, saturation * 0.8, _clamp(lightness + 0.15))
+            accent = _hsl_to_hex(hue, saturation, _clamp(lightness - 0.15))
+        else:
+            secondary = _hsl_to_hex(hue + secondary_offset, saturation * 0.9, lightness)
+            accent = _hsl_to_hex(hue + accent_offset, saturation, _clamp(lightness + 0.05))
+        
+        semantic_saturation = _clamp(0.65 * profile['saturation'])
+        
+        return ColorPalette(
+            primary=_hsl_to_hex(hue, saturation, lightness),
+            secondary=secondary,
+            accent=accent,
+            neutral=_hsl_to_hex(hue, 0.08, 0.45),
+            background=_hsl_to_hex(hue, 0.2, 0.985),
+            surface=_hsl_to_hex(hue, 0.15, 0.96),
+            success=_hsl_to_hex(0.38, semantic_saturation, 0.4),
+            warning=_hsl_to_hex(0.11, semantic_saturation, 0.45),
+            error=_hsl_to_hex(0.0, semantic_saturation, 0.48),
+            info=_hsl_to_hex(0.58, semantic_saturation, 0.45),
+            text_primary=_hsl_to_hex(hue, 0.15, 0.12),
+            text_secondary=_hsl_to_hex(hue, 0.08, 0.38),
+            border=_hsl_to_hex(hue, 0.12, 0.86),
+            shadow=_hsl_to_hex(hue, 0.3, 0.1)
+        )
+    
+    def _apply_color_overrides(self, colors: ColorPalette, overrides: Dict[str, Any]) -> ColorPalette:
+        """Replace generated palette entries with explicitly requested colors"""
+        values = {
+            name: Color(value).hex_l
+            for name, value in overrides.items()
+            if value and name in ColorPalette.__dataclass_fields__
+        }
+        return replace(colors, **values) if values else colors
+    
+    def _ensure_contrast(self, colors: ColorPalette, locked_roles: List[str]) -> ColorPalette:
+        """Correct generated roles that miss WCAG 2.1 AA; explicitly requested colors are kept as given"""
+        from app.services.generators.contrast_engine import correct_palette
+        
+        corrected = correct_palette(asdict(colors), locked_roles=locked_roles)
+        return replace(colors, **corrected) if corrected else colors
+    
+    def _generate_typography_system(self, style: str, rng: random.Random) -> TypographyScale:
+        """Generate font pairing and type scale"""
+        profile = self.style_profiles.get(style, self.style_profiles['modern'])
+        ranked = self.pairing_index.ranked(style if style in self.style_profiles else 'modern', self.pairing_choices)
+        (primary_font, secondary_font), _ = rng.choice(ranked)
+        
+        return TypographyScale(
+            font_family_primary=f"'{primary_font}', system-ui, sans-serif",
+            font_family_secondary=f"'{secondary_font}', system-ui, sans-serif",
+            font_family_mono="'JetBrains Mono', ui-monospace, monospace",
+            scale_ratio=profile['scale_ratio'],
+            base_size=f"{rng.choice([15, 16, 16, 17])}px",
+            line_height_base=round(rng.uniform(1.5, 1.7), 2),
+            line_height_heading=round(rng.uniform(1.1, 1.3), 2),
+            letter_spacing_normal="0em",
+            letter_spacing_wide=f"{rng.choice([0.025, 0.05, 0.1])}em"
+        )
+    
+    def _generate_spacing_system(self, style: str, rng: random.Random) -> SpacingSystem:
+        """Generate a spacing scale built on the style's base unit"""
+        unit = self.style_profiles.get(style, self.style_profiles['modern'])['unit']
+        density = rng.choice([0.875, 1.0, 1.25])
+        
+        return SpacingSystem(
+            unit=unit,
+            scale=[unit * step for step in (0, 1, 2, 3, 4, 6, 8, 12, 16, 24, 32)],
+            container_padding=f"{round(unit * 4 * density)}px",
+            section_padding=f"{round(unit * 16 * density)}px",
+            component_padding=f"{round(unit * 3 * density)}px"
+        )
+    
+    def _generate_border_system(self, style: str, rng: random.Random) -> BorderSystem:
+        """Generate border radii and widths"""
+        base_radius = self.style_profiles.get(style, self.style_profiles['modern'])['radius']
+        radius = base_radius * rng.choice([0.75, 1.0, 1.25])
+        width = 3 if style == 'brutalist' else 1
+        
+        return BorderSystem(
+            radius_xs=f"{round(radius * 0.25)}px",
+            radius_sm=f"{round(radius * 0.5)}px",
+            radius_md=f"{round(radius)}px",
+            radius_lg=f"{round(radius * 1.5)}px",
+            radius_xl=f"{round(radius * 2)}px",
+            radius_full="9999px" if base_radius else "0px",
+            width_thin=f"{width}px",
+            width_normal=f"{width * 2}px",
+            width_thick=f"{width * 4}px"
+        )
+    
+    def _generate_animation_system(self, style: str, rng: random.Random) -> AnimationSystem:
+        """Generate transition durations and easing curves"""
+        duration = self.style_profiles.get(style, self.style_profiles['modern'])['duration']
+        duration = round(duration * rng.uniform(0.9, 1.1))
+        
+        return AnimationSystem(
+            duration_fast=f"{round(duration * 0.5)}ms",
+            duration_normal=f"{duration}ms",
+            duration_slow=f"{round(duration * 1.75)}ms",
+            easing_ease="cubic-bezier(0.25, 0.1, 0.25, 1)",
+            easing_ease_in="cubic-bezier(0.4, 0, 1, 1)",
+            easing_ease_out="cubic-bezier(0, 0, 0.2, 1)",
+            easing_ease_in_out="cubic-bezier(0.4, 0, 0.2, 1)",
+            easing_bounce="steps(4, end)" if style == 'retro' else "cubic-bezier(0.34, 1.56, 0.64, 1)"
+        )
+    
+    def _generate_shadow_system(self, style: str, colors: ColorPalette) -> Dict[str, str]:
+        """Generate elevation shadows tinted with the palette's shadow color"""
+        # Palette entries are always normalized #rrggbb, so skip a Color() parse
+        rgb = ", ".join(str(int(colors.shadow[i:i + 2], 16)) for i in (1, 3, 5))
+        return {
+            name: template.format(rgb=rgb)
+            for name, template in self._shadow_templates(style).items()
+        }
+    
+    def _shadow_templates(self, style: str) -> Dict[str, str]:
+        """Return the style's shadow definitions with an {rgb} placeholder for the shadow color"""
+        alpha = self.style_profiles.get(style, self.style_profiles['modern'])['shadow_alpha']
+        
+        def rgba(opacity: float) -> str:
+            return f"rgba({{rgb}}, {round(min(opacity, 1.0), 3)})"
+        
+        if style in ('brutalist', 'retro'):
+            return {
+                'sm': f"2px 2px 0 {rgba(alpha)}",
+                'md': f"4px 4px 0 {rgba(alpha)}",
+                'lg': f"6px 6px 0 {rgba(alpha)}",
+                'xl': f"8px 8px 0 {rgba(alpha)}",
+                'inner': f"inset 2px 2px 0 {rgba(alpha)}"
+            }
+        
+        if style == 'neumorphism':
+            return {
+                'sm': f"2px 2px 4px {rgba(alpha)}, -2px -2px 4px rgba(255, 255, 255, 0.7)",
+                'md': f"5px 5px 10px {rgba(alpha)}, -5px -5px 10px rgba(255, 255, 255, 0.7)",
+                'lg': f"10px 10px 20px {rgba(alpha)}, -10px -10px 20px rgba(255, 255, 255, 0.7)",
+                'xl': f"16px 16px 32px {rgba(alpha)}, -16px -16px 32px rgba(255, 255, 255, 0.7)",
+                'inner': f"inset 4px 4px 8px {rgba(alpha)}, inset -4px -4px 8px rgba(255, 255, 255, 0.7)"
+            }
+        
+        return {
+            'sm': f"0 1px 2px {rgba(alpha)}",
+            'md': f"0 4px 6px -1px {rgba(alpha * 1.25)}, 0 2px 4px -2px {rgba(alpha)}",
+            'lg': f"0 10px 15px -3px {rgba(alpha * 1.25)}, 0 4px 6px -4px {rgba(alpha)}",
+            'xl': f"0 20px 25px -5px {rgba(alpha * 1.5)}, 0 8px 10px -6px {rgba(alpha)}",
+            'inner': f"inset 0 2px 4px {rgba(alpha * 0.75)}"
+        }
+    
+    def _generate_breakpoint_system(self) -> Dict[str, str]:
+        """Generate responsive breakpoints"""
+        return {
+            'sm': '640px',
+            'md': '768px',
+            'lg': '1024px',
+            'xl': '1280px',
+            '2xl': '1536px'
+        }
+
+
+def _plain(value: Any) -> Any:
+    """Copy a token section into plain dicts and lists"""
+    if is_dataclass(value):
+        return asdict(value)
+    return dict(value)
+
+
+def _section_rng(seed_base: int, section: str) -> random.Random:
+    """Independent random stream per section, so rebuilding one never shifts another"""
+    return random.Random(f"{seed_base}:{section}")
+
+
+def _clamp(value: float, low: float = 0.0, high: float = 1.0) -> float:
+    """Clamp a color channel into [low, high]"""
+    return max(low, min(high, value))
+
+
+def _hsl_to_hex(hue: float, saturation: float, lightness: float) -> str:
+    """Convert HSL components (hue in turns) to a #rrggbb hex string"""
+    red, green, blue = colorsys.hls_to_rgb(hue % 1.0, _clamp(lightness), _clamp(saturation))
+    return f"#{round(red * 255):02x}{round(green * 255):02x}{round(blue * 255):02x}"
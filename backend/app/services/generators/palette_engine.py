@@ -0,0 +1,232 @@
+# backend/app/services/generators/palette_engine.py
+"""
+Vectorized batch color engine for palette and shadow generation
+Processes N base colors at once with NumPy instead of one colour.Color at a time;
+built for pre-generating many brand palettes, where per-color object churn dominates
+"""
+
+import logging
+from dataclasses import fields
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from app.services.generators.color_math import (
+    bytes_to_hex, hsl_to_rgb, parse_hex_colors, rgb_to_bytes, rgb_to_hsl
+)
+from app.services.generators.contrast_engine import ContrastEngine
+from app.services.generators.design_generator import ColorPalette, DesignGeneratorService
+
+logger = logging.getLogger(__name__)
+
+_DECIMAL_STRINGS = np.array([str(value) for value in range(256)])
+
+# (saturation multiplier, lightness delta) for the secondary and accent roles
+_HARMONY_ADJUSTMENTS = {
+    'monochromatic': ((0.8, 0.15), (1.0, -0.15)),
+}
+_DEFAULT_HARMONY_ADJUSTMENT = ((0.9, 0.0), (1.0, 0.05))
+
+# Mix factors for tint (towards white) and shade (towards black) ramp steps
+RAMP_STEPS = {
+    50: ('tint', 0.95), 100: ('tint', 0.9), 200: ('tint', 0.75), 300: ('tint', 0.6),
+    400: ('tint', 0.3), 500: ('tint', 0.0), 600: ('shade', 0.1), 700: ('shade', 0.3),
+    800: ('shade', 0.45), 900: ('shade', 0.6), 950: ('shade', 0.75)
+}
+
+
+class BatchPaletteEngine:
+    """
+    Batch counterpart of DesignGeneratorService's palette and shadow generators
+
+    Every method works column-wise over N colors and returns NumPy string arrays
+    keyed by token name, producing the same values as the scalar path. Stateless
+    after construction, so one engine can be shared between threads.
+    """
+
+    def __init__(
+        self,
+        generator: Optional[DesignGeneratorService] = None,
+        contrast: Optional[ContrastEngine] = None
+    ):
+        self.generator = generator or DesignGeneratorService()
+        self.contrast = contrast or ContrastEngine()
+        self.palette_fields = [field.name for field in fields(ColorPalette)]
+
+    def base_hsl(self, base_colors: Sequence[str]) -> np.ndarray:
+        """Return the (N, 3) HSL array for a batch of base colors"""
+        return rgb_to_hsl(parse_hex_colors(base_colors).astype(np.float64) / 255)
+
+    def hsl_to_hex(self, hue: np.ndarray, saturation: np.ndarray, lightness: np.ndarray) -> np.ndarray:
+        """Vectorized _hsl_to_hex"""
+        return bytes_to_hex(rgb_to_bytes(hsl_to_rgb(hue, saturation, lightness)))
+
+    def harmony_rotations(
+        self,
+        base_colors: Sequence[str],
+        style: str = 'modern'
+    ) -> Dict[str, Dict[str, np.ndarray]]:
+        """Compute secondary and accent colors under every color harmony for each base color"""
+        hsl = self.base_hsl(base_colors)
+        saturation = self._styled_saturation(hsl[:, 1], np.full(len(hsl), style, dtype=object))
+        return {
+            harmony: self._harmony_roles(hsl[:, 0], saturation, hsl[:, 2], harmony)
+            for harmony in self.generator.color_harmonies
+        }
+
+    def generate_palettes(
+        self,
+        base_colors: Sequence[str],
+        styles: Union[str, Sequence[str]],
+        harmonies: Union[str, Sequence[str]],
+        correct_contrast: bool = True
+    ) -> Dict[str, np.ndarray]:
+        """
+        Build full color palettes for a batch of base colors
+
+        With correct_contrast, each palette equals the colors section
+        generate_design_system builds for that base color as the requested
+        primary color: primary is the base color itself and the other roles
+        get the same WCAG correction (ContrastEngine, primary locked).
+        Without it, the raw harmony palettes of _build_color_palette.
+
+        Args:
+            base_colors: N base colors (hex strings)
+            styles: One style for the whole batch or one per color
+            harmonies: One harmony for the whole batch or one per color
+            correct_contrast: Apply the generator's requested-primary and contrast passes
+
+        Returns:
+            ColorPalette field name -> array of N hex strings
+        """
+        count = len(base_colors)
+        rgb_bytes = parse_hex_colors(base_colors)
+        hsl = rgb_to_hsl(rgb_bytes.astype(np.float64) / 255)
+        hue, lightness = hsl[:, 0], hsl[:, 2]
+        style_array = self._broadcast(styles, count)
+        harmony_array = self._broadcast(harmonies, count)
+        saturation = self._styled_saturation(hsl[:, 1], style_array)
+
+        palette = {name: np.empty(count, dtype='U7') for name in self.palette_fields}
+        for harmony in np.unique(harmony_array):
+            mask = harmony_array == harmony
+            roles = self._harmony_roles(hue[mask], saturation[mask], lightness[mask], harmony)
+            palette['secondary'][mask] = roles['secondary']
+            palette['accent'][mask] = roles['accent']
+
+        palette['primary'] = self.hsl_to_hex(hue, saturation, lightness)
+        for name, (role_saturation, role_lightness) in {
+            'neutral': (0.08, 0.45),
+            'background': (0.2, 0.985),
+            'surface': (0.15, 0.96),
+            'text_primary': (0.15, 0.12),
+            'text_secondary': (0.08, 0.38),
+            'border': (0.12, 0.86),
+            'shadow': (0.3, 0.1)
+        }.items():
+            palette[name] = self.hsl_to_hex(hue, np.full(count, role_saturation), np.full(count, role_lightness))
+
+        for style in np.unique(style_array):
+            mask = style_array == style
+            semantic = self._semantic_colors(style)
+            for name, value in semantic.items():
+                palette[name][mask] = value
+
+        if not correct_contrast:
+            return palette
+        palette['primary'] = bytes_to_hex(rgb_bytes)
+        corrected = self.contrast.correct(palette, locked_roles=('primary',)).colors
+        return {name: values.astype('U7') for name, values in corrected.items()}
+
+    def generate_shadow_systems(
+        self,
+        shadow_colors: Sequence[str],
+        styles: Union[str, Sequence[str]]
+    ) -> Dict[str, np.ndarray]:
+        """Build shadow token strings for a batch of palette shadow colors"""
+        count = len(shadow_colors)
+        rgb_bytes = parse_hex_colors(shadow_colors)
+        rgb_strings = np.char.add(
+            np.char.add(
+                np.char.add(np.char.add(_DECIMAL_STRINGS[rgb_bytes[:, 0]], ", "), _DECIMAL_STRINGS[rgb_bytes[:, 1]]),
+                ", "
+            ),
+            _DECIMAL_STRINGS[rgb_bytes[:, 2]]
+        )
+        style_array = self._broadcast(styles, count)
+
+        shadows: Dict[str, np.ndarray] = {}
+        for style in np.unique(style_array):
+            mask = style_array == style
+            for name, template in self.generator._shadow_templates(style).items():
+                pieces = template.split("{rgb}")
+                rendered = np.full(int(mask.sum()), pieces[0])
+                for piece in pieces[1:]:
+                    rendered = np.char.add(np.char.add(rendered, rgb_strings[mask]), piece)
+                if name not in shadows:
+                    shadows[name] = np.empty(count, dtype=object)
+                shadows[name][mask] = rendered
+        return {name: values.astype(str) for name, values in shadows.items()}
+
+    def tint_shade_ramps(self, base_colors: Sequence[str]) -> Dict[int, np.ndarray]:
+        """Build Tailwind-style 50-950 ramps by mixing each base color with white or black"""
+        rgb = parse_hex_colors(base_colors).astype(np.float64)
+        ramps = {}
+        for step, (direction, amount) in RAMP_STEPS.items():
+            target = 255.0 if direction == 'tint' else 0.0
+            mixed = rgb + (target - rgb) * amount
+            ramps[step] = bytes_to_hex(np.rint(mixed).astype(np.uint8))
+        return ramps
+
+    def to_palettes(self, palette_columns: Dict[str, np.ndarray]) -> List[ColorPalette]:
+        """Materialize columnar output as ColorPalette objects"""
+        columns = [palette_columns[name].tolist() for name in self.palette_fields]
+        return [ColorPalette(*row) for row in zip(*columns)]
+
+    def _styled_saturation(self, saturation: np.ndarray, style_array: np.ndarray) -> np.ndarray:
+        profiles = self.generator.style_profiles
+        factors = np.empty(len(style_array), dtype=np.float64)
+        for style in np.unique(style_array):
+            factors[style_array == style] = profiles.get(style, profiles['modern'])['saturation']
+        return np.clip(saturation * factors, 0.0, 1.0)
+
+    def _harmony_roles(
+        self,
+        hue: np.ndarray,
+        saturation: np.ndarray,
+        lightness: np.ndarray,
+        harmony: str
+    ) -> Dict[str, np.ndarray]:
+        secondary_offset, accent_offset = self.generator.harmony_offsets[harmony]
+        (secondary_sat, secondary_light), (accent_sat, accent_light) = _HARMONY_ADJUSTMENTS.get(
+            harmony, _DEFAULT_HARMONY_ADJUSTMENT
+        )
+        return {
+            'secondary': self.hsl_to_hex(
+                hue + secondary_offset,
+                saturation * secondary_sat,
+                np.clip(lightness + secondary_light, 0.0, 1.0)
+            ),
+            'accent': self.hsl_to_hex(
+                hue + accent_offset,
+                saturation * accent_sat,
+                np.clip(lightness + accent_light, 0.0, 1.0)
+            )
+        }
+
+    def _semantic_colors(self, style: str) -> Dict[str, str]:
+        profile = self.generator.style_profiles.get(style, self.generator.style_profiles['modern'])
+        semantic_saturation = min(1.0, max(0.0, 0.65 * profile['saturation']))
+        hues = {'success': (0.38, 0.4), 'warning': (0.11, 0.45), 'error': (0.0, 0.48), 'info': (0.58, 0.45)}
+        return {
+            name: str(self.hsl_to_hex(np.array([hue]), np.array([semantic_saturation]), np.array([lightness]))[0])
+            for name, (hue, lightness) in hues.items()
+        }
+
+    @staticmethod
+    def _broadcast(values: Union[str, Sequence[str]], count: int) -> np.ndarray:
+        if isinstance(values, str):
+            return np.full(count, values, dtype=object)
+        if len(values) != count:
+            raise ValueError(f"Expected {count} values, got {len(values)}")
+        return np.asarray(values, dtype=object)
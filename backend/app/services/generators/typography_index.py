@@ -0,0 +1,102 @@
+# backend/app/services/generators/typography_index.py
+"""
+Per-style ranking of font pairings
+Every pairing is scored against every style once, when the index is built;
+queries then read a precomputed ranking instead of scoring the pairings again
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+FontPairing = Tuple[str, str]
+
+# Classification traits a font carries, each 0..1
+FONT_TRAITS = ('geometric', 'grotesque', 'humanist', 'serif', 'rounded', 'character')
+FONT_PROFILES: Dict[str, Tuple[float, ...]] = {
+    'Inter': (0.0, 1.0, 0.2, 0.0, 0.0, 0.0),
+    'Poppins': (1.0, 0.0, 0.0, 0.0, 0.1, 0.3),
+    'Roboto': (0.2, 0.8, 0.1, 0.0, 0.0, 0.0),
+    'Open Sans': (0.0, 0.1, 1.0, 0.0, 0.0, 0.0),
+    'Montserrat': (0.9, 0.0, 0.0, 0.0, 0.0, 0.5),
+    'Source Sans Pro': (0.0, 0.2, 0.9, 0.0, 0.0, 0.0),
+    'Nunito': (0.3, 0.0, 0.3, 0.0, 1.0, 0.2),
+    'Lato': (0.2, 0.0, 0.8, 0.0, 0.1, 0.1),
+    'Work Sans': (0.1, 0.6, 0.0, 0.0, 0.0, 0.4),
+    'Merriweather': (0.0, 0.0, 0.0, 1.0, 0.0, 0.3),
+    'Space Grotesk': (0.3, 0.5, 0.0, 0.0, 0.0, 1.0),
+    'Plus Jakarta Sans': (0.6, 0.4, 0.0, 0.0, 0.0, 0.2),
+    'Outfit': (1.0, 0.0, 0.0, 0.0, 0.2, 0.2)
+}
+
+# How much each style wants each trait (heading font; the body font counts
+# half), and how it values contrast between the two fonts (negative: prefers
+# one family throughout)
+STYLE_TRAIT_WEIGHTS: Dict[str, Tuple[float, ...]] = {
+    'modern': (0.6, 1.0, 0.3, 0.0, 0.0, 0.2),
+    'minimalist': (0.3, 1.0, 0.4, 0.0, 0.0, -0.5),
+    'brutalist': (0.3, 0.6, 0.0, 0.3, -0.5, 1.0),
+    'glassmorphism': (1.0, 0.5, 0.0, 0.0, 0.2, 0.2),
+    'neumorphism': (0.6, 0.0, 0.3, 0.0, 1.0, 0.0),
+    'retro': (0.5, 0.0, 0.0, 1.0, 0.0, 0.8),
+    'organic': (0.0, 0.0, 1.0, 0.4, 0.7, 0.0),
+    'geometric': (1.0, 0.3, 0.0, 0.0, 0.0, 0.3)
+}
+STYLE_PAIRING_CONTRAST: Dict[str, float] = {
+    'modern': 0.2,
+    'minimalist': -0.3,
+    'brutalist': 0.5,
+    'glassmorphism': 0.1,
+    'neumorphism': 0.0,
+    'retro': 0.6,
+    'organic': 0.3,
+    'geometric': 0.1
+}
+
+BODY_WEIGHT = 0.5
+
+
+class TypographyPairingIndex:
+    """
+    Font pairings ranked for each design style
+
+    Scores are the style's trait weights applied to the heading font's
+    traits, plus half that for the body font, plus the style's contrast
+    preference times how different the two fonts are. Fonts without a
+    profile score zero on every trait. Immutable once built.
+    """
+
+    def __init__(self, pairings: Sequence[FontPairing], styles: Sequence[str]):
+        self.pairings = [tuple(pairing) for pairing in pairings]
+        unknown = np.zeros(len(FONT_TRAITS))
+        heading = np.array([FONT_PROFILES.get(first, unknown) for first, _ in self.pairings]).reshape(-1, len(FONT_TRAITS))
+        body = np.array([FONT_PROFILES.get(second, unknown) for _, second in self.pairings]).reshape(-1, len(FONT_TRAITS))
+        # Half the Euclidean trait distance: 0 for one family, about 1 for unrelated fonts
+        difference = np.linalg.norm(heading - body, axis=1) / 2
+
+        self.styles = list(styles)
+        weights = np.array([STYLE_TRAIT_WEIGHTS.get(style, unknown) for style in self.styles]).reshape(-1, len(FONT_TRAITS))
+        contrast = np.array([STYLE_PAIRING_CONTRAST.get(style, 0.0) for style in self.styles])
+        # (styles, pairings) in one product
+        scores = weights @ (heading + BODY_WEIGHT * body).T + contrast[:, None] * difference
+
+        self._ranked: Dict[str, List[Tuple[FontPairing, float]]] = {}
+        self._rank: Dict[str, Dict[FontPairing, int]] = {}
+        for row, style in enumerate(self.styles):
+            # Stable sort: ties keep the order of the pairings list
+            order = np.argsort(-scores[row], kind='stable')
+            self._ranked[style] = [(self.pairings[i], round(float(scores[row, i]), 4)) for i in order]
+            self._rank[style] = {pairing: rank for rank, (pairing, _) in enumerate(self._ranked[style])}
+
+    def ranked(self, style: str, limit: int = 0) -> List[Tuple[FontPairing, float]]:
+        """(pairing, score) from best to worst for a style; limit 0 returns all"""
+        ranking = self._ranked[style]
+        return ranking[:limit] if limit else list(ranking)
+
+    def best(self, style: str) -> FontPairing:
+        """Highest ranked pairing for a style"""
+        return self._ranked[style][0][0]
+
+    def rank(self, style: str, pairing: FontPairing) -> int:
+        """Position of a pairing in a style's ranking (0 is best)"""
+        return self._rank[style][tuple(pairing)]
@@ -0,0 +1,189 @@
+# backend/app/services/library_export.py
+"""
+Component library export
+Renders a complete Vue or React component library from a design configuration,
+one file at a time, for streaming into an archive
+"""
+
+import json
+import logging
+from typing import Any, Dict, Iterator, List, Tuple
+
+from app.services.generation_worker import generate_design_tokens, get_component_service, resolve_css_mode
+from app.services.generators.component_generator import COMPONENT_SPECS, component_name, css_variable_name, token_key
+
+logger = logging.getLogger(__name__)
+
+# Component file extension and the suffix used when importing it
+COMPONENT_FILES = {
+    "vue": (".vue", ".vue"),
+    "react": (".tsx", "")
+}
+TAILWIND_CONTENT_EXTENSIONS = {
+    "vue": "vue,js,ts",
+    "react": "js,jsx,ts,tsx"
+}
+
+
+def iter_library_files(request_data: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (archive path, content) for every file of the exported library
+
+    Args:
+        request_data: design_config, component_types, variants_per_type,
+            include_states, framework ('vue' or 'react') and optionally css_mode
+
+    Layout:
+        design-tokens.json, tailwind.config.js, src/styles/tokens.css,
+        src/types/design-tokens.d.ts, src/components/<Name>.vue (or .tsx and
+        .css), src/index.ts; when css_mode resolves to 'shared' the components
+        carry no styles and src/styles/components.css holds the utility classes
+    """
+    framework = request_data["framework"]
+    shared_styles = resolve_css_mode(request_data) == "shared"
+    # Repeated types would only overwrite each other's files
+    component_types = list(dict.fromkeys(request_data["component_types"]))
+    unknown = [component_type for component_type in component_types if component_type not in COMPONENT_SPECS]
+    if unknown:
+        # Types become file names and identifiers; only the known specs are safe
+        raise ValueError(f"Unknown component types: {', '.join(map(repr, unknown))}")
+    extension, import_suffix = COMPONENT_FILES[framework]
+    component_service = get_component_service()
+    design_tokens = generate_design_tokens(request_data)
+    tokens_hash = token_key(design_tokens)
+    tokens = design_tokens.to_dict()
+
+    variant_indexes = range(request_data["variants_per_type"])
+    component_names = [
+        component_name(component_type, variant_index)
+        for component_type in component_types
+        for variant_index in variant_indexes
+    ]
+
+    yield "design-tokens.json", json.dumps(tokens, indent=2) + "\n"
+    yield "src/styles/tokens.css", component_service.css_variables(design_tokens, tokens_hash) + "\n"
+    if shared_styles:
+        # tokens.css already defines the custom properties
+        yield "src/styles/components.css", component_service.stylesheet(
+            None, request_data["variants_per_type"], include_states=request_data.get("include_states", True)
+        ) + "\n"
+    yield "src/types/design-tokens.d.ts", component_service.render_template(
+        "export/design-tokens.d.ts.j2",
+        sections=_typescript_sections(tokens),
+        component_names=component_names
+    )
+    yield "tailwind.config.js", component_service.render_template(
+        "export/tailwind.config.js.j2",
+        extensions=TAILWIND_CONTENT_EXTENSIONS[framework],
+        extend=_indent(json.dumps(_tailwind_theme(tokens), indent=2), 4)
+    )
+    yield "src/index.ts", component_service.render_template(
+        "export/index.ts.j2",
+        component_names=component_names,
+        import_suffix=import_suffix,
+        shared_styles=shared_styles
+    )
+
+    for component_type in component_types:
+        for variant_index in variant_indexes:
+            name = component_name(component_type, variant_index)
+            rendered = component_service.render_component(
+                component_type=component_type,
+                variant_index=variant_index,
+                framework=framework,
+                design_tokens=design_tokens,
+                include_states=request_data.get("include_states", True),
+                tokens_hash=tokens_hash,
+                css_mode="shared" if shared_styles else "scoped"
+            )
+            if shared_styles:
+                yield f"src/components/{name}{extension}", rendered["template"]
+                continue
+            styles = rendered["styles"]["main"]
+            if framework == "vue":
+                yield f"src/components/{name}{extension}", f"{rendered['template']}\n<style>\n{styles}</style>\n"
+            else:
+                yield f"src/components/{name}.css", styles
+                yield f"src/components/{name}{extension}", f"import './{name}.css'\n{rendered['template']}"
+
+    logger.info(f"Exported {framework} library with {len(component_names)} components")
+
+
+def _typescript_sections(tokens: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Interface name and typed fields for each token section"""
+    return [
+        {
+            "name": section,
+            "interface": f"{section.capitalize()}Tokens",
+            "fields": [
+                {"name": name if name.isidentifier() else json.dumps(name), "type": _typescript_type(value)}
+                for name, value in values.items()
+            ]
+        }
+        for section, values in tokens.items()
+    ]
+
+
+def _typescript_type(value: Any) -> str:
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, list):
+        item_types = sorted({_typescript_type(item) for item in value}) or ["unknown"]
+        return f"{item_types[0]}[]" if len(item_types) == 1 else f"({' | '.join(item_types)})[]"
+    if isinstance(value, dict):
+        return "Record<string, unknown>"
+    return "string"
+
+
+def _tailwind_theme(tokens: Dict[str, Any]) -> Dict[str, Any]:
+    """theme.extend for tailwind.config.js, pointing at the exported CSS variables"""
+    def keyed(section: str) -> Dict[str, str]:
+        return {
+            name.replace("_", "-"): f"var({css_variable_name(f'{section}.{name}')}, {value})"
+            for name, value in tokens[section].items()
+        }
+
+    typography = tokens["typography"]
+    spacing = tokens["spacing"]
+    return {
+        "colors": keyed("colors"),
+        "fontFamily": {
+            kind: f"var(--font-family-{kind}, {typography[f'font_family_{kind}']})"
+            for kind in ("primary", "secondary", "mono")
+        },
+        "fontSize": {"base": f"var(--font-size-base, {typography['base_size']})"},
+        "spacing": {
+            name: f"var(--spacing-{name}, {spacing[f'{name}_padding']})"
+            for name in ("container", "section", "component")
+        },
+        "borderRadius": {
+            name[len("radius_"):]: f"var(--{name.replace('_', '-')}, {value})"
+            for name, value in tokens["borders"].items()
+            if name.startswith("radius_")
+        },
+        "borderWidth": {
+            name[len("width_"):]: f"var(--border-{name.replace('_', '-')}, {value})"
+            for name, value in tokens["borders"].items()
+            if name.startswith("width_")
+        },
+        "boxShadow": keyed("shadows"),
+        "transitionDuration": {
+            name[len("duration_"):]: f"var(--{name.replace('_', '-')}, {value})"
+            for name, value in tokens["animations"].items()
+            if name.startswith("duration_")
+        },
+        "transitionTimingFunction": {
+            name[len("easing_"):].replace("_", "-"): f"var(--{name.replace('_', '-')}, {value})"
+            for name, value in tokens["animations"].items()
+            if name.startswith("easing_")
+        },
+        # Media queries cannot use custom properties
+        "screens": dict(tokens["breakpoints"])
+    }
+
+
+def _indent(text: str, spaces: int) -> str:
+    """Indent every line after the first (the first follows a key on the template line)"""
+    return text.replace("\n", "\n" + " " * spaces)
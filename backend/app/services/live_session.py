@@ -0,0 +1,158 @@
+# backend/app/services/live_session.py
+"""
+Server-side state of a live customization session
+
+A session keeps the generation request, its design tokens and the rendered
+components between edits. Each edit is applied incrementally (only the token
+sections it invalidates are rebuilt, and components are re-rendered only when
+their inputs changed) and answered with a JSON Patch against the previous
+state instead of the whole generation response.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from app.services.generation_worker import (
+    build_component, generate_design_tokens, get_design_service, iter_component_slots, resolve_css_mode,
+    shared_stylesheet
+)
+from app.services.generators.component_generator import token_key
+from app.services.generators.design_generator import DesignTokens
+from app.utils import json_patch
+
+# Edit fields that go through incremental token regeneration
+DESIGN_CONFIG_FIELDS = ("style", "colors", "seed")
+# Edit fields that only change which components are rendered, and how
+REQUEST_FIELDS = ("component_types", "variants_per_type", "include_states", "framework", "css_mode")
+# Changing one of these (or the mode css_mode 'auto' resolves to) re-renders every component
+RENDER_FIELDS = ("include_states", "framework", "css_mode")
+
+
+def merge_changes(earlier: Dict[str, Any], later: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Combine two consecutive edits into one with the same effect
+
+    Later values win; colors are merged role by role (None clears a role).
+    """
+    merged = {**earlier, **later}
+    if "colors" in earlier and "colors" in later:
+        merged["colors"] = {**(earlier["colors"] or {}), **(later["colors"] or {})}
+    return merged
+
+
+@dataclass(frozen=True)
+class LiveUpdate:
+    """Result of applying an edit: the state version and the patch leading to it"""
+    version: int
+    operations: List[Dict[str, Any]]
+    recomputed: List[str]
+    rendered: int
+    timings: Dict[str, float]
+
+
+class LiveSession:
+    """
+    One client's generation state; not thread-safe, apply edits one at a time
+
+    The state a client mirrors is snapshot(): the request, the design tokens,
+    the component IDs in display order and the components by ID (plus the
+    stylesheet when the request uses the shared CSS mode). Patch paths refer
+    to that document.
+    """
+
+    def __init__(self, request_data: Dict[str, Any]):
+        self.request_data = request_data
+        self.version = 0
+        self.design_tokens: Optional[DesignTokens] = None
+        self.components: Dict[str, Dict[str, Any]] = {}
+
+    def start(self) -> Dict[str, Any]:
+        """Generate the initial tokens and components and return the snapshot"""
+        self.design_tokens = generate_design_tokens(self.request_data)
+        self.components = self._render(self.request_data, self.design_tokens, {})
+        self.version = 1
+        return self.snapshot()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """The full session state, as mirrored by the client"""
+        state = {
+            "version": self.version,
+            "request": self.request_data,
+            "design_tokens": self.design_tokens.to_dict(),
+            "component_ids": list(self.components),
+            "components": self.components
+        }
+        stylesheet = shared_stylesheet(self.request_data, self.design_tokens)
+        if stylesheet is not None:
+            state["stylesheet"] = stylesheet
+        return state
+
+    def apply(self, changes: Dict[str, Any]) -> LiveUpdate:
+        """
+        Apply an edit (fields of ComponentGenerationRequest, design config ones
+        at the top level) and return the patch from the previous state
+        """
+        timings: Dict[str, float] = {}
+        started = time.perf_counter()
+        request_data = dict(self.request_data)
+        design_tokens = self.design_tokens
+        recomputed: List[str] = []
+
+        config_changes = {name: changes[name] for name in DESIGN_CONFIG_FIELDS if name in changes}
+        if config_changes:
+            design_tokens, design_config, recomputed = get_design_service().regenerate_design_system(
+                self.design_tokens, request_data["design_config"], config_changes, timings=timings
+            )
+            request_data["design_config"] = design_config
+        request_data.update((name, changes[name]) for name in REQUEST_FIELDS if name in changes)
+
+        # Unchanged tokens and render options leave existing components valid
+        reusable = {} if (
+            design_tokens != self.design_tokens
+            or any(request_data.get(name) != self.request_data.get(name) for name in RENDER_FIELDS)
+            or resolve_css_mode(request_data) != resolve_css_mode(self.request_data)
+        ) else self.components
+        components_started = time.perf_counter()
+        components = self._render(request_data, design_tokens, reusable)
+        timings["components"] = time.perf_counter() - components_started
+
+        previous = self.snapshot()
+        self.request_data = request_data
+        self.design_tokens = design_tokens
+        self.components = components
+        current = self.snapshot()
+        del previous["version"], current["version"]
+
+        operations = json_patch.diff(previous, current)
+        if operations:
+            self.version += 1
+        timings["total"] = time.perf_counter() - started
+        return LiveUpdate(
+            version=self.version,
+            operations=operations,
+            recomputed=recomputed,
+            rendered=sum(1 for component_id in components if component_id not in reusable),
+            timings=timings
+        )
+
+    def _render(
+        self,
+        request_data: Dict[str, Any],
+        design_tokens: DesignTokens,
+        reusable: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        tokens_hash = token_key(design_tokens)
+        components = {}
+        for component_id, type_index, component_type, variant_index in iter_component_slots(request_data):
+            component = reusable.get(component_id)
+            if component is None:
+                component = build_component(
+                    request_data, design_tokens, component_type, type_index, variant_index, tokens_hash
+                )
+                previous = self.components.get(component_id)
+                if previous is not None:
+                    # Keep the creation time so unchanged output produces no patch
+                    component["created_at"] = previous["created_at"]
+            components[component_id] = component
+        return components
@@ -0,0 +1,427 @@
+# backend/app/services/similarity_index.py
+"""
+Nearest-neighbour index over generated design systems
+Each DesignTokens becomes a feature vector; near-duplicates of earlier designs
+are found with k-d tree lookups instead of pairwise comparison
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.generators.color_math import parse_hex_colors, rgb_bytes_to_lab
+
+logger = logging.getLogger(__name__)
+
+# Bump when design_features changes; saved indexes with another version are discarded
+FEATURE_VERSION = 1
+
+# Palette roles that dominate how a design looks; the rest derive from them
+SIMILARITY_COLOR_ROLES = ('primary', 'secondary', 'accent', 'background', 'surface', 'text_primary')
+
+# Non-color features as (section, field, span); a difference of one span is as
+# large as a design's features get apart
+LAYOUT_FEATURES = (
+    ('typography', 'scale_ratio', 0.3),
+    ('typography', 'base_size', 2.0),
+    ('spacing', 'unit', 4.0),
+    ('borders', 'radius_md', 25.0),
+    ('animations', 'duration_normal', 300.0),
+)
+
+FEATURE_SIZE = 3 * len(SIMILARITY_COLOR_ROLES) + len(LAYOUT_FEATURES)
+
+# Color coordinates are scaled so the color block's distance is the RMS Delta E
+# over the roles divided by 100; layout features likewise give the RMS of their
+# span-normalized differences
+_COLOR_SCALE = 1.0 / (100.0 * np.sqrt(len(SIMILARITY_COLOR_ROLES)))
+_LAYOUT_SCALE = np.array([1.0 / span for _, _, span in LAYOUT_FEATURES]) / np.sqrt(len(LAYOUT_FEATURES))
+
+# Points per k-d tree leaf, leaves per bounding group, and inserts buffered
+# before they are built into a tree
+LEAF_SIZE = 64
+GROUP_SIZE = 16
+PENDING_LIMIT = 512
+
+
+def design_features(design_tokens: Any) -> np.ndarray:
+    """
+    Feature vector of a design token system
+
+    CIE Lab coordinates of the main palette roles followed by type scale
+    ratio, base font size, spacing unit, medium radius and normal duration.
+    Euclidean distance between two vectors is roughly the fraction by which
+    the designs differ: 0.05 is an RMS Delta E of 5 with identical layout.
+    """
+    colors = design_tokens.colors
+    lab = rgb_bytes_to_lab(parse_hex_colors([getattr(colors, role) for role in SIMILARITY_COLOR_ROLES]))
+    layout = np.array([
+        _numeric(getattr(getattr(design_tokens, section), name))
+        for section, name, _ in LAYOUT_FEATURES
+    ])
+    return np.concatenate([lab.ravel() * _COLOR_SCALE, layout * _LAYOUT_SCALE])
+
+
+def _numeric(value: Any) -> float:
+    """Number from a token value such as 1.25, 8, '16px' or '200ms'"""
+    if isinstance(value, str):
+        value = value.strip().rstrip('pxmsre%')
+    return float(value)
+
+
+class KDTree:
+    """
+    Static k-d tree over rows of a point array
+
+    Nodes split at the median of their widest dimension down to leaves of at
+    most leaf_size points. Lookups do not walk the tree node by node: leaves
+    keep their bounding boxes, runs of GROUP_SIZE consecutive leaves (which
+    are spatially close) get a box of their own, and a query prunes groups,
+    then leaves, then scans the surviving points, each step one vectorized
+    pass. Leaves are padded to leaf_size with points at infinity.
+    """
+
+    def __init__(self, points: np.ndarray, ids: np.ndarray, leaf_size: int = LEAF_SIZE):
+        order = np.arange(len(points))
+        ranges: List[Tuple[int, int]] = []
+        self._split(points, order, 0, len(points), leaf_size, ranges)
+        self.size = len(points)
+
+        sorted_points = points[order]
+        sorted_ids = ids[order]
+        self.leaf_points = np.full((len(ranges), leaf_size, points.shape[1]), np.inf)
+        self.leaf_ids = np.full((len(ranges), leaf_size), -1, dtype=np.intp)
+        self.leaf_low = np.empty((len(ranges), points.shape[1]))
+        self.leaf_high = np.empty((len(ranges), points.shape[1]))
+        for leaf, (start, end) in enumerate(ranges):
+            self.leaf_points[leaf, :end - start] = sorted_points[start:end]
+            self.leaf_ids[leaf, :end - start] = sorted_ids[start:end]
+            self.leaf_low[leaf] = sorted_points[start:end].min(axis=0)
+            self.leaf_high[leaf] = sorted_points[start:end].max(axis=0)
+
+        self.group_first = np.arange(0, len(ranges), GROUP_SIZE)
+        self.group_end = np.minimum(self.group_first + GROUP_SIZE, len(ranges))
+        self.group_low = np.minimum.reduceat(self.leaf_low, self.group_first) if len(ranges) else self.leaf_low
+        self.group_high = np.maximum.reduceat(self.leaf_high, self.group_first) if len(ranges) else self.leaf_high
+
+    def __len__(self) -> int:
+        return self.size
+
+    @staticmethod
+    def _split(
+        points: np.ndarray,
+        order: np.ndarray,
+        start: int,
+        end: int,
+        leaf_size: int,
+        ranges: List[Tuple[int, int]]
+    ) -> None:
+        if end - start <= leaf_size:
+            if end > start:
+                ranges.append((start, end))
+            return
+
+        subset = points[order[start:end]]
+        dim = int(np.argmax(subset.max(axis=0) - subset.min(axis=0)))
+        middle = (end - start) // 2
+        order[start:end] = order[start:end][np.argpartition(subset[:, dim], middle)]
+        KDTree._split(points, order, start, start + middle, leaf_size, ranges)
+        KDTree._split(points, order, start + middle, end, leaf_size, ranges)
+
+    def nearest(
+        self,
+        point: np.ndarray,
+        max_distance: float,
+        live: Optional[np.ndarray] = None,
+        exclude: int = -1
+    ) -> Tuple[int, float]:
+        """Closest id within max_distance, or (-1, inf); ids where live is False and the id exclude are skipped"""
+        return _nearest_in_leaves(
+            point, max_distance, self.group_low, self.group_high, self.group_first, self.group_end,
+            self.leaf_low, self.leaf_high, self.leaf_points, self.leaf_ids, live, exclude
+        )
+
+
+def _box_distance(point: np.ndarray, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+    """Squared distance from point to each (low, high) box"""
+    outside = np.maximum(low - point, 0) + np.maximum(point - high, 0)
+    return np.einsum('ij,ij->i', outside, outside)
+
+
+def _nearest_in_leaves(
+    point: np.ndarray,
+    max_distance: float,
+    group_low: np.ndarray,
+    group_high: np.ndarray,
+    group_first: np.ndarray,
+    group_end: np.ndarray,
+    leaf_low: np.ndarray,
+    leaf_high: np.ndarray,
+    leaf_points: np.ndarray,
+    leaf_ids: np.ndarray,
+    live: Optional[np.ndarray],
+    exclude: int
+) -> Tuple[int, float]:
+    """Group, leaf and point passes shared by KDTree and the index's combined leaves"""
+    limit = max_distance * max_distance
+    groups = np.flatnonzero(_box_distance(point, group_low, group_high) <= limit)
+    if not len(groups):
+        return -1, float('inf')
+
+    leaves = group_first[groups, None] + np.arange(GROUP_SIZE)
+    leaves = leaves[leaves < group_end[groups, None]]
+    leaves = leaves[_box_distance(point, leaf_low[leaves], leaf_high[leaves]) <= limit]
+    if not len(leaves):
+        return -1, float('inf')
+
+    differences = leaf_points[leaves] - point
+    squared = np.einsum('ijk,ijk->ij', differences, differences)
+    ids = leaf_ids[leaves]
+    if live is not None:
+        squared[~live[ids] & (ids >= 0)] = np.inf
+    if exclude >= 0:
+        squared[ids == exclude] = np.inf
+    position = np.unravel_index(np.argmin(squared), squared.shape)
+    if squared[position] > limit:
+        return -1, float('inf')
+    return int(ids[position]), float(np.sqrt(squared[position]))
+
+
+class DesignSimilarityIndex:
+    """
+    Incremental nearest-neighbour index of design feature vectors, keyed by design cache key
+
+    New vectors are buffered and scanned linearly until PENDING_LIMIT of them
+    accumulate, then built into a k-d tree. Trees are merged like a binary
+    counter (a new tree absorbs every existing tree no larger than itself), so
+    there are O(log n) trees and each vector is rebuilt O(log n) times. The
+    trees' leaves live in one array, smallest trees last, so a merge only
+    rewrites the tail and a lookup searches every tree in one pass.
+    A key added again replaces its vector. When path is set the index is
+    loaded from and saved to that .npz file. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.05,
+        path: Optional[str] = None,
+        autosave_every: int = 0,
+        leaf_size: int = LEAF_SIZE,
+        pending_limit: int = PENDING_LIMIT
+    ):
+        if threshold < 0:
+            raise ValueError("threshold must not be negative")
+
+        self.threshold = threshold
+        self.path = path
+        self.autosave_every = autosave_every
+        self.leaf_size = leaf_size
+        self.pending_limit = pending_limit
+        self._lock = threading.Lock()
+        self._points = np.empty((1024, FEATURE_SIZE))
+        self._keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._live = np.zeros(1024, dtype=bool)
+        self._pending: List[int] = []
+        self._replaced = 0
+        self._unsaved = 0
+        self.lookups = 0
+        self.duplicates = 0
+
+        # Combined leaves of all trees; _trees holds (first leaf, KDTree without its leaf arrays)
+        self._trees: List[Tuple[int, KDTree]] = []
+        self._leaf_count = 0
+        self._leaf_points = np.empty((0, leaf_size, FEATURE_SIZE))
+        self._leaf_ids = np.empty((0, leaf_size), dtype=np.intp)
+        self._leaf_low = np.empty((0, FEATURE_SIZE))
+        self._leaf_high = np.empty((0, FEATURE_SIZE))
+        self._groups: Tuple[np.ndarray, ...] = ()
+
+        if path:
+            self.load()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._rows)
+
+    def nearest(self, features: np.ndarray, exclude_key: Optional[str] = None) -> Optional[Tuple[str, float]]:
+        """Key and distance of the nearest indexed design within threshold, ignoring exclude_key"""
+        with self._lock:
+            self.lookups += 1
+            exclude = self._rows.get(exclude_key, -1) if exclude_key is not None else -1
+            best_row, best_distance = -1, float('inf')
+            if self._trees:
+                # Only masked when some vector has been replaced
+                best_row, best_distance = _nearest_in_leaves(
+                    features, self.threshold, *self._groups,
+                    self._leaf_low, self._leaf_high, self._leaf_points, self._leaf_ids,
+                    self._live if self._replaced else None, exclude
+                )
+
+            pending = [row for row in self._pending if row != exclude]
+            if pending:
+                offsets = self._points[pending] - features
+                squared = np.einsum('ij,ij->i', offsets, offsets)
+                position = int(np.argmin(squared))
+                distance = float(np.sqrt(squared[position]))
+                if distance <= self.threshold and distance < best_distance:
+                    best_row, best_distance = pending[position], distance
+
+            if best_row < 0:
+                return None
+            self.duplicates += 1
+            return self._keys[best_row], best_distance
+
+    def add(self, key: str, features: np.ndarray) -> None:
+        """Index a design's feature vector under key"""
+        with self._lock:
+            previous = self._rows.get(key)
+            if previous is not None:
+                if np.array_equal(self._points[previous], features):
+                    return
+                # Replaced vectors stay in their tree but are never returned
+                self._live[previous] = False
+                self._replaced += 1
+                if previous in self._pending:
+                    self._pending.remove(previous)
+
+            self._append([key], features[None, :])
+            self._unsaved += 1
+            autosave = self.autosave_every and self._unsaved >= self.autosave_every
+
+        if autosave:
+            self.save()
+
+    def save(self) -> None:
+        """
+        Write the index to path atomically (no-op without a path)
+
+        Vectors saved by other processes since this one last read the file are
+        merged in first, so workers sharing a path converge on one index.
+        """
+        if not self.path:
+            return
+        saved = self._read()
+        with self._lock:
+            if saved is not None:
+                self._merge(*saved)
+            rows = sorted(self._rows.values())
+            keys = np.array([self._keys[row] for row in rows], dtype=str)
+            points = self._points[rows].copy()
+            self._unsaved = 0
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp.npz"
+        try:
+            np.savez(temp_path, version=FEATURE_VERSION, keys=keys, points=points)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to save design similarity index {self.path}: {str(e)}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def load(self) -> None:
+        """Add the vectors saved at path that are not indexed yet"""
+        saved = self._read()
+        if saved is None:
+            return
+        with self._lock:
+            added = self._merge(*saved)
+        logger.info(f"Loaded {added} designs into the similarity index from {self.path}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return index counters for health and metrics reporting"""
+        with self._lock:
+            return {
+                "size": len(self._rows),
+                "threshold": self.threshold,
+                "trees": len(self._trees),
+                "pending": len(self._pending),
+                "lookups": self.lookups,
+                "duplicates": self.duplicates,
+                "persistent": self.path is not None
+            }
+
+    def _read(self) -> Optional[Tuple[List[str], np.ndarray]]:
+        """Keys and vectors saved at path, or None if there is no usable file"""
+        try:
+            with np.load(self.path) as data:
+                if int(data['version']) != FEATURE_VERSION or data['points'].shape[1:] != (FEATURE_SIZE,):
+                    logger.warning(f"Ignoring design similarity index {self.path} built with other features")
+                    return None
+                return data['keys'].tolist(), data['points']
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Discarding unreadable design similarity index {self.path}: {str(e)}")
+            return None
+
+    def _merge(self, keys: List[str], points: np.ndarray) -> int:
+        """Append saved vectors whose keys are not indexed; returns how many were added"""
+        new = [position for position, key in enumerate(keys) if key not in self._rows]
+        if new:
+            self._append([keys[position] for position in new], points[new])
+        return len(new)
+
+    def _append(self, keys: List[str], points: np.ndarray) -> None:
+        start = len(self._keys)
+        end = start + len(keys)
+        if end > len(self._points):
+            capacity = 1 << (end - 1).bit_length()
+            self._points = np.concatenate([self._points, np.empty((capacity - len(self._points), FEATURE_SIZE))])
+            self._live = np.concatenate([self._live, np.zeros(capacity - len(self._live), dtype=bool)])
+        self._points[start:end] = points
+        self._live[start:end] = True
+        self._keys.extend(keys)
+        self._rows.update((key, row) for row, key in enumerate(keys, start))
+        self._pending.extend(range(start, end))
+        if len(self._pending) >= self.pending_limit:
+            self._flush_pending()
+
+    def _flush_pending(self) -> None:
+        rows = np.array(self._pending)
+        self._pending = []
+        while self._trees and len(self._trees[-1][1]) <= len(rows):
+            first, tree = self._trees.pop()
+            merged = self._leaf_ids[first:self._leaf_count].ravel()
+            rows = np.concatenate([merged[merged >= 0], rows])
+            self._leaf_count = first
+        rows = rows[self._live[rows]]
+        if len(rows):
+            self._store(self._build(rows))
+        if self._trees:
+            self._groups = (
+                np.concatenate([tree.group_low for _, tree in self._trees]),
+                np.concatenate([tree.group_high for _, tree in self._trees]),
+                np.concatenate([first + tree.group_first for first, tree in self._trees]),
+                np.concatenate([first + tree.group_end for first, tree in self._trees])
+            )
+
+    def _store(self, tree: KDTree) -> None:
+        """Move a tree's leaves to the end of the combined leaves"""
+        first = self._leaf_count
+        end = first + len(tree.leaf_ids)
+        if end > len(self._leaf_ids):
+            capacity = max(64, 1 << (end - 1).bit_length())
+            grow = capacity - len(self._leaf_ids)
+            self._leaf_points = np.concatenate([self._leaf_points, np.full((grow, self.leaf_size, FEATURE_SIZE), np.inf)])
+            self._leaf_ids = np.concatenate([self._leaf_ids, np.full((grow, self.leaf_size), -1, dtype=np.intp)])
+            self._leaf_low = np.concatenate([self._leaf_low, np.empty((grow, FEATURE_SIZE))])
+            self._leaf_high = np.concatenate([self._leaf_high, np.empty((grow, FEATURE_SIZE))])
+        self._leaf_points[first:end] = tree.leaf_points
+        self._leaf_ids[first:end] = tree.leaf_ids
+        self._leaf_low[first:end] = tree.leaf_low
+        self._leaf_high[first:end] = tree.leaf_high
+        self._leaf_count = end
+        tree.leaf_points = tree.leaf_ids = tree.leaf_low = tree.leaf_high = None
+        self._trees.append((first, tree))
+
+    def _build(self, rows: np.ndarray) -> KDTree:
+        return KDTree(self._points[rows], rows, self.leaf_size)
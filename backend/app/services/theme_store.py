@@ -0,0 +1,415 @@
+# backend/app/services/theme_store.py
+"""
+Persistent store for saved themes on embedded SQLite (WAL mode)
+
+Token sets are stored once, keyed by their content hash, and referenced by
+any number of saved themes. Listing and search use keyset pagination over
+covering indexes, so a page costs the same at the millionth row as at the
+first.
+"""
+
+import asyncio
+import base64
+import colorsys
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+import orjson
+
+from app.services.generators.component_generator import token_key
+from app.services.generators.design_generator import DesignTokens
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SCHEMA_VERSION = 1
+
+# Hue is bucketed so "themes around this hue" is an index equality lookup;
+# near-grey primaries (low saturation) have no meaningful hue and share NEUTRAL_HUE_BUCKET
+HUE_BUCKET_DEGREES = 15
+NEUTRAL_HUE_BUCKET = -1
+NEUTRAL_SATURATION = 0.08
+
+# Every theme index ends in the rowid (id), so (column..., created_at, id)
+# orderings and keyset comparisons are served from the index alone
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS token_sets (
+    hash TEXT PRIMARY KEY,
+    tokens BLOB NOT NULL,
+    created_at INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS themes (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    style TEXT NOT NULL,
+    primary_color TEXT NOT NULL,
+    hue_bucket INTEGER NOT NULL,
+    token_hash TEXT NOT NULL REFERENCES token_sets (hash),
+    design_config BLOB NOT NULL,
+    created_at INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS themes_created ON themes (created_at);
+CREATE INDEX IF NOT EXISTS themes_style_created ON themes (style, created_at);
+CREATE INDEX IF NOT EXISTS themes_hue_created ON themes (hue_bucket, created_at);
+CREATE INDEX IF NOT EXISTS themes_style_hue_created ON themes (style, hue_bucket, created_at);
+CREATE INDEX IF NOT EXISTS themes_name ON themes (name_key);
+CREATE INDEX IF NOT EXISTS themes_token_hash ON themes (token_hash);
+"""
+
+SUMMARY_COLUMNS = "id, name, style, primary_color, hue_bucket, token_hash, created_at"
+
+
+def hue_to_bucket(hue: float) -> int:
+    """Bucket of a hue in degrees"""
+    return int(hue) % 360 // HUE_BUCKET_DEGREES
+
+
+def hue_bucket(color: str) -> int:
+    """Bucket of a hex color's hue (HUE_BUCKET_DEGREES wide), or NEUTRAL_HUE_BUCKET for greys"""
+    value = color.strip().lstrip("#")
+    if len(value) == 3:
+        value = "".join(channel * 2 for channel in value)
+    red, green, blue = (int(value[index:index + 2], 16) / 255 for index in (0, 2, 4))
+    hue, _, saturation = colorsys.rgb_to_hls(red, green, blue)
+    if saturation < NEUTRAL_SATURATION:
+        return NEUTRAL_HUE_BUCKET
+    return hue_to_bucket(hue * 360)
+
+
+@dataclass(frozen=True)
+class ThemeRecord:
+    """A theme ready to be written: encoded, hashed and bucketed outside the writer"""
+    name: str
+    style: str
+    primary_color: str
+    hue_bucket: int
+    token_hash: str
+    tokens: bytes
+    design_config: bytes
+
+    @classmethod
+    def create(cls, name: str, design_config: Dict[str, Any], design_tokens: DesignTokens) -> "ThemeRecord":
+        primary_color = design_tokens.colors.primary
+        return cls(
+            name=name,
+            style=design_config.get("style") or "modern",
+            primary_color=primary_color,
+            hue_bucket=hue_bucket(primary_color),
+            token_hash=token_key(design_tokens),
+            tokens=design_tokens.to_json(),
+            design_config=orjson.dumps(design_config)
+        )
+
+
+@dataclass(frozen=True)
+class StoredTheme:
+    """A saved theme with its token set as stored (JSON bytes, ready to splice into a response)"""
+    summary: Dict[str, Any]
+    design_config: bytes
+    tokens: bytes
+
+
+@dataclass(frozen=True)
+class ThemePage:
+    """One page of theme summaries; next_cursor is None on the last page"""
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque keyset cursor for the last row of a page"""
+    return base64.urlsafe_b64encode(orjson.dumps(values)).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> Tuple[Any, ...]:
+    """
+    Parse a cursor from encode_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued by another listing
+    """
+    try:
+        values = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, orjson.JSONDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list) or len(values) != len(types) or not all(
+        type(value) is expected for value, expected in zip(values, types)
+    ):
+        raise ValueError("Invalid cursor")
+    return tuple(values)
+
+
+class ThemeStore:
+    """
+    SQLite theme store with an async connection pool
+
+    One writer connection (SQLite allows one writer at a time; WAL lets
+    readers proceed alongside it) and a pool of read-only connections. Every
+    query runs on a worker thread so the event loop never blocks on disk.
+    The database is opened lazily on first use. Several processes may share
+    one file; concurrent writers wait up to busy_timeout_ms for the lock.
+    """
+
+    def __init__(self, path: str, readers: int = 4, busy_timeout_ms: int = 5000):
+        if readers < 1:
+            raise ValueError("readers must be at least 1")
+
+        self.path = path
+        self.readers = readers
+        self.busy_timeout_ms = busy_timeout_ms
+        self._writer: Optional[sqlite3.Connection] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._reader_pool: Optional[asyncio.Queue] = None
+        self._connections: List[sqlite3.Connection] = []
+        self._open_lock = threading.Lock()
+
+    async def open(self) -> None:
+        """Create the schema and connections (idempotent)"""
+        if self._reader_pool is None:
+            await asyncio.to_thread(self._open)
+
+    async def close(self) -> None:
+        """Close every connection; the store reopens on next use"""
+        with self._open_lock:
+            connections, self._connections = self._connections, []
+            self._writer = self._reader_pool = self._write_lock = None
+        for connection in connections:
+            connection.close()
+
+    async def save(self, record: ThemeRecord) -> Tuple[Dict[str, Any], bool]:
+        """
+        Save a theme, storing its token set only if that content is new
+
+        Returns:
+            The theme summary and whether the token set was already stored
+        """
+        (summary, deduplicated), = await self.save_many([record])
+        return summary, deduplicated
+
+    async def save_many(self, records: Sequence[ThemeRecord]) -> List[Tuple[Dict[str, Any], bool]]:
+        """Save several themes in one transaction (see save)"""
+        return await self._write(_insert_themes, records, int(time.time() * 1000))
+
+    async def get(self, theme_id: int) -> Optional[StoredTheme]:
+        """Return a saved theme with its tokens, or None"""
+        return await self._read(_select_theme, theme_id)
+
+    async def get_tokens(self, token_hash: str) -> Optional[bytes]:
+        """Return a stored token set (JSON bytes) by its hash, or None"""
+        return await self._read(_select_tokens, token_hash)
+
+    async def list(
+        self,
+        style: Optional[str] = None,
+        hue_bucket: Optional[int] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> ThemePage:
+        """
+        Newest themes first, optionally filtered by style and hue bucket
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        after = decode_cursor(cursor, (int, int)) if cursor else None
+        return await self._read(_select_page, style, hue_bucket, limit, after)
+
+    async def search(
+        self,
+        query: str,
+        style: Optional[str] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> ThemePage:
+        """
+        Themes whose name starts with query (case-insensitive), in name order
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        after = decode_cursor(cursor, (str, int)) if cursor else None
+        return await self._read(_select_name_page, query.strip().lower(), style, limit, after)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "open": self._reader_pool is not None,
+            "readers": self.readers,
+            "idle_readers": self._reader_pool.qsize() if self._reader_pool is not None else 0
+        }
+
+    async def _read(self, func: Callable[..., T], *args: Any) -> T:
+        await self.open()
+        pool = self._reader_pool
+        connection = await pool.get()
+        try:
+            return await asyncio.to_thread(func, connection, *args)
+        finally:
+            pool.put_nowait(connection)
+
+    async def _write(self, func: Callable[..., T], *args: Any) -> T:
+        await self.open()
+        async with self._write_lock:
+            return await asyncio.to_thread(func, self._writer, *args)
+
+    def _open(self) -> None:
+        with self._open_lock:
+            if self._reader_pool is not None:
+                return
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            writer = self._connect()
+            writer.execute("PRAGMA journal_mode = WAL")
+            if writer.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                with writer:
+                    writer.executescript(SCHEMA)
+                    writer.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+            readers = [self._connect(read_only=True) for _ in range(self.readers)]
+            pool: asyncio.Queue = asyncio.Queue()
+            for reader in readers:
+                pool.put_nowait(reader)
+
+            self._connections = [writer, *readers]
+            self._writer = writer
+            self._write_lock = asyncio.Lock()
+            self._reader_pool = pool
+            logger.info(f"Theme store opened at {self.path} with {self.readers} readers")
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        # Connections move between worker threads but are only ever used by one at a time
+        connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        connection.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        connection.execute("PRAGMA foreign_keys = ON")
+        connection.execute("PRAGMA cache_size = -16384")
+        connection.execute("PRAGMA mmap_size = 268435456")
+        connection.execute("PRAGMA temp_store = MEMORY")
+        if read_only:
+            connection.execute("PRAGMA query_only = ON")
+        return connection
+
+
+def _summary(row: Sequence[Any]) -> Dict[str, Any]:
+    return {
+        "id": row[0],
+        "name": row[1],
+        "style": row[2],
+        "primary_color": row[3],
+        "hue_bucket": row[4],
+        "token_hash": row[5],
+        "created_at": row[6]
+    }
+
+
+def _insert_themes(
+    connection: sqlite3.Connection,
+    records: Sequence[ThemeRecord],
+    created_at: int
+) -> List[Tuple[Dict[str, Any], bool]]:
+    results = []
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        for record in records:
+            deduplicated = connection.execute(
+                "INSERT OR IGNORE INTO token_sets (hash, tokens, created_at) VALUES (?, ?, ?)",
+                (record.token_hash, record.tokens, created_at)
+            ).rowcount == 0
+            theme_id = connection.execute(
+                "INSERT INTO themes (name, name_key, style, primary_color, hue_bucket, token_hash, design_config, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    record.name, record.name.lower(), record.style, record.primary_color,
+                    record.hue_bucket, record.token_hash, record.design_config, created_at
+                )
+            ).lastrowid
+            results.append((_summary((
+                theme_id, record.name, record.style, record.primary_color,
+                record.hue_bucket, record.token_hash, created_at
+            )), deduplicated))
+        connection.execute("COMMIT")
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    return results
+
+
+def _select_theme(connection: sqlite3.Connection, theme_id: int) -> Optional[StoredTheme]:
+    row = connection.execute(
+        "SELECT t.id, t.name, t.style, t.primary_color, t.hue_bucket, t.token_hash, t.created_at,"
+        " t.design_config, s.tokens FROM themes t JOIN token_sets s ON s.hash = t.token_hash WHERE t.id = ?",
+        (theme_id,)
+    ).fetchone()
+    if row is None:
+        return None
+    return StoredTheme(summary=_summary(row), design_config=row[7], tokens=row[8])
+
+
+def _select_tokens(connection: sqlite3.Connection, token_hash: str) -> Optional[bytes]:
+    row = connection.execute("SELECT tokens FROM token_sets WHERE hash = ?", (token_hash,)).fetchone()
+    return row[0] if row is not None else None
+
+
+def _select_page(
+    connection: sqlite3.Connection,
+    style: Optional[str],
+    hue_bucket: Optional[int],
+    limit: int,
+    after: Optional[Tuple[int, int]]
+) -> ThemePage:
+    clauses: List[str] = []
+    params: List[Any] = []
+    if style is not None:
+        clauses.append("style = ?")
+        params.append(style)
+    if hue_bucket is not None:
+        clauses.append("hue_bucket = ?")
+        params.append(hue_bucket)
+    if after is not None:
+        clauses.append("(created_at, id) < (?, ?)")
+        params.extend(after)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    rows = connection.execute(
+        f"SELECT {SUMMARY_COLUMNS} FROM themes {where} ORDER BY created_at DESC, id DESC LIMIT ?",
+        (*params, limit + 1)
+    ).fetchall()
+    items = [_summary(row) for row in rows[:limit]]
+    next_cursor = encode_cursor(items[-1]["created_at"], items[-1]["id"]) if len(rows) > limit else None
+    return ThemePage(items=items, next_cursor=next_cursor)
+
+
+def _select_name_page(
+    connection: sqlite3.Connection,
+    prefix: str,
+    style: Optional[str],
+    limit: int,
+    after: Optional[Tuple[str, int]]
+) -> ThemePage:
+    # Prefix match as a range on the name index: prefix <= name_key < prefix + U+10FFFF
+    clauses = ["name_key >= ?", "name_key < ?"]
+    params: List[Any] = [prefix, prefix + "\U0010ffff"]
+    if style is not None:
+        clauses.append("style = ?")
+        params.append(style)
+    if after is not None:
+        clauses.append("(name_key, id) > (?, ?)")
+        params.extend(after)
+    rows = connection.execute(
+        f"SELECT {SUMMARY_COLUMNS}, name_key FROM themes WHERE {' AND '.join(clauses)}"
+        " ORDER BY name_key, id LIMIT ?",
+        (*params, limit + 1)
+    ).fetchall()
+    items = [_summary(row) for row in rows[:limit]]
+    next_cursor = encode_cursor(rows[limit - 1][7], rows[limit - 1][0]) if len(rows) > limit else None
+    return ThemePage(items=items, next_cursor=next_cursor)
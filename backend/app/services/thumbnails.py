@@ -0,0 +1,280 @@
+# backend/app/services/thumbnails.py
+"""
+Server-side preview thumbnails of design token sets (PNG / WebP via Pillow)
+
+A thumbnail shows a swatch for every ColorPalette role, a sample of each
+BorderSystem radius and cards under the sm/md/lg/xl shadows. Rendered images
+are cached by (token hash, width, format); since a token hash identifies its
+content, an image never goes stale and can be served with long-lived cache
+headers.
+"""
+
+import io
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import fields
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFilter
+
+from app.services.generators.design_generator import ColorPalette, DesignTokens
+
+# Bump when the layout changes so ETags (and clients' caches) turn over
+RENDERER_VERSION = 1
+
+# format -> (Pillow format, media type, save options)
+THUMBNAIL_FORMATS: Dict[str, Tuple[str, str, Dict[str, object]]] = {
+    "png": ("PNG", "image/png", {"compress_level": 6}),
+    "webp": ("WEBP", "image/webp", {"lossless": True, "quality": 60, "method": 2})
+}
+
+# Layout is designed on a BASE_WIDTH x BASE_HEIGHT canvas and scaled to the requested width
+BASE_WIDTH = 640
+BASE_HEIGHT = 400
+PADDING = 24
+GAP = 8
+
+SWATCH_ROLES = tuple(field.name for field in fields(ColorPalette))
+SWATCH_COLUMNS = 7
+RADIUS_SAMPLES = ("radius_xs", "radius_sm", "radius_md", "radius_lg", "radius_xl", "radius_full")
+SHADOW_SAMPLES = ("sm", "md", "lg", "xl")
+
+_SHADOW_TOKEN = re.compile(r"rgba?\([^)]*\)|#[0-9a-fA-F]{3,8}|inset|-?\d*\.?\d+(?:px)?")
+
+Box = Tuple[float, float, float, float]
+RGBA = Tuple[int, int, int, float]
+
+
+def thumbnail_height(width: int) -> int:
+    """Height of a thumbnail of the given width (fixed BASE_WIDTH:BASE_HEIGHT aspect)"""
+    return round(width * BASE_HEIGHT / BASE_WIDTH)
+
+
+def _px(value: str) -> float:
+    value = value.strip()
+    return float(value[:-2] if value.endswith("px") else value or 0)
+
+
+def _color(value: str) -> RGBA:
+    value = value.strip()
+    if value.startswith("rgb"):
+        parts = [part.strip() for part in value[value.index("(") + 1:-1].split(",")]
+        alpha = float(parts[3]) if len(parts) > 3 else 1.0
+        return int(float(parts[0])), int(float(parts[1])), int(float(parts[2])), alpha
+    digits = value.lstrip("#")
+    if len(digits) in (3, 4):
+        digits = "".join(channel * 2 for channel in digits)
+    alpha = int(digits[6:8], 16) / 255 if len(digits) == 8 else 1.0
+    return int(digits[0:2], 16), int(digits[2:4], 16), int(digits[4:6], 16), alpha
+
+
+def parse_box_shadow(value: str) -> List[Tuple[bool, float, float, float, float, RGBA]]:
+    """
+    Parse a CSS box-shadow into (inset, x, y, blur, spread, color) layers, topmost first
+
+    Only the forms the design generator emits are needed: lengths in px (or
+    unitless 0) with an rgb()/rgba() or hex color.
+    """
+    layers = []
+    depth = 0
+    start = 0
+    for index, char in enumerate(value + ","):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            tokens = _SHADOW_TOKEN.findall(value[start:index])
+            start = index + 1
+            if not tokens or tokens == ["none"]:
+                continue
+            inset = "inset" in tokens
+            lengths = [_px(token) for token in tokens if token[0] not in "#ri"]
+            colors = [token for token in tokens if token[0] in "#r"]
+            lengths += [0.0] * (4 - len(lengths))
+            layers.append((inset, *lengths[:4], _color(colors[0]) if colors else (0, 0, 0, 1.0)))
+    return layers
+
+
+def _rounded(draw: ImageDraw.ImageDraw, box: Box, radius: float, fill, outline=None, width: int = 0) -> None:
+    radius = max(0.0, min(radius, (box[2] - box[0]) / 2, (box[3] - box[1]) / 2))
+    draw.rounded_rectangle(box, radius=round(radius), fill=fill, outline=outline, width=width)
+
+
+class ThumbnailRenderer:
+    """
+    Renders and caches token-set thumbnails
+
+    render() and encode() are blocking and CPU-bound; the API encodes in the
+    generation process pool (render_thumbnail) and keeps the results here with
+    store(). Layouts are drawn at supersample times the target size and
+    reduced, which anti-aliases the rounded shapes.
+    """
+
+    def __init__(
+        self,
+        cache_entries: int = 4096,
+        cache_bytes: int = 64 * 1024 * 1024,
+        supersample: int = 2
+    ):
+        self.cache_entries = cache_entries
+        self.cache_bytes = cache_bytes
+        self.supersample = supersample
+        self._cache: "OrderedDict[Tuple[str, int, str], bytes]" = OrderedDict()
+        self._cache_size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def cached(self, token_hash: str, width: int, image_format: str) -> Optional[bytes]:
+        """Return a cached thumbnail, or None"""
+        key = (token_hash, width, image_format)
+        with self._lock:
+            image = self._cache.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return image
+
+    def render(self, design_tokens: DesignTokens, token_hash: str, width: int, image_format: str) -> bytes:
+        """Render (or fetch from the cache) the encoded thumbnail of a token set"""
+        key = (token_hash, width, image_format)
+        with self._lock:
+            image = self._cache.get(key)
+            if image is not None:
+                self._cache.move_to_end(key)
+                return image
+
+        image = self.encode(design_tokens, width, image_format)
+        self.store(token_hash, width, image_format, image)
+        return image
+
+    def encode(self, design_tokens: DesignTokens, width: int, image_format: str) -> bytes:
+        """Draw and encode the thumbnail of a token set, bypassing the cache"""
+        return self._encode(self.draw(design_tokens, width), image_format)
+
+    def store(self, token_hash: str, width: int, image_format: str, image: bytes) -> None:
+        """Cache a thumbnail encoded elsewhere (e.g. in a pool worker)"""
+        key = (token_hash, width, image_format)
+        with self._lock:
+            if key not in self._cache and len(image) <= self.cache_bytes:
+                self._cache[key] = image
+                self._cache_size += len(image)
+                while len(self._cache) > self.cache_entries or self._cache_size > self.cache_bytes:
+                    _, evicted = self._cache.popitem(last=False)
+                    self._cache_size -= len(evicted)
+
+    def draw(self, design_tokens: DesignTokens, width: int) -> "Image.Image":
+        """Draw the thumbnail of a token set as an RGB image of the given width"""
+        scale = width * self.supersample / BASE_WIDTH
+        colors = design_tokens.colors
+        canvas = Image.new("RGB", (width * self.supersample, thumbnail_height(width) * self.supersample), colors.background)
+        draw = ImageDraw.Draw(canvas)
+
+        def box(left: float, top: float, right: float, bottom: float) -> Box:
+            return left * scale, top * scale, right * scale, bottom * scale
+
+        borders = design_tokens.borders
+        outline_width = max(1, round(_px(borders.width_thin) * scale / 2))
+
+        # Swatches: every palette role, in declaration order
+        swatch_width = (BASE_WIDTH - 2 * PADDING - (SWATCH_COLUMNS - 1) * GAP) / SWATCH_COLUMNS
+        swatch_height = 72
+        for index, role in enumerate(SWATCH_ROLES):
+            row, column = divmod(index, SWATCH_COLUMNS)
+            left = PADDING + column * (swatch_width + GAP)
+            top = PADDING + row * (swatch_height + GAP)
+            _rounded(
+                draw, box(left, top, left + swatch_width, top + swatch_height),
+                _px(borders.radius_sm) * scale, fill=getattr(colors, role),
+                outline=colors.border, width=outline_width
+            )
+
+        band_top = PADDING + 2 * swatch_height + GAP + 2 * PADDING
+        band_height = BASE_HEIGHT - PADDING - band_top
+        half_width = (BASE_WIDTH - 3 * PADDING) / 2
+
+        # Radius samples: 3 x 2 grid on the left half
+        cell_width = (half_width - 2 * GAP) / 3
+        cell_height = (band_height - GAP) / 2
+        for index, radius_name in enumerate(RADIUS_SAMPLES):
+            row, column = divmod(index, 3)
+            left = PADDING + column * (cell_width + GAP)
+            top = band_top + row * (cell_height + GAP)
+            _rounded(
+                draw, box(left, top, left + cell_width, top + cell_height),
+                _px(getattr(borders, radius_name)) * scale, fill=colors.primary
+            )
+
+        # Shadow samples: surface cards in a 2 x 2 grid on the right half
+        card_margin = 14
+        cell_width = (half_width - GAP) / 2
+        cell_height = (band_height - GAP) / 2
+        for index, shadow_name in enumerate(SHADOW_SAMPLES):
+            row, column = divmod(index, 2)
+            left = 2 * PADDING + half_width + column * (cell_width + GAP) + card_margin
+            top = band_top + row * (cell_height + GAP) + card_margin / 2
+            card = box(left, top, left + cell_width - 2 * card_margin, top + cell_height - card_margin)
+            radius = _px(borders.radius_md) * scale
+            shadow = design_tokens.shadows.get(shadow_name)
+            if shadow:
+                self._draw_shadow(canvas, card, radius, shadow, scale)
+            _rounded(draw, card, radius, fill=colors.surface)
+
+        return canvas.reduce(self.supersample) if self.supersample > 1 else canvas
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._cache),
+                "bytes": self._cache_size,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+    @staticmethod
+    def _draw_shadow(canvas: "Image.Image", card: Box, radius: float, shadow: str, scale: float) -> None:
+        """Composite the outer layers of a box-shadow under card (bottom layer first, as in CSS)"""
+        for inset, offset_x, offset_y, blur, spread, (red, green, blue, alpha) in reversed(parse_box_shadow(shadow)):
+            if inset or alpha <= 0:
+                continue
+            offset_x, offset_y, blur, spread = offset_x * scale, offset_y * scale, blur * scale, spread * scale
+            # Patch around the offset, spread shape with room for the blur
+            margin = blur + 2
+            shape = (card[0] - spread + offset_x, card[1] - spread + offset_y, card[2] + spread + offset_x, card[3] + spread + offset_y)
+            left, top = int(shape[0] - margin), int(shape[1] - margin)
+            right, bottom = int(shape[2] + margin) + 1, int(shape[3] + margin) + 1
+            mask = Image.new("L", (right - left, bottom - top), 0)
+            _rounded(
+                ImageDraw.Draw(mask),
+                (shape[0] - left, shape[1] - top, shape[2] - left, shape[3] - top),
+                radius + max(spread, 0), fill=255
+            )
+            if blur > 0:
+                # A CSS blur radius corresponds to a Gaussian with sigma = radius / 2
+                mask = mask.filter(ImageFilter.GaussianBlur(blur / 2))
+            if alpha < 1:
+                mask = mask.point(lambda value: round(value * alpha))
+            canvas.paste((red, green, blue), (left, top, right, bottom), mask)
+
+    @staticmethod
+    def _encode(image: "Image.Image", image_format: str) -> bytes:
+        pillow_format, _, options = THUMBNAIL_FORMATS[image_format]
+        buffer = io.BytesIO()
+        image.save(buffer, pillow_format, **options)
+        return buffer.getvalue()
+
+
+# Renderer of each pool worker process; its cache is unused (results go back to the API's renderer)
+_worker_renderer: Optional[ThumbnailRenderer] = None
+
+
+def render_thumbnail(design_tokens: DesignTokens, width: int, image_format: str) -> bytes:
+    """Encode a thumbnail in a pool worker (module-level so process pools can pickle it)"""
+    global _worker_renderer
+    if _worker_renderer is None:
+        _worker_renderer = ThumbnailRenderer(cache_entries=0)
+    return _worker_renderer.encode(design_tokens, width, image_format)
@@ -0,0 +1,278 @@
+# backend/app/utils/compression.py
+"""
+Negotiated response compression (brotli / gzip) as pure ASGI middleware
+
+Complete bodies above a size threshold are compressed once per distinct
+content and encoding: the compressed bytes are kept in a bounded LRU keyed by
+a hash of the body, so popular themes are not recompressed on every request.
+Large bodies are compressed on a worker thread to keep the event loop free.
+Streamed bodies (NDJSON) are compressed chunk by chunk with a sync flush, so
+clients still receive every chunk as soon as it is produced.
+"""
+
+import gzip
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.http_cache import accepted_encodings
+from app.utils.metrics import COMPRESSED_RESPONSES, COMPRESSION_SAVED_BYTES
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Types worth compressing; anything else (images, ZIP archives) is passed through
+COMPRESSIBLE_TYPES = (
+    "text/", "application/json", "application/x-ndjson", "application/javascript",
+    "application/xml", "image/svg+xml"
+)
+
+# Event streams are left alone: proxies and browsers handle compressed SSE poorly
+EXCLUDED_TYPES = ("text/event-stream",)
+
+
+def _compressible(content_type: str) -> bool:
+    content_type = content_type.lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES) and not content_type.startswith(EXCLUDED_TYPES)
+
+
+class CompressedBodyCache:
+    """
+    LRU of compressed bodies keyed by (content key, encoding)
+
+    Bounded by entry count and total compressed size; thread-safe because
+    large bodies are compressed off the event loop.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, str]) -> Optional[bytes]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Tuple[str, str], value: bytes) -> None:
+        if self.max_entries <= 0 or len(value) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = value
+            self._size += len(value)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses with the best coding the client accepts (br, then gzip)
+
+    Only compressible content types of at least minimum_size bytes are
+    compressed, and never when the app already set Content-Encoding (e.g.
+    precompressed static files). Bodies of offload_size bytes or more are
+    compressed on a worker thread. Compressed responses get Vary:
+    Accept-Encoding and their ETag is weakened, since the bytes differ from
+    the identity representation but the content is the same (conditional
+    requests keep working, as If-None-Match uses weak comparison).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+        offload_size: int = 256 * 1024,
+        cache: Optional[CompressedBodyCache] = None
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.offload_size = offload_size
+        self.cache = cache if cache is not None else CompressedBodyCache()
+        self.encodings = ("br", "gzip") if brotli is not None else ("gzip",)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding"))
+        encoding = next((coding for coding in self.encodings if coding in accepted or "*" in accepted), None)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        """Compress a complete body (blocking)"""
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        # mtime=0 keeps the output identical for identical bodies
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    async def compress_cached(self, body: bytes, encoding: str) -> bytes:
+        """
+        Compressed body, reused for identical content and compressed off the loop when large
+
+        Keyed by a hash of the body itself rather than the response's ETag:
+        an ETag derived from the request (as for generate) need not pin the
+        exact bytes, and reusing by it would serve an earlier body.
+        """
+        key = (hashlib.blake2b(body, digest_size=16).hexdigest(), encoding)
+        compressed = self.cache.get(key)
+        if compressed is not None:
+            COMPRESSED_RESPONSES.labels(encoding, "hit").inc()
+            return compressed
+        if len(body) >= self.offload_size:
+            compressed = await run_in_threadpool(self.compress, body, encoding)
+        else:
+            compressed = self.compress(body, encoding)
+        self.cache.put(key, compressed)
+        COMPRESSED_RESPONSES.labels(encoding, "miss").inc()
+        return compressed
+
+    def stream_compressor(self, encoding: str) -> "_StreamCompressor":
+        return _StreamCompressor(encoding, self.gzip_level, self.brotli_quality)
+
+
+class _StreamCompressor:
+    """Incremental compressor whose output is flushed after every chunk"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, chunk: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(chunk) + self._compressor.flush()
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _CompressionResponder:
+    """Per-request send wrapper: holds the response start until the body shows whether to compress"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self._start: Optional[Message] = None
+        self._passthrough = False
+        self._stream: Optional[_StreamCompressor] = None
+        self._streamed_bytes = 0
+        self._compressed_bytes = 0
+
+    async def send(self, message: Message) -> None:
+        if self._passthrough:
+            await self._send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message.get("headers", []))
+            status = message["status"]
+            if (
+                "content-encoding" in headers
+                or not _compressible(headers.get("content-type", ""))
+                or status < 200 or status in (204, 304)
+            ):
+                self._passthrough = True
+                await self._send(message)
+            else:
+                self._start = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._stream is not None:
+            await self._send_chunk(body, more_body)
+            return
+
+        if not more_body:
+            # Complete body in one message: compress (or reuse) it as a whole
+            if len(body) < self.middleware.minimum_size:
+                await self._send(self._start)
+                await self._send(message)
+                return
+            compressed = await self.middleware.compress_cached(body, self.encoding)
+            COMPRESSION_SAVED_BYTES.labels(self.encoding).inc(max(0, len(body) - len(compressed)))
+            await self._send(self._encoded_start(len(compressed)))
+            await self._send({"type": "http.response.body", "body": compressed, "more_body": False})
+            return
+
+        # Streamed body: the final size is unknown, so compress every chunk
+        self._stream = self.middleware.stream_compressor(self.encoding)
+        await self._send(self._encoded_start(None))
+        await self._send_chunk(body, more_body)
+
+    async def _send_chunk(self, body: bytes, more_body: bool) -> None:
+        compressed = self._stream.compress(body) if body else b""
+        if not more_body:
+            compressed += self._stream.finish()
+        self._streamed_bytes += len(body)
+        self._compressed_bytes += len(compressed)
+        if not more_body:
+            COMPRESSED_RESPONSES.labels(self.encoding, "stream").inc()
+            COMPRESSION_SAVED_BYTES.labels(self.encoding).inc(max(0, self._streamed_bytes - self._compressed_bytes))
+        await self._send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+    def _encoded_start(self, content_length: Optional[int]) -> Message:
+        message = dict(self._start)
+        headers = MutableHeaders(raw=list(message.get("headers", [])))
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        message["headers"] = headers.raw
+        return message
@@ -0,0 +1,179 @@
+# backend/app/utils/http_cache.py
+"""
+HTTP caching helpers: ETags, conditional requests and precompressed static files
+
+Validators are computed from what determines a response (request inputs plus
+generator version) rather than from the body, so a matching If-None-Match is
+answered with 304 before any work is done.
+"""
+
+import hashlib
+import mimetypes
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Optional, Set
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+# Precompressed siblings, in order of preference: app.js -> app.js.br / app.js.gz
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def strong_etag(*parts: bytes) -> str:
+    """Return a quoted strong ETag over the given byte strings"""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(len(part).to_bytes(8, "little"))
+        digest.update(part)
+    return f'"{digest.hexdigest()}"'
+
+
+def weak_etag(*parts: bytes) -> str:
+    """
+    Return a weak ETag over the given byte strings
+
+    For responses that are equivalent but not byte-identical for the same
+    inputs (e.g. they carry a timestamp); If-None-Match still matches it.
+    """
+    return f"W/{strong_etag(*parts)}"
+
+
+def http_date(timestamp: float) -> str:
+    """Format a POSIX timestamp as an HTTP-date (for Last-Modified)"""
+    return formatdate(timestamp, usegmt=True)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match evaluation (weak comparison, as RFC 9110 requires for it)
+
+    Accepts a list of entity tags or "*".
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def is_not_modified(
+    request_headers: Headers,
+    etag: Optional[str],
+    last_modified: Optional[str] = None
+) -> bool:
+    """
+    Decide whether a conditional GET/HEAD can be answered with 304
+
+    If-Modified-Since is only considered when the request has no If-None-Match.
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag is not None and etag_matches(if_none_match, etag)
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if not if_modified_since or not last_modified:
+        return False
+    try:
+        return parsedate_to_datetime(if_modified_since) >= parsedate_to_datetime(last_modified)
+    except (TypeError, ValueError):
+        return False
+
+
+def cache_headers(
+    etag: str,
+    cache_control: str,
+    last_modified: Optional[str] = None
+) -> Dict[str, str]:
+    """Response headers carrying the validators and caching policy"""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+    return headers
+
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    """304 response repeating the validators and caching headers"""
+    return Response(status_code=304, headers=headers)
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> Set[str]:
+    """Content codings accepted by an Accept-Encoding header (q=0 excluded)"""
+    accepted = set()
+    for item in (accept_encoding or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding)
+    return accepted
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves foo.js.br / foo.js.gz in place of foo.js when the
+    client accepts that coding, and adds a Cache-Control policy
+
+    The compressed files are produced at build time; a variant is only used
+    if it is at least as new as the original, so a stale .gz never shadows an
+    updated asset. ETag and Last-Modified come from the file actually sent.
+    """
+
+    def __init__(self, *args, cache_control: str = "public, max-age=86400", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_control = cache_control
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        media_type = mimetypes.guess_type(str(full_path))[0] or "text/plain"
+        encoding = None
+
+        accepted = accepted_encodings(request_headers.get("accept-encoding"))
+        for coding, suffix in PRECOMPRESSED_ENCODINGS:
+            if coding not in accepted and "*" not in accepted:
+                continue
+            try:
+                variant_stat = os.stat(f"{full_path}{suffix}")
+            except OSError:
+                continue
+            if variant_stat.st_mtime >= stat_result.st_mtime:
+                full_path, stat_result, encoding = f"{full_path}{suffix}", variant_stat, coding
+                break
+
+        response = FileResponse(
+            full_path,
+            status_code=status_code,
+            stat_result=stat_result,
+            method=scope["method"],
+            media_type=media_type
+        )
+        response.headers["Cache-Control"] = self.cache_control
+        response.headers["Vary"] = "Accept-Encoding"
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+
+        if is_not_modified(request_headers, response.headers.get("etag"), response.headers.get("last-modified")):
+            return NotModifiedResponse(response.headers)
+        return response
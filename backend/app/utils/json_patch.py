@@ -0,0 +1,135 @@
+# backend/app/utils/json_patch.py
+"""
+Minimal JSON Patch (RFC 6902) diff/apply for JSON-like documents
+
+diff() emits add / remove / replace operations. Objects are diffed key by
+key, so an edit to one nested value yields one small operation; lists (short
+in design tokens and components) are replaced whole when they differ.
+
+One extension: a long multi-line string (generated CSS, templates) that
+changed in a few lines gets {"op": "splice", "path", "edits"} instead of a
+replace, where edits are [start line, lines removed, lines inserted] against
+the old value's lines, in ascending order.
+"""
+
+import difflib
+from typing import Any, Dict, List, Tuple
+
+Operation = Dict[str, Any]
+
+# Strings shorter than this are always replaced whole
+SPLICE_MIN_LENGTH = 256
+
+
+def escape_pointer(key: str) -> str:
+    """Escape one JSON Pointer (RFC 6901) reference token"""
+    return key.replace("~", "~0").replace("/", "~1")
+
+
+def unescape_pointer(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def diff(old: Any, new: Any, path: str = "") -> List[Operation]:
+    """Operations that turn old into new (empty when they are equal)"""
+    operations: List[Operation] = []
+    _diff(old, new, path, operations)
+    return operations
+
+
+def _diff(old: Any, new: Any, path: str, operations: List[Operation]) -> None:
+    if old is new:
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key, value in old.items():
+            if key not in new:
+                operations.append({"op": "remove", "path": f"{path}/{escape_pointer(key)}"})
+            else:
+                _diff(value, new[key], f"{path}/{escape_pointer(key)}", operations)
+        for key, value in new.items():
+            if key not in old:
+                operations.append({"op": "add", "path": f"{path}/{escape_pointer(key)}", "value": value})
+    elif old != new or type(old) is not type(new):
+        if isinstance(old, str) and isinstance(new, str) and len(new) >= SPLICE_MIN_LENGTH and "\n" in new:
+            edits = _line_edits(old, new)
+            if edits is not None:
+                operations.append({"op": "splice", "path": path, "edits": edits})
+                return
+        operations.append({"op": "replace", "path": path, "value": new})
+
+
+def _line_edits(old: str, new: str) -> Any:
+    """Line edits turning old into new, or None unless they are under half the size of new"""
+    old_lines = old.split("\n")
+    new_lines = new.split("\n")
+    if len(old_lines) == len(new_lines):
+        # Regenerated text usually keeps its shape; comparing line by line is much cheaper than difflib
+        opcodes = _changed_runs(old_lines, new_lines)
+    else:
+        opcodes = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False).get_opcodes()
+    edits = []
+    size = 0
+    for tag, old_start, old_end, new_start, new_end in opcodes:
+        if tag == "equal":
+            continue
+        inserted = new_lines[new_start:new_end]
+        edits.append([old_start, old_end - old_start, inserted])
+        size += sum(len(line) + 4 for line in inserted) + 16
+        if size * 2 > len(new):
+            return None
+    return edits
+
+
+def _changed_runs(old_lines: List[str], new_lines: List[str]) -> List[Tuple[str, int, int, int, int]]:
+    """difflib-style opcodes for runs of differing lines between equally long line lists"""
+    runs = []
+    start = None
+    for index, (old_line, new_line) in enumerate(zip(old_lines, new_lines)):
+        if old_line != new_line:
+            if start is None:
+                start = index
+        elif start is not None:
+            runs.append(("replace", start, index, start, index))
+            start = None
+    if start is not None:
+        runs.append(("replace", start, len(new_lines), start, len(new_lines)))
+    return runs
+
+
+def apply(document: Any, operations: List[Operation]) -> Any:
+    """
+    Apply operations produced by diff() to document
+
+    Objects along changed paths are copied, so the input is left untouched.
+
+    Raises:
+        KeyError: If a path does not exist in the document
+    """
+    for operation in operations:
+        tokens = [unescape_pointer(token) for token in operation["path"].split("/")[1:]]
+        if not tokens:
+            document = operation["value"]
+            continue
+        document = _copy(document)
+        parent = document
+        for token in tokens[:-1]:
+            parent[token] = _copy(parent[token])
+            parent = parent[token]
+        if operation["op"] == "remove":
+            del parent[tokens[-1]]
+        elif operation["op"] == "splice":
+            lines = parent[tokens[-1]].split("\n")
+            for start, removed, inserted in reversed(operation["edits"]):
+                lines[start:start + removed] = inserted
+            parent[tokens[-1]] = "\n".join(lines)
+        elif operation["op"] == "replace" and tokens[-1] not in parent:
+            raise KeyError(operation["path"])
+        else:
+            parent[tokens[-1]] = operation["value"]
+    return document
+
+
+def _copy(value: Any) -> Any:
+    if isinstance(value, dict):
+        return dict(value)
+    raise KeyError("JSON patch paths may only traverse objects")
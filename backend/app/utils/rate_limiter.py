@@ -1,36 +1,307 @@
 # backend/app/utils/rate_limiter.py
 """
 Rate limiting utility for API endpoints
+
+Uses a sliding-window counter: each key keeps the request count of the current
+and previous fixed windows, and the previous count is weighted by how much of
+it still overlaps the sliding window. Every check is O(1) in time and memory.
 """
 
 import asyncio
-from typing import Dict
-from datetime import datetime, timedelta
+import hashlib
+import logging
+import os
+import struct
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from multiprocessing import resource_tracker, shared_memory
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _sliding_window(
+    stored_window: int,
+    current: int,
+    previous: int,
+    window_index: int
+) -> Tuple[int, int]:
+    """Roll a key's (current, previous) counts forward to window_index"""
+    if window_index == stored_window:
+        return current, previous
+    if window_index == stored_window + 1:
+        return 0, current
+    return 0, 0
+
+
+class RateLimitBackend(ABC):
+    """
+    Storage for per-key sliding-window counters
+
+    Implementations must make hit() atomic for their sharing scope (one
+    process for the in-memory backend, every attached process for the shared
+    memory backend).
+    """
+
+    @abstractmethod
+    def hit(self, key: str, now: float, window_seconds: float, max_requests: int) -> bool:
+        """Record a request for key if it is under the limit; return whether it was allowed"""
+
+    @abstractmethod
+    def evict_idle(self, now: float, window_seconds: float) -> int:
+        """Drop keys with no requests in the last two windows; return how many were dropped"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of keys currently tracked"""
+
+    # Whether evict_idle() may block long enough that it belongs on a thread
+    # rather than the event loop; such backends must also make it thread-safe
+    blocking_eviction = False
+
+    def close(self) -> None:
+        """Release any resources held by the backend"""
+
+
+class InMemoryBackend(RateLimitBackend):
+    """
+    Per-process backend holding counters in an LRU-ordered dict
+
+    Keys are moved to the end on every hit, so idle keys collect at the front:
+    the idle sweep stops at the first active key, and the max_keys cap evicts
+    the least recently seen key in O(1).
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._counters: "OrderedDict[str, List[int]]" = OrderedDict()
+        self.evictions = 0
+
+    def hit(self, key: str, now: float, window_seconds: float, max_requests: int) -> bool:
+        window_index = int(now // window_seconds)
+        state = self._counters.get(key)
+
+        if state is None:
+            state = [window_index, 0, 0]
+            self._counters[key] = state
+            if len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._counters.move_to_end(key)
+            if state[0] != window_index:
+                state[1], state[2] = _sliding_window(state[0], state[1], state[2], window_index)
+                state[0] = window_index
+
+        overlap = 1.0 - (now / window_seconds - window_index)
+        if state[2] * overlap + state[1] >= max_requests:
+            return False
+
+        state[1] += 1
+        return True
+
+    def evict_idle(self, now: float, window_seconds: float) -> int:
+        oldest_active = int(now // window_seconds) - 1
+        evicted = 0
+        while self._counters:
+            key, state = next(iter(self._counters.items()))
+            if state[0] >= oldest_active:
+                break
+            self._counters.popitem(last=False)
+            evicted += 1
+        self.evictions += evicted
+        return evicted
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+
+class SharedMemoryBackend(RateLimitBackend):
+    """
+    Backend shared by every process on the host through a named shared memory segment
+
+    The segment is a fixed-size open-addressing table of 24-byte slots
+    (key hash, window index, current count, previous count), so memory use is
+    capped at max_keys * 24 bytes regardless of traffic. Keys are hashed with
+    BLAKE2b (stable across processes, unlike hash()). Updates are serialized
+    with an flock on a companion lock file; when every probed slot is taken,
+    the stalest one is reused. The idle sweep takes the lock one chunk of
+    slots at a time, so it never holds up hit() for a whole table scan.
+    """
+
+    SLOT = struct.Struct("<QqII")
+    PROBES = 8
+    EVICT_CHUNK = 4096
+    blocking_eviction = True
+
+    def __init__(self, name: str = "ui_customizer_rate_limit", max_keys: int = 1 << 18, lock_dir: Optional[str] = None):
+        import fcntl  # POSIX only; imported here so other backends work everywhere
+
+        self._fcntl = fcntl
+        self.name = name
+        self.slots = max_keys
+        size = self.slots * self.SLOT.size
+
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            logger.info(f"Created shared rate limit table {name} ({self.slots} slots)")
+        except FileExistsError:
+            self._shm = shared_memory.SharedMemory(name=name, create=False)
+            self.slots = self._shm.size // self.SLOT.size
+
+        # The segment outlives any single worker; stop the resource tracker
+        # from unlinking it when the process that created it exits
+        resource_tracker.unregister(self._shm._name, "shared_memory")
+
+        self._buffer = self._shm.buf
+        # flock excludes other processes but not threads sharing this descriptor
+        self._thread_lock = threading.Lock()
+        lock_path = os.path.join(lock_dir or "/tmp", f"{name}.lock")
+        self._lock_fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+
+    def hit(self, key: str, now: float, window_seconds: float, max_requests: int) -> bool:
+        key_hash = int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little") | 1
+        window_index = int(now // window_seconds)
+        overlap = 1.0 - (now / window_seconds - window_index)
+        start = key_hash % self.slots
+
+        with self._thread_lock:
+            self._fcntl.flock(self._lock_fd, self._fcntl.LOCK_EX)
+            try:
+                offset, state = self._find_slot(key_hash, start, window_index)
+                stored_hash, stored_window, current, previous = state
+
+                if stored_hash != key_hash:
+                    current, previous = 0, 0
+                else:
+                    current, previous = _sliding_window(stored_window, current, previous, window_index)
+
+                allowed = previous * overlap + current < max_requests
+                if allowed:
+                    current += 1
+                self.SLOT.pack_into(self._buffer, offset, key_hash, window_index, current, previous)
+                return allowed
+            finally:
+                self._fcntl.flock(self._lock_fd, self._fcntl.LOCK_UN)
+
+    def _find_slot(self, key_hash: int, start: int, window_index: int) -> Tuple[int, Tuple[int, int, int, int]]:
+        """Return the slot holding key_hash, else the first empty or expired one, else the stalest probed"""
+        probed = []
+        for probe in range(self.PROBES):
+            offset = ((start + probe) % self.slots) * self.SLOT.size
+            state = self.SLOT.unpack_from(self._buffer, offset)
+            # The key may sit past a slot that was freed after it was placed,
+            # so the whole probe sequence is checked before reusing any slot
+            if state[0] == key_hash:
+                return offset, state
+            probed.append((offset, state))
+        for offset, state in probed:
+            if state[0] == 0 or state[1] < window_index - 1:
+                return offset, state
+        return min(probed, key=lambda slot: slot[1][1])
+
+    def evict_idle(self, now: float, window_seconds: float) -> int:
+        oldest_active = int(now // window_seconds) - 1
+        evicted = 0
+        for first in range(0, self.slots, self.EVICT_CHUNK):
+            with self._thread_lock:
+                self._fcntl.flock(self._lock_fd, self._fcntl.LOCK_EX)
+                try:
+                    for slot in range(first, min(first + self.EVICT_CHUNK, self.slots)):
+                        offset = slot * self.SLOT.size
+                        key_hash, stored_window, _, _ = self.SLOT.unpack_from(self._buffer, offset)
+                        if key_hash and stored_window < oldest_active:
+                            self.SLOT.pack_into(self._buffer, offset, 0, 0, 0, 0)
+                            evicted += 1
+                finally:
+                    self._fcntl.flock(self._lock_fd, self._fcntl.LOCK_UN)
+        return evicted
+
+    def __len__(self) -> int:
+        return sum(
+            1 for offset in range(0, self.slots * self.SLOT.size, self.SLOT.size)
+            if self.SLOT.unpack_from(self._buffer, offset)[0]
+        )
+
+    def close(self) -> None:
+        self._buffer = None
+        self._shm.close()
+        os.close(self._lock_fd)
+
+    def unlink(self) -> None:
+        """Remove the segment from the system (call once, after every process has closed it)"""
+        # unlink() unregisters from the resource tracker, which we already did
+        resource_tracker.register(self._shm._name, "shared_memory")
+        self._shm.unlink()
+
+
+def create_backend(kind: Optional[str] = None, max_keys: Optional[int] = None) -> RateLimitBackend:
+    """Build a backend from arguments or RATE_LIMIT_BACKEND / RATE_LIMIT_MAX_KEYS"""
+    kind = kind or os.getenv("RATE_LIMIT_BACKEND", "memory")
+    max_keys = max_keys or int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+    if kind == "memory":
+        return InMemoryBackend(max_keys=max_keys)
+    if kind == "shared":
+        return SharedMemoryBackend(
+            name=os.getenv("RATE_LIMIT_SHM_NAME", "ui_customizer_rate_limit"),
+            max_keys=max_keys
+        )
+    raise ValueError(f"Unknown rate limit backend: {kind}")
+
 
 class RateLimiter:
-    """Simple in-memory rate limiter"""
-    
-    def __init__(self, max_requests: int = 100, window_seconds: int = 60):
+    """Sliding-window rate limiter over a pluggable counter backend"""
+
+    def __init__(
+        self,
+        max_requests: int = 100,
+        window_seconds: int = 60,
+        backend: Optional[RateLimitBackend] = None
+    ):
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.requests: Dict[str, list] = {}
-    
+        self.backend = backend if backend is not None else InMemoryBackend()
+        self.rejections = 0
+        self._eviction_task: Optional[asyncio.Task] = None
+
+    def allow(self, key: str) -> bool:
+        """Synchronous check-and-record for key"""
+        allowed = self.backend.hit(key, time.monotonic(), self.window_seconds, self.max_requests)
+        if not allowed:
+            self.rejections += 1
+        return allowed
+
     async def is_allowed(self, client_ip: str) -> bool:
         """Check if request is allowed for client IP"""
-        now = datetime.now()
-        
-        # Clean old requests
-        if client_ip in self.requests:
-            self.requests[client_ip] = [
-                req_time for req_time in self.requests[client_ip]
-                if now - req_time < timedelta(seconds=self.window_seconds)
-            ]
-        else:
-            self.requests[client_ip] = []
-        
-        # Check if under limit
-        if len(self.requests[client_ip]) < self.max_requests:
-            self.requests[client_ip].append(now)
-            return True
-        
-        return False
\ No newline at end of file
+        return self.allow(client_ip)
+
+    def start(self, interval_seconds: Optional[float] = None) -> None:
+        """Start the background task that evicts idle keys (once per window by default)"""
+        if self._eviction_task is None:
+            self._eviction_task = asyncio.create_task(self._evict_periodically(interval_seconds or self.window_seconds))
+
+    async def stop(self) -> None:
+        """Stop background eviction and release the backend"""
+        if self._eviction_task is not None:
+            self._eviction_task.cancel()
+            try:
+                await self._eviction_task
+            except asyncio.CancelledError:
+                pass
+            self._eviction_task = None
+        self.backend.close()
+
+    async def _evict_periodically(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                if self.backend.blocking_eviction:
+                    evicted = await asyncio.to_thread(self.backend.evict_idle, time.monotonic(), self.window_seconds)
+                else:
+                    evicted = self.backend.evict_idle(time.monotonic(), self.window_seconds)
+                if evicted:
+                    logger.info(f"Evicted {evicted} idle rate limit keys")
+            except Exception as e:
+                logger.error(f"Rate limit eviction failed: {str(e)}")
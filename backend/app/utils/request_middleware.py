@@ -0,0 +1,149 @@
+# backend/app/utils/request_middleware.py
+"""
+Pure ASGI request middleware: request IDs, rate limiting, access logging and HTTP metrics
+
+Works on the raw ASGI messages instead of Starlette's BaseHTTPMiddleware, so
+responses (including streamed ones) pass through without being re-wrapped in
+an extra task and memory stream.
+"""
+
+import itertools
+import logging
+import os
+import random
+import time
+from typing import Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.metrics import (
+    HTTP_REQUEST_DURATION, HTTP_REQUEST_SIZE, HTTP_REQUESTS_IN_FLIGHT, HTTP_RESPONSE_SIZE,
+    RATE_LIMIT_REJECTIONS
+)
+from app.utils.rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+access_logger = logging.getLogger("app.access")
+
+# Process prefix + counter: unique across workers, ordered within one, and
+# far cheaper than uuid4
+_REQUEST_ID_PREFIX = f"{os.getpid():x}-{int(time.time()):x}-"
+_request_counter = itertools.count(1)
+
+
+def next_request_id() -> str:
+    """Return a new process-unique, monotonically increasing request ID"""
+    return f"{_REQUEST_ID_PREFIX}{next(_request_counter):x}"
+
+
+def _route_label(scope: Scope) -> str:
+    """Route template (not the raw path) so metric label cardinality stays bounded"""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if "endpoint" in scope:
+        # Mounted sub-application such as /static
+        return scope.get("root_path") or "/"
+    return "unmatched"
+
+
+class RequestContextMiddleware:
+    """
+    Assigns request IDs, applies the rate limiter, writes access logs and
+    records HTTP metrics (latency, in-flight requests, payload sizes)
+
+    The request ID is stored on request.state (for exception handlers) and
+    returned in the X-Request-ID header. Access log lines are structured
+    (method, path, status, duration_ms, bytes) and sampled at
+    access_log_sample_rate; 5xx responses and unhandled errors are always logged.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rate_limiter: Optional[RateLimiter] = None,
+        access_log_sample_rate: float = 1.0
+    ):
+        self.app = app
+        self.rate_limiter = rate_limiter
+        self.access_log_sample_rate = access_log_sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        request_id = next_request_id()
+        scope.setdefault("state", {})["request_id"] = request_id
+        client_ip = scope["client"][0] if scope.get("client") else "unknown"
+
+        if self.rate_limiter is not None and not self.rate_limiter.allow(client_ip):
+            RATE_LIMIT_REJECTIONS.inc()
+            logger.warning("Rate limit exceeded", extra={"request_id": request_id, "client": client_ip})
+            response = JSONResponse(
+                status_code=429,
+                content={
+                    "error": "Rate Limit Exceeded",
+                    "message": "Too many requests. Please try again later.",
+                    "request_id": request_id
+                },
+                headers={"X-Request-ID": request_id}
+            )
+            await response(scope, receive, send)
+            return
+
+        status_code = 500
+        body_bytes = 0
+        header_value = request_id.encode("latin-1")
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, body_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [*message.get("headers", ()), (b"x-request-id", header_value)]
+            elif message["type"] == "http.response.body":
+                body_bytes += len(message.get("body", b""))
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            logger.exception(
+                "Error processing request",
+                extra={"request_id": request_id, "method": scope["method"], "path": scope["path"]}
+            )
+            raise
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            duration = time.perf_counter() - started
+            method = scope["method"]
+            route = _route_label(scope)
+            HTTP_REQUEST_DURATION.labels(method, route, str(status_code)).observe(duration)
+            HTTP_RESPONSE_SIZE.labels(method, route).observe(body_bytes)
+            content_length = _header(scope, b"content-length")
+            if content_length and content_length.isdigit():
+                HTTP_REQUEST_SIZE.labels(method, route).observe(int(content_length))
+
+            if status_code >= 500 or random.random() < self.access_log_sample_rate:
+                access_logger.info(
+                    "request",
+                    extra={
+                        "request_id": request_id,
+                        "method": method,
+                        "path": scope["path"],
+                        "status": status_code,
+                        "duration_ms": round(duration * 1000, 3),
+                        "bytes": body_bytes,
+                        "client": client_ip
+                    }
+                )
+
+
+def _header(scope: Scope, name: bytes) -> Optional[bytes]:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value
+    return None
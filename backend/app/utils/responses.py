@@ -0,0 +1,34 @@
+# backend/app/utils/responses.py
+"""
+Fast JSON responses
+
+FastAPI runs jsonable_encoder over whatever an endpoint returns before the
+response class sees it. Endpoints on hot paths return FastJSONResponse
+directly, which skips that walk and encodes with orjson (dataclasses, numpy
+arrays and datetimes are handled natively).
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content the way FastJSONResponse does"""
+    return orjson.dumps(content, option=_ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class RawJSONResponse(Response):
+    """Response for a body that is already encoded JSON"""
+
+    media_type = "application/json"
@@ -0,0 +1,118 @@
+# backend/app/utils/single_flight.py
+"""
+Single-flight coalescing of identical concurrent work
+"""
+
+import asyncio
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class TooManyWaiters(Exception):
+    """Raised when a key already has max_waiters callers awaiting its result"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Too many requests waiting on the same result, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class _Flight(Generic[T]):
+    task: "asyncio.Task[T]"
+    started_at: float
+    waiters: int = 1
+
+
+class SingleFlight:
+    """
+    Runs one computation per key at a time and shares its result
+
+    The first caller for a key starts the computation; callers arriving with
+    the same key before it finishes await that computation instead of
+    starting their own, and all of them get its result or its exception. The
+    key is forgotten as soon as the computation finishes, so nothing is cached
+    beyond the calls that overlapped it.
+
+    At most max_waiters callers (the first one included) may await a key;
+    further ones are rejected with TooManyWaiters. Each caller waits at most
+    timeout seconds (asyncio.TimeoutError); a caller giving up or being
+    cancelled does not cancel the computation the others are waiting for.
+    Single event loop only.
+    """
+
+    def __init__(self, name: str, max_waiters: int = 256, timeout: Optional[float] = 30.0):
+        self.name = name
+        self.max_waiters = max_waiters
+        self.timeout = timeout
+        self._flights: Dict[Hashable, _Flight] = {}
+
+        self.started = 0
+        self.shared = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.failed = 0
+
+    async def run(self, key: Hashable, func: Callable[..., Awaitable[T]], *args: Any) -> Tuple[T, bool]:
+        """
+        Await func(*args), or the identical call already in flight for key
+
+        Returns:
+            The result and whether it came from another caller's computation
+
+        Raises:
+            TooManyWaiters: If max_waiters callers are already awaiting key
+            asyncio.TimeoutError: If the result takes longer than timeout
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            task = asyncio.ensure_future(func(*args))
+            flight = _Flight(task=task, started_at=time.monotonic())
+            self._flights[key] = flight
+            task.add_done_callback(lambda done, key=key: self._finish(key, done))
+            self.started += 1
+            shared = False
+        else:
+            if flight.waiters >= self.max_waiters:
+                self.rejected += 1
+                raise TooManyWaiters(self._retry_after(flight))
+            flight.waiters += 1
+            self.shared += 1
+            shared = True
+
+        try:
+            # shield: one caller timing out or disconnecting leaves the task to the rest
+            return await asyncio.wait_for(asyncio.shield(flight.task), self.timeout), shared
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return in-flight keys and waiters plus outcome counters"""
+        return {
+            "max_waiters": self.max_waiters,
+            "timeout_seconds": self.timeout,
+            "in_flight": len(self._flights),
+            "waiters": sum(flight.waiters for flight in self._flights.values()),
+            "started": self.started,
+            "shared": self.shared,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "failed": self.failed
+        }
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._flights.get(key) is not None and self._flights[key].task is task:
+            del self._flights[key]
+        # Retrieve the exception so it is not reported as unhandled when every caller gave up
+        if not task.cancelled() and task.exception() is not None:
+            self.failed += 1
+
+    def _retry_after(self, flight: _Flight) -> int:
+        """Seconds until the in-flight computation is likely done, from how long it has run so far"""
+        return max(1, math.ceil(time.monotonic() - flight.started_at))
@@ -0,0 +1,96 @@
+# backend/app/utils/startup.py
+"""
+Startup warmup and readiness
+
+Expensive initialization (template compilation, lookup tables, worker
+processes) runs as named tasks on threads once the app is serving, all at
+the same time, instead of at import. /health answers as soon as the process
+is up; readiness turns true only when every warmup task has finished.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Warmup:
+    """
+    Named warmup tasks, run concurrently on worker threads
+
+    Requests that arrive before warmup finishes still work; they initialize
+    what they need on first use and are merely slower. A failed task keeps
+    the app not ready and is reported with its error.
+    """
+
+    def __init__(self):
+        self._tasks: List[Tuple[str, Callable[[], Any]]] = []
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._runner: Optional[asyncio.Task] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def add(self, name: str, func: Callable[[], Any]) -> None:
+        """Register a blocking callable to run during warmup"""
+        self._tasks.append((name, func))
+        self._status[name] = {"state": "pending"}
+
+    def start(self) -> None:
+        """Start every task in the background (call from the running event loop)"""
+        if self._runner is None:
+            self.started_at = time.perf_counter()
+            self._runner = asyncio.create_task(self._run_all())
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for warmup to finish; returns whether the app is ready"""
+        if self._runner is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(self._runner), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.ready
+
+    async def stop(self) -> None:
+        """Cancel warmup if it is still running (threads already started finish on their own)"""
+        if self._runner is not None and not self._runner.done():
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+
+    @property
+    def ready(self) -> bool:
+        return all(status["state"] == "done" for status in self._status.values())
+
+    def report(self) -> Dict[str, Any]:
+        """Readiness plus state and duration of each task"""
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+        return {
+            "ready": self.ready,
+            "elapsed_ms": round(elapsed * 1000, 3) if elapsed is not None else None,
+            "tasks": {name: dict(status) for name, status in self._status.items()}
+        }
+
+    async def _run_all(self) -> None:
+        await asyncio.gather(*(self._run(name, func) for name, func in self._tasks))
+        self.finished_at = time.perf_counter()
+        if self.ready:
+            logger.info(f"Warmup finished in {(self.finished_at - self.started_at) * 1000:.1f} ms")
+        else:
+            logger.error("Warmup finished with failures; the app will report not ready")
+
+    async def _run(self, name: str, func: Callable[[], Any]) -> None:
+        self._status[name] = {"state": "running"}
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(func)
+        except Exception as e:
+            logger.exception(f"Warmup task {name} failed: {str(e)}")
+            self._status[name] = {"state": "failed", "error": str(e)}
+            return
+        self._status[name] = {"state": "done", "duration_ms": round((time.perf_counter() - started) * 1000, 3)}
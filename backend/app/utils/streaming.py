@@ -0,0 +1,54 @@
+# backend/app/utils/streaming.py
+"""
+Encoders for streamed (NDJSON and server-sent event) responses
+"""
+
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+import orjson
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+
+# Stop proxies (nginx) from buffering the stream and clients from caching it
+STREAMING_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no"
+}
+
+
+def negotiate_stream_format(accept_header: Optional[str]) -> Optional[str]:
+    """Return the streaming media type requested by an Accept header, or None for plain JSON"""
+    if not accept_header:
+        return None
+    if SSE_MEDIA_TYPE in accept_header:
+        return SSE_MEDIA_TYPE
+    if NDJSON_MEDIA_TYPE in accept_header:
+        return NDJSON_MEDIA_TYPE
+    return None
+
+
+# Event payloads are dicts, or bytes that are already encoded JSON (such as a
+# token set's cached to_json()) and are spliced in without re-encoding
+EventData = Union[Dict[str, Any], bytes]
+
+
+def _encode_data(data: EventData) -> bytes:
+    return data if isinstance(data, bytes) else orjson.dumps(data)
+
+
+def encode_ndjson(event: str, data: EventData) -> bytes:
+    """Encode one event as a newline-delimited JSON record"""
+    return b'{"event":' + orjson.dumps(event) + b',"data":' + _encode_data(data) + b'}\n'
+
+
+def encode_sse(event: str, data: EventData) -> bytes:
+    """Encode one event in text/event-stream framing"""
+    return b"event: " + event.encode("utf-8") + b"\ndata: " + _encode_data(data) + b"\n\n"
+
+
+def encode_event_stream(events: Iterable[Tuple[str, EventData]], media_type: str) -> Iterator[bytes]:
+    """Encode (event, data) pairs lazily in the given streaming media type"""
+    encode = encode_sse if media_type == SSE_MEDIA_TYPE else encode_ndjson
+    for event, data in events:
+        yield encode(event, data)
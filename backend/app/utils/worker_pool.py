@@ -0,0 +1,219 @@
+# backend/app/utils/worker_pool.py
+"""
+Bounded worker pool for running blocking work off the event loop
+"""
+
+import asyncio
+import math
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class WorkerPoolFull(Exception):
+    """Raised when a pool's queue is at capacity"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Worker pool is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+def _timed_call(func: Callable[..., T], args: Tuple[Any, ...], submitted_at: float) -> Tuple[float, float, T]:
+    """Run func in the worker and report how long it waited and ran (monotonic clock is system-wide)"""
+    started_at = time.monotonic()
+    result = func(*args)
+    return started_at - submitted_at, time.monotonic() - started_at, result
+
+
+class PoolSlot:
+    """
+    A pool slot held by work that runs outside the executor
+
+    Counts toward the pool's limit until released; releasing is idempotent,
+    so it can be done both from a finally block and a completion callback.
+    """
+
+    def __init__(self, pool: "BoundedWorkerPool"):
+        self._pool = pool
+        self._released = False
+        self._lock = threading.Lock()
+
+    def release(self) -> None:
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        self._pool._release(None)
+
+    def __enter__(self) -> "PoolSlot":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.release()
+
+
+class BoundedWorkerPool:
+    """
+    Worker pool with a concurrency limit and a bounded wait queue
+
+    At most max_workers jobs run at once and at most max_queue more may wait;
+    anything beyond that is rejected immediately with WorkerPoolFull so callers
+    can shed load instead of piling up requests. Queue depth, wait times and
+    run times are tracked for health reporting.
+
+    With use_processes the jobs run in a spawned ProcessPoolExecutor (func and
+    its arguments must be picklable), which keeps CPU-bound work from competing
+    with the event loop for the GIL; otherwise a ThreadPoolExecutor is used.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int = 4,
+        max_queue: int = 64,
+        use_processes: bool = False,
+        initializer: Optional[Callable[[], None]] = None,
+        sample_size: int = 1024
+    ):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.use_processes = use_processes
+        self._initializer = initializer
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._wait_times: deque = deque(maxlen=sample_size)
+        self._run_times: deque = deque(maxlen=sample_size)
+
+        self.completed = 0
+        self.rejected = 0
+
+    @property
+    def executor(self) -> Executor:
+        """The underlying executor, started on first access"""
+        if self._executor is None:
+            if self.use_processes:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=self._initializer
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=self.name,
+                    initializer=self._initializer
+                )
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Run func(*args) on a pool worker and await its result
+
+        Raises:
+            WorkerPoolFull: If max_workers + max_queue jobs are already pending
+        """
+        self._acquire()
+        try:
+            future = self.executor.submit(_timed_call, func, args, time.monotonic())
+        except BaseException:
+            # Broken or shut down executor: the job never ran, so give the slot back
+            with self._lock:
+                self._pending -= 1
+            raise
+        # Release the slot when the job really finishes, even if the awaiting
+        # request was cancelled in the meantime
+        future.add_done_callback(self._release)
+        wait_time, run_time, result = await asyncio.wrap_future(future)
+
+        with self._lock:
+            self._wait_times.append(wait_time)
+            self._run_times.append(run_time)
+        return result
+
+    def reserve(self) -> PoolSlot:
+        """
+        Take a slot for work the caller runs itself, e.g. a streamed response
+        produced incrementally on another thread
+
+        Raises:
+            WorkerPoolFull: If max_workers + max_queue jobs are already pending
+        """
+        self._acquire()
+        return PoolSlot(self)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, throughput counters and wait/run time percentiles (ms)"""
+        with self._lock:
+            waits = sorted(self._wait_times)
+            runs = sorted(self._run_times)
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "executor": "process" if self.use_processes else "thread",
+                "in_flight": self._pending,
+                "queue_depth": max(0, self._pending - self.max_workers),
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "wait_ms_p50": _percentile_ms(waits, 0.5),
+                "wait_ms_p99": _percentile_ms(waits, 0.99),
+                "run_ms_p50": _percentile_ms(runs, 0.5),
+                "run_ms_p99": _percentile_ms(runs, 0.99)
+            }
+
+    def start(self) -> None:
+        """Start the executor ahead of the first job (spawns worker processes eagerly)"""
+        for _ in range(self.max_workers if self.use_processes else 0):
+            self.executor.submit(time.monotonic)
+
+    def warm_up(self, timeout: Optional[float] = None) -> None:
+        """
+        Start every worker and block until they have run the initializer
+
+        Each worker runs the initializer before its first job, so waiting on
+        one no-op per worker means the pool is ready for real work.
+        """
+        futures = [self.executor.submit(time.monotonic) for _ in range(self.max_workers)]
+        _, not_done = wait(futures, timeout=timeout)
+        if not_done:
+            raise TimeoutError(f"{len(not_done)} of {self.max_workers} {self.name} workers not ready after {timeout}s")
+        for future in futures:
+            future.result()
+
+    def shutdown(self) -> None:
+        """Stop accepting work and wait for running jobs"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise WorkerPoolFull(self._retry_after())
+            self._pending += 1
+
+    def _release(self, _future: Optional[Future]) -> None:
+        with self._lock:
+            self._pending -= 1
+            self.completed += 1
+
+    def _retry_after(self) -> int:
+        """Estimate seconds until a slot frees up from recent run times (lock held)"""
+        if not self._run_times:
+            return 1
+        average_run = sum(self._run_times) / len(self._run_times)
+        return max(1, math.ceil(average_run * self._pending / self.max_workers))
+
+
+def _percentile_ms(sorted_values: list, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return round(sorted_values[index] * 1000, 3)
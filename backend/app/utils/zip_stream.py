@@ -0,0 +1,66 @@
+# backend/app/utils/zip_stream.py
+"""
+ZIP archives written incrementally to a response stream
+
+zipfile can write to an unseekable file: each member is followed by a data
+descriptor instead of patching its local header afterwards. Writing into a
+sink that is drained after every member means only the member being
+compressed (plus the small central directory) is ever held in memory.
+"""
+
+import io
+import time
+import zipfile
+from typing import Iterable, Iterator, List, Tuple, Union
+
+ZIP_MEDIA_TYPE = "application/zip"
+
+ArchiveMember = Tuple[str, Union[str, bytes]]
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, unseekable file that buffers writes until drained"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._offset = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # zipfile records member offsets for the central directory
+        return self._offset
+
+    def drain(self) -> bytes:
+        chunk = b"".join(self._chunks)
+        self._chunks.clear()
+        return chunk
+
+
+def iter_zip(members: Iterable[ArchiveMember], compresslevel: int = 6) -> Iterator[bytes]:
+    """
+    Yield a deflated ZIP archive of (path, content) members as it is built
+
+    Members are consumed lazily, so a generator that renders files one at a
+    time produces the first bytes of the archive before the last file exists.
+    """
+    sink = _ChunkSink()
+    date_time = time.localtime()[:6]
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as archive:
+        for path, content in members:
+            info = zipfile.ZipInfo(path, date_time=date_time)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+            archive.writestr(info, content, compresslevel=compresslevel)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    # Central directory, written on close
+    yield sink.drain()
@@ -0,0 +1,145 @@
+# backend/benchmarks/bench_cold_start.py
+"""
+Cold-start benchmark: import time of the app and time until it reports ready
+
+Imports app.main in fresh interpreters under `python -X importtime`, reports
+the median import time and the modules with the largest cumulative import
+cost, then starts the app lifespan in fresh interpreters and measures how
+long the startup warmup takes until /ready would return 200.
+
+Run from the backend directory:
+    python -m benchmarks.bench_cold_start --runs 5 --top 15
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+READY_SCRIPT = """
+import asyncio, json, time
+started = time.perf_counter()
+from app.main import app, warmup
+imported = time.perf_counter()
+
+async def main():
+    async with app.router.lifespan_context(app):
+        serving = time.perf_counter()
+        ready = await warmup.wait()
+        done = time.perf_counter()
+        print(json.dumps({
+            "import_ms": (imported - started) * 1000,
+            "serving_ms": (serving - started) * 1000,
+            "ready_ms": (done - started) * 1000,
+            "ready": ready,
+            "tasks": warmup.report()["tasks"]
+        }))
+
+asyncio.run(main())
+"""
+
+
+def _environment() -> Dict[str, str]:
+    return dict(os.environ, PYTHONPATH=BACKEND_DIR, LOG_LEVEL="WARNING")
+
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[int, int, int]]:
+    """Map module -> (self us, cumulative us, nesting depth) from -X importtime output"""
+    modules = {}
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            own, cumulative, indent, name = match.groups()
+            modules[name] = (int(own), int(cumulative), (len(indent) - 1) // 2)
+    return modules
+
+
+def measure_import(runs: int) -> Tuple[List[float], List[Dict[str, Tuple[int, int, int]]]]:
+    walls, profiles = [], []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import app.main"],
+            cwd=BACKEND_DIR, env=_environment(), capture_output=True, text=True, check=True
+        )
+        walls.append(time.perf_counter() - started)
+        profiles.append(parse_importtime(result.stderr))
+    return walls, profiles
+
+
+def measure_ready(runs: int) -> List[Dict]:
+    results = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", READY_SCRIPT],
+            cwd=BACKEND_DIR, env=_environment(), capture_output=True, text=True, check=True
+        )
+        results.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Number of modules to list by cumulative import time")
+    parser.add_argument("--skip-ready", action="store_true", help="Only measure imports")
+    args = parser.parse_args()
+
+    # One untimed run so bytecode caches are written
+    measure_import(1)
+    walls, profiles = measure_import(args.runs)
+
+    cumulative: Dict[str, List[int]] = defaultdict(list)
+    depth: Dict[str, int] = {}
+    for profile in profiles:
+        for name, (_, total, level) in profile.items():
+            cumulative[name].append(total)
+            depth[name] = level
+    app_main = statistics.median(cumulative["app.main"]) / 1000
+
+    print(f"interpreter + import app.main: median {statistics.median(walls) * 1000:.1f} ms over {args.runs} runs")
+    print(f"import app.main (importtime): median {app_main:.1f} ms")
+    print(f"\n{'cumulative ms':>14} {'share':>7}  module (top-level imports of app.main's tree)")
+    ranked = sorted(cumulative.items(), key=lambda item: -statistics.median(item[1]))
+    listed = 0
+    for name, totals in ranked:
+        if name == "app.main" or depth[name] > 1:
+            continue
+        median = statistics.median(totals) / 1000
+        print(f"{median:>14.1f} {median / app_main:>6.0%}  {name}")
+        listed += 1
+        if listed == args.top:
+            break
+
+    heavy = ("numpy", "jinja2", "PIL", "lxml", "bs4", "cssutils", "passlib", "jose")
+    loaded = sorted(name for name in heavy if name in profiles[0])
+    print(f"\nheavy packages imported by app.main: {', '.join(loaded) or 'none'}")
+
+    if args.skip_ready:
+        return
+
+    results = measure_ready(args.runs)
+    print(f"\n{'import ms':>10} {'serving ms':>11} {'ready ms':>9}  slowest warmup tasks")
+    for result in results:
+        tasks = sorted(
+            ((name, status.get("duration_ms", float("nan"))) for name, status in result["tasks"].items()),
+            key=lambda item: -item[1]
+        )
+        slowest = ", ".join(f"{name} {duration:.0f}" for name, duration in tasks[:3])
+        flag = "" if result["ready"] else "  NOT READY"
+        print(f"{result['import_ms']:>10.1f} {result['serving_ms']:>11.1f} {result['ready_ms']:>9.1f}  {slowest}{flag}")
+    print(f"median time to ready: {statistics.median(result['ready_ms'] for result in results):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# backend/benchmarks/bench_color_names.py
+"""
+Nearest named color / Tailwind step lookups against a per-color scan
+
+Times ColorNameTable.nearest for batches of random colors against matching
+each color on its own (one broadcast distance pass per color), then table
+start-up (build, first write, memory-mapped open) and ranked pairing lookups
+against scoring the pairings per call. tests/test_color_names.py checks the
+results.
+
+Run from the backend directory:
+    python -m benchmarks.bench_color_names --batches 100 1000 10000
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from typing import Callable
+
+import numpy as np
+
+from app.services.generators.color_math import parse_hex_colors, rgb_bytes_to_lab
+from app.services.generators.color_names import ColorNameTable, build_color_table
+from app.services.generators.design_generator import DesignGeneratorService
+from app.services.generators.typography_index import TypographyPairingIndex
+
+
+def _best_of(func: Callable[[], object], rounds: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def per_color_nearest(table: ColorNameTable, colors) -> np.ndarray:
+    reference = np.asarray(table.table['lab'])
+    return np.array([
+        int(np.argmin(((reference - rgb_bytes_to_lab(parse_hex_colors([color]))[0]) ** 2).sum(axis=1)))
+        for color in colors
+    ])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batches", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        build = _best_of(build_color_table, args.rounds)
+        started = time.perf_counter()
+        ColorNameTable(directory)
+        first = time.perf_counter() - started
+        mapped = _best_of(lambda: ColorNameTable(directory), args.rounds)
+        table = ColorNameTable(directory)
+        print(
+            f"table: {len(table)} colors; build {build * 1000:.2f} ms, first open (build + write) "
+            f"{first * 1000:.2f} ms, memory-mapped open {mapped * 1000:.2f} ms\n"
+        )
+
+        print(f"{'colors':>7} {'batch ms':>9} {'per color us':>13} {'scan ms':>9} {'speedup':>8}")
+        for size in args.batches:
+            colors = [f"#{value:06x}" for value in rng.integers(0, 1 << 24, size)]
+            batch = _best_of(lambda: table.nearest(colors), args.rounds)
+            sample = colors[:min(size, 1000)]
+            scan = _best_of(lambda: per_color_nearest(table, sample), 1) * size / len(sample)
+            print(f"{size:>7} {batch * 1000:>9.2f} {batch / size * 1e6:>13.2f} {scan * 1000:>9.1f} {scan / batch:>7.0f}x")
+
+    generator = DesignGeneratorService()
+    index = TypographyPairingIndex(generator.typography_pairings, generator.design_styles)
+    lookups = 10000
+    ranked = _best_of(lambda: [index.ranked(style, 3) for style in generator.design_styles * (lookups // 8)], args.rounds)
+    rescored = _best_of(
+        lambda: [
+            TypographyPairingIndex(generator.typography_pairings, [style]).ranked(style, 3)
+            for style in generator.design_styles * (lookups // 80)
+        ],
+        args.rounds
+    ) * 10
+    print(
+        f"\npairings: {len(generator.typography_pairings)} x {len(generator.design_styles)} styles; "
+        f"ranked lookup {ranked / lookups * 1e6:.2f} us, scoring per call {rescored / lookups * 1e6:.2f} us"
+    )
+
+
+if __name__ == "__main__":
+    main()
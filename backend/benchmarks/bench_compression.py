@@ -0,0 +1,85 @@
+# backend/benchmarks/bench_compression.py
+"""
+Response compression benchmark: size and time per coding and level
+
+Builds real generate response bodies of a few sizes, then reports the
+compressed size and compression time for gzip levels and brotli qualities,
+and the cost of serving a body from the compressed-body cache (keyed by
+content hash) instead.
+
+Run from the backend directory:
+    python -m benchmarks.bench_compression --components 1 3 6 --variants 3 10
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.services.generation_worker import build_generation_payload
+from app.utils.compression import CompressedBodyCache, CompressionMiddleware, brotli
+
+
+def _body(component_count: int, variants: int) -> bytes:
+    component_types = ["button", "card", "form", "input", "modal", "navigation"][:component_count]
+    body, _ = build_generation_payload({
+        "design_config": {"style": "modern", "colors": {"primary": "#3366ff"}, "seed": 1},
+        "component_types": component_types,
+        "variants_per_type": variants,
+        "include_states": True,
+        "framework": "vue"
+    })
+    return body
+
+
+def _cached_lookup(middleware: CompressionMiddleware, body: bytes, encoding: str) -> None:
+    # A cache hit never suspends, so the coroutine completes on its first step
+    coroutine = middleware.compress_cached(body, encoding)
+    try:
+        coroutine.send(None)
+    except StopIteration:
+        pass
+
+
+def _best_of(repeats: int, func, *args) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--components", type=int, nargs="+", default=[1, 3, 6])
+    parser.add_argument("--variants", type=int, nargs="+", default=[3, 10])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    codings = [("gzip", level) for level in (1, 6, 9)]
+    if brotli is not None:
+        codings += [("br", quality) for quality in (1, 5, 11)]
+    else:
+        print("brotli is not installed; only gzip is measured")
+
+    print(f"{'body KiB':>9} {'coding':>8} {'KiB':>8} {'ratio':>7} {'compress ms':>12} {'cache hit ms':>12}")
+    for component_count in args.components:
+        for variants in args.variants:
+            body = _body(component_count, variants)
+            for encoding, level in codings:
+                middleware = CompressionMiddleware(
+                    None, gzip_level=level, brotli_quality=level, offload_size=1 << 62, cache=CompressedBodyCache()
+                )
+                compressed = middleware.compress(body, encoding)
+                compress_time = _best_of(args.repeats, middleware.compress, body, encoding)
+                asyncio.run(middleware.compress_cached(body, encoding))
+                cache_hit = _best_of(args.repeats, _cached_lookup, middleware, body, encoding)
+                print(
+                    f"{len(body) / 1024:>9.1f} {f'{encoding}-{level}':>8} {len(compressed) / 1024:>8.1f} "
+                    f"{len(body) / len(compressed):>6.1f}x {compress_time * 1000:>12.3f} "
+                    f"{cache_hit * 1000:>12.3f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# backend/benchmarks/bench_contrast_engine.py
+"""
+Throughput benchmark for the batch contrast engine against the scalar path
+
+Times auditing and correcting batches of random generated palettes with
+ContrastEngine and one palette at a time (tests/test_contrast_engine.py
+checks that both agree). The scalar audit computes each requirement's ratio
+through colour.Color, the way a per-palette check would be written without
+the engine.
+
+Run from the backend directory:
+    python -m benchmarks.bench_contrast_engine --sizes 1 100 1000 10000
+"""
+
+import argparse
+import random
+import time
+from dataclasses import asdict
+from typing import Dict, List
+
+from colour import Color
+
+from app.services.generators.contrast_engine import CONTRAST_REQUIREMENTS, ContrastEngine, correct_palette
+from app.services.generators.design_generator import DesignGeneratorService
+
+
+def _random_palettes(count: int, rng: random.Random, generator: DesignGeneratorService) -> Dict[str, List[str]]:
+    """Generated palettes before contrast correction, column-wise"""
+    rows = [
+        asdict(generator._generate_color_palette(f"#{rng.randrange(1 << 24):06x}", rng.choice(generator.design_styles), rng))
+        for _ in range(count)
+    ]
+    return {role: [row[role] for row in rows] for role in rows[0]}
+
+
+def _rows(palettes: Dict[str, List[str]]) -> List[Dict[str, str]]:
+    return [dict(zip(palettes, values)) for values in zip(*palettes.values())]
+
+
+def _luminance(color: str) -> float:
+    channels = [value / 12.92 if value <= 0.03928 else ((value + 0.055) / 1.055) ** 2.4 for value in Color(color).rgb]
+    return 0.2126 * channels[0] + 0.7152 * channels[1] + 0.0722 * channels[2]
+
+
+def run_scalar_audit(rows: List[Dict[str, str]]) -> List[bool]:
+    results = []
+    for row in rows:
+        passed = True
+        for foreground, background, minimum in CONTRAST_REQUIREMENTS:
+            first, second = _luminance(row[foreground]), _luminance(row[background])
+            passed &= (max(first, second) + 0.05) / (min(first, second) + 0.05) >= minimum
+        results.append(passed)
+    return results
+
+
+def run_scalar_correct(rows: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    return [correct_palette(row) for row in rows]
+
+
+def _best_of(repeats: int, func, *args) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 1000, 10000])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    generator = DesignGeneratorService()
+    contrast = ContrastEngine()
+    print(f"{'batch':>8} {'op':>8} {'scalar/s':>12} {'batch/s':>12} {'speedup':>8}")
+    for size in args.sizes:
+        palettes = _random_palettes(size, random.Random(args.seed), generator)
+        rows = _rows(palettes)
+        for op, scalar_func, batch_func in (
+            ("audit", run_scalar_audit, contrast.audit),
+            ("correct", run_scalar_correct, contrast.correct),
+        ):
+            scalar = _best_of(args.repeats, scalar_func, rows)
+            batch = _best_of(args.repeats, batch_func, palettes)
+            print(f"{size:>8} {op:>8} {size / scalar:>12.0f} {size / batch:>12.0f} {scalar / batch:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# backend/benchmarks/bench_css_bundle.py
+"""
+CSS bundle size and generation time, scoped versus shared CSS mode
+
+For a grid of component type and variant counts, generates the same request
+in both css modes and reports the total CSS a client has to load (every
+component's styles in scoped mode; the one stylesheet in shared mode),
+raw and gzipped, the markup size and the generation time. Shared bundles
+stop growing once every variant is in use, whatever the number of
+component types, but the stylesheet is a fixed cost and the markup grows by
+a class list per component. "total gz" compresses CSS and markup together;
+"smaller" names the mode that wins on it and "auto" what css_mode 'auto'
+picks (shared_css_pays_off: types * (variants + 2) >= 48 with states,
+types * variants >= 56 without).
+
+Run from the backend directory:
+    python -m benchmarks.bench_css_bundle --types 1 6 18 --variants 1 3 10
+"""
+
+import argparse
+import statistics
+import time
+import zlib
+from typing import Any, Dict, Tuple
+
+import orjson
+
+from app.services.generation_worker import build_generation_payload, resolve_css_mode
+
+COMPONENT_TYPES = [
+    "button", "input", "select", "checkbox", "radio", "toggle", "card", "modal",
+    "dropdown", "accordion", "tab", "navigation", "breadcrumb", "pagination",
+    "table", "list", "avatar", "badge"
+]
+
+
+def _measure(request_data: Dict[str, Any], rounds: int) -> Tuple[int, int, int, int, float]:
+    """CSS bytes, gzipped CSS bytes, template bytes, gzipped CSS + template bytes and median seconds per generation"""
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        body, _ = build_generation_payload(request_data)
+        samples.append(time.perf_counter() - started)
+    response = orjson.loads(body)
+    css = "".join(
+        styles for component in response["components"] for styles in component["styles"].values()
+    ) + response.get("stylesheet", "")
+    markup = "".join(component["template"] for component in response["components"])
+    return (
+        len(css), len(zlib.compress(css.encode("utf-8"), 6)), len(markup),
+        len(zlib.compress((css + markup).encode("utf-8"), 6)), statistics.median(samples)
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--types", type=int, nargs="+", default=[1, 6, 18])
+    parser.add_argument("--variants", type=int, nargs="+", default=[1, 3, 10])
+    parser.add_argument("--framework", choices=["vue", "react"], default="vue")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--no-states", action="store_true", help="Generate without interaction states")
+    args = parser.parse_args()
+
+    print(
+        f"{'types':>5} {'vars':>4} {'scoped CSS':>11} {'shared CSS':>11} {'ratio':>6} "
+        f"{'scoped gz':>10} {'shared gz':>10} {'markup +/-':>11} {'scoped total gz':>16} {'shared total gz':>16} "
+        f"{'smaller':>8} {'auto':>7} {'scoped ms':>10} {'shared ms':>10}"
+    )
+    for type_count in args.types:
+        for variants in args.variants:
+            request_data = {
+                "design_config": {"style": "modern", "colors": {"primary": "#3366ff"}, "seed": 7},
+                "component_types": COMPONENT_TYPES[:type_count],
+                "variants_per_type": variants,
+                "include_states": not args.no_states,
+                "framework": args.framework
+            }
+            scoped = _measure({**request_data, "css_mode": "scoped"}, args.rounds)
+            shared = _measure({**request_data, "css_mode": "shared"}, args.rounds)
+            print(
+                f"{type_count:>5} {variants:>4} {scoped[0]:>11} {shared[0]:>11} {scoped[0] / shared[0]:>5.1f}x "
+                f"{scoped[1]:>10} {shared[1]:>10} {shared[2] - scoped[2]:>+11} {scoped[3]:>16} {shared[3]:>16} "
+                f"{'shared' if shared[3] < scoped[3] else 'scoped':>8} {resolve_css_mode({**request_data, 'css_mode': 'auto'}):>7} "
+                f"{scoped[4] * 1000:>10.2f} {shared[4] * 1000:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
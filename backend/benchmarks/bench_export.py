@@ -0,0 +1,84 @@
+# backend/benchmarks/bench_export.py
+"""
+Benchmark: streamed ZIP export vs building the archive in memory
+
+For growing libraries (component types x variants, both frameworks) reports
+time to the first archive chunk, total time, archive size and the peak Python
+heap allocated while producing it (tracemalloc, measured in a separate pass so
+it does not distort the timings). Streaming should keep the first chunk and
+the peak flat as the library grows; the buffered archive grows with it.
+
+Run from the backend directory:
+    python -m benchmarks.bench_export
+"""
+
+import argparse
+import io
+import time
+import tracemalloc
+import zipfile
+from typing import Any, Callable, Dict, Iterator
+
+from app.services.generators.component_generator import COMPONENT_SPECS
+from app.services.library_export import iter_library_files
+from app.utils.zip_stream import iter_zip
+
+
+def streamed(request_data: Dict[str, Any]) -> Iterator[bytes]:
+    return iter_zip(iter_library_files(request_data))
+
+
+def buffered(request_data: Dict[str, Any]) -> Iterator[bytes]:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=6) as archive:
+        for path, content in iter_library_files(request_data):
+            archive.writestr(path, content)
+    yield buffer.getvalue()
+
+
+def measure(produce: Callable[[Dict[str, Any]], Iterator[bytes]], request_data: Dict[str, Any]) -> Dict[str, float]:
+    started = time.perf_counter()
+    first_chunk = None
+    size = 0
+    for chunk in produce(request_data):
+        if first_chunk is None:
+            first_chunk = time.perf_counter() - started
+        size += len(chunk)
+    total = time.perf_counter() - started
+
+    tracemalloc.start()
+    for _ in produce(request_data):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"first_chunk": first_chunk, "total": total, "size": size, "peak": peak}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--framework", choices=["vue", "react"], default="react")
+    args = parser.parse_args()
+
+    component_types = list(COMPONENT_SPECS)
+    grid = [(1, 1), (6, 3), (len(component_types), 5), (len(component_types), 10)]
+
+    print(f"{'library':>10} {'files':>6} {'mode':>9} {'first chunk':>12} {'total':>10} {'size':>10} {'peak heap':>10}")
+    for types, variants in grid:
+        request_data = {
+            "design_config": {"style": "modern", "colors": {"primary": "#3366ff"}, "seed": 1},
+            "component_types": component_types[:types],
+            "variants_per_type": variants,
+            "include_states": True,
+            "framework": args.framework
+        }
+        files = sum(1 for _ in iter_library_files(request_data))
+        for mode, produce in (("buffered", buffered), ("streamed", streamed)):
+            result = measure(produce, request_data)
+            print(
+                f"{f'{types}x{variants}':>10} {files:>6} {mode:>9} {result['first_chunk'] * 1000:>9.2f} ms "
+                f"{result['total'] * 1000:>7.2f} ms {result['size'] / 1024:>7.1f} KB {result['peak'] / 1024:>7.1f} KB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# backend/benchmarks/bench_live_session.py
+"""
+Live session edits versus re-posting the whole generation request
+
+Replays a scripted editing session (color picker drags, a style switch,
+variant count and framework changes) twice: once as full generate requests,
+as the customizer panel did, and once through a LiveSession producing JSON
+patches. Reports payload bytes per edit, raw and on the wire: each full
+response compressed on its own (as separate HTTP responses are) and patches
+through one deflate stream (as permessage-deflate carries them), plus server
+time per edit (full generation runs with the caches the session warmed, so
+its time is a best case). tests/test_live_session.py checks that the patches
+reproduce the session state.
+
+Run from the backend directory:
+    python -m benchmarks.bench_live_session --drags 50 --components button card input
+"""
+
+import argparse
+import colorsys
+import statistics
+import time
+import zlib
+from typing import Any, Dict, List, Tuple
+
+import orjson
+
+from app.services.generation_worker import build_generation_payload
+from app.services.live_session import LiveSession
+
+
+def _script(drags: int) -> List[Tuple[str, Dict[str, Any]]]:
+    edits: List[Tuple[str, Dict[str, Any]]] = []
+    for index in range(drags):
+        red, green, blue = colorsys.hls_to_rgb(index / drags, 0.5, 0.7)
+        edits.append(("color drag", {"colors": {"primary": f"#{round(red * 255):02x}{round(green * 255):02x}{round(blue * 255):02x}"}}))
+    edits.append(("style", {"style": "brutalist"}))
+    edits.append(("variants", {"variants_per_type": 4}))
+    edits.append(("accent", {"colors": {"accent": "#10b981"}}))
+    edits.append(("framework", {"framework": "react"}))
+    return edits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--drags", type=int, default=50)
+    parser.add_argument("--components", nargs="+", default=["button", "card", "input"])
+    parser.add_argument("--variants", type=int, default=3)
+    args = parser.parse_args()
+
+    request_data = {
+        "design_config": {"style": "modern", "colors": {"primary": "#3366ff"}, "seed": 5},
+        "component_types": args.components,
+        "variants_per_type": args.variants,
+        "include_states": True,
+        "framework": "vue"
+    }
+    session = LiveSession(request_data)
+    snapshot = session.start()
+    snapshot_bytes = len(orjson.dumps(snapshot))
+    patch_deflater = zlib.compressobj(6)
+
+    rows: Dict[str, List[Tuple[int, int, int, int, float, float]]] = {}
+    for name, changes in _script(args.drags):
+        update = session.apply(changes)
+        message = orjson.dumps({"type": "patch", "version": update.version, "ops": update.operations})
+
+        started = time.perf_counter()
+        body, _ = build_generation_payload(session.request_data)
+        full_seconds = time.perf_counter() - started
+
+        full_wire = len(zlib.compress(body, 6))
+        # The WebSocket keeps its compression context from message to message
+        patch_wire = len(patch_deflater.compress(message) + patch_deflater.flush(zlib.Z_SYNC_FLUSH))
+        rows.setdefault(name, []).append(
+            (len(body), len(message), full_wire, patch_wire, full_seconds, update.timings["total"])
+        )
+
+    print(f"snapshot {snapshot_bytes} bytes; {sum(map(len, rows.values()))} edits\n")
+
+    print(f"{'edit':<11} {'n':>4} {'full B':>8} {'patch B':>8} {'ratio':>6} {'full wire':>10} {'patch wire':>11} {'full ms':>8} {'patch ms':>9}")
+    for name, samples in rows.items():
+        full, patch, full_wire, patch_wire, full_seconds, patch_seconds = (statistics.median(column) for column in zip(*samples))
+        print(
+            f"{name:<11} {len(samples):>4} {full:>8.0f} {patch:>8.0f} {full / patch:>5.1f}x {full_wire:>10.0f} "
+            f"{patch_wire:>11.0f} {full_seconds * 1000:>8.2f} {patch_seconds * 1000:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
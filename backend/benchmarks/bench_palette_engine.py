@@ -0,0 +1,78 @@
+# backend/benchmarks/bench_palette_engine.py
+"""
+Throughput benchmark for the batch palette engine against the scalar path
+
+Both sides produce what generate_design_system's colors and shadows sections
+hold for a requested primary color: the harmony palette, the requested primary
+and the WCAG contrast correction (tests/test_palette_engine.py checks that
+they agree). Throughput is reported per batch size, the way the palette
+pre-generation job calls the engine.
+
+Run from the backend directory:
+    python -m benchmarks.bench_palette_engine --sizes 1 10 100 1000 10000
+"""
+
+import argparse
+import random
+import time
+from typing import List
+
+from colour import Color
+
+from app.services.generators.design_generator import DesignGeneratorService
+from app.services.generators.palette_engine import BatchPaletteEngine
+
+
+def _random_inputs(count: int, rng: random.Random, generator: DesignGeneratorService):
+    colors = [f"#{rng.randrange(1 << 24):06x}" for _ in range(count)]
+    styles = [rng.choice(generator.design_styles) for _ in range(count)]
+    harmonies = [rng.choice(generator.color_harmonies) for _ in range(count)]
+    return colors, styles, harmonies
+
+
+def run_scalar(generator: DesignGeneratorService, colors: List[str], styles: List[str], harmonies: List[str]):
+    """Palette plus shadows for each color through colour.Color/colorsys, as _build_section does"""
+    results = []
+    for color, style, harmony in zip(colors, styles, harmonies):
+        hue, saturation, lightness = Color(color).hsl
+        palette = generator._build_color_palette(hue, saturation, lightness, style, harmony)
+        palette = generator._apply_color_overrides(palette, {'primary': color})
+        palette = generator._ensure_contrast(palette, locked_roles=['primary'])
+        results.append((palette, generator._generate_shadow_system(style, palette)))
+    return results
+
+
+def run_batch(engine: BatchPaletteEngine, colors: List[str], styles: List[str], harmonies: List[str]):
+    """Palette plus shadows for the whole batch through the NumPy engine"""
+    palettes = engine.generate_palettes(colors, styles, harmonies)
+    return palettes, engine.generate_shadow_systems(palettes['shadow'], styles)
+
+
+def _best_of(repeats: int, func, *args) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000, 10000])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    generator = DesignGeneratorService()
+    engine = BatchPaletteEngine(generator)
+    print(f"{'batch':>8} {'scalar/s':>12} {'batch/s':>12} {'speedup':>8}")
+    for size in args.sizes:
+        colors, styles, harmonies = _random_inputs(size, random.Random(args.seed), generator)
+        scalar = _best_of(args.repeats, run_scalar, generator, colors, styles, harmonies)
+        batch = _best_of(args.repeats, run_batch, engine, colors, styles, harmonies)
+        print(f"{size:>8} {size / scalar:>12.0f} {size / batch:>12.0f} {scalar / batch:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
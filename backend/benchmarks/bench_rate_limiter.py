@@ -0,0 +1,79 @@
+# backend/benchmarks/bench_rate_limiter.py
+"""
+Microbenchmark: RateLimiter.allow over a million distinct client IPs
+
+Per-check cost is reported for each slice of 100k new keys, so any growth with
+the number of tracked keys shows up as a rising column, along with tracked key
+counts and a single hot key's allowance. tests/test_rate_limiter.py checks the
+limits and the key cap of both backends.
+
+Run from the backend directory:
+    python -m benchmarks.bench_rate_limiter
+    python -m benchmarks.bench_rate_limiter --keys 200000 --backend shared
+"""
+
+import argparse
+import resource
+import time
+import uuid
+
+from app.utils.rate_limiter import InMemoryBackend, RateLimiter, SharedMemoryBackend
+
+
+def _ip(index: int) -> str:
+    return f"{(index >> 24) & 255}.{(index >> 16) & 255}.{(index >> 8) & 255}.{index & 255}"
+
+
+def _make_backend(kind: str, max_keys: int):
+    if kind == "memory":
+        return InMemoryBackend(max_keys=max_keys)
+    # A unique segment name per run so repeated runs start from an empty table
+    return SharedMemoryBackend(name=f"bench_rate_limit_{uuid.uuid4().hex[:8]}", max_keys=max_keys)
+
+
+def run(kind: str, keys: int, max_keys: int, slice_size: int) -> None:
+    limiter = RateLimiter(max_requests=100, window_seconds=60, backend=_make_backend(kind, max_keys))
+    ips = [_ip(i) for i in range(keys)]
+
+    print(f"backend={kind} max_keys={max_keys}")
+    print(f"{'keys seen':>10} {'ns/check':>10} {'tracked':>10}")
+    started = time.perf_counter()
+    for offset in range(0, keys, slice_size):
+        chunk = ips[offset:offset + slice_size]
+        chunk_started = time.perf_counter()
+        for ip in chunk:
+            limiter.allow(ip)
+        elapsed = time.perf_counter() - chunk_started
+        tracked = len(limiter.backend) if kind == "memory" else "-"
+        print(f"{offset + len(chunk):>10} {elapsed / len(chunk) * 1e9:>10.0f} {tracked:>10}")
+    total = time.perf_counter() - started
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print(f"total {keys} checks in {total:.2f}s ({keys / total:,.0f} checks/s), peak RSS {peak_rss:.0f} MB")
+
+    # One hot key: exactly max_requests of the first 150 calls may pass
+    allowed = sum(limiter.allow("203.0.113.7") for _ in range(150))
+    print(f"hot key allowed {allowed}/150 (limit {limiter.max_requests})")
+    evicted = limiter.backend.evict_idle(time.monotonic() + 180, limiter.window_seconds)
+    print(f"idle sweep after 3 windows evicted {evicted} keys")
+
+    limiter.backend.close()
+    if kind == "shared":
+        limiter.backend.unlink()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--keys", type=int, default=1_000_000, help="distinct client IPs")
+    parser.add_argument("--max-keys", type=int, default=100_000, help="backend key cap")
+    parser.add_argument("--slice", type=int, default=100_000, help="keys per reported slice")
+    parser.add_argument("--backend", choices=["memory", "shared", "both"], default="both")
+    args = parser.parse_args()
+
+    for kind in (["memory", "shared"] if args.backend == "both" else [args.backend]):
+        run(kind, args.keys, args.max_keys, args.slice)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# backend/benchmarks/bench_request_pipeline.py
+"""
+Benchmark: requests per second through the request middleware, before and after
+
+"before" is the previous @app.middleware("http") implementation (uuid4 IDs,
+two f-string log lines per request, synchronous StreamHandler); "after" is
+RequestContextMiddleware with JSON logging through the queue listener, at full
+and sampled access logging. Each app serves a trivial JSON route and a small
+streamed route, driven in-process over ASGI so only the pipeline differs.
+Logs go to a temporary file.
+
+Run from the backend directory:
+    python -m benchmarks.bench_request_pipeline --requests 5000 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.utils.logging_config import setup_logging
+from app.utils.rate_limiter import RateLimiter
+from app.utils.request_middleware import RequestContextMiddleware
+
+
+def _add_routes(app: FastAPI) -> FastAPI:
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(8):
+                yield f'{{"chunk":{i}}}\n'.encode()
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    return app
+
+
+def build_before_app(rate_limiter: RateLimiter) -> FastAPI:
+    app = FastAPI()
+    logger = logging.getLogger("bench.before")
+
+    @app.middleware("http")
+    async def request_middleware(request: Request, call_next):
+        import uuid
+        request_id = str(uuid.uuid4())
+        request.state.request_id = request_id
+        client_ip = request.client.host if request.client else "unknown"
+        if not await rate_limiter.is_allowed(client_ip):
+            return JSONResponse(status_code=429, content={"request_id": request_id})
+        logger.info(f"Request {request_id}: {request.method} {request.url} from {client_ip}")
+        response = await call_next(request)
+        logger.info(f"Response {request_id}: {response.status_code}")
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+    return _add_routes(app)
+
+
+def build_after_app(rate_limiter: RateLimiter, sample_rate: float) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware, rate_limiter=rate_limiter, access_log_sample_rate=sample_rate)
+    return _add_routes(app)
+
+
+async def measure(app: FastAPI, total: int, concurrency: int, path: str) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(50):
+            await client.get(path)
+
+        remaining = iter(range(total))
+
+        async def worker() -> None:
+            for _ in remaining:
+                response = await client.get(path)
+                assert response.status_code == 200 and response.headers["x-request-id"]
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    log_file = tempfile.NamedTemporaryFile("w", suffix=".log", delete=True)
+    limiter = RateLimiter(max_requests=10 ** 9, window_seconds=60)
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    # Before: synchronous handler with the old text format
+    sync_handler = logging.StreamHandler(log_file)
+    sync_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+    root.handlers = [sync_handler]
+    results = []
+    for path in ("/ping", "/stream"):
+        results.append(("before", path, asyncio.run(measure(build_before_app(limiter), args.requests, args.concurrency, path))))
+
+    # After: queue-backed JSON logging
+    setup_logging(stream=log_file)
+    for sample_rate in (1.0, 0.1):
+        for path in ("/ping", "/stream"):
+            rps = asyncio.run(measure(build_after_app(limiter, sample_rate), args.requests, args.concurrency, path))
+            results.append((f"after@{sample_rate:g}", path, rps))
+
+    baseline = {path: rps for label, path, rps in results if label == "before"}
+    print(f"{'pipeline':>12} {'route':>8} {'req/s':>10} {'vs before':>10}")
+    for label, path, rps in results:
+        print(f"{label:>12} {path:>8} {rps:>10.0f} {rps / baseline[path]:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
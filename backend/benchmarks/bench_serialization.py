@@ -0,0 +1,102 @@
+# backend/benchmarks/bench_serialization.py
+"""
+Benchmark: response serialization cost for a maximal generate request
+
+Builds the components and tokens for every component type with 10 variants
+once, then times only the encoding of the response body:
+
+  jsonable_encoder  dict with nested token dataclasses -> jsonable_encoder ->
+                    JSONResponse.render (the original endpoint path)
+  json.dumps        asdict() + json.dumps (the previous worker path)
+  orjson            orjson for the envelope, token JSON encoded per call
+  orjson+cached     orjson envelope spliced with the token set's cached to_json()
+
+tests/test_serialization.py checks that the encodings agree.
+
+Run from the backend directory:
+    python -m benchmarks.bench_serialization
+"""
+
+import argparse
+import json
+import time
+from dataclasses import asdict, is_dataclass
+from typing import Callable
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.services.generation_worker import generate_design_tokens, iter_components
+from app.services.generators.component_generator import COMPONENT_SPECS
+from app.services.generators.design_generator import SECTION_DEPENDENCIES, DesignTokens
+
+
+def _time(func: Callable[[], bytes], repeat: int) -> float:
+    func()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    request_data = {
+        "design_config": {"style": "modern", "colors": {"primary": "#3366ff"}, "seed": 1},
+        "component_types": list(COMPONENT_SPECS),
+        "variants_per_type": 10,
+        "framework": "vue",
+        "include_states": True
+    }
+    design_tokens = generate_design_tokens(request_data)
+    components = list(iter_components(request_data, design_tokens))
+    envelope = {
+        "success": True,
+        "message": f"Successfully generated {len(components)} components",
+        "components": components,
+        "generation_time": 0.0,
+        "total_components": len(components)
+    }
+
+    sections = {name: getattr(design_tokens, name) for name in SECTION_DEPENDENCIES}
+
+    def original() -> bytes:
+        content = {**envelope, "design_tokens": sections}
+        return JSONResponse(content=jsonable_encoder(content)).body
+
+    def stdlib_json() -> bytes:
+        content = {**envelope, "design_tokens": {name: asdict(value) if is_dataclass(value) else dict(value) for name, value in sections.items()}}
+        return json.dumps(content, separators=(",", ":")).encode("utf-8")
+
+    def orjson_fresh() -> bytes:
+        # A fresh token object each call, so nothing is cached
+        tokens = DesignTokens(**sections)
+        return orjson.dumps(envelope)[:-1] + b',"design_tokens":' + tokens.to_json() + b"}"
+
+    def orjson_cached() -> bytes:
+        return orjson.dumps(envelope)[:-1] + b',"design_tokens":' + design_tokens.to_json() + b"}"
+
+    print(f"{len(components)} components ({len(COMPONENT_SPECS)} types x 10 variants)")
+    print(f"{'path':>18} {'ms/response':>12} {'MB/s':>8} {'bytes':>10} {'speedup':>8}")
+    baseline = None
+    for name, func in (
+        ("jsonable_encoder", original),
+        ("json.dumps", stdlib_json),
+        ("orjson", orjson_fresh),
+        ("orjson+cached", orjson_cached)
+    ):
+        body = func()
+        seconds = _time(func, args.repeat)
+        baseline = baseline or seconds
+        print(
+            f"{name:>18} {seconds * 1000:>12.3f} {len(body) / seconds / 1e6:>8.1f} "
+            f"{len(body):>10} {baseline / seconds:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# backend/benchmarks/bench_similarity_index.py
+"""
+Lookup latency of the design similarity index against a linear scan
+
+Feature vectors come from generated designs; sizes beyond --designs are
+filled with slightly perturbed copies of them, which keeps the clustered
+shape of real data (and many near-duplicates) at large sizes.
+tests/test_similarity_index.py checks lookups against a linear scan.
+
+Run from the backend directory:
+    python -m benchmarks.bench_similarity_index --sizes 1000 10000 100000 300000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.services.generators.design_generator import DesignGeneratorService
+from app.services.similarity_index import DesignSimilarityIndex, design_features
+
+
+def linear_nearest(points: np.ndarray, features: np.ndarray, threshold: float):
+    distances = np.sqrt(((points - features) ** 2).sum(axis=1))
+    position = int(np.argmin(distances))
+    return (str(position), float(distances[position])) if distances[position] <= threshold else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 300000])
+    parser.add_argument("--designs", type=int, default=10000, help="distinct generated designs")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--threshold", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    generator = DesignGeneratorService()
+    started = time.perf_counter()
+    designs = np.array([
+        design_features(generator.generate_design_system(seed=args.seed * 1_000_000 + index))
+        for index in range(args.designs + args.queries)
+    ])
+    print(f"generated {len(designs)} designs in {time.perf_counter() - started:.1f} s")
+    queries, designs = designs[:args.queries], designs[args.queries:]
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'indexed':>8} {'add':>10} {'lookup p50':>11} {'lookup p99':>11} {'linear':>10} {'duplicates':>11}")
+    for size in args.sizes:
+        copies = designs[rng.integers(0, len(designs), max(size - len(designs), 0))]
+        points = np.concatenate([designs[:size], copies + rng.normal(0, 0.01, copies.shape)])
+
+        index = DesignSimilarityIndex(threshold=args.threshold)
+        started = time.perf_counter()
+        for position, features in enumerate(points):
+            index.add(str(position), features)
+        add = (time.perf_counter() - started) / size
+
+        latencies = []
+        duplicates = 0
+        for features in queries:
+            started = time.perf_counter()
+            match = index.nearest(features)
+            latencies.append(time.perf_counter() - started)
+            if match is not None:
+                duplicates += 1
+
+        started = time.perf_counter()
+        for features in queries[:100]:
+            linear_nearest(points, features, args.threshold)
+        linear = (time.perf_counter() - started) / min(len(queries), 100)
+
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1e6
+        print(
+            f"{size:>8} {add * 1e6:>7.1f} us {p50:>8.1f} us {p99:>8.1f} us {linear * 1e6:>7.0f} us "
+            f"{duplicates / len(queries):>10.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# backend/benchmarks/bench_single_flight.py
+"""
+Single-flight coalescing of identical generate requests: timing
+
+Times a burst of N concurrent identical POST /api/v1/components/generate
+requests (coalesced into one generation) against a burst of N distinct ones,
+with the app in-process over httpx's ASGI transport. The coalescing behavior
+itself is covered by tests/test_single_flight.py.
+
+Run from the backend directory:
+    python -m benchmarks.bench_single_flight --requests 32 --components 18 --variants 3
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Any, Dict, List
+
+import httpx
+
+COMPONENT_TYPES = [
+    "button", "input", "select", "checkbox", "radio", "toggle", "card", "modal",
+    "dropdown", "accordion", "tab", "navigation", "breadcrumb", "pagination",
+    "table", "list", "avatar", "badge"
+]
+
+
+async def _burst(client: httpx.AsyncClient, bodies: List[Dict[str, Any]]) -> List[httpx.Response]:
+    return await asyncio.gather(*(client.post("/api/v1/components/generate", json=body) for body in bodies))
+
+
+async def run(args: argparse.Namespace) -> None:
+    from app.main import app
+
+    body = {
+        "design_config": {"style": "modern", "colors": {"primary": "#3366ff"}, "seed": 11},
+        "component_types": COMPONENT_TYPES[:args.components],
+        "variants_per_type": args.variants,
+        "framework": "vue"
+    }
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost", timeout=60) as client:
+        print(f"{args.requests} concurrent requests, median of {args.rounds} rounds")
+        for label, make_bodies in (
+            ("identical", lambda round_index: [{**body, "design_config": {**body["design_config"], "seed": 1000 + round_index}}] * args.requests),
+            ("distinct", lambda round_index: [
+                {**body, "design_config": {**body["design_config"], "seed": 2000 + round_index * args.requests + index}}
+                for index in range(args.requests)
+            ])
+        ):
+            samples = []
+            for round_index in range(args.rounds):
+                started = time.perf_counter()
+                responses = await _burst(client, make_bodies(round_index))
+                samples.append(time.perf_counter() - started)
+                if any(response.status_code != 200 for response in responses):
+                    raise RuntimeError(f"{label} burst: {sorted({response.status_code for response in responses})}")
+            samples.sort()
+            print(f"  {label:<10} {samples[len(samples) // 2] * 1000:>9.1f} ms per burst")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--components", type=int, default=18)
+    parser.add_argument("--variants", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ["RATE_LIMIT_MAX_REQUESTS"] = str(10 ** 9)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
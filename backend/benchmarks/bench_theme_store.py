@@ -0,0 +1,121 @@
+# backend/benchmarks/bench_theme_store.py
+"""
+Theme store benchmark: bulk save throughput and lookup latency at scale
+
+Fills a fresh SQLite store with --themes saved themes that share --token-sets
+distinct generated token sets (so deduplication is exercised), then reports
+p50/p99 latency for fetching by id, the first and a deep listing page (by
+style, by style + hue, unfiltered), and name-prefix search. Deep pages are
+reached with a keyset cursor, which is what keeps them as fast as page one.
+
+Run from the backend directory:
+    python -m benchmarks.bench_theme_store --themes 1000000 --token-sets 2000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from typing import Awaitable, Callable, List
+
+from app.services.generators.design_generator import DesignGeneratorService
+from app.services.theme_store import ThemeRecord, ThemeStore, encode_cursor
+
+WORDS = ["ocean", "forest", "sunset", "midnight", "citrus", "slate", "ember", "glacier", "meadow", "neon"]
+
+
+def _token_set_records(count: int, rng: random.Random) -> List[ThemeRecord]:
+    generator = DesignGeneratorService()
+    records = []
+    for index in range(count):
+        style = rng.choice(generator.design_styles)
+        design_config = {"style": style, "colors": {"primary": f"#{rng.randrange(1 << 24):06x}"}, "seed": index}
+        design_tokens = generator.generate_design_system(
+            base_config=design_config,
+            style_preference=style,
+            color_preference=design_config["colors"]["primary"],
+            seed=index
+        )
+        records.append(ThemeRecord.create(f"{rng.choice(WORDS)} {index}", design_config, design_tokens))
+    return records
+
+
+async def _latency(runs: int, func: Callable[[], Awaitable]) -> str:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await func()
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return f"p50 {statistics.median(samples) * 1000:7.3f} ms   p99 {p99 * 1000:7.3f} ms"
+
+
+async def run(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    directory = tempfile.mkdtemp(prefix="theme-store-bench-")
+    store = ThemeStore(os.path.join(directory, "themes.db"), readers=args.readers)
+
+    started = time.perf_counter()
+    templates = _token_set_records(args.token_sets, rng)
+    print(f"generated {len(templates)} token sets in {time.perf_counter() - started:.1f} s")
+
+    started = time.perf_counter()
+    saved = 0
+    while saved < args.themes:
+        batch = [
+            ThemeRecord(**{**vars(template), "name": f"{rng.choice(WORDS)} {rng.choice(WORDS)} {saved + offset}"})
+            for offset, template in enumerate(rng.choices(templates, k=min(args.batch, args.themes - saved)))
+        ]
+        await store.save_many(batch)
+        saved += len(batch)
+    elapsed = time.perf_counter() - started
+    size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+    print(f"saved {saved} themes in {elapsed:.1f} s ({saved / elapsed:.0f}/s), database {size / 2 ** 20:.0f} MiB")
+
+    styles = sorted({template.style for template in templates})
+    buckets = sorted({template.hue_bucket for template in templates})
+    # The cursor of the middle row stands in for page N/2 of the newest-first order
+    middle_row = (await store.get(saved // 2)).summary
+    middle = encode_cursor(middle_row["created_at"], middle_row["id"])
+
+    cases = [
+        ("get by id", lambda: store.get(rng.randrange(1, saved + 1))),
+        ("list, first page", lambda: store.list(limit=20)),
+        ("list, deep page", lambda: store.list(limit=20, cursor=middle)),
+        ("list by style", lambda: store.list(style=rng.choice(styles), limit=20)),
+        ("list by style, deep", lambda: store.list(style=rng.choice(styles), limit=20, cursor=middle)),
+        ("list by style + hue", lambda: store.list(style=rng.choice(styles), hue_bucket=rng.choice(buckets), limit=20)),
+        ("search by name prefix", lambda: store.search(rng.choice(WORDS)[:3], limit=20)),
+    ]
+    print(f"\n{'query':<24} latency over {args.runs} runs")
+    for name, func in cases:
+        print(f"{name:<24} {await _latency(args.runs, func)}")
+
+    # Concurrent reads share the reader pool
+    started = time.perf_counter()
+    await asyncio.gather(*(store.get(rng.randrange(1, saved + 1)) for _ in range(args.runs)))
+    elapsed = time.perf_counter() - started
+    print(f"\n{args.runs} concurrent gets: {args.runs / elapsed:.0f}/s with {args.readers} readers")
+
+    await store.close()
+    shutil.rmtree(directory)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--themes", type=int, default=200000)
+    parser.add_argument("--token-sets", type=int, default=1000)
+    parser.add_argument("--batch", type=int, default=10000)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
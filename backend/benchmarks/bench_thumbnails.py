@@ -0,0 +1,103 @@
+# backend/benchmarks/bench_thumbnails.py
+"""
+Thumbnail rendering: cold render cost, cache hits and worker pool scaling
+
+Renders one thumbnail per design style at each width and format with an
+empty cache (cold) and again from the cache, then renders --jobs distinct
+thumbnails through a worker pool with 1 process, --workers threads and
+--workers processes. Pillow releases the GIL for only part of a render, so
+threads gain little over a single worker; the API renders in the generation
+process pool instead, which scales up to the number of CPUs.
+
+Run from the backend directory:
+    python -m benchmarks.bench_thumbnails --widths 320 640 --workers 4
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from typing import Callable, List
+
+from app.services.generators.component_generator import token_key
+from app.services.generators.design_generator import DesignGeneratorService, DesignTokens
+from app.services.thumbnails import THUMBNAIL_FORMATS, ThumbnailRenderer, render_thumbnail
+from app.utils.worker_pool import BoundedWorkerPool
+
+
+def _token_sets(count: int) -> List[DesignTokens]:
+    generator = DesignGeneratorService()
+    styles = generator.design_styles
+    return [
+        generator.generate_design_system(
+            style_preference=styles[index % len(styles)],
+            color_preference=f"#{(index * 2654435761) % (1 << 24):06x}",
+            seed=index
+        )
+        for index in range(count)
+    ]
+
+
+def _median_ms(runs: int, func: Callable[[], object]) -> float:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+async def _throughput(workers: int, use_processes: bool, token_sets: List[DesignTokens], width: int, image_format: str) -> float:
+    pool = BoundedWorkerPool(name="thumbnails", max_workers=workers, max_queue=len(token_sets), use_processes=use_processes)
+    # Start the workers (and their imports) outside the timed section
+    await asyncio.gather(*(pool.run(render_thumbnail, token_sets[0], width, image_format) for _ in range(workers)))
+    started = time.perf_counter()
+    await asyncio.gather(*(pool.run(render_thumbnail, design_tokens, width, image_format) for design_tokens in token_sets))
+    elapsed = time.perf_counter() - started
+    pool.shutdown()
+    return len(token_sets) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--widths", type=int, nargs="+", default=[320, 640])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--jobs", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    styles = DesignGeneratorService().design_styles
+    token_sets = _token_sets(max(args.jobs, len(styles)))
+
+    print(f"{'format':<6} {'width':>6} {'cold ms':>9} {'cached ms':>10} {'bytes':>8}   (median over {len(styles)} styles)")
+    for image_format in THUMBNAIL_FORMATS:
+        for width in args.widths:
+            cold, cached, sizes = [], [], []
+            for design_tokens in token_sets[:len(styles)]:
+                token_hash = token_key(design_tokens)
+
+                def render_cold():
+                    return ThumbnailRenderer().render(design_tokens, token_hash, width, image_format)
+
+                renderer = ThumbnailRenderer()
+                sizes.append(len(renderer.render(design_tokens, token_hash, width, image_format)))
+                cold.append(_median_ms(args.runs, render_cold))
+                cached.append(_median_ms(args.runs * 100, lambda: renderer.cached(token_hash, width, image_format)))
+            print(
+                f"{image_format:<6} {width:>6} {statistics.median(cold):>9.2f} "
+                f"{statistics.median(cached):>10.4f} {int(statistics.median(sizes)):>8}"
+            )
+
+    width = args.widths[0]
+    jobs = token_sets[:args.jobs]
+    single = asyncio.run(_throughput(1, True, jobs, width, "png"))
+    threads = asyncio.run(_throughput(args.workers, False, jobs, width, "png"))
+    processes = asyncio.run(_throughput(args.workers, True, jobs, width, "png"))
+    print(f"\n{len(jobs)} png thumbnails at {width}px ({os.cpu_count()} CPUs)")
+    print(f"  1 process     {single:>7.0f}/s")
+    print(f"  {args.workers} threads     {threads:>7.0f}/s ({threads / single:.1f}x)")
+    print(f"  {args.workers} processes   {processes:>7.0f}/s ({processes / single:.1f}x)")
+
+if __name__ == "__main__":
+    main()
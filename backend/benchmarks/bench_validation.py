@@ -0,0 +1,119 @@
+# backend/benchmarks/bench_validation.py
+"""
+Validation throughput for batched generation requests
+
+Compares the previous request models (v1-style @validator, colors as plain
+strings; reproduced here) with the current ones, both parsed the way
+FastAPI does it (json.loads, then validating the dict) and ending with the
+dict form handed to the batch runner. The last column validates the raw
+body with TypeAdapter.validate_json instead, which on pydantic 2.5 is not
+faster than json.loads plus validating the dict, so the endpoint keeps
+FastAPI's parsing. tests/test_validation.py covers what the models accept.
+
+Run from the backend directory:
+    python -m benchmarks.bench_validation --sizes 1 100 1000
+"""
+
+import argparse
+import json
+import random
+import time
+import warnings
+from typing import Any, Callable, Dict, List, Optional
+
+import orjson
+from pydantic import BaseModel, Field, TypeAdapter, validator
+
+from app.api.endpoints.themes import DESIGN_CONFIGS_ADAPTER, ThemeBatchRequest
+from app.api.validation import DESIGN_STYLES
+
+
+class LegacyColorPaletteRequest(BaseModel):
+    primary: str = Field(...)
+    secondary: Optional[str] = Field(None)
+    accent: Optional[str] = Field(None)
+    neutral: Optional[str] = Field(None)
+    background: Optional[str] = Field(None)
+    surface: Optional[str] = Field(None)
+
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+
+    class LegacyDesignConfigRequest(BaseModel):
+        style: str = Field(default="modern")
+        colors: LegacyColorPaletteRequest = Field(...)
+        seed: Optional[int] = Field(None)
+
+        @validator('style')
+        def validate_style(cls, v):
+            allowed_styles = ['modern', 'minimalist', 'brutalist', 'glassmorphism', 'neumorphism', 'retro', 'organic', 'geometric']
+            if v not in allowed_styles:
+                raise ValueError(f'Style must be one of: {", ".join(allowed_styles)}')
+            return v
+
+
+class LegacyThemeBatchRequest(BaseModel):
+    items: List[LegacyDesignConfigRequest] = Field(..., min_length=1, max_length=1000)
+
+
+def _payload(size: int, rng: random.Random) -> bytes:
+    items = []
+    for _ in range(size):
+        colors: Dict[str, Any] = {"primary": f"#{rng.randrange(1 << 24):06X}"}
+        for role in ("secondary", "accent", "background"):
+            if rng.random() < 0.5:
+                colors[role] = f"#{rng.randrange(1 << 24):06x}"
+        items.append({"style": rng.choice(DESIGN_STYLES), "colors": colors, "seed": rng.randrange(1 << 31)})
+    return orjson.dumps({"items": items})
+
+
+def run_legacy(body: bytes) -> List[Dict[str, Any]]:
+    request = LegacyThemeBatchRequest.model_validate(json.loads(body))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return [item.dict() for item in request.items]
+
+
+def run_model(body: bytes) -> List[Dict[str, Any]]:
+    request = ThemeBatchRequest.model_validate(json.loads(body))
+    return DESIGN_CONFIGS_ADAPTER.dump_python(request.items)
+
+
+def run_validate_json(body: bytes) -> List[Dict[str, Any]]:
+    return DESIGN_CONFIGS_ADAPTER.dump_python(THEME_BATCH_REQUEST.validate_json(body).items)
+
+
+THEME_BATCH_REQUEST = TypeAdapter(ThemeBatchRequest)
+
+
+def _best_of(repeats: int, func: Callable, *args) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 1000])
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'items':>6} {'legacy/s':>12} {'current/s':>12} {'speedup':>8} {'validate_json/s':>16}")
+    for size in args.sizes:
+        body = _payload(size, random.Random(args.seed))
+        legacy = _best_of(args.repeats, run_legacy, body)
+        model = _best_of(args.repeats, run_model, body)
+        validate_json = _best_of(args.repeats, run_validate_json, body)
+        print(
+            f"{size:>6} {size / legacy:>12.0f} {size / model:>12.0f} {legacy / model:>7.1f}x "
+            f"{size / validate_json:>16.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
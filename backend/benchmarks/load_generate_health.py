@@ -0,0 +1,138 @@
+# backend/benchmarks/load_generate_health.py
+"""
+Load test: /health latency while generate traffic saturates the service
+
+Starts the API under uvicorn in a subprocess (so the load generator does not
+share its event loop), measures /health latency at idle, then again while
+concurrent clients post maximal generate requests.
+
+Run from the backend directory:
+    python -m benchmarks.load_generate_health --concurrency 16 --duration 5
+    python -m benchmarks.load_generate_health --executor thread   # compare
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import List
+
+import httpx
+
+COMPONENT_TYPES = [
+    "button", "input", "select", "checkbox", "radio", "toggle", "card", "modal",
+    "dropdown", "accordion", "tab", "navigation", "breadcrumb", "pagination",
+    "table", "list", "avatar", "badge"
+]
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+def _generate_payload(index: int) -> dict:
+    return {
+        "design_config": {
+            "style": "modern",
+            "colors": {"primary": f"#{(index * 7919) % 0xFFFFFF:06x}"},
+            "seed": index
+        },
+        "component_types": COMPONENT_TYPES,
+        "variants_per_type": 10
+    }
+
+
+async def _probe_health(client: httpx.AsyncClient, stop_at: float, interval: float) -> List[float]:
+    latencies = []
+    while time.perf_counter() < stop_at:
+        started = time.perf_counter()
+        response = await client.get("/health")
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def _drive_generate(client: httpx.AsyncClient, stop_at: float, worker: int, statuses: Counter) -> None:
+    index = worker
+    while time.perf_counter() < stop_at:
+        response = await client.post("/api/v1/components/generate", json=_generate_payload(index))
+        statuses[response.status_code] += 1
+        if response.status_code == 503:
+            await asyncio.sleep(float(response.headers.get("Retry-After", "1")) / 10)
+        index += 1000
+
+
+async def _wait_until_ready(client: httpx.AsyncClient, timeout: float) -> None:
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        if time.perf_counter() > deadline:
+            raise RuntimeError("API did not become ready")
+        await asyncio.sleep(0.1)
+
+
+async def run(base_url: str, concurrency: int, duration: float, interval: float) -> None:
+    limits = httpx.Limits(max_connections=concurrency + 4)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        await _wait_until_ready(client, timeout=30)
+        idle = await _probe_health(client, time.perf_counter() + min(duration, 2.0), interval)
+
+        statuses: Counter = Counter()
+        stop_at = time.perf_counter() + duration
+        drivers = [
+            asyncio.create_task(_drive_generate(client, stop_at, worker, statuses))
+            for worker in range(concurrency)
+        ]
+        loaded = await _probe_health(client, stop_at, interval)
+        await asyncio.gather(*drivers)
+        pool_stats = (await client.get("/api/v1/components/health")).json().get("generation_pool")
+
+    print(f"{'phase':>8} {'samples':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for phase, samples in (("idle", idle), ("loaded", loaded)):
+        print(
+            f"{phase:>8} {len(samples):>8} {_percentile(samples, 0.5):>8.2f} "
+            f"{_percentile(samples, 0.99):>8.2f} {max(samples, default=0.0):>8.2f}"
+        )
+    print(f"generate responses by status: {dict(statuses)} ({sum(statuses.values()) / duration:.1f} req/s)")
+    print(f"generation pool: {pool_stats}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent generate clients")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds of generate load")
+    parser.add_argument("--interval", type=float, default=0.005, help="pause between /health probes")
+    parser.add_argument("--executor", choices=["process", "thread"], default="process")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    env = {
+        **os.environ,
+        "GENERATION_EXECUTOR": args.executor,
+        # The per-IP limiter would otherwise reject the load generator itself
+        "RATE_LIMIT_MAX_REQUESTS": str(10 ** 9)
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+        env=env
+    )
+    try:
+        asyncio.run(run(f"http://127.0.0.1:{args.port}", args.concurrency, args.duration, args.interval))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+# backend/benchmarks/suite.py
+"""
+Benchmark suite with JSON baselines and regression checks
+
+Covers generate_design_system per style, each sub-generator on its own,
+RateLimiter.is_allowed across a large key space, and end-to-end
+POST /api/v1/components/generate over a grid of component and variant counts
+through an in-process ASGI client (app lifespan included).
+
+Every benchmark is timed in several rounds; the median per-operation time is
+compared with the saved baseline and the run fails (exit status 1) when any
+benchmark is slower by more than the threshold.
+
+Run from the backend directory:
+    python -m benchmarks.suite --save                 # record a baseline
+    python -m benchmarks.suite                        # compare against it
+    python -m benchmarks.suite --filter design --threshold 0.25
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "suite.json")
+
+STYLES = ["modern", "minimalist", "brutalist", "glassmorphism", "neumorphism", "retro", "organic", "geometric"]
+COMPONENT_TYPES = [
+    "button", "input", "select", "checkbox", "radio", "toggle", "card", "modal",
+    "dropdown", "accordion", "tab", "navigation", "breadcrumb", "pagination",
+    "table", "list", "avatar", "badge"
+]
+COMPONENT_GRID = [1, 6, 18]
+VARIANT_GRID = [1, 3, 10]
+
+Benchmark = Tuple[str, Callable[[], Callable[[], None]]]
+
+
+def _seeds() -> Iterator[int]:
+    """Fresh seeds so every generation misses the token and fragment caches"""
+    return itertools.count(1)
+
+
+def design_benchmarks() -> List[Benchmark]:
+    from app.services.generators.design_generator import DesignGeneratorService
+
+    benchmarks: List[Benchmark] = []
+    for style in STYLES:
+        def setup(style=style):
+            service = DesignGeneratorService()
+            seeds = _seeds()
+            return lambda: service.generate_design_system(
+                base_config={"colors": {"primary": "#3366ff"}},
+                style_preference=style,
+                color_preference="#3366ff",
+                seed=next(seeds)
+            )
+        benchmarks.append((f"design.generate_design_system[{style}]", setup))
+    return benchmarks
+
+
+def sub_generator_benchmarks() -> List[Benchmark]:
+    from app.services.generators.design_generator import DesignGeneratorService
+
+    service = DesignGeneratorService()
+    rng = random.Random(42)
+    colors = service._generate_color_palette("#3366ff", "modern", rng)
+    stages = {
+        "colors": lambda: service._generate_color_palette("#3366ff", "modern", rng),
+        "typography": lambda: service._generate_typography_system("modern", rng),
+        "spacing": lambda: service._generate_spacing_system("modern", rng),
+        "borders": lambda: service._generate_border_system("modern", rng),
+        "animations": lambda: service._generate_animation_system("modern", rng),
+        "shadows": lambda: service._generate_shadow_system("modern", colors),
+        "breakpoints": service._generate_breakpoint_system
+    }
+    return [(f"design.stage[{stage}]", lambda func=func: func) for stage, func in stages.items()]
+
+
+def rate_limiter_benchmarks(keys: int = 1_000_000, batch: int = 10_000) -> List[Benchmark]:
+    from app.utils.rate_limiter import RateLimiter
+
+    def setup():
+        limiter = RateLimiter(max_requests=100, window_seconds=60)
+        ips = [f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}" for i in range(keys)]
+        cursor = itertools.cycle(range(0, keys, batch))
+        loop = asyncio.new_event_loop()
+
+        async def check(start: int) -> None:
+            for ip in ips[start:start + batch]:
+                await limiter.is_allowed(ip)
+
+        # One operation = one batch of checks; reported per check below
+        return lambda: loop.run_until_complete(check(next(cursor)))
+
+    return [(f"rate_limiter.is_allowed[{keys}_keys]", setup)]
+
+
+class _ApiClient:
+    """In-process ASGI client with the app lifespan running on a private loop"""
+
+    def __init__(self):
+        import httpx
+        from app.main import app
+
+        self.loop = asyncio.new_event_loop()
+        self._lifespan = app.router.lifespan_context(app)
+        self.loop.run_until_complete(self._lifespan.__aenter__())
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://localhost", timeout=120)
+
+    def post(self, path: str, payload: dict) -> None:
+        response = self.loop.run_until_complete(self.client.post(path, json=payload))
+        if response.status_code != 200:
+            raise RuntimeError(f"{path} returned {response.status_code}: {response.text[:200]}")
+
+    def close(self) -> None:
+        self.loop.run_until_complete(self.client.aclose())
+        self.loop.run_until_complete(self._lifespan.__aexit__(None, None, None))
+        self.loop.close()
+
+
+def api_benchmarks(client_holder: List[_ApiClient]) -> List[Benchmark]:
+    benchmarks: List[Benchmark] = []
+    for components, variants in itertools.product(COMPONENT_GRID, VARIANT_GRID):
+        def setup(components=components, variants=variants):
+            if not client_holder:
+                client_holder.append(_ApiClient())
+            client = client_holder[0]
+            seeds = _seeds()
+            return lambda: client.post("/api/v1/components/generate", {
+                "design_config": {"style": "modern", "colors": {"primary": "#3366ff"}, "seed": next(seeds)},
+                "component_types": COMPONENT_TYPES[:components],
+                "variants_per_type": variants
+            })
+        benchmarks.append((f"api.generate[{components}x{variants}]", setup))
+    return benchmarks
+
+
+def time_benchmark(op: Callable[[], None], rounds: int, min_round_time: float) -> Dict[str, float]:
+    """Calibrate a loop count, then time several rounds; returns seconds per operation"""
+    op()
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            op()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_round_time or number >= 1 << 20:
+            break
+        number *= 2
+
+    samples = [elapsed / number]
+    for _ in range(rounds - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            op()
+        samples.append((time.perf_counter() - started) / number)
+
+    return {
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "max": max(samples),
+        "rounds": rounds,
+        "number": number
+    }
+
+
+def load_baseline(path: str) -> Optional[dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, results: Dict[str, Dict[str, float]]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    document = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON path")
+    parser.add_argument("--save", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.20, help="allowed slowdown (0.20 = 20%%)")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--min-round-time", type=float, default=0.2, help="seconds per timed round")
+    parser.add_argument("--executor", choices=["process", "thread"], default="process", help="generation pool for api.*")
+    args = parser.parse_args()
+
+    # Keep the app quiet and unthrottled before it is imported
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("ACCESS_LOG_SAMPLE_RATE", "0")
+    os.environ["RATE_LIMIT_MAX_REQUESTS"] = str(10 ** 9)
+    os.environ["GENERATION_EXECUTOR"] = args.executor
+
+    rate_limiter_batch = 10_000
+    client_holder: List[_ApiClient] = []
+    benchmarks = [
+        *design_benchmarks(),
+        *sub_generator_benchmarks(),
+        *rate_limiter_benchmarks(batch=rate_limiter_batch),
+        *api_benchmarks(client_holder)
+    ]
+    benchmarks = [(name, setup) for name, setup in benchmarks if args.filter in name]
+
+    baseline = None if args.save else load_baseline(args.baseline)
+    baseline_results = (baseline or {}).get("results", {})
+    results: Dict[str, Dict[str, float]] = {}
+    regressions = []
+
+    print(f"{'benchmark':<48} {'median':>12} {'min':>12} {'baseline':>12} {'change':>8}")
+    try:
+        for name, setup in benchmarks:
+            result = time_benchmark(setup(), args.rounds, args.min_round_time)
+            if name.startswith("rate_limiter."):
+                for key in ("median", "min", "max"):
+                    result[key] /= rate_limiter_batch
+            results[name] = result
+
+            previous = baseline_results.get(name)
+            change = ""
+            if previous:
+                ratio = result["median"] / previous["median"] - 1
+                change = f"{ratio:+.1%}"
+                if ratio > args.threshold:
+                    regressions.append((name, ratio))
+                    change += " !"
+            print(
+                f"{name:<48} {_format_time(result['median']):>12} {_format_time(result['min']):>12} "
+                f"{_format_time(previous['median']) if previous else '-':>12} {change:>8}"
+            )
+    finally:
+        for client in client_holder:
+            client.close()
+
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"\nSaved baseline with {len(results)} results to {args.baseline}")
+        return 0
+
+    if baseline is None:
+        print(f"\nNo baseline at {args.baseline}; run with --save to record one")
+        return 0
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+        for name, ratio in regressions:
+            print(f"  {name}: {ratio:+.1%}")
+        return 1
+
+    print(f"\nNo regressions over {args.threshold:.0%}")
+    return 0
+
+
+def _format_time(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.3f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f} ms"
+    if seconds >= 1e-6:
+        return f"{seconds * 1e6:.2f} us"
+    return f"{seconds * 1e9:.0f} ns"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
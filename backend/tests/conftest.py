@@ -0,0 +1,24 @@
+# backend/tests/conftest.py
+"""
+Shared fixtures: the app is exercised in-process through httpx's ASGI transport
+"""
+
+import os
+
+# Read when the app modules are imported, so they are set before any test imports them
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ["RATE_LIMIT_MAX_REQUESTS"] = str(10 ** 9)
+# Thread executor: pool job counts are only visible in this process
+os.environ["GENERATION_EXECUTOR"] = "thread"
+
+import httpx
+import pytest
+
+
+@pytest.fixture
+async def client():
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost", timeout=60) as client:
+        yield client
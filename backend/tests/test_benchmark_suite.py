@@ -0,0 +1,68 @@
+# backend/tests/test_benchmark_suite.py
+"""
+Benchmark suite plumbing: timing, baselines and regression exit status
+"""
+
+import json
+import sys
+
+import pytest
+
+from benchmarks import suite
+
+STAGE = "design.stage[breakpoints]"
+
+
+@pytest.fixture
+def run_suite(monkeypatch, capsys):
+    # main() sets these for the app; restore them afterwards
+    monkeypatch.setenv("GENERATION_EXECUTOR", "thread")
+    monkeypatch.setenv("ACCESS_LOG_SAMPLE_RATE", "1")
+
+    def run(*args):
+        monkeypatch.setattr(sys, "argv", [
+            "suite", "--filter", STAGE, "--rounds", "2", "--min-round-time", "0.001", "--executor", "thread", *args
+        ])
+        status = suite.main()
+        return status, capsys.readouterr().out
+
+    return run
+
+
+def test_time_benchmark_calibrates_loop_count():
+    calls = []
+    result = suite.time_benchmark(lambda: calls.append(None), rounds=3, min_round_time=0.001)
+
+    assert result["rounds"] == 3 and result["number"] >= 1
+    # Warm-up call, doubling calibration rounds (the last one is kept), then the other rounds
+    assert len(calls) == 1 + (2 * result["number"] - 1) + 2 * result["number"]
+    assert result["min"] <= result["median"] <= result["max"]
+
+
+def test_baseline_round_trip(tmp_path):
+    path = str(tmp_path / "nested" / "suite.json")
+    suite.save_baseline(path, {"a": {"median": 1.0}})
+
+    assert suite.load_baseline(path)["results"] == {"a": {"median": 1.0}}
+    assert suite.load_baseline(str(tmp_path / "missing.json")) is None
+
+
+def test_regressions_fail_the_run(tmp_path, run_suite):
+    baseline = str(tmp_path / "suite.json")
+
+    assert run_suite("--baseline", baseline)[0] == 0
+    status, output = run_suite("--baseline", baseline, "--save")
+    assert status == 0 and "Saved baseline with 1 results" in output
+
+    saved = json.loads(open(baseline).read())
+    saved["results"][STAGE]["median"] /= 1000
+    with open(baseline, "w") as handle:
+        json.dump(saved, handle)
+
+    status, output = run_suite("--baseline", baseline)
+    assert status == 1 and "1 regression(s)" in output
+
+
+@pytest.mark.parametrize("seconds, expected", [(2.0, "2.000 s"), (0.0015, "1.500 ms"), (2.5e-6, "2.50 us"), (3e-8, "30 ns")])
+def test_time_formatting(seconds, expected):
+    assert suite._format_time(seconds) == expected
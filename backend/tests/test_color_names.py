@@ -0,0 +1,101 @@
+# backend/tests/test_color_names.py
+"""
+Nearest named colors from the shared color table, and ranked font pairings
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from app.services.generators.color_math import parse_hex_colors, rgb_bytes_to_lab
+from app.services.generators.color_names import TABLE_VERSION, ColorNameTable
+from app.services.generators.design_generator import DesignGeneratorService
+from app.services.generators.typography_index import (
+    BODY_WEIGHT, FONT_PROFILES, FONT_TRAITS, STYLE_PAIRING_CONTRAST, STYLE_TRAIT_WEIGHTS, TypographyPairingIndex
+)
+
+
+@pytest.fixture(scope="module")
+def table():
+    return ColorNameTable()
+
+
+def test_nearest_matches_a_per_color_scan(table):
+    colors = [f"#{value:06x}" for value in np.random.default_rng(7).integers(0, 1 << 24, 2000)]
+    indices, distances = table.nearest(colors)
+
+    reference = np.asarray(table.table['lab'])
+    squared = ((reference[None, :, :] - rgb_bytes_to_lab(parse_hex_colors(colors))[:, None, :]) ** 2).sum(axis=2)
+    expected = squared.argmin(axis=1)
+    # Equidistant references (e.g. identical Tailwind steps) may resolve to either row
+    assert np.array_equal(reference[indices], reference[expected])
+    assert np.allclose(distances, np.sqrt(squared.min(axis=1)))
+
+
+@pytest.mark.parametrize("color, source, name", [
+    ("#3b82f6", "tailwind", "blue-500"),
+    ("#ff0000", "css", "red"),
+    ("#808080", "css", "gray")
+])
+def test_exact_colors_match_their_name(table, color, source, name):
+    match, = table.match([color], source)
+
+    assert (match.name, match.source, match.hex, match.delta_e) == (name, source, color, 0.0)
+
+
+def test_table_is_written_once_and_memory_mapped(tmp_path, table):
+    first = ColorNameTable(str(tmp_path))
+    assert os.path.exists(tmp_path / f"color_table_v{TABLE_VERSION}.npy")
+    second = ColorNameTable(str(tmp_path))
+
+    assert isinstance(second.table, np.memmap)
+    assert np.array_equal(second.table, table.table)
+    colors = ["#123456", "#abcdef", "#fedcba"]
+    assert first.match(colors) == second.match(colors) == table.match(colors)
+
+
+def test_pairings_are_ranked_by_score():
+    generator = DesignGeneratorService()
+    index = TypographyPairingIndex(generator.typography_pairings, generator.design_styles)
+    unknown = (0.0,) * len(FONT_TRAITS)
+
+    for style in generator.design_styles:
+        weights = np.array(STYLE_TRAIT_WEIGHTS[style])
+        scores = []
+        for first, second in generator.typography_pairings:
+            heading, body = np.array(FONT_PROFILES.get(first, unknown)), np.array(FONT_PROFILES.get(second, unknown))
+            difference = np.linalg.norm(heading - body) / 2
+            scores.append(weights @ (heading + BODY_WEIGHT * body) + STYLE_PAIRING_CONTRAST[style] * difference)
+        ranked = index.ranked(style)
+        assert [score for _, score in ranked] == sorted((round(score, 4) for score in scores), reverse=True)
+        assert index.best(style) == ranked[0][0]
+
+
+def test_generated_typography_uses_a_top_ranked_pairing():
+    generator = DesignGeneratorService()
+
+    for seed in range(40):
+        style = generator.design_styles[seed % len(generator.design_styles)]
+        typography = generator.generate_design_system(style_preference=style, seed=seed).typography
+        fonts = (typography.font_family_primary.split("'")[1], typography.font_family_secondary.split("'")[1])
+        assert generator.pairing_index.rank(style, fonts) < generator.pairing_choices
+
+
+async def test_color_match_endpoint(client):
+    response = await client.post("/api/v1/themes/colors/match", json={"colors": ["#3B82F6", "#f00"], "source": "tailwind"})
+
+    assert response.status_code == 200
+    matches = response.json()["matches"]
+    assert [match["color"] for match in matches] == ["#3b82f6", "#ff0000"]
+    assert matches[0]["name"] == "blue-500"
+    assert all(match["source"] == "tailwind" for match in matches)
+
+
+async def test_typography_pairings_endpoint(client):
+    response = await client.get("/api/v1/themes/typography/pairings", params={"style": "retro", "limit": 3})
+
+    assert response.status_code == 200
+    pairings = response.json()["pairings"]
+    assert len(pairings) == 3
+    assert [pairing["score"] for pairing in pairings] == sorted((pairing["score"] for pairing in pairings), reverse=True)
@@ -0,0 +1,81 @@
+# backend/tests/test_component_generator.py
+"""
+Precompiled Jinja2 component rendering
+"""
+
+import os
+
+import pytest
+
+from app.services.generators.component_generator import (
+    COMPONENT_SPECS, CSS_MODES, FRAMEWORK_TEMPLATES, VARIANTS, ComponentGeneratorService,
+    component_name, css_variable_name, pascal_case, token_key
+)
+from app.services.generators.design_generator import DesignGeneratorService
+
+
+@pytest.fixture(scope="module")
+def design_tokens():
+    return DesignGeneratorService().generate_design_system(style_preference="modern", seed=5)
+
+
+def _render_all(service, design_tokens):
+    return [
+        service.render_component(component_type, variant_index, framework, design_tokens, css_mode=css_mode)
+        for framework in FRAMEWORK_TEMPLATES
+        for component_type in COMPONENT_SPECS
+        for variant_index in range(len(VARIANTS))
+        for css_mode in CSS_MODES
+    ]
+
+
+def test_names():
+    assert css_variable_name("colors.text_primary") == "--color-text-primary"
+    assert pascal_case("date-picker") == "DatePicker"
+    assert pascal_case("3d view") == "Component3dView"
+    assert component_name("button", len(VARIANTS)) == component_name("button", 0)
+
+
+def test_precompiled_templates_render_the_same_components(tmp_path, design_tokens):
+    cold = ComponentGeneratorService(bytecode_cache_dir=str(tmp_path / "bytecode"))
+    warm = ComponentGeneratorService(bytecode_cache_dir=str(tmp_path / "bytecode"), precompiled_dir=str(tmp_path / "modules"))
+    warm.warm_up()
+
+    assert warm.is_warm
+    assert any(name.endswith(".py") for name in os.listdir(tmp_path / "modules"))
+    assert _render_all(warm, design_tokens) == _render_all(cold, design_tokens)
+
+
+def test_bytecode_cache_is_written(tmp_path, design_tokens):
+    service = ComponentGeneratorService(bytecode_cache_dir=str(tmp_path))
+    service.render_component("button", 0, "vue", design_tokens)
+
+    assert os.listdir(tmp_path)
+
+
+def test_scoped_and_shared_styles(design_tokens):
+    service = ComponentGeneratorService()
+    scoped = service.render_component("button", 1, "react", design_tokens)
+    shared = service.render_component("button", 1, "react", design_tokens, css_mode="shared")
+
+    assert ".ui-button--secondary" in scoped["styles"]["main"]
+    assert shared["styles"] == {}
+    assert scoped["props"] == {"label": "Button", "size": "md", "disabled": False}
+    assert service.stylesheet(design_tokens, variants_per_type=1).startswith(":root{")
+
+
+def test_fragments_are_memoized_per_token_set(design_tokens):
+    service = ComponentGeneratorService(fragment_cache_size=4)
+    tokens_hash = token_key(design_tokens)
+    first = service.css_variables(design_tokens, tokens_hash)
+
+    assert service.css_variables(design_tokens, tokens_hash) is first
+    for variant_index in range(len(VARIANTS)):
+        service.render_component("card", variant_index, "vue", design_tokens, tokens_hash=tokens_hash)
+    assert len(service._fragments) == 4
+
+
+@pytest.mark.parametrize("options", [{"framework": "svelte"}, {"framework": "vue", "css_mode": "inline"}])
+def test_unsupported_options_are_rejected(design_tokens, options):
+    with pytest.raises(ValueError):
+        ComponentGeneratorService().render_component("button", 0, design_tokens=design_tokens, **options)
@@ -0,0 +1,144 @@
+# backend/tests/test_compression.py
+"""
+Negotiated response compression and compressed-body reuse
+"""
+
+import asyncio
+import gzip
+import zlib
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from app.utils import compression
+from app.utils.compression import CompressedBodyCache, CompressionMiddleware
+
+BODY = "".join(f"line {index}: the quick brown fox\n" for index in range(200))
+CHUNKS = [f'{{"event":"component","data":{index}}}\n'.encode() * 40 for index in range(3)]
+
+
+async def _text(request):
+    return PlainTextResponse(BODY, headers={"ETag": '"body"'})
+
+
+async def _small(request):
+    return PlainTextResponse("tiny")
+
+
+async def _image(request):
+    return Response(b"\x89PNG" + bytes(4096), media_type="image/png")
+
+
+async def _precompressed(request):
+    return Response(gzip.compress(b"x" * 4096), media_type="text/plain", headers={"Content-Encoding": "gzip"})
+
+
+async def _stream(request):
+    async def chunks():
+        for chunk in CHUNKS:
+            yield chunk
+    return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+
+async def _events(request):
+    async def chunks():
+        yield b"event: done\ndata: {}\n\n" * 100
+    return StreamingResponse(chunks(), media_type="text/event-stream")
+
+
+def _app(cache=None, offload_size=256 * 1024):
+    app = Starlette(routes=[
+        Route("/text", _text), Route("/small", _small), Route("/image", _image),
+        Route("/precompressed", _precompressed), Route("/stream", _stream), Route("/events", _events)
+    ])
+    app.add_middleware(CompressionMiddleware, minimum_size=1024, offload_size=offload_size, cache=cache)
+    return app
+
+
+async def _get(app, path, accept_encoding):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://localhost") as client:
+        return await client.get(path, headers={"Accept-Encoding": accept_encoding})
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip", "gzip"),
+    ("br, gzip", "br" if compression.brotli is not None else "gzip"),
+    ("*", "br" if compression.brotli is not None else "gzip"),
+    ("gzip;q=0", None),
+    ("identity", None)
+])
+async def test_encoding_is_negotiated(accept_encoding, expected):
+    response = await _get(_app(), "/text", accept_encoding)
+
+    assert response.headers.get("content-encoding") == expected
+    assert response.text == BODY
+    if expected:
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"] == 'W/"body"'
+        assert int(response.headers["content-length"]) < len(BODY)
+    else:
+        assert response.headers["etag"] == '"body"'
+
+
+@pytest.mark.parametrize("path", ["/small", "/image", "/precompressed", "/events"])
+async def test_small_binary_encoded_and_event_stream_bodies_pass_through(path):
+    response = await _get(_app(), path, "gzip")
+
+    assert response.headers.get("content-encoding") == ("gzip" if path == "/precompressed" else None)
+    assert "vary" not in response.headers
+
+
+@pytest.mark.parametrize("offload_size", [1, 256 * 1024])
+async def test_identical_bodies_are_compressed_once(offload_size):
+    cache = CompressedBodyCache()
+    app = _app(cache, offload_size=offload_size)
+    first = await _get(app, "/text", "gzip")
+    second = await _get(app, "/text", "gzip")
+
+    assert first.text == second.text == BODY
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_cache_is_bounded_by_entries_and_bytes():
+    cache = CompressedBodyCache(max_entries=2, max_bytes=10)
+    cache.put(("a", "gzip"), b"1234")
+    cache.put(("b", "gzip"), b"1234")
+    cache.put(("c", "gzip"), b"1234")
+    cache.put(("huge", "gzip"), b"x" * 11)
+
+    assert cache.get(("a", "gzip")) is None and cache.get(("huge", "gzip")) is None
+    assert cache.stats()["entries"] == 2 and cache.stats()["bytes"] == 8
+
+
+async def test_streamed_chunks_decompress_as_they_arrive():
+    messages = []
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        # The client stays connected; StreamingResponse waits on this for a disconnect
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http", "method": "GET", "path": "/stream", "raw_path": b"/stream", "root_path": "",
+        "scheme": "http", "query_string": b"", "headers": [(b"host", b"localhost"), (b"accept-encoding", b"gzip")],
+        "server": ("localhost", 80), "client": ("127.0.0.1", 1234)
+    }
+    await _app()(scope, receive, send)
+
+    start, *bodies = messages
+    headers = dict(start["headers"])
+    assert headers[b"content-encoding"] == b"gzip" and b"content-length" not in headers
+
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    received = [decompressor.decompress(message["body"]) for message in bodies]
+    # Every chunk is fully readable on arrival, not held back by the compressor
+    assert received[:len(CHUNKS)] == CHUNKS
+    assert b"".join(received[len(CHUNKS):]) + decompressor.flush() == b""
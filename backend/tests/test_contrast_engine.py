@@ -0,0 +1,115 @@
+# backend/tests/test_contrast_engine.py
+"""
+Batch contrast engine: WCAG ratios and corrections match the scalar path
+"""
+
+import random
+from dataclasses import asdict
+
+import numpy as np
+import pytest
+from colour import Color
+
+from app.services.generators.contrast_engine import CONTRAST_REQUIREMENTS, ContrastEngine, correct_palette
+from app.services.generators.design_generator import DesignGeneratorService
+
+
+@pytest.fixture(scope="module")
+def palettes():
+    """Generated palettes before contrast correction, column-wise"""
+    generator = DesignGeneratorService()
+    rng = random.Random(7)
+    rows = [
+        asdict(generator._generate_color_palette(f"#{rng.randrange(1 << 24):06x}", rng.choice(generator.design_styles), rng))
+        for _ in range(300)
+    ]
+    return {role: [row[role] for row in rows] for role in rows[0]}
+
+
+def _rows(palettes):
+    return [dict(zip(palettes, values)) for values in zip(*palettes.values())]
+
+
+def _ratio(first: str, second: str) -> float:
+    def luminance(color: str) -> float:
+        channels = [value / 12.92 if value <= 0.03928 else ((value + 0.055) / 1.055) ** 2.4 for value in Color(color).rgb]
+        return 0.2126 * channels[0] + 0.7152 * channels[1] + 0.0722 * channels[2]
+    lighter, darker = sorted((luminance(first), luminance(second)), reverse=True)
+    return (lighter + 0.05) / (darker + 0.05)
+
+
+def test_audit_matches_scalar_ratios(palettes):
+    audit = ContrastEngine().audit(palettes)
+
+    for index, row in enumerate(_rows(palettes)):
+        for column, (foreground, background, minimum) in enumerate(audit.requirements):
+            ratio = _ratio(row[foreground], row[background])
+            assert audit.ratios[index, column] == pytest.approx(ratio, rel=1e-6)
+            assert bool(audit.passed[index, column]) == (ratio >= minimum)
+
+
+def test_correct_matches_correct_palette(palettes):
+    correction = ContrastEngine().correct(palettes)
+
+    assert correction.audit.passed.all()
+    for index, row in enumerate(_rows(palettes)):
+        expected = {**row, **correct_palette(row)}
+        assert {role: str(values[index]) for role, values in correction.colors.items()} == expected, row
+
+
+def test_locked_roles_are_left_alone(palettes):
+    correction = ContrastEngine().correct(palettes, locked_roles=["primary", "background"])
+
+    assert list(correction.colors["primary"]) == palettes["primary"]
+    assert list(correction.colors["background"]) == palettes["background"]
+    for index, row in enumerate(_rows(palettes)):
+        expected = {**row, **correct_palette(row, locked_roles=["primary", "background"])}
+        assert {role: str(values[index]) for role, values in correction.colors.items()} == expected, row
+
+
+def test_missing_roles_count_as_passing():
+    audit = ContrastEngine().audit({"text_primary": ["#777777", None], "background": ["#ffffff", "#ffffff"]})
+
+    column = audit.requirements.index(("text_primary", "background", CONTRAST_REQUIREMENTS[0][2]))
+    assert not audit.passed[0, column]
+    assert audit.passed[1, column]
+    assert np.isnan(audit.ratios[1, column])
+
+
+async def test_audit_endpoint_corrects_failing_roles(client):
+    response = await client.post("/api/v1/themes/contrast/audit", json={
+        "palettes": [
+            {"text_primary": "#777777", "background": "#ffffff"},
+            {"text_primary": "#111111", "background": "#ffffff"}
+        ]
+    })
+
+    assert response.status_code == 200
+    body = response.json()
+    assert list(body["results"][0]["corrected"]) == ["text_primary"]
+    assert _ratio(body["results"][0]["corrected"]["text_primary"], "#ffffff") >= 4.5
+    assert body["results"][1] == {"passes": True, "corrected": {}, "unresolved": []}
+    assert body["summary"] == {"total": 2, "passing": 2, "corrected": 1}
+
+
+async def test_audit_endpoint_reports_locked_failures(client):
+    response = await client.post("/api/v1/themes/contrast/audit", json={
+        "palettes": [{"text_primary": "#777777", "background": "#ffffff"}],
+        "locked_roles": ["text_primary"]
+    })
+
+    assert response.status_code == 200
+    result = response.json()["results"][0]
+    assert not result["passes"]
+    assert [failure["foreground"] for failure in result["unresolved"]] == ["text_primary"]
+
+
+@pytest.mark.parametrize("body", [
+    {"palettes": [{"text_primary": "#zzzzzz", "background": "#ffffff"}]},
+    {"palettes": [{"text_primary": "not a color", "background": "#ffffff"}]},
+    {"palettes": [{"text_primary": "#777777"}], "locked_roles": ["headline"]}
+])
+async def test_audit_endpoint_rejects_invalid_input(client, body):
+    response = await client.post("/api/v1/themes/contrast/audit", json=body)
+
+    assert response.status_code == 422
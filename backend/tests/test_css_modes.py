@@ -0,0 +1,70 @@
+# backend/tests/test_css_modes.py
+"""
+css_mode 'auto': shared utility styles only past the size break-even
+"""
+
+import orjson
+import pytest
+
+from app.services.generation_worker import build_generation_payload, canonical_generation_request, resolve_css_mode
+from app.services.generators.css_compiler import shared_css_pays_off
+from app.services.live_session import LiveSession
+
+COMPONENT_TYPES = [
+    "button", "input", "select", "checkbox", "radio", "toggle", "card", "modal",
+    "dropdown", "accordion", "tab", "navigation", "breadcrumb", "pagination",
+    "table", "list", "avatar", "badge"
+]
+
+
+def _request(type_count: int, variants: int, css_mode: str = "auto", include_states: bool = True):
+    return {
+        "design_config": {"style": "modern", "colors": {"primary": "#3366ff"}, "seed": 7},
+        "component_types": COMPONENT_TYPES[:type_count],
+        "variants_per_type": variants,
+        "include_states": include_states,
+        "framework": "vue",
+        "css_mode": css_mode
+    }
+
+
+@pytest.mark.parametrize("type_count, variants, include_states, expected", [
+    (1, 10, True, "scoped"),
+    (6, 3, True, "scoped"),
+    (16, 1, True, "shared"),
+    (4, 10, True, "shared"),
+    (6, 3, False, "scoped"),
+    (6, 10, False, "shared")
+])
+def test_auto_resolves_by_size(type_count, variants, include_states, expected):
+    assert resolve_css_mode(_request(type_count, variants, include_states=include_states)) == expected
+
+
+def test_auto_counts_distinct_types():
+    request_data = {**_request(1, 1), "component_types": ["button"] * 18}
+
+    assert not shared_css_pays_off(1, 1)
+    assert resolve_css_mode(request_data) == "scoped"
+
+
+@pytest.mark.parametrize("type_count, variants", [(2, 3), (18, 3)])
+def test_auto_output_matches_the_resolved_mode(type_count, variants):
+    auto = _request(type_count, variants)
+    explicit = {**auto, "css_mode": resolve_css_mode(auto)}
+    auto_body, explicit_body = (orjson.loads(build_generation_payload(data)[0]) for data in (auto, explicit))
+
+    assert canonical_generation_request(auto) == canonical_generation_request(explicit)
+    assert ("stylesheet" in auto_body) == (explicit["css_mode"] == "shared")
+    assert [component["template"] for component in auto_body["components"]] == \
+        [component["template"] for component in explicit_body["components"]]
+
+
+def test_live_session_rerenders_when_auto_flips_mode():
+    session = LiveSession(_request(2, 3))
+    assert "stylesheet" not in session.start()
+
+    update = session.apply({"component_types": COMPONENT_TYPES[:18]})
+
+    assert update.rendered == 18 * 3
+    assert "stylesheet" in session.snapshot()
+    assert all(not component["styles"] for component in session.components.values())
@@ -0,0 +1,80 @@
+# backend/tests/test_design_batch.py
+"""
+Batch design system generation on the process pool
+"""
+
+import orjson
+import pytest
+
+from app.services.design_batch import DesignBatchRunner, generate_in_worker
+from app.services.generation_worker import create_similarity_index
+from app.services.generators.design_generator import DesignGeneratorService
+
+CONFIGS = [
+    {"style": "modern", "colors": {"primary": "#3366ff"}, "seed": 1},
+    {"style": "retro", "colors": {}, "seed": 2},
+    {"style": "organic", "colors": {"primary": "not a color"}, "seed": 3},
+    {"style": "geometric", "colors": {"primary": "#aa2200"}, "seed": None}
+]
+
+
+@pytest.fixture
+def runner():
+    runner = DesignBatchRunner(max_workers=1, max_in_flight=2)
+    yield runner
+    runner.shutdown()
+
+
+@pytest.fixture
+def batch_runner():
+    from app.api.endpoints.themes import batch_runner
+
+    yield batch_runner
+    batch_runner.shutdown()
+
+
+async def test_results_arrive_in_order_with_per_item_errors(runner):
+    items = [item async for item in runner.generate(CONFIGS)]
+
+    assert [item["index"] for item in items] == [0, 1, 2, 3]
+    assert "error" in items[2] and items[2]["generation_time_ms"] is None
+    assert all("design_tokens" in items[index] for index in (0, 1, 3))
+    assert all(item["total_time_ms"] >= 0 for item in items)
+
+
+async def test_pool_results_match_in_process_generation(runner):
+    items = [item async for item in runner.generate([CONFIGS[0], CONFIGS[3]])]
+    service = DesignGeneratorService(similarity_index=create_similarity_index())
+
+    for item, config in zip(items, [CONFIGS[0], CONFIGS[3]]):
+        expected = service.generate_design_system(
+            base_config=config,
+            style_preference=config["style"],
+            color_preference=config["colors"].get("primary"),
+            seed=config["seed"]
+        )
+        assert item["design_tokens"] == orjson.loads(orjson.dumps(expected.to_dict()))
+
+
+def test_worker_reports_generation_time():
+    result = generate_in_worker(CONFIGS[1])
+
+    assert set(result) == {"design_tokens", "generation_time_ms"}
+    assert result["design_tokens"]["colors"]["primary"].startswith("#")
+
+
+async def test_batch_endpoint_streams_ndjson_with_summary(client, batch_runner):
+    response = await client.post("/api/v1/themes/batch", json={"items": [CONFIGS[0], CONFIGS[3]]})
+    lines = [orjson.loads(line) for line in response.content.splitlines()]
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert [line["index"] for line in lines[:2]] == [0, 1]
+    assert lines[2]["done"] is True and lines[2]["total"] == 2 and lines[2]["failed"] == 0
+
+
+async def test_batch_endpoint_validates_items(client):
+    empty = await client.post("/api/v1/themes/batch", json={"items": []})
+    invalid = await client.post("/api/v1/themes/batch", json={"items": [{"colors": {"primary": "not a color"}}]})
+
+    assert empty.status_code == 422 and invalid.status_code == 422
@@ -0,0 +1,72 @@
+# backend/tests/test_design_cache.py
+"""
+Content-addressed design token cache and its use by the generator
+"""
+
+import pytest
+
+from app.services.design_cache import DesignTokenCache, canonical_design_key
+from app.services.generators.design_generator import DesignGeneratorService
+
+def test_equivalent_inputs_share_a_key():
+    key = canonical_design_key("modern", {"primary": "#3366FF", "accent": None}, 7)
+
+    assert canonical_design_key("modern", {"primary": " #3366ff "}, 7) == key
+    assert canonical_design_key("modern", {"primary": "#3366ff", "accent": ""}, 7) == key
+    assert canonical_design_key("modern", {"primary": "#3366ff"}, 8) != key
+    assert canonical_design_key("retro", {"primary": "#3366ff"}, 7) != key
+
+def test_identical_inputs_generate_identical_tokens():
+    generator = DesignGeneratorService()
+    first = generator.generate_design_system(style_preference="modern", color_preference="#3366ff")
+    second = generator.generate_design_system(style_preference="modern", color_preference="#3366FF")
+
+    assert first.to_dict() == second.to_dict()
+    assert generator.generate_design_system(style_preference="modern", seed=1).to_dict() != first.to_dict()
+
+def test_generator_returns_cached_tokens():
+    cache = DesignTokenCache()
+    generator = DesignGeneratorService(cache=cache)
+    timings = {}
+    first = generator.generate_design_system(style_preference="retro", seed=3)
+
+    assert generator.generate_design_system(style_preference="retro", seed=3, timings=timings) is first
+    assert list(timings) == ["cache"]
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+def test_cache_evicts_least_recently_used():
+    cache = DesignTokenCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+    assert cache.evictions == 1
+
+def test_expired_entries_are_misses():
+    cache = DesignTokenCache(ttl_seconds=0)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+    assert cache.expirations == 1 and len(cache) == 0
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    generated = DesignGeneratorService(cache=DesignTokenCache(disk_path=str(tmp_path)))
+    tokens = generated.generate_design_system(style_preference="organic", color_preference="#228844")
+    restarted_cache = DesignTokenCache(disk_path=str(tmp_path))
+    restarted = DesignGeneratorService(cache=restarted_cache)
+
+    assert restarted.generate_design_system(style_preference="organic", color_preference="#228844").to_dict() == tokens.to_dict()
+    assert restarted_cache.disk_hits == 1 and len(restarted_cache) == 1
+
+def test_unreadable_disk_entries_are_discarded(tmp_path):
+    cache = DesignTokenCache(disk_path=str(tmp_path))
+    (tmp_path / "broken.json").write_text("{not json")
+
+    assert cache.get_serialized("broken") is None
+    assert cache.get_serialized("missing") is None
+
+def test_max_entries_must_be_positive():
+    with pytest.raises(ValueError):
+        DesignTokenCache(max_entries=0)
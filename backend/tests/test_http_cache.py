@@ -0,0 +1,121 @@
+# backend/tests/test_http_cache.py
+"""
+ETags, conditional requests and precompressed static files
+"""
+
+import gzip
+import os
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.datastructures import Headers
+from starlette.routing import Mount
+
+from app.utils.http_cache import (
+    PrecompressedStaticFiles, accepted_encodings, etag_matches, http_date, is_not_modified, strong_etag, weak_etag
+)
+from tests.test_single_flight import GENERATE_BODY
+
+
+@pytest.mark.parametrize("if_none_match, etag, expected", [
+    (None, '"a"', False),
+    ('"a"', '"a"', True),
+    ('W/"a"', '"a"', True),
+    ('"b", W/"a"', 'W/"a"', True),
+    ('"b"', '"a"', False),
+    ("*", '"a"', True)
+])
+def test_if_none_match_uses_weak_comparison(if_none_match, etag, expected):
+    assert etag_matches(if_none_match, etag) is expected
+
+
+def test_etags_are_deterministic_and_length_prefixed():
+    assert strong_etag(b"ab", b"c") == strong_etag(b"ab", b"c")
+    assert strong_etag(b"ab", b"c") != strong_etag(b"a", b"bc")
+    assert weak_etag(b"x") == f"W/{strong_etag(b'x')}"
+
+
+def test_if_modified_since_only_without_if_none_match():
+    last_modified = http_date(1_700_000_000)
+
+    assert is_not_modified(Headers({"if-modified-since": http_date(1_700_000_001)}), '"a"', last_modified)
+    assert not is_not_modified(Headers({"if-modified-since": http_date(1_699_999_999)}), '"a"', last_modified)
+    assert not is_not_modified(Headers({"if-modified-since": "yesterday"}), '"a"', last_modified)
+    assert not is_not_modified(
+        Headers({"if-none-match": '"b"', "if-modified-since": http_date(1_700_000_001)}), '"a"', last_modified
+    )
+
+
+def test_accepted_encodings_skip_zero_quality():
+    assert accepted_encodings("gzip;q=0, br;q=0.5, Identity, ;q=1, x;q=bad") == {"br", "identity"}
+    assert accepted_encodings(None) == set()
+
+
+async def test_component_types_revalidate(client):
+    first = await client.get("/api/v1/components/types")
+    by_etag = await client.get("/api/v1/components/types", headers={"If-None-Match": first.headers["etag"]})
+    by_date = await client.get("/api/v1/components/types", headers={"If-Modified-Since": first.headers["last-modified"]})
+
+    assert first.status_code == 200 and first.headers["cache-control"] == "public, max-age=3600"
+    assert (by_etag.status_code, by_etag.content, by_etag.headers["etag"]) == (304, b"", first.headers["etag"])
+    assert by_date.status_code == 304
+
+
+async def test_seeded_generation_revalidates_before_generating(client):
+    from app.api.endpoints.components import generation_flights
+
+    first = await client.post("/api/v1/components/generate", json=GENERATE_BODY)
+    started = generation_flights.stats()["started"]
+    revalidated = await client.post(
+        "/api/v1/components/generate", json=GENERATE_BODY, headers={"If-None-Match": first.headers["etag"]}
+    )
+    streamed = await client.post(
+        "/api/v1/components/generate", json=GENERATE_BODY, headers={"Accept": "application/x-ndjson"}
+    )
+
+    assert first.headers["etag"].startswith("W/")
+    assert revalidated.status_code == 304 and revalidated.content == b""
+    assert generation_flights.stats()["started"] == started
+    assert streamed.headers["etag"] != first.headers["etag"]
+
+
+async def test_rerolled_generation_is_not_cacheable(client, monkeypatch):
+    monkeypatch.setenv("DESIGN_SIMILARITY_THRESHOLD", "0.05")
+    body = {**GENERATE_BODY, "design_config": {**GENERATE_BODY["design_config"], "seed": None}}
+    response = await client.post("/api/v1/components/generate", json=body)
+
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+    assert response.headers["cache-control"] == "no-store"
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    (tmp_path / "app.js").write_bytes(b"console.log('app');" * 10)
+    (tmp_path / "app.js.gz").write_bytes(gzip.compress((tmp_path / "app.js").read_bytes()))
+    (tmp_path / "stale.js").write_bytes(b"fresh")
+    (tmp_path / "stale.js.gz").write_bytes(gzip.compress(b"stale"))
+    modified = os.stat(tmp_path / "stale.js").st_mtime
+    os.utime(tmp_path / "stale.js.gz", (modified - 60, modified - 60))
+    return tmp_path
+
+
+async def test_precompressed_variants_are_served_when_accepted(static_dir):
+    app = Starlette(routes=[Mount("/static", PrecompressedStaticFiles(directory=str(static_dir)))])
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://localhost") as client:
+        compressed = await client.get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+        plain = await client.get("/static/app.js", headers={"Accept-Encoding": "identity"})
+        stale = await client.get("/static/stale.js", headers={"Accept-Encoding": "gzip"})
+        revalidated = await client.get(
+            "/static/app.js", headers={"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["etag"]}
+        )
+
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["vary"] == "Accept-Encoding"
+    assert compressed.headers["content-type"].startswith(("application/javascript", "text/javascript"))
+    assert compressed.content == plain.content
+    assert "content-encoding" not in plain.headers
+    assert compressed.headers["etag"] != plain.headers["etag"]
+    assert stale.content == b"fresh" and "content-encoding" not in stale.headers
+    assert revalidated.status_code == 304
@@ -0,0 +1,90 @@
+# backend/tests/test_library_export.py
+"""
+Component library export streamed as a ZIP archive
+"""
+
+import io
+import zipfile
+
+import pytest
+
+from app.services.library_export import iter_library_files
+from app.utils.zip_stream import iter_zip
+
+EXPORT_BODY = {
+    "design_config": {"style": "modern", "colors": {"primary": "#3366ff"}, "seed": 5},
+    "component_types": ["button", "card"],
+    "variants_per_type": 2
+}
+
+
+def _request_data(framework="vue", **overrides):
+    from app.api.endpoints.export import LibraryExportRequest
+
+    return {**LibraryExportRequest.model_validate({**EXPORT_BODY, **overrides}).model_dump(), "framework": framework}
+
+
+def test_archive_is_streamed_member_by_member():
+    files = [("a.txt", "alpha" * 1000), ("b/c.bin", bytes(range(256)))]
+    pulled = []
+
+    def members():
+        for member in files:
+            pulled.append(member[0])
+            yield member
+
+    chunks = iter_zip(members())
+    first = next(chunks)
+    assert first.startswith(b"PK\x03\x04") and pulled == ["a.txt"]
+
+    with zipfile.ZipFile(io.BytesIO(first + b"".join(chunks))) as archive:
+        assert archive.testzip() is None
+        assert [(name, archive.read(name)) for name in archive.namelist()] == [
+            ("a.txt", b"alpha" * 1000), ("b/c.bin", bytes(range(256)))
+        ]
+
+
+@pytest.mark.parametrize("framework, component_files", [
+    ("vue", ["ButtonPrimary.vue", "ButtonSecondary.vue", "CardPrimary.vue", "CardSecondary.vue"]),
+    ("react", [
+        "ButtonPrimary.css", "ButtonPrimary.tsx", "ButtonSecondary.css", "ButtonSecondary.tsx",
+        "CardPrimary.css", "CardPrimary.tsx", "CardSecondary.css", "CardSecondary.tsx"
+    ])
+])
+def test_library_layout(framework, component_files):
+    paths = [path for path, _ in iter_library_files(_request_data(framework))]
+
+    assert paths[:5] == [
+        "design-tokens.json", "src/styles/tokens.css", "src/types/design-tokens.d.ts", "tailwind.config.js", "src/index.ts"
+    ]
+    assert paths[5:] == [f"src/components/{name}" for name in component_files]
+
+
+def test_shared_css_mode_exports_one_stylesheet():
+    files = dict(iter_library_files(_request_data("vue", css_mode="shared")))
+
+    assert "src/styles/components.css" in files
+    assert "<style>" not in files["src/components/ButtonPrimary.vue"]
+    assert "components.css" in files["src/index.ts"]
+
+
+def test_unknown_component_types_are_rejected():
+    with pytest.raises(ValueError):
+        list(iter_library_files({**_request_data(), "component_types": ["../evil"]}))
+
+
+async def test_export_endpoint_returns_a_valid_archive(client):
+    response = await client.post("/api/v1/export/react", json=EXPORT_BODY)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    assert response.headers["content-disposition"] == 'attachment; filename="ui-library-react.zip"'
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        assert archive.testzip() is None
+        archived = {name: archive.read(name) for name in archive.namelist()}
+    assert archived == {path: content.encode("utf-8") for path, content in iter_library_files(_request_data("react"))}
+
+
+async def test_export_endpoint_rejects_unknown_frameworks(client):
+    assert (await client.post("/api/v1/export/svelte", json=EXPORT_BODY)).status_code == 404
+    assert (await client.post("/api/v1/export/vue", json={**EXPORT_BODY, "component_types": ["nope"]})).status_code == 422
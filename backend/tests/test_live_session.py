@@ -0,0 +1,99 @@
+# backend/tests/test_live_session.py
+"""
+Live sessions: incremental edits answered with JSON Patches
+"""
+
+import orjson
+import pytest
+from starlette.testclient import TestClient
+
+from app.services.live_session import LiveSession
+from app.utils import json_patch
+
+REQUEST = {
+    "design_config": {"style": "modern", "colors": {"primary": "#3366ff"}, "seed": 5},
+    "component_types": ["button", "card", "input"],
+    "variants_per_type": 2,
+    "include_states": True,
+    "framework": "vue"
+}
+
+EDITS = [
+    {"colors": {"primary": "#ff3366"}},
+    {"colors": {"primary": "#33ff66"}},
+    {"style": "brutalist"},
+    {"variants_per_type": 3},
+    {"colors": {"accent": "#10b981"}},
+    {"component_types": ["button", "modal"]},
+    {"framework": "react"},
+    {"css_mode": "shared"}
+]
+
+
+def _state(snapshot):
+    return {key: value for key, value in snapshot.items() if key != "version"}
+
+
+def test_patches_reproduce_the_session_state():
+    session = LiveSession(dict(REQUEST))
+    mirror = _state(session.start())
+
+    for changes in EDITS:
+        update = session.apply(changes)
+        mirror = json_patch.apply(mirror, update.operations)
+        assert mirror == _state(session.snapshot()), changes
+
+
+def test_color_edit_rebuilds_only_dependent_sections():
+    session = LiveSession(dict(REQUEST))
+    session.start()
+
+    update = session.apply({"colors": {"primary": "#ff3366"}})
+
+    assert sorted(update.recomputed) == ["colors", "shadows"]
+    assert update.rendered == 6
+
+
+def test_unchanged_edit_produces_no_patch():
+    session = LiveSession(dict(REQUEST))
+    session.start()
+
+    update = session.apply({"framework": "vue"})
+
+    assert update.operations == []
+    assert update.version == 1
+    assert update.rendered == 0
+
+
+@pytest.mark.parametrize("old, new", [
+    ({"a/b": 1, "c~d": [1, 2, 3]}, {"a/b": 2, "c~d": [1, 3]}),
+    ({"text": "one\ntwo\nthree\n"}, {"text": "one\n2\nthree\nfour\n"}),
+    ([{"id": 1}, {"id": 2}], [{"id": 2}]),
+    ({"nested": {"keep": True, "drop": None}}, {"nested": {"keep": True}, "added": "x"})
+])
+def test_json_patch_round_trip(old, new):
+    assert json_patch.apply(old, json_patch.diff(old, new)) == new
+
+
+def test_websocket_session():
+    from app.main import app
+
+    with TestClient(app).websocket_connect("ws://localhost/api/v1/components/live") as websocket:
+        websocket.send_text(orjson.dumps({"type": "start", "request": REQUEST}).decode())
+        snapshot = orjson.loads(websocket.receive_text())
+        assert snapshot["type"] == "snapshot"
+        assert len(snapshot["component_ids"]) == 6
+
+        websocket.send_text(orjson.dumps({"type": "edit", "seq": 1, "changes": {"colors": {"primary": "#ff3366"}}}).decode())
+        patch = orjson.loads(websocket.receive_text())
+        assert (patch["type"], patch["seq"]) == ("patch", 1)
+        mirror = json_patch.apply(_state({key: value for key, value in snapshot.items() if key != "type"}), patch["ops"])
+
+        websocket.send_text(orjson.dumps({"type": "edit", "seq": 2, "changes": {"colors": {"primary": "red"}}}).decode())
+        error = orjson.loads(websocket.receive_text())
+        assert (error["type"], error["seq"]) == ("error", 2)
+
+        websocket.send_text(orjson.dumps({"type": "resync"}).decode())
+        resync = orjson.loads(websocket.receive_text())
+        assert resync["type"] == "snapshot"
+        assert mirror == _state({key: value for key, value in resync.items() if key != "type"})
@@ -0,0 +1,72 @@
+# backend/tests/test_metrics.py
+"""
+Prometheus-style metrics and the /metrics endpoint
+"""
+
+import pytest
+
+from app.utils.metrics import Counter, Gauge, Histogram, MetricsRegistry, observe_generation
+
+
+def _render(metric) -> list:
+    registry = MetricsRegistry()
+    registry.register(metric)
+    return registry.render().decode("utf-8").splitlines()
+
+
+def test_counter_and_gauge_exposition():
+    counter = Counter("jobs", "Jobs run", ["result"])
+    counter.labels('o"k').inc()
+    counter.labels('o"k').inc(2)
+    gauge = Gauge("depth", "Queue depth")
+
+    assert _render(counter) == ["# HELP jobs Jobs run", "# TYPE jobs counter", 'jobs_total{result="o\\"k"} 3']
+    gauge.set_function(lambda: 7)
+    assert _render(gauge)[-1] == "depth 7"
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("latency", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 5.0):
+        histogram.observe(value)
+
+    assert _render(histogram)[2:] == [
+        'latency_bucket{le="0.1"} 2',
+        'latency_bucket{le="1"} 3',
+        'latency_bucket{le="+Inf"} 4',
+        "latency_sum 5.65",
+        "latency_count 4"
+    ]
+
+
+def test_unlabelled_metrics_start_at_zero_and_names_are_unique():
+    registry = MetricsRegistry()
+    registry.register(Counter("requests", "Requests"))
+
+    assert registry.render().decode("utf-8").splitlines()[-1] == "requests_total 0"
+    with pytest.raises(ValueError):
+        registry.register(Gauge("requests", "Requests again"))
+
+
+def test_generation_timings_split_total_from_stages():
+    from app.utils.metrics import GENERATION_DURATION, GENERATION_STAGE_DURATION
+
+    before_total = sum(GENERATION_DURATION.labels("test").counts)
+    observe_generation({"colors": 0.001, "total": 0.01}, "test")
+
+    assert sum(GENERATION_DURATION.labels("test").counts) == before_total + 1
+    assert sum(GENERATION_STAGE_DURATION.labels("colors").counts) >= 1
+
+
+async def test_metrics_endpoint_reports_routes_and_generation(client):
+    from tests.test_single_flight import GENERATE_BODY
+
+    await client.post("/api/v1/components/generate", json=GENERATE_BODY)
+    response = await client.get("/metrics")
+    text = response.text
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_request_duration_seconds_count{method="POST",route="/api/v1/components/generate",status="200"}' in text
+    assert 'generation_stage_duration_seconds_count{stage="colors"}' in text
+    assert "http_requests_in_flight 1" in text
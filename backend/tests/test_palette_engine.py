@@ -0,0 +1,84 @@
+# backend/tests/test_palette_engine.py
+"""
+Batch palette engine: same palettes and shadows as the scalar generator
+"""
+
+import random
+from dataclasses import asdict
+
+import pytest
+from colour import Color
+
+from app.services.generators.design_generator import DesignGeneratorService, _section_rng
+from app.services.generators.palette_engine import BatchPaletteEngine
+
+
+@pytest.fixture(scope="module")
+def generator():
+    return DesignGeneratorService()
+
+
+@pytest.fixture(scope="module")
+def engine(generator):
+    return BatchPaletteEngine(generator)
+
+
+def _scalar(generator, color, style, harmony):
+    """Palette plus shadows the way _build_section makes them for a requested primary color"""
+    hue, saturation, lightness = Color(color).hsl
+    palette = generator._build_color_palette(hue, saturation, lightness, style, harmony)
+    palette = generator._apply_color_overrides(palette, {'primary': color})
+    palette = generator._ensure_contrast(palette, locked_roles=['primary'])
+    return palette, generator._generate_shadow_system(style, palette)
+
+
+def test_batch_matches_scalar_output(generator, engine):
+    rng = random.Random(7)
+    colors = [f"#{rng.randrange(1 << 24):06x}" for _ in range(500)]
+    styles = [rng.choice(generator.design_styles) for _ in colors]
+    harmonies = [rng.choice(generator.color_harmonies) for _ in colors]
+
+    palettes = engine.generate_palettes(colors, styles, harmonies)
+    shadows = engine.generate_shadow_systems(palettes['shadow'], styles)
+    batch_palettes = engine.to_palettes(palettes)
+    for index, (color, style, harmony) in enumerate(zip(colors, styles, harmonies)):
+        palette, shadow = _scalar(generator, color, style, harmony)
+        assert batch_palettes[index] == palette, color
+        assert {name: str(values[index]) for name, values in shadows.items()} == shadow, color
+
+
+def test_batch_matches_generated_design_systems(generator, engine):
+    requests = [(f"#{(seed * 2654435761) % (1 << 24):06x}", generator.design_styles[seed % 8], seed) for seed in range(50)]
+    # The colors section picks its harmony from its own seeded stream
+    harmonies = [_section_rng(seed, 'colors').choice(generator.color_harmonies) for _, _, seed in requests]
+
+    palettes = engine.to_palettes(engine.generate_palettes(
+        [color for color, _, _ in requests], [style for _, style, _ in requests], harmonies
+    ))
+    for (color, style, seed), palette in zip(requests, palettes):
+        design_tokens = generator.generate_design_system(style_preference=style, color_preference=color, seed=seed)
+        assert palette == design_tokens.colors, color
+
+
+async def test_palette_endpoint(client, generator):
+    response = await client.post("/api/v1/themes/palettes", json={
+        "base_colors": ["#3366FF", "#aa3300"], "style": "modern", "harmony": "triadic", "include_shadows": True
+    })
+
+    assert response.status_code == 200
+    body = response.json()
+    for color, palette, shadows in zip(("#3366ff", "#aa3300"), body["palettes"], body["shadows"]):
+        expected_palette, expected_shadows = _scalar(generator, color, "modern", "triadic")
+        assert palette == asdict(expected_palette)
+        assert shadows == expected_shadows
+
+
+@pytest.mark.parametrize("body", [
+    {"base_colors": ["#33ff"], "style": "modern"},
+    {"base_colors": ["#3366ff"], "style": "modern", "harmony": "pentadic"},
+    {"base_colors": [], "style": "modern"}
+])
+async def test_palette_endpoint_rejects_invalid_input(client, body):
+    response = await client.post("/api/v1/themes/palettes", json=body)
+
+    assert response.status_code == 422
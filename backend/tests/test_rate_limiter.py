@@ -0,0 +1,102 @@
+# backend/tests/test_rate_limiter.py
+"""
+Sliding-window rate limiting in the in-memory and shared-memory backends
+"""
+
+import hashlib
+import uuid
+
+import pytest
+
+from app.utils.rate_limiter import InMemoryBackend, SharedMemoryBackend
+
+WINDOW = 60.0
+
+
+@pytest.fixture
+def shared_backend(tmp_path):
+    backends = []
+
+    def attach(max_keys: int = 1024, name: str = ""):
+        backend = SharedMemoryBackend(name=name or f"test_rate_limit_{uuid.uuid4().hex[:12]}", max_keys=max_keys, lock_dir=str(tmp_path))
+        backends.append(backend)
+        return backend
+
+    yield attach
+    for backend in reversed(backends):
+        backend.close()
+    if backends:
+        backends[0].unlink()
+
+
+@pytest.fixture(params=["memory", "shared"])
+def backend(request, shared_backend):
+    return InMemoryBackend() if request.param == "memory" else shared_backend()
+
+
+def _hits(backend, key, now, count, limit):
+    return [backend.hit(key, now, WINDOW, limit) for _ in range(count)]
+
+
+def test_limit_applies_per_key(backend):
+    assert _hits(backend, "a", 10.0, 4, 3) == [True, True, True, False]
+    assert _hits(backend, "b", 10.0, 3, 3) == [True, True, True]
+
+
+def test_previous_window_is_weighted_by_its_overlap(backend):
+    assert all(_hits(backend, "a", 50.0, 10, 10))
+    # Half way through the next window half of the previous count still applies
+    assert _hits(backend, "a", WINDOW + 30.0, 6, 10) == [True] * 5 + [False]
+    # Two windows later nothing carries over
+    assert all(_hits(backend, "a", 3 * WINDOW + 1.0, 10, 10))
+
+
+def test_idle_keys_are_evicted(backend):
+    backend.hit("idle", 1.0, WINDOW, 10)
+    backend.hit("active", 2 * WINDOW + 1.0, WINDOW, 10)
+
+    assert backend.evict_idle(2 * WINDOW + 2.0, WINDOW) == 1
+    assert len(backend) == 1
+
+
+def test_memory_backend_caps_keys():
+    backend = InMemoryBackend(max_keys=2)
+    for key in ("a", "b", "c"):
+        backend.hit(key, 1.0, WINDOW, 10)
+
+    assert len(backend) == 2
+    assert backend.evictions == 1
+
+
+def test_shared_backend_reuses_the_stalest_slot_when_full(shared_backend):
+    backend = shared_backend(max_keys=8)
+    for index in range(20):
+        backend.hit(f"client-{index}", float(index) * WINDOW, WINDOW, 10)
+
+    assert len(backend) <= backend.slots == 8
+    # The newest key kept its slot and its count
+    assert _hits(backend, "client-19", 19 * WINDOW, 10, 10) == [True] * 9 + [False]
+
+
+def test_shared_backend_counts_across_attachments(shared_backend):
+    first = shared_backend()
+    second = shared_backend(name=first.name)
+
+    assert _hits(first, "a", 1.0, 2, 3) == [True, True]
+    assert _hits(second, "a", 1.0, 2, 3) == [True, False]
+
+
+def test_shared_backend_finds_a_key_past_a_freed_slot(shared_backend):
+    backend = shared_backend(max_keys=64)
+
+    def start(key):
+        return (int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") | 1) % backend.slots
+
+    # Two keys probing from the same slot: the second lands one slot further
+    keys = [f"client-{index}" for index in range(10_000) if start(f"client-{index}") == start("client-0")][:2]
+    backend.hit(keys[0], 1.0, WINDOW, 3)
+    assert _hits(backend, keys[1], 1.0, 2, 3) == [True, True]
+    # Free the first slot, as the idle sweep would
+    backend.SLOT.pack_into(backend._buffer, start(keys[0]) * backend.SLOT.size, 0, 0, 0, 0)
+
+    assert _hits(backend, keys[1], 1.0, 2, 3) == [True, False]
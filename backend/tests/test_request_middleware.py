@@ -0,0 +1,104 @@
+# backend/tests/test_request_middleware.py
+"""
+Request IDs, rate limiting and access logging in RequestContextMiddleware
+"""
+
+import logging
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.utils.rate_limiter import RateLimiter
+from app.utils.request_middleware import RequestContextMiddleware, next_request_id
+
+
+async def _hello(request):
+    return PlainTextResponse(f"hello {request.state.request_id}")
+
+
+async def _stream(request):
+    async def chunks():
+        for chunk in (b"a" * 10, b"b" * 20):
+            yield chunk
+    return StreamingResponse(chunks())
+
+
+async def _boom(request):
+    raise RuntimeError("boom")
+
+
+def _client(**middleware_options) -> httpx.AsyncClient:
+    app = Starlette(routes=[Route("/hello", _hello), Route("/stream", _stream), Route("/items/{item_id}", _boom)])
+    app.add_middleware(RequestContextMiddleware, **middleware_options)
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    return httpx.AsyncClient(transport=transport, base_url="http://localhost")
+
+
+class _Records(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def access_records():
+    access_logger = logging.getLogger("app.access")
+    handler = _Records()
+    previous_level = access_logger.level
+    access_logger.addHandler(handler)
+    access_logger.setLevel(logging.INFO)
+    yield handler.records
+    access_logger.removeHandler(handler)
+    access_logger.setLevel(previous_level)
+
+
+def test_request_ids_are_unique_and_increasing():
+    first, second = next_request_id(), next_request_id()
+    prefix, _, counter = first.rpartition("-")
+
+    assert first != second
+    assert second.startswith(prefix + "-")
+    assert int(second.rpartition("-")[2], 16) == int(counter, 16) + 1
+
+
+async def test_request_id_is_returned_and_on_request_state():
+    async with _client() as client:
+        response = await client.get("/hello")
+
+    assert response.status_code == 200
+    assert response.text == f"hello {response.headers['x-request-id']}"
+
+
+async def test_rate_limited_requests_get_429_with_request_id():
+    async with _client(rate_limiter=RateLimiter(max_requests=2)) as client:
+        responses = [await client.get("/hello") for _ in range(3)]
+
+    assert [response.status_code for response in responses] == [200, 200, 429]
+    body = responses[2].json()
+    assert body["error"] == "Rate Limit Exceeded"
+    assert body["request_id"] == responses[2].headers["x-request-id"]
+
+
+async def test_access_log_records_route_fields(access_records):
+    async with _client() as client:
+        response = await client.get("/stream")
+
+    record, = access_records
+    assert record.request_id == response.headers["x-request-id"]
+    assert (record.method, record.path, record.status, record.bytes) == ("GET", "/stream", 200, 30)
+    assert record.duration_ms >= 0
+
+
+async def test_sampling_skips_successes_but_keeps_errors(access_records):
+    async with _client(access_log_sample_rate=0.0) as client:
+        ok = await client.get("/hello")
+        failed = await client.get("/items/1")
+
+    assert ok.status_code == 200 and failed.status_code == 500
+    assert [(record.path, record.status) for record in access_records] == [("/items/1", 500)]
@@ -0,0 +1,67 @@
+# backend/tests/test_serialization.py
+"""
+Frozen token dataclasses and orjson-encoded responses
+"""
+
+import dataclasses
+import json
+from dataclasses import asdict, is_dataclass
+
+import numpy as np
+import orjson
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from app.services.generation_worker import build_generation_payload
+from app.services.generators.design_generator import DesignGeneratorService, DesignTokens
+from app.utils.responses import dumps
+
+
+@pytest.fixture(scope="module")
+def design_tokens():
+    return DesignGeneratorService().generate_design_system(style_preference="retro", color_preference="#aa3300", seed=4)
+
+
+def test_tokens_are_frozen(design_tokens):
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        design_tokens.colors.primary = "#000000"
+    with pytest.raises((dataclasses.FrozenInstanceError, AttributeError)):
+        design_tokens.colors = design_tokens.colors
+
+
+def _sections(design_tokens):
+    return {
+        field.name: getattr(design_tokens, field.name)
+        for field in dataclasses.fields(design_tokens) if field.init
+    }
+
+
+def test_cached_encodings_match_the_dataclasses(design_tokens):
+    sections = {name: asdict(value) if is_dataclass(value) else dict(value) for name, value in _sections(design_tokens).items()}
+
+    assert design_tokens.to_dict() == sections
+    assert orjson.loads(design_tokens.to_json()) == sections
+    assert design_tokens.to_json() is design_tokens.to_json()
+    assert DesignTokens.from_dict(design_tokens.to_dict()) == design_tokens
+
+
+def test_generation_payload_matches_the_jsonable_encoder_path():
+    request_data = {
+        "design_config": {"style": "modern", "colors": {"primary": "#3366ff"}, "seed": 1},
+        "component_types": ["button", "card", "modal"],
+        "variants_per_type": 3,
+        "framework": "react",
+        "include_states": True
+    }
+    body, timings = build_generation_payload(request_data)
+    response = orjson.loads(body)
+    tokens = DesignGeneratorService().generate_design_system(style_preference="modern", color_preference="#3366ff", seed=1)
+
+    # What the endpoint returned before it encoded with orjson
+    assert response["design_tokens"] == json.loads(json.dumps(jsonable_encoder(_sections(tokens))))
+    assert response["total_components"] == len(response["components"]) == 9
+    assert set(timings) >= {"components", "total"}
+
+
+def test_dumps_handles_numpy_and_non_string_keys():
+    assert orjson.loads(dumps({1: np.array([1.5, np.nan]), "ok": np.float64(2.0)})) == {"1": [1.5, None], "ok": 2.0}
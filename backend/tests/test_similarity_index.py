@@ -0,0 +1,93 @@
+# backend/tests/test_similarity_index.py
+"""
+Design similarity index: exact nearest neighbours, persistence and re-rolls
+"""
+
+import numpy as np
+import pytest
+
+from app.services.generators.design_generator import DesignGeneratorService
+from app.services.similarity_index import FEATURE_SIZE, DesignSimilarityIndex
+
+THRESHOLD = 0.3
+
+
+def _linear_nearest(points, features, exclude=None):
+    candidates = {key: point for key, point in points.items() if key != exclude}
+    key = min(candidates, key=lambda key: np.linalg.norm(candidates[key] - features))
+    distance = float(np.linalg.norm(candidates[key] - features))
+    return (key, distance) if distance <= THRESHOLD else None
+
+
+@pytest.fixture
+def clustered():
+    rng = np.random.default_rng(7)
+    centers = rng.random((40, FEATURE_SIZE))
+    return centers[rng.integers(0, len(centers), 3000)] + rng.normal(0, 0.05, (3000, FEATURE_SIZE)), rng
+
+
+def test_nearest_matches_a_linear_scan(clustered):
+    vectors, rng = clustered
+    # Small leaves and pending buffer so lookups span several merged trees
+    index = DesignSimilarityIndex(threshold=THRESHOLD, leaf_size=8, pending_limit=32)
+    points = {}
+    for position, features in enumerate(vectors):
+        index.add(f"design-{position}", features)
+        points[f"design-{position}"] = features
+    # Replaced vectors must no longer be found
+    for position in range(0, 3000, 7):
+        features = rng.random(FEATURE_SIZE)
+        index.add(f"design-{position}", features)
+        points[f"design-{position}"] = features
+
+    for features in np.concatenate([vectors[:100] + rng.normal(0, 0.05, (100, FEATURE_SIZE)), rng.random((100, FEATURE_SIZE))]):
+        match, expected = index.nearest(features), _linear_nearest(points, features)
+        assert (match is None) == (expected is None)
+        if match is not None:
+            assert match[1] == pytest.approx(expected[1], abs=1e-9)
+
+    match = index.nearest(points["design-1"], exclude_key="design-1")
+    expected = _linear_nearest(points, points["design-1"], exclude="design-1")
+    assert (match is None) == (expected is None)
+    if match is not None:
+        assert match[1] == pytest.approx(expected[1], abs=1e-9)
+
+
+def test_indexes_sharing_a_path_converge(tmp_path, clustered):
+    vectors, _ = clustered
+    path = str(tmp_path / "index.npz")
+    first, second = DesignSimilarityIndex(threshold=THRESHOLD, path=path), DesignSimilarityIndex(threshold=THRESHOLD, path=path)
+    for position in range(0, 200, 2):
+        first.add(f"design-{position}", vectors[position])
+        second.add(f"design-{position + 1}", vectors[position + 1])
+    first.save()
+    second.save()
+
+    loaded = DesignSimilarityIndex(threshold=THRESHOLD, path=path)
+    assert len(loaded) == 200
+    assert loaded.nearest(vectors[3]) == ("design-3", 0.0)
+
+
+def test_seeded_designs_are_never_rerolled():
+    plain = DesignGeneratorService()
+    indexed = DesignGeneratorService(similarity_index=DesignSimilarityIndex(threshold=1e9), max_rerolls=3)
+
+    for seed in range(5):
+        assert indexed.generate_design_system(style_preference="modern", seed=seed) == \
+            plain.generate_design_system(style_preference="modern", seed=seed)
+
+
+def test_unseeded_duplicates_are_rerolled_deterministically():
+    def generate(colors):
+        generator = DesignGeneratorService(similarity_index=DesignSimilarityIndex(threshold=1e9), max_rerolls=2)
+        return [generator.generate_design_system(style_preference="modern", color_preference=color) for color in colors]
+
+    colors = ["#3366ff", "#ff6633", "#33ff66"]
+    plain = DesignGeneratorService()
+    first, second = generate(colors), generate(colors)
+
+    assert first == second
+    # The first design has nothing to collide with; every later one is a "duplicate"
+    assert first[0] == plain.generate_design_system(style_preference="modern", color_preference=colors[0])
+    assert first[1] != plain.generate_design_system(style_preference="modern", color_preference=colors[1])
+    assert first[1].colors.primary == "#ff6633"
@@ -0,0 +1,115 @@
+# backend/tests/test_single_flight.py
+"""
+Single-flight coalescing: identical concurrent generate requests run one generation
+"""
+
+import asyncio
+
+import pytest
+
+from app.utils.single_flight import SingleFlight, TooManyWaiters
+
+GENERATE_BODY = {
+    "design_config": {"style": "modern", "colors": {"primary": "#3366ff"}, "seed": 11},
+    "component_types": ["button", "card", "input"],
+    "variants_per_type": 2,
+    "framework": "vue"
+}
+
+
+async def test_identical_requests_share_one_generation(client):
+    from app.api.endpoints.components import generation_flights, generation_pool
+
+    jobs_before = generation_pool.stats()["completed"]
+    started_before = generation_flights.stats()["started"]
+    responses = await asyncio.gather(*(
+        client.post("/api/v1/components/generate", json=GENERATE_BODY) for _ in range(16)
+    ))
+
+    assert [response.status_code for response in responses] == [200] * 16
+    assert len({response.content for response in responses}) == 1
+    assert generation_pool.stats()["completed"] - jobs_before == 1
+    assert generation_flights.stats()["started"] - started_before == 1
+    assert generation_flights.stats()["in_flight"] == 0
+
+
+async def test_distinct_requests_are_not_coalesced(client):
+    from app.api.endpoints.components import generation_flights
+
+    started_before = generation_flights.stats()["started"]
+    responses = await asyncio.gather(*(
+        client.post(
+            "/api/v1/components/generate",
+            json={**GENERATE_BODY, "design_config": {**GENERATE_BODY["design_config"], "seed": 100 + index}}
+        )
+        for index in range(4)
+    ))
+
+    assert [response.status_code for response in responses] == [200] * 4
+    assert generation_flights.stats()["started"] - started_before == 4
+
+
+async def test_exception_reaches_every_waiter():
+    async def fail() -> None:
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    flights = SingleFlight("test", max_waiters=8, timeout=5)
+    outcomes = await asyncio.gather(*(flights.run("key", fail) for _ in range(5)), return_exceptions=True)
+
+    assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+    assert flights.stats()["started"] == 1
+    assert flights.stats()["failed"] == 1
+    assert flights.stats()["in_flight"] == 0
+
+
+async def test_callers_beyond_max_waiters_are_rejected():
+    calls = 0
+
+    async def slow() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return calls
+
+    flights = SingleFlight("test", max_waiters=3, timeout=5)
+    outcomes = await asyncio.gather(*(flights.run("key", slow) for _ in range(5)), return_exceptions=True)
+
+    assert sum(isinstance(outcome, TooManyWaiters) for outcome in outcomes) == 2
+    assert [outcome for outcome in outcomes if not isinstance(outcome, Exception)] == [(1, False), (1, True), (1, True)]
+    assert flights.stats()["rejected"] == 2
+
+
+async def test_waiter_timing_out_leaves_the_computation_to_others():
+    calls = 0
+
+    async def slow() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.1)
+        return calls
+
+    flights = SingleFlight("test", max_waiters=8, timeout=0.02)
+    impatient = asyncio.ensure_future(flights.run("key", slow))
+    await asyncio.sleep(0)
+    flights.timeout = 1
+    patient = asyncio.ensure_future(flights.run("key", slow))
+    outcomes = await asyncio.gather(impatient, patient, return_exceptions=True)
+
+    assert isinstance(outcomes[0], asyncio.TimeoutError)
+    assert outcomes[1] == (1, True)
+    assert calls == 1
+    assert flights.stats()["timed_out"] == 1
+
+
+@pytest.mark.parametrize("max_waiters", [1, 2])
+async def test_rejection_carries_retry_after(max_waiters):
+    async def slow() -> None:
+        await asyncio.sleep(0.02)
+
+    flights = SingleFlight("test", max_waiters=max_waiters, timeout=5)
+    outcomes = await asyncio.gather(*(flights.run("key", slow) for _ in range(max_waiters + 1)), return_exceptions=True)
+
+    rejected = [outcome for outcome in outcomes if isinstance(outcome, TooManyWaiters)]
+    assert len(rejected) == 1
+    assert rejected[0].retry_after >= 1
@@ -0,0 +1,97 @@
+# backend/tests/test_startup.py
+"""
+Lazy imports at startup and the warmup behind /ready
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+
+from app.utils.startup import Warmup
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LAZY_MODULES = [
+    "jinja2", "numpy", "PIL.Image",
+    "app.services.generators.palette_engine", "app.services.generators.contrast_engine",
+    "app.services.generators.color_names", "app.services.thumbnails", "app.services.similarity_index"
+]
+
+
+def _run_python(code: str) -> str:
+    """Run code in a fresh interpreter, so imports made by other tests do not count"""
+    env = {**os.environ, "LOG_LEVEL": "ERROR", "GENERATION_EXECUTOR": "thread", "WARMUP_BLOCKING": "1"}
+    completed = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=300
+    )
+    assert completed.returncode == 0, completed.stderr
+    return completed.stdout.strip().splitlines()[-1]
+
+
+def test_heavy_modules_are_not_imported_with_the_app():
+    loaded = json.loads(_run_python(
+        "import json, sys, app.main; "
+        f"print(json.dumps([name for name in {LAZY_MODULES!r} if name in sys.modules]))"
+    ))
+
+    assert loaded == []
+
+
+def test_lifespan_warmup_makes_the_app_ready():
+    report = json.loads(_run_python("""
+import asyncio, json, httpx
+from app.main import app
+
+async def main():
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+            response = await client.get("/ready")
+    print(json.dumps({"status": response.status_code, **response.json()}))
+
+asyncio.run(main())
+"""))
+
+    assert report["status"] == 200 and report["ready"] is True
+    assert set(report["tasks"]) == {
+        "templates", "design_generator", "contrast_engine", "thumbnails", "color_table", "generation_pool"
+    }
+    assert all(task["state"] == "done" for task in report["tasks"].values())
+
+
+async def test_ready_is_503_until_warmup_has_run(client):
+    # The in-process tests never run the lifespan, so warmup has not started
+    response = await client.get("/ready")
+    health = await client.get("/health")
+
+    assert health.status_code == 200
+    assert response.status_code == 503 and response.json()["ready"] is False
+    assert {task["state"] for task in response.json()["tasks"].values()} == {"pending"}
+
+
+async def test_warmup_tasks_run_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+    warmup = Warmup()
+    warmup.add("first", barrier.wait)
+    warmup.add("second", barrier.wait)
+
+    assert warmup.report()["tasks"] == {"first": {"state": "pending"}, "second": {"state": "pending"}}
+    warmup.start()
+    assert await warmup.wait(timeout=10)
+    assert warmup.report()["elapsed_ms"] >= 0
+
+
+async def test_failed_warmup_task_keeps_the_app_not_ready():
+    def fail():
+        raise RuntimeError("no templates")
+
+    warmup = Warmup()
+    warmup.add("ok", lambda: None)
+    warmup.add("templates", fail)
+    warmup.start()
+
+    assert not await warmup.wait(timeout=10)
+    assert warmup.report()["tasks"]["templates"] == {"state": "failed", "error": "no templates"}
+    assert warmup.report()["tasks"]["ok"]["state"] == "done"
@@ -0,0 +1,88 @@
+# backend/tests/test_streaming.py
+"""
+Streamed (NDJSON and server-sent event) component generation
+"""
+
+import orjson
+import pytest
+
+from app.services import generation_worker
+from app.services.generation_worker import iter_generation_events
+from app.utils.streaming import (
+    NDJSON_MEDIA_TYPE, SSE_MEDIA_TYPE, encode_ndjson, encode_sse, negotiate_stream_format
+)
+from tests.test_single_flight import GENERATE_BODY
+from tests.test_worker_pool import _request_data
+
+
+@pytest.mark.parametrize("accept, expected", [
+    (None, None),
+    ("application/json", None),
+    ("application/x-ndjson", NDJSON_MEDIA_TYPE),
+    ("text/event-stream, application/x-ndjson;q=0.5", SSE_MEDIA_TYPE)
+])
+def test_stream_format_is_negotiated_from_accept(accept, expected):
+    assert negotiate_stream_format(accept) == expected
+
+
+def test_event_framing():
+    assert orjson.loads(encode_ndjson("component", {"id": 1})) == {"event": "component", "data": {"id": 1}}
+    assert encode_ndjson("design_tokens", b'{"a":1}') == b'{"event":"design_tokens","data":{"a":1}}\n'
+    assert encode_sse("done", {"ok": True}) == b'event: done\ndata: {"ok":true}\n\n'
+
+
+def _ndjson_events(body: bytes):
+    return [(record["event"], record["data"]) for record in map(orjson.loads, body.splitlines())]
+
+
+def _sse_events(body: bytes):
+    events = []
+    for frame in body.decode("utf-8").split("\n\n"):
+        if frame:
+            event_line, data_line = frame.split("\n")
+            events.append((event_line[len("event: "):], orjson.loads(data_line[len("data: "):])))
+    return events
+
+
+def _without_timestamps(components):
+    return [{key: value for key, value in component.items() if key != "created_at"} for component in components]
+
+
+@pytest.mark.parametrize("media_type, parse", [(NDJSON_MEDIA_TYPE, _ndjson_events), (SSE_MEDIA_TYPE, _sse_events)])
+async def test_streamed_events_match_the_json_response(client, media_type, parse):
+    from app.api.endpoints.components import generation_pool
+
+    plain = await client.post("/api/v1/components/generate", json=GENERATE_BODY)
+    streamed = await client.post("/api/v1/components/generate", json=GENERATE_BODY, headers={"Accept": media_type})
+    events = parse(streamed.content)
+    expected = plain.json()
+
+    assert streamed.status_code == 200
+    assert streamed.headers["content-type"].startswith(media_type)
+    assert streamed.headers["x-accel-buffering"] == "no"
+    assert [event for event, _ in events] == ["design_tokens"] + ["component"] * 6 + ["done"]
+    assert events[0][1] == expected["design_tokens"]
+    assert _without_timestamps([data for event, data in events if event == "component"]) == _without_timestamps(expected["components"])
+    assert events[-1][1]["total_components"] == 6
+    assert generation_pool.stats()["in_flight"] == 0
+
+
+async def test_shared_css_mode_streams_the_stylesheet_once(client):
+    body = {**GENERATE_BODY, "css_mode": "shared"}
+    streamed = await client.post("/api/v1/components/generate", json=body, headers={"Accept": NDJSON_MEDIA_TYPE})
+    events = _ndjson_events(streamed.content)
+
+    assert [event for event, _ in events[:2]] == ["design_tokens", "stylesheet"]
+    assert events[1][1]["css"]
+
+
+def test_failures_are_reported_in_band(monkeypatch):
+    def failing_components(request_data, design_tokens):
+        yield from ()
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(generation_worker, "iter_components", failing_components)
+    events = list(iter_generation_events(_request_data()))
+
+    assert [event for event, _ in events] == ["design_tokens", "error"]
+    assert events[-1][1]["success"] is False and events[-1][1]["total_components"] == 0
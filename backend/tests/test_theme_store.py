@@ -0,0 +1,159 @@
+# backend/tests/test_theme_store.py
+"""
+Persistent theme store: content-deduplicated tokens and keyset pagination
+"""
+
+import orjson
+import pytest
+
+from app.services.generators.design_generator import DesignGeneratorService
+from app.services.theme_store import NEUTRAL_HUE_BUCKET, ThemeRecord, ThemeStore, hue_bucket, hue_to_bucket
+
+
+@pytest.fixture(scope="module")
+def generator():
+    return DesignGeneratorService()
+
+
+@pytest.fixture
+async def store(tmp_path):
+    store = ThemeStore(str(tmp_path / "themes.db"), readers=2)
+    yield store
+    await store.close()
+
+
+def _record(generator, name, style="modern", primary="#3366ff", seed=1):
+    config = {"style": style, "colors": {"primary": primary}, "seed": seed}
+    design_tokens = generator.generate_design_system(
+        base_config=config, style_preference=style, color_preference=primary, seed=seed
+    )
+    return ThemeRecord.create(name, config, design_tokens)
+
+
+async def _collect(fetch, limit):
+    items, cursor = [], None
+    while True:
+        page = await fetch(limit=limit, cursor=cursor)
+        items += page.items
+        cursor = page.next_cursor
+        if cursor is None:
+            return items
+
+
+def test_hue_buckets():
+    assert hue_bucket("#ff0000") == hue_to_bucket(0) == 0
+    assert hue_bucket("#00f") == hue_to_bucket(240)
+    assert hue_bucket("#777777") == hue_bucket("#7a7a7c") == NEUTRAL_HUE_BUCKET
+    assert hue_to_bucket(375) == hue_to_bucket(15)
+
+
+async def test_identical_token_sets_are_stored_once(store, generator):
+    record = _record(generator, "Ocean")
+    first, first_deduplicated = await store.save(record)
+    second, second_deduplicated = await store.save(_record(generator, "Ocean copy"))
+
+    assert (first_deduplicated, second_deduplicated) == (False, True)
+    assert first["token_hash"] == second["token_hash"] and first["id"] != second["id"]
+    assert await store.get_tokens(first["token_hash"]) == record.tokens
+
+    theme = await store.get(second["id"])
+    assert theme.summary == second
+    assert orjson.loads(theme.design_config) == orjson.loads(record.design_config)
+    assert await store.get(10_000) is None
+
+
+async def test_listing_pages_newest_first_and_filters(store, generator):
+    records = [
+        _record(generator, f"Theme {index:02d}", style="retro" if index % 3 == 0 else "modern",
+                primary="#808080" if index % 5 == 0 else "#3366ff", seed=index)
+        for index in range(23)
+    ]
+    saved = [summary for summary, _ in await store.save_many(records[:12])]
+    saved += [summary for summary, _ in await store.save_many(records[12:])]
+
+    listed = await _collect(store.list, limit=5)
+    assert [item["id"] for item in listed] == sorted((item["id"] for item in saved), reverse=True)
+
+    retro = await _collect(lambda **page: store.list(style="retro", **page), limit=3)
+    assert {item["name"] for item in retro} == {f"Theme {index:02d}" for index in range(0, 23, 3)}
+
+    grey = await _collect(lambda **page: store.list(hue_bucket=NEUTRAL_HUE_BUCKET, **page), limit=2)
+    assert {item["name"] for item in grey} == {f"Theme {index:02d}" for index in range(0, 23, 5)}
+
+
+async def test_pages_do_not_shift_when_themes_are_added(store, generator):
+    await store.save_many([_record(generator, f"Theme {index}", seed=index) for index in range(6)])
+    first = await store.list(limit=3)
+    await store.save(_record(generator, "Newest", seed=99))
+    second = await store.list(limit=3, cursor=first.next_cursor)
+
+    assert [item["name"] for item in first.items + second.items] == [f"Theme {index}" for index in range(5, -1, -1)]
+
+
+async def test_search_by_name_prefix(store, generator):
+    names = ["Sunset", "sunrise", "Sunflower", "Moon", "SUNDIAL"]
+    await store.save_many([_record(generator, name, seed=index) for index, name in enumerate(names)])
+
+    found = await _collect(lambda **page: store.search(" Sun", **page), limit=2)
+    assert [item["name"] for item in found] == ["SUNDIAL", "Sunflower", "sunrise", "Sunset"]
+
+
+async def test_invalid_cursors_are_rejected(store, generator):
+    await store.save_many([_record(generator, f"Sun {index}", seed=index) for index in range(3)])
+    search_cursor = (await store.search("sun", limit=1)).next_cursor
+
+    for cursor in ("not-a-cursor", search_cursor):
+        with pytest.raises(ValueError):
+            await store.list(cursor=cursor)
+
+
+async def test_themes_survive_reopening(tmp_path, generator):
+    path = str(tmp_path / "themes.db")
+    first = ThemeStore(path)
+    summary, _ = await first.save(_record(generator, "Kept"))
+    await first.close()
+
+    reopened = ThemeStore(path)
+    try:
+        assert (await reopened.get(summary["id"])).summary == summary
+    finally:
+        await reopened.close()
+
+
+@pytest.fixture
+def app_store(monkeypatch, store):
+    from app.api.endpoints import themes
+
+    monkeypatch.setattr(themes, "theme_store", store)
+    return store
+
+
+async def test_theme_endpoints(client, app_store):
+    config = {"style": "organic", "colors": {"primary": "#22aa66"}, "seed": 3}
+    created = await client.post("/api/v1/themes", json={"name": "Forest", "design_config": config})
+    theme_id = created.json()["theme"]["id"]
+    fetched = await client.get(f"/api/v1/themes/{theme_id}")
+    listed = await client.get("/api/v1/themes", params={"hue": 150, "style": "organic"})
+    searched = await client.get("/api/v1/themes/search", params={"q": "for"})
+
+    assert created.status_code == 201 and created.json()["deduplicated"] is False
+    assert fetched.json()["design_config"]["colors"]["primary"] == "#22aa66"
+    assert {key: fetched.json()["design_config"][key] for key in ("style", "seed")} == {"style": "organic", "seed": 3}
+    assert fetched.json()["design_tokens"]["colors"]["primary"] == created.json()["theme"]["primary_color"]
+    assert [item["id"] for item in listed.json()["themes"]] == [theme_id]
+    assert [item["id"] for item in searched.json()["themes"]] == [theme_id]
+
+    resaved = await client.post("/api/v1/themes", json={
+        "name": "Forest again", "design_config": config, "design_tokens": fetched.json()["design_tokens"]
+    })
+    assert resaved.json()["deduplicated"] is True
+
+
+async def test_theme_endpoint_errors(client, app_store):
+    config = {"style": "organic", "colors": {"primary": "#22aa66"}}
+
+    assert (await client.get("/api/v1/themes/424242")).status_code == 404
+    assert (await client.get("/api/v1/themes", params={"cursor": "bogus"})).status_code == 422
+    assert (await client.post("/api/v1/themes", json={
+        "name": "Broken", "design_config": config, "design_tokens": {"colors": {}}
+    })).status_code == 422
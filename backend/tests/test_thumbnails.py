@@ -0,0 +1,40 @@
+# backend/tests/test_thumbnails.py
+"""
+Theme thumbnails: rendered in the generation pool, cached in the API process
+"""
+
+from dataclasses import asdict
+
+import pytest
+
+from app.services.generation_worker import get_design_service
+
+
+@pytest.fixture
+def design_tokens():
+    return asdict(get_design_service().generate_design_system(style_preference="modern", seed=21))
+
+
+async def test_thumbnail_renders_once_then_serves_from_cache(client, design_tokens):
+    from app.api.endpoints.components import generation_pool
+
+    jobs_before = generation_pool.stats()["completed"]
+    body = {"design_tokens": design_tokens, "width": 320, "format": "png"}
+    first = await client.post("/api/v1/themes/thumbnail", json=body)
+    second = await client.post("/api/v1/themes/thumbnail", json=body)
+
+    assert first.status_code == second.status_code == 200
+    assert first.headers["content-type"] == "image/png"
+    assert first.content.startswith(b"\x89PNG")
+    assert second.content == first.content
+    assert generation_pool.stats()["completed"] - jobs_before == 1
+
+    revalidated = await client.post("/api/v1/themes/thumbnail", json=body, headers={"If-None-Match": first.headers["etag"]})
+    assert revalidated.status_code == 304
+
+
+async def test_thumbnail_rejects_malformed_tokens(client, design_tokens):
+    design_tokens["borders"]["radius_md"] = "8px; background: red"
+    response = await client.post("/api/v1/themes/thumbnail", json={"design_tokens": design_tokens})
+
+    assert response.status_code == 422
@@ -0,0 +1,89 @@
+# backend/tests/test_token_regeneration.py
+"""
+Incremental token regeneration along the section dependency graph
+"""
+
+import pytest
+
+from app.api.validation import parse_design_tokens
+from app.services.generators.design_generator import SECTION_DEPENDENCIES, DesignGeneratorService
+
+CONFIG = {"style": "modern", "colors": {"primary": "#3366ff"}, "seed": 21}
+
+
+@pytest.fixture(scope="module")
+def generator():
+    return DesignGeneratorService()
+
+
+def _generate(generator, config):
+    return generator.generate_design_system(
+        base_config=config,
+        style_preference=config["style"],
+        color_preference=config["colors"].get("primary"),
+        seed=config["seed"]
+    )
+
+
+@pytest.mark.parametrize("changes, expected", [
+    ({"colors": {"primary": "#cc3300"}}, ["colors", "shadows"]),
+    ({"colors": {"accent": "#22aa66"}}, ["colors", "shadows"]),
+    ({"style": "retro"}, ["colors", "typography", "spacing", "borders", "animations", "shadows"]),
+    ({"seed": 22}, ["colors", "typography", "spacing", "borders", "animations", "shadows"]),
+    # Rebuilt colors come out identical, so shadows are not rebuilt
+    ({"colors": {"primary": "#3366FF"}}, ["colors"]),
+    ({"seed": 21}, [])
+])
+def test_edits_rebuild_only_dependent_sections(generator, changes, expected):
+    previous = _generate(generator, CONFIG)
+    design_tokens, config, rebuilt = generator.regenerate_design_system(previous, CONFIG, changes)
+
+    assert rebuilt == expected
+    assert design_tokens.to_dict() == _generate(generator, config).to_dict()
+    for section in SECTION_DEPENDENCIES:
+        if section not in rebuilt:
+            assert getattr(design_tokens, section) is getattr(previous, section)
+
+
+def test_null_color_clears_an_override(generator):
+    config = {**CONFIG, "colors": {"primary": "#3366ff", "accent": "#22aa66"}}
+    previous = _generate(generator, config)
+    design_tokens, merged, rebuilt = generator.regenerate_design_system(previous, config, {"colors": {"accent": None}})
+
+    assert merged["colors"] == {"primary": "#3366ff", "accent": None}
+    assert design_tokens.colors == _generate(generator, CONFIG).colors
+
+
+async def test_patch_endpoint_reports_recomputed_sections(client, generator):
+    previous = _generate(generator, CONFIG).to_dict()
+    response = await client.patch("/api/v1/themes/tokens", json={
+        "previous_tokens": previous,
+        "design_config": CONFIG,
+        "changes": {"colors": {"primary": "#cc3300"}}
+    })
+    body = response.json()
+
+    assert response.status_code == 200
+    assert body["recomputed"] == ["colors", "shadows"]
+    assert body["reused"] == ["typography", "spacing", "borders", "animations", "breakpoints"]
+    assert body["design_tokens"]["typography"] == previous["typography"]
+    assert body["design_config"]["colors"]["primary"] == "#cc3300"
+
+
+@pytest.mark.parametrize("corrupt", [
+    lambda tokens: tokens.pop("shadows"),
+    lambda tokens: tokens["colors"].update(primary="red; } body { display: none"),
+    lambda tokens: tokens["spacing"].update(md="1e9vw"),
+    lambda tokens: tokens["shadows"].update({"x}{": "none"})
+])
+async def test_malformed_previous_tokens_are_rejected(client, generator, corrupt):
+    tokens = _generate(generator, CONFIG).to_dict()
+    tokens = {section: dict(value) if isinstance(value, dict) else value for section, value in tokens.items()}
+    corrupt(tokens)
+
+    with pytest.raises(ValueError):
+        parse_design_tokens(tokens)
+    response = await client.patch("/api/v1/themes/tokens", json={
+        "previous_tokens": tokens, "design_config": CONFIG, "changes": {"seed": 1}
+    })
+    assert response.status_code == 422
@@ -0,0 +1,70 @@
+# backend/tests/test_validation.py
+"""
+Request field types: colors, styles and component types checked at the API boundary
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from app.api.endpoints.components import ComponentGenerationRequest
+from app.api.endpoints.themes import DESIGN_CONFIGS_ADAPTER, ThemeBatchRequest
+from app.api.validation import format_hex_color, parse_hex_color
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("#3366ff", 0x3366ff),
+    ("#3366FF", 0x3366ff),
+    ("3366ff", 0x3366ff),
+    ("#36f", 0x3366ff),
+    (" #36F ", 0x3366ff),
+    (0x3366ff, 0x3366ff)
+])
+def test_parse_hex_color(value, expected):
+    assert parse_hex_color(value) == expected
+    assert format_hex_color(parse_hex_color(value)) == "#3366ff"
+
+
+@pytest.mark.parametrize("value", ["#3366f", "#3366fg", "blue", "", "#3366ff;", True, -1, 1 << 24, 1.5, None])
+def test_parse_hex_color_rejects(value):
+    with pytest.raises(ValueError):
+        parse_hex_color(value)
+
+
+def test_batch_items_dump_canonical_colors():
+    request = ThemeBatchRequest.model_validate({"items": [
+        {"style": "retro", "colors": {"primary": "#ABC", "accent": "10B981"}, "seed": 3},
+        {"colors": {"primary": "#3366FF"}}
+    ]})
+
+    assert DESIGN_CONFIGS_ADAPTER.dump_python(request.items) == [
+        {"style": "retro", "colors": {
+            "primary": "#aabbcc", "secondary": None, "accent": "#10b981", "neutral": None, "background": None, "surface": None
+        }, "seed": 3},
+        {"style": "modern", "colors": {
+            "primary": "#3366ff", "secondary": None, "accent": None, "neutral": None, "background": None, "surface": None
+        }, "seed": None}
+    ]
+
+
+@pytest.mark.parametrize("changes", [
+    {"design_config": {"style": "baroque", "colors": {"primary": "#3366ff"}}},
+    {"design_config": {"colors": {"primary": "not a color"}}},
+    {"component_types": ["button", "../../etc/passwd"]},
+    {"component_types": []},
+    {"variants_per_type": 11},
+    {"framework": "svelte"},
+    {"css_mode": "inline"}
+])
+def test_generation_request_rejects(changes):
+    body = {"design_config": {"colors": {"primary": "#3366ff"}}, "component_types": ["button"], **changes}
+
+    with pytest.raises(ValidationError):
+        ComponentGenerationRequest.model_validate(body)
+
+
+async def test_generate_endpoint_answers_422(client):
+    response = await client.post("/api/v1/components/generate", json={
+        "design_config": {"colors": {"primary": "#zzzzzz"}}, "component_types": ["button"]
+    })
+
+    assert response.status_code == 422
@@ -0,0 +1,122 @@
+# backend/tests/test_worker_pool.py
+"""
+Bounded worker pool: generation runs off the event loop and sheds load when full
+"""
+
+import asyncio
+import threading
+
+import orjson
+import pytest
+
+from app.services.generation_worker import build_generation_payload
+from app.utils.worker_pool import BoundedWorkerPool, WorkerPoolFull
+from tests.test_single_flight import GENERATE_BODY
+
+
+@pytest.fixture
+def pool():
+    pool = BoundedWorkerPool("test", max_workers=1, max_queue=1)
+    yield pool
+    pool.shutdown()
+
+
+def _stable(body: bytes) -> dict:
+    """Payload without the per-run timestamps and timings"""
+    payload = orjson.loads(body)
+    payload.pop("generation_time")
+    for component in payload["components"]:
+        component.pop("created_at")
+    return payload
+
+
+def _request_data():
+    from app.api.endpoints.components import ComponentGenerationRequest
+
+    return ComponentGenerationRequest.model_validate(GENERATE_BODY).model_dump()
+
+
+async def test_run_returns_result_and_records_timings(pool):
+    assert await pool.run(sum, [1, 2, 3]) == 6
+
+    stats = pool.stats()
+    assert (stats["executor"], stats["completed"], stats["in_flight"]) == ("thread", 1, 0)
+    assert stats["run_ms_p50"] >= 0
+
+
+async def test_full_pool_rejects_with_retry_after(pool):
+    gate = threading.Event()
+    running = [asyncio.ensure_future(pool.run(gate.wait)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(WorkerPoolFull) as rejected:
+        await pool.run(gate.wait)
+    assert rejected.value.retry_after >= 1
+    assert pool.stats()["queue_depth"] == 1 and pool.rejected == 1
+
+    gate.set()
+    await asyncio.gather(*running)
+    assert pool.stats()["in_flight"] == 0
+
+
+async def test_cancelled_caller_keeps_slot_until_job_finishes(pool):
+    gate = threading.Event()
+    task = asyncio.ensure_future(pool.run(gate.wait))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    await asyncio.sleep(0.01)
+
+    assert pool.stats()["in_flight"] == 1
+    gate.set()
+    await asyncio.sleep(0.05)
+    assert pool.stats()["in_flight"] == 0
+
+
+def test_reserved_slots_count_and_release_once(pool):
+    slot = pool.reserve()
+    with pool.reserve():
+        with pytest.raises(WorkerPoolFull):
+            pool.reserve()
+
+    slot.release()
+    slot.release()
+    assert pool.stats()["in_flight"] == 0
+
+
+async def test_shut_down_executor_gives_the_slot_back(pool):
+    pool.executor.shutdown()
+
+    with pytest.raises(RuntimeError):
+        await pool.run(sum, [1])
+    assert pool.stats()["in_flight"] == 0
+
+
+async def test_process_pool_builds_the_same_payload():
+    pool = BoundedWorkerPool("test-process", max_workers=1, use_processes=True)
+    try:
+        body, timings = await pool.run(build_generation_payload, _request_data())
+    finally:
+        pool.shutdown()
+
+    assert _stable(body) == _stable(build_generation_payload(_request_data())[0])
+    assert timings["total"] > 0
+
+
+async def test_generate_returns_503_when_the_pool_is_full(client, monkeypatch):
+    from app.api.endpoints.components import generation_pool
+
+    monkeypatch.setattr(generation_pool, "max_queue", 0)
+    slots = [generation_pool.reserve() for _ in range(generation_pool.max_workers)]
+    body = {**GENERATE_BODY, "design_config": {**GENERATE_BODY["design_config"], "seed": 404}}
+    try:
+        pooled = await client.post("/api/v1/components/generate", json=body)
+        streamed = await client.post(
+            "/api/v1/components/generate", json=body, headers={"Accept": "application/x-ndjson"}
+        )
+    finally:
+        for slot in slots:
+            slot.release()
+
+    for response in (pooled, streamed):
+        assert response.status_code == 503
+        assert int(response.headers["retry-after"]) >= 1
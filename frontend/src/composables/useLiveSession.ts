@@ -0,0 +1,134 @@
+// frontend/src/composables/useLiveSession.ts
+/**
+ * Composable for live customization over a WebSocket
+ * Edits go out as small change messages; the server answers with JSON patches
+ */
+
+import { ref, shallowRef } from 'vue'
+import { useDesignStore } from '../stores/design'
+import type { JsonPatchOperation, LiveSessionChanges, LiveSessionMessage, LiveSessionState } from '../types'
+
+// Objects along each changed path are copied, so unchanged components keep their identity
+export function applyPatch<T>(document: T, operations: JsonPatchOperation[]): T {
+  let result: any = document
+
+  for (const operation of operations) {
+    const tokens = operation.path
+      .split('/')
+      .slice(1)
+      .map(token => token.replace(/~1/g, '/').replace(/~0/g, '~'))
+
+    if (tokens.length === 0) {
+      if (operation.op !== 'remove' && operation.op !== 'splice') result = operation.value
+      continue
+    }
+
+    result = { ...result }
+    let parent = result
+    for (const token of tokens.slice(0, -1)) {
+      parent[token] = { ...parent[token] }
+      parent = parent[token]
+    }
+
+    const key = tokens[tokens.length - 1]
+    if (operation.op === 'remove') {
+      delete parent[key]
+    } else if (operation.op === 'splice') {
+      const lines: string[] = parent[key].split('\n')
+      for (const [start, removed, inserted] of [...operation.edits].reverse()) {
+        lines.splice(start, removed, ...inserted)
+      }
+      parent[key] = lines.join('\n')
+    } else {
+      parent[key] = operation.value
+    }
+  }
+
+  return result
+}
+
+export function useLiveSession() {
+  const designStore = useDesignStore()
+  const state = shallowRef<LiveSessionState | null>(null)
+  const version = ref(0)
+  const connected = ref(false)
+  const lastError = ref<string | null>(null)
+
+  let socket: WebSocket | null = null
+  let seq = 0
+
+  const syncStore = () => {
+    if (!state.value) return
+    designStore.designTokens = state.value.design_tokens
+    designStore.generatedComponents = state.value.component_ids.map(id => state.value!.components[id])
+  }
+
+  const start = (request: Record<string, any>): Promise<void> => {
+    stop()
+
+    return new Promise((resolve, reject) => {
+      const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:'
+      const ws = new WebSocket(`${protocol}//${window.location.host}/api/v1/components/live`)
+      socket = ws
+
+      ws.onopen = () => {
+        connected.value = true
+        ws.send(JSON.stringify({ type: 'start', request }))
+      }
+
+      ws.onmessage = (event: MessageEvent<string>) => {
+        const message = JSON.parse(event.data) as LiveSessionMessage
+
+        if (message.type === 'snapshot') {
+          const { type, version: snapshotVersion, ...snapshot } = message
+          state.value = snapshot
+          version.value = snapshotVersion
+          syncStore()
+          resolve()
+        } else if (message.type === 'patch') {
+          if (!state.value) return
+          state.value = applyPatch(state.value, message.ops)
+          version.value = message.version
+          syncStore()
+        } else if (message.type === 'error') {
+          lastError.value = message.message
+        }
+      }
+
+      ws.onerror = () => reject(new Error('Live session connection failed'))
+      ws.onclose = (event: CloseEvent) => {
+        connected.value = false
+        if (socket === ws) socket = null
+        if (!state.value) reject(new Error(event.reason || 'Live session closed'))
+      }
+    })
+  }
+
+  // Send every change as it happens (e.g. on each color picker input); the server coalesces bursts
+  const edit = (changes: LiveSessionChanges) => {
+    if (!socket || socket.readyState !== WebSocket.OPEN) return
+    seq += 1
+    socket.send(JSON.stringify({ type: 'edit', seq, changes }))
+  }
+
+  const resync = () => {
+    socket?.send(JSON.stringify({ type: 'resync' }))
+  }
+
+  const stop = () => {
+    socket?.close()
+    socket = null
+    state.value = null
+  }
+
+  return {
+    state,
+    version,
+    connected,
+    lastError,
+    start,
+    edit,
+    resync,
+    stop
+  }
+}
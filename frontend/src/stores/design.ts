@@ -5,7 +5,7 @@
 
 import { defineStore } from 'pinia'
 import { ref, computed } from 'vue'
-import type { DesignConfig, GeneratedComponent, ComponentGenerationResponse } from '../types'
+import type { DesignConfig, GeneratedComponent, ComponentGenerationResponse, ComponentStreamEvent, TokenPatchResponse } from '../types'
 
 export const useDesignStore = defineStore('design', () => {
   // State
@@ -48,6 +48,7 @@ export const useDesignStore = defineStore('design', () => {
   })
 
   const generatedComponents = ref<GeneratedComponent[]>([])
+  const designTokens = ref<Record<string, any> | null>(null)
   const isGenerating = ref(false)
 
   // Getters
@@ -105,6 +106,85 @@ export const useDesignStore = defineStore('design', () => {
     }
   }
 
+  const streamComponents = async (request: Record<string, any>): Promise<void> => {
+    isGenerating.value = true
+    generatedComponents.value = []
+    
+    try {
+      const response = await fetch('/api/v1/components/generate', {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+          Accept: 'application/x-ndjson'
+        },
+        body: JSON.stringify(request)
+      })
+      
+      if (!response.ok || !response.body) {
+        throw new Error(`Generation failed with status ${response.status}`)
+      }
+      
+      // Render tokens and each variant as soon as its line arrives
+      const reader = response.body.pipeThrough(new TextDecoderStream()).getReader()
+      let buffer = ''
+      
+      while (true) {
+        const { value, done } = await reader.read()
+        if (done) break
+        
+        buffer += value
+        const lines = buffer.split('\n')
+        buffer = lines.pop() ?? ''
+        
+        for (const line of lines) {
+          if (!line) continue
+          const message = JSON.parse(line) as ComponentStreamEvent
+          
+          if (message.event === 'design_tokens') {
+            designTokens.value = message.data
+          } else if (message.event === 'component') {
+            generatedComponents.value.push(message.data)
+          } else if (message.event === 'error') {
+            throw new Error(message.data.message)
+          }
+        }
+      }
+    } catch (error) {
+      console.error('Error streaming components:', error)
+      throw error
+    } finally {
+      isGenerating.value = false
+    }
+  }
+
+  // Live-preview edits: the server only recomputes the token sections the change touches
+  const patchDesignTokens = async (
+    baseConfig: Record<string, any>,
+    changes: Record<string, any>
+  ): Promise<TokenPatchResponse> => {
+    if (!designTokens.value) {
+      throw new Error('No design tokens to update; generate components first')
+    }
+    
+    const response = await fetch('/api/v1/themes/tokens', {
+      method: 'PATCH',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({
+        previous_tokens: designTokens.value,
+        design_config: baseConfig,
+        changes
+      })
+    })
+    
+    if (!response.ok) {
+      throw new Error(`Token update failed with status ${response.status}`)
+    }
+    
+    const result = await response.json() as TokenPatchResponse
+    designTokens.value = result.design_tokens
+    return result
+  }
+
   const exportCode = async (components: GeneratedComponent[], format: 'vue' | 'react') => {
     // Mock export functionality
     return {
@@ -118,10 +198,13 @@ export const useDesignStore = defineStore('design', () => {
   return {
     designConfig,
     generatedComponents,
+    designTokens,
     isGenerating,
     componentCount,
     updateDesignConfig,
     generateComponents,
+    streamComponents,
+    patchDesignTokens,
     exportCode
   }
 })
\ No newline at end of file
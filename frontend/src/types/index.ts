@@ -116,12 +116,90 @@ export interface GeneratedComponent {
   created_at: string
 }
 
+// 'scoped': styles per component; 'shared': components reference utility classes of one stylesheet;
+// 'auto': 'shared' when that makes the response smaller (the response then carries a stylesheet)
+export type CssMode = 'scoped' | 'shared' | 'auto'
+
 // API Response Types
 export interface ComponentGenerationResponse {
   success: boolean
   message: string
   components: GeneratedComponent[]
   design_tokens: Record<string, any>
+  stylesheet?: string
   generation_time: number
   total_components: number
-}
\ No newline at end of file
+}
+// Streamed generation events (Accept: application/x-ndjson)
+export type ComponentStreamEvent =
+  | { event: 'design_tokens'; data: Record<string, any> }
+  | { event: 'stylesheet'; data: { css: string } }
+  | { event: 'component'; data: GeneratedComponent }
+  | { event: 'done'; data: { success: boolean; message: string; generation_time: number; total_components: number } }
+  | { event: 'error'; data: { success: boolean; message: string; total_components: number } }
+
+// Incremental token update (PATCH /api/v1/themes/tokens)
+export interface TokenPatchResponse {
+  success: boolean
+  design_tokens: Record<string, any>
+  design_config: Record<string, any>
+  recomputed: string[]
+  reused: string[]
+  generation_time: number
+}
+
+// Nearest named color / Tailwind step (POST /api/v1/themes/colors/match)
+export interface ColorMatch {
+  color: string
+  name: string
+  hex: string
+  source: 'css' | 'tailwind'
+  delta_e: number
+}
+
+// Bulk palettes for pre-generation (POST /api/v1/themes/palettes), one entry per base color
+export interface PaletteBatchResponse {
+  success: boolean
+  palettes: Record<string, string>[]
+  shadows?: Record<string, string>[]
+  ramps?: Record<string, string>[]
+}
+
+// Ranked font pairings (GET /api/v1/themes/typography/pairings)
+export interface TypographyPairing {
+  primary: string
+  secondary: string
+  score: number
+}
+
+// Live customization session (WebSocket /api/v1/components/live)
+export interface LiveSessionChanges {
+  style?: DesignStyle
+  colors?: Partial<Record<'primary' | 'secondary' | 'accent' | 'neutral' | 'background' | 'surface', string | null>>
+  seed?: number | null
+  component_types?: ComponentType[]
+  variants_per_type?: number
+  include_states?: boolean
+  framework?: ExportFormat
+  css_mode?: CssMode
+}
+
+// RFC 6902 operations plus 'splice': line edits [start, removed, inserted] of a long string
+export type JsonPatchOperation =
+  | { op: 'add' | 'replace'; path: string; value: any }
+  | { op: 'remove'; path: string }
+  | { op: 'splice'; path: string; edits: [number, number, string[]][] }
+
+export interface LiveSessionState {
+  request: Record<string, any>
+  design_tokens: Record<string, any>
+  component_ids: string[]
+  components: Record<string, GeneratedComponent>
+  stylesheet?: string
+}
+
+export type LiveSessionMessage =
+  | ({ type: 'snapshot'; version: number } & LiveSessionState)
+  | { type: 'patch'; version: number; seq: number | null; coalesced: number; ops: JsonPatchOperation[]; recomputed: string[]; rendered: number; generation_time: number }
+  | { type: 'error'; seq: number | null; message: string }
+  | { type: 'busy'; retry_after: number }